@@ -0,0 +1,385 @@
+"""Engine microbenchmarks for hot paths.
+
+Times the engine operations that dominate simulation and server load on
+fixed, seeded fixtures and compares them against a stored baseline.
+
+Usage:
+    python benchmark.py                     # Run all, compare to baseline
+    python benchmark.py -k serialization    # Only benchmarks matching a substring
+    python benchmark.py -o results.json     # Write results as JSON
+    python benchmark.py --save-baseline     # Store results as the new baseline
+    python benchmark.py --tolerance 0.5     # Flag only >50% slowdowns
+
+Fixtures:
+    skirmish  - a few hand-placed cards, like tests/conftest.py
+    corpus    - states recorded before every command of seeded
+                rule-based games with AI-built squads
+
+Exit code is 1 when any benchmark is slower than baseline * (1 + tolerance).
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+from dataclasses import dataclass, asdict
+from typing import Callable, Dict, List, Optional, Tuple
+
+from src.ai import RuleBasedAI
+from src.board import Board
+from src.card import Card
+from src.commands import Command
+from src.constants import GamePhase
+from src.game import Game
+from src.match import MatchServer
+from src.network.protocol import FrameReader, msg_resync
+
+
+SEED = 1234
+CORPUS_SEEDS = (0, 1, 2)
+DEFAULT_REPEAT = 5
+DEFAULT_TOLERANCE = 0.25
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmark_baseline.json')
+
+
+@dataclass
+class BenchResult:
+    """Timing of one benchmark (per-operation microseconds)."""
+    name: str
+    ops: int          # Operations per round
+    median_us: float  # Median over rounds
+    min_us: float
+    mean_us: float
+
+
+# =============================================================================
+# FIXTURES
+# =============================================================================
+
+def place(game: Game, card_name: str, player: int, pos: int, tapped: bool = False) -> Card:
+    """Place a card directly on the board (same as the place_card test fixture)."""
+    card = Card(def_id=card_name, player=player)
+    card.id = game._next_card_id
+    game._next_card_id += 1
+    card.tapped = tapped
+    card.position = pos
+    if pos >= Board.FLYING_P2_START:
+        game.board.flying_p2[pos - Board.FLYING_P2_START] = card
+    elif pos >= Board.FLYING_P1_START:
+        game.board.flying_p1[pos - Board.FLYING_P1_START] = card
+    else:
+        game.board.cells[pos] = card
+    return card
+
+
+def skirmish_game() -> Game:
+    """Small hand-placed board in MAIN phase, player 1 to act."""
+    game = Game()
+    game.headless = True
+    game.phase = GamePhase.MAIN
+    game.current_player = 1
+    game.turn_number = 1
+    place(game, "Циклоп", 1, 10)
+    place(game, "Друид", 1, 11)
+    place(game, "Гном-басаарг", 1, 12)
+    place(game, "Корпит", 1, 30)
+    place(game, "Гном-басаарг", 2, 15)
+    place(game, "Паук-пересмешник", 2, 16)
+    place(game, "Циклоп", 2, 17, tapped=True)
+    place(game, "Корпит", 2, 35)
+    game.recalculate_formations()
+    return game
+
+
+def record_game(seed: int, max_actions: int = 2000) -> List[Tuple[dict, Command]]:
+    """Play a seeded rule-based game and record (state, command) before every command.
+
+    States are full (unredacted) Game.to_dict() snapshots, so each entry can
+    be restored with Game.from_dict() and the command replayed.
+    """
+    from simulate import setup_game_with_ai_squads
+
+    random.seed(seed)
+    server = MatchServer(headless=True)
+    setup_game_with_ai_squads(server, seed=seed)
+    game = server.game
+    ais = {1: RuleBasedAI(server, 1, seed=seed, trusted=True),
+           2: RuleBasedAI(server, 2, seed=seed + 1, trusted=True)}
+
+    entries = []
+    while game.phase == GamePhase.MAIN and len(entries) < max_actions:
+        ai = next((a for a in ais.values() if a.is_my_turn()), None)
+        if ai is None:
+            break
+        action = ai.choose_action()
+        if action is None:
+            break
+        entries.append((game.to_dict(), action.command))
+        server.apply(action.command, include_snapshot=False)
+    return entries
+
+
+def build_corpus(seeds=CORPUS_SEEDS) -> List[Tuple[dict, Command]]:
+    """Recorded (state, command) pairs from several seeded games."""
+    corpus = []
+    for seed in seeds:
+        corpus.extend(record_game(seed))
+    return corpus
+
+
+def restore(state: dict) -> Game:
+    game = Game.from_dict(state)
+    game.headless = True
+    return game
+
+
+# =============================================================================
+# MEASUREMENT
+# =============================================================================
+
+def measure(name: str, run_round: Callable[[], Tuple[int, int]], repeat: int) -> BenchResult:
+    """Time a benchmark.
+
+    run_round() performs one round and returns (elapsed_ns, ops), so setup
+    that must not be timed (restoring a game, building arguments) can stay
+    inside the round.
+    """
+    per_op = []
+    ops = 0
+    for _ in range(repeat):
+        random.seed(SEED)
+        elapsed, ops = run_round()
+        per_op.append(elapsed / max(ops, 1) / 1000)
+    return BenchResult(
+        name=name,
+        ops=ops,
+        median_us=statistics.median(per_op),
+        min_us=min(per_op),
+        mean_us=statistics.fmean(per_op),
+    )
+
+
+def timed_calls(fn: Callable, args_list: List[tuple]) -> Tuple[int, int]:
+    """Call fn(*args) for every args tuple, timing only the calls."""
+    clock = time.perf_counter_ns
+    total = 0
+    for args in args_list:
+        t0 = clock()
+        fn(*args)
+        total += clock() - t0
+    return total, len(args_list)
+
+
+# =============================================================================
+# BENCHMARKS
+# =============================================================================
+
+def bench_process_command(corpus, repeat) -> List[BenchResult]:
+    """Game.process_command grouped by command type."""
+    by_type: Dict[str, List[Tuple[dict, Command]]] = {}
+    for state, cmd in corpus:
+        by_type.setdefault(cmd.type.name, []).append((state, cmd))
+
+    results = []
+    for type_name, entries in sorted(by_type.items()):
+        def run_round(entries=entries):
+            clock = time.perf_counter_ns
+            total = 0
+            for state, cmd in entries:
+                game = restore(state)
+                t0 = clock()
+                game.process_command(cmd, server_only=True)
+                total += clock() - t0
+            return total, len(entries)
+        results.append(measure(f"process_command.{type_name}", run_round, repeat))
+    return results
+
+
+def bench_serialization(games, repeat) -> List[BenchResult]:
+    """to_dict / from_dict / snapshot_for_player."""
+    states = [g.to_dict() for g in games]
+    return [
+        measure("serialization.to_dict",
+                lambda: timed_calls(lambda g: g.to_dict(), [(g,) for g in games]), repeat),
+        measure("serialization.from_dict",
+                lambda: timed_calls(Game.from_dict, [(s,) for s in states]), repeat),
+        measure("serialization.snapshot_for_player",
+                lambda: timed_calls(lambda g, p: g.snapshot_for_player(p),
+                                    [(g, p) for g in games for p in (1, 2)]), repeat),
+    ]
+
+
+def bench_board_queries(games, repeat) -> List[BenchResult]:
+    """Board.get_attack_targets / get_valid_defenders and Game.recalculate_formations."""
+    attack_args = []
+    defender_args = []
+    for game in games:
+        board = game.board
+        for card in board.get_all_cards():
+            attack_args.append((board, card))
+            for pos in board.get_attack_targets(card, include_allies=False):
+                target = board.get_card(pos)
+                if target:
+                    defender_args.append((board, card, target))
+    return [
+        measure("board.get_attack_targets",
+                lambda: timed_calls(lambda b, c: b.get_attack_targets(c), attack_args), repeat),
+        measure("board.get_valid_defenders",
+                lambda: timed_calls(lambda b, a, t: b.get_valid_defenders(a, t), defender_args), repeat),
+        measure("board.recalculate_formations",
+                lambda: timed_calls(lambda g: g.recalculate_formations(), [(g,) for g in games]), repeat),
+    ]
+
+
+def bench_ai_actions(states, repeat) -> List[BenchResult]:
+    """AIPlayer.get_valid_actions through snapshots and through a trusted view."""
+    def run_round(trusted: bool):
+        clock = time.perf_counter_ns
+        total = 0
+        for state in states:
+            server = MatchServer(headless=True)
+            server.game = restore(state)
+            ai = RuleBasedAI(server, server.game.current_player, seed=SEED, trusted=trusted)
+            t0 = clock()
+            ai.get_valid_actions()
+            total += clock() - t0
+        return total, len(states)
+    return [
+        measure("ai.get_valid_actions", lambda: run_round(False), repeat),
+        measure("ai.get_valid_actions_trusted", lambda: run_round(True), repeat),
+    ]
+
+
+def bench_protocol(games, repeat) -> List[BenchResult]:
+    """Message.to_bytes and FrameReader over resync messages."""
+    messages = [msg_resync(g.snapshot_for_player(1), seq) for seq, g in enumerate(games)]
+    stream = b''.join(m.to_bytes() for m in messages)
+
+    def read_all():
+        clock = time.perf_counter_ns
+        t0 = clock()
+        reader = FrameReader()
+        reader.feed(stream)
+        count = len(reader.get_messages())
+        return clock() - t0, count
+
+    return [
+        measure("protocol.to_bytes",
+                lambda: timed_calls(lambda m: m.to_bytes(), [(m,) for m in messages]), repeat),
+        measure("protocol.frame_reader", read_all, repeat),
+    ]
+
+
+def run_benchmarks(repeat: int = DEFAULT_REPEAT, pattern: Optional[str] = None,
+                   seeds=CORPUS_SEEDS) -> List[BenchResult]:
+    """Build fixtures and run every benchmark matching pattern."""
+    corpus = build_corpus(seeds)
+    # Every 10th recorded state for the per-state benchmarks
+    states = [state for state, _ in corpus[::10]]
+    games = [skirmish_game()] + [restore(s) for s in states]
+    turn_states = [s for s in states if not s.get('interaction') and not s.get('priority_phase')]
+
+    suites = [
+        ("process_command", lambda: bench_process_command(corpus, repeat)),
+        ("serialization", lambda: bench_serialization(games, repeat)),
+        ("board", lambda: bench_board_queries(games, repeat)),
+        ("ai", lambda: bench_ai_actions(turn_states, repeat)),
+        ("protocol", lambda: bench_protocol(games, repeat)),
+    ]
+    # Skip whole suites when the pattern names one (e.g. "serialization" or
+    # "process_command.MOVE"); a bare substring runs everything and filters
+    if pattern:
+        named = [(p, s) for p, s in suites if pattern.split('.')[0] in p]
+        suites = named or suites
+
+    results = []
+    for _, suite in suites:
+        results.extend(r for r in suite() if not pattern or pattern in r.name)
+    return results
+
+
+# =============================================================================
+# BASELINE
+# =============================================================================
+
+def results_to_json(results: List[BenchResult]) -> dict:
+    return {
+        'meta': {
+            'seed': SEED,
+            'corpus_seeds': list(CORPUS_SEEDS),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        },
+        'results': {r.name: asdict(r) for r in results},
+    }
+
+
+def compare(results: List[BenchResult], baseline: dict, tolerance: float) -> List[str]:
+    """Print a comparison table and return names of regressed benchmarks."""
+    base = baseline.get('results', {})
+    regressions = []
+    print(f"{'benchmark':<40} {'median us':>10} {'baseline':>10} {'ratio':>7}")
+    print("-" * 70)
+    for r in results:
+        ref = base.get(r.name)
+        if ref is None:
+            print(f"{r.name:<40} {r.median_us:>10.1f} {'-':>10} {'new':>7}")
+            continue
+        ratio = r.median_us / ref['median_us'] if ref['median_us'] else 1.0
+        flag = ""
+        if ratio > 1 + tolerance:
+            flag = "  REGRESSION"
+            regressions.append(r.name)
+        elif ratio < 1 - tolerance:
+            flag = "  faster"
+        print(f"{r.name:<40} {r.median_us:>10.1f} {ref['median_us']:>10.1f} {ratio:>6.2f}x{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run engine microbenchmarks')
+    parser.add_argument('-k', '--filter', type=str, default=None,
+                        help='Only run benchmarks whose name contains this substring')
+    parser.add_argument('-r', '--repeat', type=int, default=DEFAULT_REPEAT,
+                        help=f'Rounds per benchmark (default: {DEFAULT_REPEAT})')
+    parser.add_argument('-o', '--output', type=str, default=None,
+                        help='Write results as JSON to this file')
+    parser.add_argument('--baseline', type=str, default=BASELINE_PATH,
+                        help='Baseline JSON to compare against')
+    parser.add_argument('--save-baseline', action='store_true',
+                        help='Store results as the new baseline')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help=f'Allowed slowdown before flagging (default: {DEFAULT_TOLERANCE})')
+
+    args = parser.parse_args()
+
+    results = run_benchmarks(repeat=args.repeat, pattern=args.filter)
+    data = results_to_json(results)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+
+    if args.save_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+        print(f"Baseline saved to {args.baseline}")
+
+    baseline = {}
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print(f"\n{len(regressions)} regression(s): {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
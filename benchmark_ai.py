@@ -0,0 +1,241 @@
+"""AI decision latency benchmark over recorded mid-game positions.
+
+Per-game averages from simulate.py hide the slow decisions that cause UI
+hitches. This tool harvests a corpus of game states from seeded simulations
+(normal turns, crowded boards, priority windows and interactions), replays
+choose_action() for every AI type on each state and reports tail latency,
+memory allocated per decision and nodes evaluated.
+
+Usage:
+    python benchmark_ai.py                        # Harvest corpus and benchmark all AIs
+    python benchmark_ai.py --ai utility           # One AI type
+    python benchmark_ai.py --save-corpus c.json   # Keep the harvested states
+    python benchmark_ai.py --corpus c.json        # Reuse a saved corpus
+    python benchmark_ai.py --by-category          # Break results down per state kind
+    python benchmark_ai.py -o results.json        # Write results as JSON
+
+Timing and allocation are measured in separate passes because tracemalloc
+slows every allocation down.
+"""
+
+import argparse
+import json
+import math
+import statistics
+import time
+import tracemalloc
+from dataclasses import dataclass, asdict
+from typing import Any, Dict, List, Optional
+
+from benchmark import record_game, restore
+from src.ai import RandomAI, RuleBasedAI, UtilityAI
+from src.match import MatchServer
+
+
+SEED = 1234
+CORPUS_SEEDS = tuple(range(8))
+PER_CATEGORY = 40     # States kept per category
+MIN_TURN = 2          # Skip the opening - mid-game positions only
+CROWDED_CARDS = 16    # Cards on board for a "crowded" state
+
+AI_TYPES = {
+    'random': RandomAI,
+    'rulebased': RuleBasedAI,
+    'utility': UtilityAI,
+}
+CATEGORIES = ('turn', 'crowded', 'priority', 'interaction')
+
+
+@dataclass
+class LatencyStats:
+    """Decision statistics for one AI type (and optionally one category)."""
+    ai: str
+    category: str
+    decisions: int
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    max_ms: float
+    mean_peak_kib: float  # Peak traced memory per decision
+    max_peak_kib: float
+    mean_nodes: float     # Candidate actions/positions scored per decision
+    max_nodes: int
+
+
+# =============================================================================
+# CORPUS
+# =============================================================================
+
+def categorize(state: Dict[str, Any]) -> str:
+    """Kind of decision a state asks for."""
+    if state.get('interaction'):
+        return 'interaction'
+    if state.get('priority_phase'):
+        return 'priority'
+    board = state['board']
+    cards = sum(1 for c in board['cells'] + board['flying_p1'] + board['flying_p2'] if c)
+    if cards >= CROWDED_CARDS:
+        return 'crowded'
+    return 'turn'
+
+
+def harvest_corpus(seeds=CORPUS_SEEDS, per_category: int = PER_CATEGORY) -> List[Dict[str, Any]]:
+    """Collect mid-game states from seeded rule-based games.
+
+    Returns entries {'seed', 'category', 'state'} with at most per_category
+    states of each kind, sampled evenly across the recorded games.
+    """
+    pools: Dict[str, List[Dict[str, Any]]] = {c: [] for c in CATEGORIES}
+    for seed in seeds:
+        for state, _ in record_game(seed):
+            if state['turn_number'] < MIN_TURN:
+                continue
+            category = categorize(state)
+            pools[category].append({'seed': seed, 'category': category, 'state': state})
+
+    corpus = []
+    for category in CATEGORIES:
+        pool = pools[category]
+        step = max(1, len(pool) // per_category)
+        corpus.extend(pool[::step][:per_category])
+    return corpus
+
+
+# =============================================================================
+# MEASUREMENT
+# =============================================================================
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+def _make_ai(ai_type: str, state: Dict[str, Any]):
+    """Fresh AI for the acting player of a restored state (None if nobody can act)."""
+    server = MatchServer(headless=True)
+    server.game = restore(state)
+    for player in (1, 2):
+        ai = AI_TYPES[ai_type](server, player, seed=SEED)
+        if ai.is_my_turn():
+            return ai
+    return None
+
+
+def measure_decision(ai_type: str, state: Dict[str, Any], trace: bool = False) -> Optional[Dict[str, float]]:
+    """Time one choose_action() call on a fresh AI.
+
+    With trace=True the call runs under tracemalloc and the peak traced
+    memory is reported instead of the (distorted) time.
+    """
+    ai = _make_ai(ai_type, state)
+    if ai is None:
+        return None
+
+    if trace:
+        tracemalloc.start()
+        tracemalloc.reset_peak()
+        ai.choose_action()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return {'peak_kib': peak / 1024}
+
+    t0 = time.perf_counter()
+    ai.choose_action()
+    elapsed = time.perf_counter() - t0
+    return {'ms': elapsed * 1000, 'nodes': ai.nodes_evaluated}
+
+
+def summarize(ai_type: str, category: str, times: List[float],
+              peaks: List[float], nodes: List[int]) -> LatencyStats:
+    return LatencyStats(
+        ai=ai_type,
+        category=category,
+        decisions=len(times),
+        p50_ms=percentile(times, 50),
+        p95_ms=percentile(times, 95),
+        p99_ms=percentile(times, 99),
+        max_ms=max(times, default=0.0),
+        mean_peak_kib=statistics.fmean(peaks) if peaks else 0.0,
+        max_peak_kib=max(peaks, default=0.0),
+        mean_nodes=statistics.fmean(nodes) if nodes else 0.0,
+        max_nodes=max(nodes, default=0),
+    )
+
+
+def run_benchmark(corpus: List[Dict[str, Any]], ai_types: List[str],
+                  by_category: bool = False) -> List[LatencyStats]:
+    """Replay choose_action() for each AI type on every corpus state."""
+    results = []
+    for ai_type in ai_types:
+        samples: Dict[str, Dict[str, list]] = {}
+        for entry in corpus:
+            timing = measure_decision(ai_type, entry['state'])
+            if timing is None:
+                continue
+            memory = measure_decision(ai_type, entry['state'], trace=True)
+            for key in ('all', entry['category']):
+                bucket = samples.setdefault(key, {'ms': [], 'peak': [], 'nodes': []})
+                bucket['ms'].append(timing['ms'])
+                bucket['nodes'].append(timing['nodes'])
+                bucket['peak'].append(memory['peak_kib'])
+
+        keys = ['all'] + ([c for c in CATEGORIES if c in samples] if by_category else [])
+        for key in keys:
+            bucket = samples.get(key, {'ms': [], 'peak': [], 'nodes': []})
+            results.append(summarize(ai_type, key, bucket['ms'], bucket['peak'], bucket['nodes']))
+    return results
+
+
+def print_results(results: List[LatencyStats]):
+    print(f"{'ai':<10} {'category':<12} {'n':>4} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+          f"{'max ms':>8} {'peak KiB':>9} {'nodes':>7}")
+    print("-" * 82)
+    for r in results:
+        print(f"{r.ai:<10} {r.category:<12} {r.decisions:>4} {r.p50_ms:>8.2f} {r.p95_ms:>8.2f} "
+              f"{r.p99_ms:>8.2f} {r.max_ms:>8.2f} {r.mean_peak_kib:>9.1f} {r.mean_nodes:>7.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark AI decision latency')
+    parser.add_argument('--ai', type=str, action='append', choices=list(AI_TYPES),
+                        help='AI type to benchmark (repeatable, default: all)')
+    parser.add_argument('--corpus', type=str, default=None,
+                        help='Load corpus from JSON instead of harvesting')
+    parser.add_argument('--save-corpus', type=str, default=None,
+                        help='Save the harvested corpus to JSON')
+    parser.add_argument('--per-category', type=int, default=PER_CATEGORY,
+                        help=f'States per category when harvesting (default: {PER_CATEGORY})')
+    parser.add_argument('--by-category', action='store_true',
+                        help='Also report each state category separately')
+    parser.add_argument('-o', '--output', type=str, default=None,
+                        help='Write results as JSON to this file')
+
+    args = parser.parse_args()
+
+    if args.corpus:
+        with open(args.corpus, encoding='utf-8') as f:
+            corpus = json.load(f)
+    else:
+        corpus = harvest_corpus(per_category=args.per_category)
+        if args.save_corpus:
+            with open(args.save_corpus, 'w', encoding='utf-8') as f:
+                json.dump(corpus, f, ensure_ascii=False)
+
+    counts = {c: sum(1 for e in corpus if e['category'] == c) for c in CATEGORIES}
+    print(f"Corpus: {len(corpus)} states " +
+          ", ".join(f"{c}={n}" for c, n in counts.items()))
+
+    results = run_benchmark(corpus, args.ai or list(AI_TYPES), by_category=args.by_category)
+    print_results(results)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump([asdict(r) for r in results], f, indent=2, ensure_ascii=False)
+
+
+if __name__ == '__main__':
+    main()
@@ -23,7 +23,7 @@ After=network.target
 Type=simple
 User=$USER
 WorkingDirectory=$(pwd)
-ExecStart=/usr/bin/python3.11 -m src.network.server --host 0.0.0.0 --port 7777
+ExecStart=/usr/bin/python3.11 -m src.network.server --host 0.0.0.0 --port 7777 --metrics-port 9777 --journal $(pwd)/journal
 Restart=always
 RestartSec=5
 
@@ -49,5 +49,7 @@ echo "Server running on port 7777"
 echo ""
 echo "Useful commands:"
 echo "  View logs:     sudo journalctl -u berserk -f"
+echo "  Metrics:       curl -s http://127.0.0.1:9777/metrics"
+echo "  Dump to log:   sudo systemctl kill -s USR1 berserk"
 echo "  Restart:       sudo systemctl restart berserk"
 echo "  Stop:          sudo systemctl stop berserk"
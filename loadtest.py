@@ -0,0 +1,483 @@
+"""Synthetic load test for GameServer with headless bot clients.
+
+Spawns pairs of asyncio bots that speak the real protocol (HELLO,
+CREATE_MATCH/JOIN_MATCH, PLAYER_READY, PLACEMENT_DONE, COMMAND) and play
+full matches with RandomAI/RuleBasedAI logic against a local server.
+Reports throughput, command round-trip latency and the server's CPU and
+memory, giving a capacity number before a deploy.
+
+Usage:
+    python loadtest.py                          # 10 matches against a spawned server
+    python loadtest.py -m 50 --think 0.5        # 50 concurrent matches, 0.5s think time
+    python loadtest.py --ai random              # Cheaper bots
+    python loadtest.py --server-workers 4       # Spawned server shards matches over 4 processes
+    python loadtest.py --connect 127.0.0.1:7777 --server-pid 1234   # Existing server
+
+The spawned server runs `python -m src.network.server` on a free port.
+CPU and memory (summed over the server and its worker processes) are read
+with psutil when installed, otherwise from /proc (Linux); elsewhere they
+are reported as unavailable.
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from benchmark_ai import percentile
+from simulate import create_random_deck
+from src.ai import RandomAI, RuleBasedAI, build_ai_squad
+from src.constants import GamePhase
+from src.game import Game
+from src.match import get_content_hash
+from src.network.compression import get_codec, supported_codecs
+from src.network.latency import PING_INTERVAL
+from src.network.protocol import (
+    FrameReader, Message, MessageType,
+    msg_hello, msg_create_match, msg_join_match, msg_player_ready,
+    msg_placement_done, msg_command, msg_ping, msg_pong,
+)
+
+
+AI_TYPES = {'random': RandomAI, 'rulebased': RuleBasedAI}
+MAX_COMMANDS_PER_BOT = 5000  # simulate.py caps a whole game at 10000 actions
+SAMPLE_INTERVAL = 1.0  # Seconds between server resource samples
+STALL_TIMEOUT = 15.0   # Seconds without a game update before a match counts as stalled
+
+
+@dataclass
+class LoadStats:
+    """Counters shared by all bots."""
+    matches_started: int = 0
+    matches_finished: int = 0
+    matches_failed: int = 0
+    matches_stalled: int = 0
+    commands_sent: int = 0
+    commands_rejected: int = 0
+    errors: int = 0
+    latencies_ms: List[float] = field(default_factory=list)
+    bytes_in: int = 0
+    bytes_out: int = 0
+
+
+class MatchStalled(Exception):
+    """Neither bot can act (the simulate.py "neither AI can act" case)."""
+
+
+# =============================================================================
+# BOT CLIENT
+# =============================================================================
+
+class SnapshotServer:
+    """Stands in for MatchServer so an AIPlayer can read the bot's latest snapshot."""
+
+    def __init__(self):
+        self.game: Optional[Game] = None
+        self.snapshot: Dict[str, Any] = {}
+
+    def update(self, snapshot: Dict[str, Any]):
+        self.snapshot = snapshot
+        self.game = Game.from_dict(snapshot)
+        self.game.headless = True
+
+    def get_snapshot(self, for_player: Optional[int] = None) -> Dict[str, Any]:
+        return self.snapshot
+
+
+class BotConnection:
+    """Framed protocol connection for one bot."""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, stats: LoadStats):
+        self.reader = reader
+        self.writer = writer
+        self.stats = stats
+        self.frames = FrameReader()
+
+    async def send(self, msg: Message):
+        data = msg.to_bytes(self.frames.compression)
+        self.stats.bytes_out += len(data)
+        self.writer.write(data)
+        await self.writer.drain()
+
+    async def recv(self) -> Message:
+        while True:
+            msg = self.frames.get_message()
+            if msg is not None and msg.type == MessageType.PING:
+                # Server heartbeat: answer like NetworkClient so it measures RTT
+                await self.send(msg_pong(msg.payload.get('t'), time.time()))
+            elif msg is not None:
+                return msg
+            data = await self.reader.read(65536)
+            if not data:
+                raise ConnectionError("Server closed connection")
+            self.stats.bytes_in += len(data)
+            self.frames.feed(data)
+
+    async def expect(self, *types: MessageType) -> Message:
+        """Receive until one of the given message types arrives."""
+        while True:
+            msg = await self.recv()
+            if msg.type in types:
+                return msg
+            if msg.type == MessageType.ERROR:
+                self.stats.errors += 1
+                raise RuntimeError(msg.payload.get('error', 'server error'))
+
+    async def ping_loop(self):
+        """Keep the session alive past the server's heartbeat timeout."""
+        while True:
+            await asyncio.sleep(PING_INTERVAL)
+            await self.send(msg_ping(time.monotonic()))
+
+    def close(self):
+        self.writer.close()
+
+
+async def run_bot(host: str, port: int, player: int, match_id: 'asyncio.Future',
+                  ai_type: str, think: float, seed: int, stats: LoadStats):
+    """Play one side of a match from HELLO to GAME_OVER."""
+    rng = random.Random(seed)
+    reader, writer = await asyncio.open_connection(host, port)
+    conn = BotConnection(reader, writer, stats)
+    pinger = asyncio.create_task(conn.ping_loop())
+    try:
+        await conn.send(msg_hello(f"bot{seed}", get_content_hash(), supported_codecs()))
+        welcome = await conn.expect(MessageType.WELCOME)
+        conn.frames.compression = get_codec(welcome.payload.get('compression'))
+
+        squad, placement = build_ai_squad(player, create_random_deck(rng))
+        placed_cards = [card.to_dict() for card in placement.values()]
+
+        # Lobby: host creates, guest joins the host's match
+        if player == 1:
+            await conn.send(msg_create_match(squad))
+            created = await conn.expect(MessageType.MATCH_CREATED)
+            match_id.set_result(created.match_id)
+        else:
+            await conn.send(msg_join_match(await match_id, squad))
+        await conn.expect(MessageType.MATCH_JOINED)
+
+        await conn.send(msg_player_ready())
+        await conn.send(msg_placement_done(placed_cards))
+        start = await conn.expect(MessageType.GAME_START)
+        if player == 1:
+            stats.matches_started += 1
+
+        view = SnapshotServer()
+        view.update(start.payload['snapshot'])
+        ai = AI_TYPES[ai_type](view, player, seed=seed, trusted=True)
+
+        seq = 0
+        sent_at: Optional[float] = None
+        while seq < MAX_COMMANDS_PER_BOT:
+            # The server only sends GAME_OVER when there is a winner; a draw
+            # shows up as the phase in the snapshot
+            if view.game.phase == GamePhase.GAME_OVER and sent_at is None:
+                if player == 1:
+                    stats.matches_finished += 1
+                return
+            if sent_at is None and ai.is_my_turn():
+                if think > 0:
+                    await asyncio.sleep(think * rng.uniform(0.5, 1.5))
+                action = ai.choose_action()
+                if action is not None:
+                    seq += 1
+                    sent_at = time.perf_counter()
+                    await conn.send(msg_command(action.command, seq))
+                    stats.commands_sent += 1
+
+            try:
+                msg = await asyncio.wait_for(
+                    conn.expect(MessageType.UPDATE, MessageType.COMMAND_ACK,
+                                MessageType.RESYNC, MessageType.GAME_OVER),
+                    STALL_TIMEOUT)
+            except asyncio.TimeoutError:
+                raise MatchStalled() from None
+            if msg.type == MessageType.GAME_OVER:
+                if player == 1:
+                    stats.matches_finished += 1
+                return
+            answered = (msg.type == MessageType.UPDATE and msg.payload.get('command_seq') == seq
+                        or msg.type == MessageType.COMMAND_ACK and msg.payload.get('ack') == seq)
+            if sent_at is not None and answered:
+                stats.latencies_ms.append((time.perf_counter() - sent_at) * 1000)
+                if not msg.payload.get('accepted'):
+                    stats.commands_rejected += 1
+                if msg.payload.get('error') and msg.type == MessageType.COMMAND_ACK:
+                    stats.errors += 1
+                sent_at = None
+            if msg.payload.get('snapshot'):
+                view.update(msg.payload['snapshot'])
+        raise RuntimeError("command limit reached")
+    finally:
+        pinger.cancel()
+        conn.close()
+
+
+async def run_match(host: str, port: int, index: int, ai_type: str, think: float,
+                    timeout: float, stats: LoadStats):
+    """Run host and guest bots for one match."""
+    match_id = asyncio.get_running_loop().create_future()
+    bots = [
+        asyncio.create_task(run_bot(host, port, player, match_id, ai_type, think,
+                                    seed=index * 2 + player - 1, stats=stats))
+        for player in (1, 2)
+    ]
+    try:
+        await asyncio.wait_for(asyncio.gather(*bots), timeout)
+    except MatchStalled:
+        stats.matches_stalled += 1
+        print(f"  match {index} stalled: no game update for {STALL_TIMEOUT:.0f}s")
+    except Exception as e:
+        stats.matches_failed += 1
+        print(f"  match {index} failed: {type(e).__name__}: {e}")
+    finally:
+        for bot in bots:
+            bot.cancel()
+
+
+# =============================================================================
+# SERVER PROCESS
+# =============================================================================
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def spawn_server(port: int, workers: int = 0) -> subprocess.Popen:
+    """Start a local GameServer and wait until it accepts connections."""
+    proc = subprocess.Popen(
+        [sys.executable, '-m', 'src.network.server', '--host', '127.0.0.1',
+         '--port', str(port), '--metrics-interval', '0', '--workers', str(workers)],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    deadline = time.time() + 15
+    while time.time() < deadline:
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=0.2).close()
+            return proc
+        except OSError:
+            if proc.poll() is not None:
+                break
+            time.sleep(0.1)
+    proc.kill()
+    raise RuntimeError("Server failed to start")
+
+
+class ProcessSampler:
+    """Samples CPU% and resident memory of a process and its children (match workers)."""
+
+    def __init__(self, pid: int):
+        self.pid = pid
+        self.cpu_percent: List[float] = []
+        self.rss_mb: List[float] = []
+        self._root = None
+        self._procs: Dict[int, Any] = {}  # pid -> primed psutil.Process
+        try:
+            import psutil
+            self._root = psutil.Process(pid)
+            self._root.cpu_percent()  # Prime the counter
+            self._procs[pid] = self._root
+        except Exception:
+            self._root = None
+        self._last = self._cpu_seconds()
+        self._last_time = time.perf_counter()
+
+    @property
+    def available(self) -> bool:
+        return self._root is not None or self._last is not None
+
+    def _tree(self) -> List[int]:
+        """The server pid plus its direct children, from /proc."""
+        pids = [self.pid]
+        for entry in os.listdir('/proc'):
+            if not entry.isdigit():
+                continue
+            try:
+                with open(f'/proc/{entry}/stat') as f:
+                    ppid = int(f.read().rsplit(')', 1)[1].split()[1])
+            except (OSError, IndexError, ValueError):
+                continue
+            if ppid == self.pid:
+                pids.append(int(entry))
+        return pids
+
+    def _cpu_seconds(self) -> Optional[float]:
+        try:
+            total = 0.0
+            for pid in self._tree():
+                with open(f'/proc/{pid}/stat') as f:
+                    fields = f.read().rsplit(')', 1)[1].split()
+                total += (int(fields[11]) + int(fields[12])) / os.sysconf('SC_CLK_TCK')
+            return total
+        except (OSError, IndexError, ValueError, AttributeError):
+            return None
+
+    def _rss_mb(self) -> Optional[float]:
+        total = 0.0
+        try:
+            for pid in self._tree():
+                with open(f'/proc/{pid}/status') as f:
+                    for line in f:
+                        if line.startswith('VmRSS:'):
+                            total += int(line.split()[1]) / 1024
+        except OSError:
+            return None
+        return total
+
+    def sample(self):
+        if self._root is not None:
+            try:
+                cpu, rss = 0.0, 0
+                for proc in [self._root] + self._root.children(recursive=True):
+                    proc = self._procs.setdefault(proc.pid, proc)
+                    cpu += proc.cpu_percent()
+                    rss += proc.memory_info().rss
+                self.cpu_percent.append(cpu)
+                self.rss_mb.append(rss / 1024 / 1024)
+            except Exception:
+                pass
+            return
+        cpu = self._cpu_seconds()
+        now = time.perf_counter()
+        if cpu is not None and self._last is not None:
+            self.cpu_percent.append((cpu - self._last) / (now - self._last_time) * 100)
+        self._last, self._last_time = cpu, now
+        rss = self._rss_mb()
+        if rss is not None:
+            self.rss_mb.append(rss)
+
+    async def run(self, stop: asyncio.Event):
+        while not stop.is_set():
+            try:
+                await asyncio.wait_for(stop.wait(), SAMPLE_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+            self.sample()
+
+
+# =============================================================================
+# DRIVER
+# =============================================================================
+
+async def run_load(host: str, port: int, matches: int, ai_type: str, think: float,
+                   ramp: float, timeout: float, server_pid: Optional[int]) -> Dict[str, Any]:
+    """Run all matches concurrently and collect results."""
+    stats = LoadStats()
+    sampler = ProcessSampler(server_pid) if server_pid else None
+    stop = asyncio.Event()
+    sampler_task = asyncio.create_task(sampler.run(stop)) if sampler and sampler.available else None
+
+    start = time.perf_counter()
+    tasks = []
+    for i in range(matches):
+        tasks.append(asyncio.create_task(run_match(host, port, i, ai_type, think, timeout, stats)))
+        if ramp > 0:
+            await asyncio.sleep(ramp)
+    await asyncio.gather(*tasks)
+    duration = time.perf_counter() - start
+
+    stop.set()
+    if sampler_task:
+        await sampler_task
+
+    lat = stats.latencies_ms
+    report = {
+        'matches': matches,
+        'matches_finished': stats.matches_finished,
+        'matches_failed': stats.matches_failed,
+        'matches_stalled': stats.matches_stalled,
+        'duration_s': duration,
+        'commands': stats.commands_sent,
+        'commands_rejected': stats.commands_rejected,
+        'commands_per_s': stats.commands_sent / duration if duration else 0.0,
+        'matches_per_min': stats.matches_finished / duration * 60 if duration else 0.0,
+        'latency_p50_ms': percentile(lat, 50),
+        'latency_p95_ms': percentile(lat, 95),
+        'latency_p99_ms': percentile(lat, 99),
+        'latency_max_ms': max(lat, default=0.0),
+        'mb_in': stats.bytes_in / 1024 / 1024,
+        'mb_out': stats.bytes_out / 1024 / 1024,
+        'errors': stats.errors,
+    }
+    if sampler and sampler.cpu_percent:
+        report['server_cpu_avg_pct'] = sum(sampler.cpu_percent) / len(sampler.cpu_percent)
+        report['server_cpu_max_pct'] = max(sampler.cpu_percent)
+    if sampler and sampler.rss_mb:
+        report['server_rss_max_mb'] = max(sampler.rss_mb)
+    return report
+
+
+def print_report(report: Dict[str, Any]):
+    print("-" * 50)
+    print(f"Matches: {report['matches_finished']}/{report['matches']} finished, "
+          f"{report['matches_stalled']} stalled, {report['matches_failed']} failed "
+          f"in {report['duration_s']:.1f}s")
+    print(f"  Throughput: {report['commands_per_s']:.1f} commands/s, "
+          f"{report['matches_per_min']:.1f} matches/min")
+    print(f"  Commands: {report['commands']} ({report['commands_rejected']} rejected)")
+    print(f"  Latency ms: p50={report['latency_p50_ms']:.1f} p95={report['latency_p95_ms']:.1f} "
+          f"p99={report['latency_p99_ms']:.1f} max={report['latency_max_ms']:.1f}")
+    print(f"  Traffic (client side): {report['mb_in']:.1f} MB in, {report['mb_out']:.1f} MB out")
+    if 'server_cpu_avg_pct' in report:
+        print(f"  Server CPU: avg {report['server_cpu_avg_pct']:.0f}%, max {report['server_cpu_max_pct']:.0f}%")
+    if 'server_rss_max_mb' in report:
+        print(f"  Server memory: max RSS {report['server_rss_max_mb']:.1f} MB")
+    if 'server_cpu_avg_pct' not in report:
+        print("  Server CPU/memory: unavailable")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Load test GameServer with bot clients')
+    parser.add_argument('-m', '--matches', type=int, default=10,
+                        help='Concurrent matches (2 bots each, default: 10)')
+    parser.add_argument('--ai', type=str, default='rulebased', choices=list(AI_TYPES),
+                        help='Bot AI (default: rulebased)')
+    parser.add_argument('--think', type=float, default=0.1,
+                        help='Mean bot think time per command in seconds (default: 0.1)')
+    parser.add_argument('--ramp', type=float, default=0.05,
+                        help='Delay between match starts in seconds (default: 0.05)')
+    parser.add_argument('--timeout', type=float, default=600.0,
+                        help='Per-match timeout in seconds (default: 600)')
+    parser.add_argument('--connect', type=str, default=None,
+                        help='host:port of a running server (default: spawn one)')
+    parser.add_argument('--server-pid', type=int, default=None,
+                        help='PID of the --connect server for CPU/memory sampling')
+    parser.add_argument('--server-workers', type=int, default=0,
+                        help='Match worker processes for the spawned server (default: 0)')
+
+    args = parser.parse_args()
+
+    proc = None
+    if args.connect:
+        host, port = args.connect.rsplit(':', 1)
+        port = int(port)
+        server_pid = args.server_pid
+    else:
+        host, port = '127.0.0.1', free_port()
+        proc = spawn_server(port, args.server_workers)
+        server_pid = proc.pid
+
+    print(f"Load test: {args.matches} match(es), {args.ai} bots, think {args.think}s "
+          f"against {host}:{port}")
+    try:
+        report = asyncio.run(run_load(host, port, args.matches, args.ai, args.think,
+                                      args.ramp, args.timeout, server_pid))
+    finally:
+        if proc:
+            proc.terminate()
+            proc.wait(timeout=10)
+    print_report(report)
+
+
+if __name__ == '__main__':
+    main()
@@ -18,6 +18,7 @@ from src.state_handlers import (
     GameHandler,
     NetworkLobbyHandler,
     NetworkGameHandler,
+    ReplayHandler,
 )
 
 
@@ -77,6 +78,7 @@ def main():
         AppState.GAME: GameHandler(ctx),
         AppState.NETWORK_LOBBY: NetworkLobbyHandler(ctx),
         AppState.NETWORK_GAME: NetworkGameHandler(ctx),
+        AppState.REPLAY: ReplayHandler(ctx),
     }
 
     # Initial state
@@ -6,9 +6,12 @@ Usage:
     python simulate.py -p1 random -p2 rulebased  # Specific AI types
     python simulate.py -n 100 --verbose   # Show each game result
     python simulate.py --no-squad         # Use auto-placement instead of AI squads
+    python simulate.py -n 100 --trusted   # AIs read the live game (no snapshots)
+    python simulate.py -n 20 --profile    # Profile, attribute time per subsystem
 """
 
 import argparse
+import os
 import random
 import time
 from typing import Tuple, Dict, Any, List
@@ -32,12 +35,16 @@ class GameResult:
     p2_cards_remaining: int
 
 
-def create_ai(ai_type: str, server: MatchServer, player: int):
-    """Create AI player of specified type."""
+def create_ai(ai_type: str, server: MatchServer, player: int, trusted: bool = False):
+    """Create AI player of specified type.
+
+    Trusted AIs read a redacted PlayerView of the live game instead of
+    rebuilding it from filtered snapshots - only valid in-process.
+    """
     if ai_type == 'random':
-        return RandomAI(server, player)
+        return RandomAI(server, player, trusted=trusted)
     elif ai_type == 'rulebased':
-        return RuleBasedAI(server, player)
+        return RuleBasedAI(server, player, trusted=trusted)
     else:
         raise ValueError(f"Unknown AI type: {ai_type}")
 
@@ -98,6 +105,7 @@ def setup_game_with_ai_squads(server: MatchServer, seed: int = None,
     # Create Game and set up with placed cards
     from src.game import Game
     game = Game()
+    game.headless = server.headless
     server.game = game
 
     # Collect Card objects from placement dicts
@@ -110,7 +118,7 @@ def setup_game_with_ai_squads(server: MatchServer, seed: int = None,
 
 def run_game(p1_type: str = 'rulebased', p2_type: str = 'rulebased',
              max_turns: int = 500, seed: int = None, debug: bool = False,
-             use_squad_ai: bool = False) -> GameResult:
+             use_squad_ai: bool = False, trusted: bool = False) -> GameResult:
     """Run a single AI vs AI game.
 
     Args:
@@ -119,14 +127,15 @@ def run_game(p1_type: str = 'rulebased', p2_type: str = 'rulebased',
         max_turns: Maximum turns before declaring draw
         seed: Random seed for reproducibility
         use_squad_ai: If True, use AI squad building instead of auto_place_for_testing
+        trusted: If True, AIs read the live game through a PlayerView
 
     Returns:
         GameResult with winner, turns, duration, etc.
     """
     start_time = time.time()
 
-    # Set up server and game
-    server = MatchServer()
+    # Set up server and game (no log strings or UI events needed)
+    server = MatchServer(headless=True)
 
     if use_squad_ai:
         # Use AI squad building for diverse games
@@ -137,8 +146,8 @@ def run_game(p1_type: str = 'rulebased', p2_type: str = 'rulebased',
         server.game.auto_place_for_testing()
 
     # Create AIs
-    ai1 = create_ai(p1_type, server, player=1)
-    ai2 = create_ai(p2_type, server, player=2)
+    ai1 = create_ai(p1_type, server, player=1, trusted=trusted)
+    ai2 = create_ai(p2_type, server, player=2, trusted=trusted)
 
     game = server.game
     action_count = 0
@@ -216,7 +225,8 @@ def run_game(p1_type: str = 'rulebased', p2_type: str = 'rulebased',
 
 def run_simulation(n_games: int = 1, p1_type: str = 'rulebased',
                    p2_type: str = 'rulebased', verbose: bool = False,
-                   debug: bool = False, use_squad_ai: bool = False) -> Dict[str, Any]:
+                   debug: bool = False, use_squad_ai: bool = False,
+                   trusted: bool = False) -> Dict[str, Any]:
     """Run multiple games and collect statistics.
 
     Args:
@@ -226,6 +236,7 @@ def run_simulation(n_games: int = 1, p1_type: str = 'rulebased',
         verbose: Print each game result
         debug: Print detailed debug info for each action
         use_squad_ai: Use AI squad building for diverse games
+        trusted: AIs read the live game instead of filtered snapshots
 
     Returns:
         Dictionary with statistics
@@ -238,6 +249,8 @@ def run_simulation(n_games: int = 1, p1_type: str = 'rulebased',
     total_duration = 0.0
 
     mode_str = "AI squad building" if use_squad_ai else "auto-placement"
+    if trusted:
+        mode_str += ", trusted"
     print(f"Running {n_games} game(s): {p1_type} (P1) vs {p2_type} (P2) [{mode_str}]")
     print("-" * 50)
 
@@ -245,7 +258,8 @@ def run_simulation(n_games: int = 1, p1_type: str = 'rulebased',
         game_seed = i if use_squad_ai else None
         if verbose or debug:
             print(f"Game {i+1} (seed={game_seed}):")
-        result = run_game(p1_type, p2_type, debug=debug, use_squad_ai=use_squad_ai, seed=game_seed)
+        result = run_game(p1_type, p2_type, debug=debug, use_squad_ai=use_squad_ai,
+                          seed=game_seed, trusted=trusted)
         results.append(result)
 
         if result.winner == 1:
@@ -308,17 +322,45 @@ def main():
                         help='Show detailed debug info')
     parser.add_argument('--no-squad', action='store_true',
                         help='Disable AI squad building (use auto-placement instead)')
+    parser.add_argument('--trusted', action='store_true',
+                        help='AIs read a redacted view of the live game instead of snapshots')
+    parser.add_argument('--profile', action='store_true',
+                        help='Profile the run and attribute time to subsystems')
+    parser.add_argument('--profile-out', type=str, default='profile',
+                        help='Directory for profile summary and collapsed stacks (default: profile)')
 
     args = parser.parse_args()
 
-    run_simulation(
-        n_games=args.games,
-        p1_type=args.player1,
-        p2_type=args.player2,
-        verbose=args.verbose,
-        debug=args.debug,
-        use_squad_ai=not args.no_squad
-    )
+    def run():
+        run_simulation(
+            n_games=args.games,
+            p1_type=args.player1,
+            p2_type=args.player2,
+            verbose=args.verbose,
+            debug=args.debug,
+            use_squad_ai=not args.no_squad,
+            trusted=args.trusted
+        )
+
+    if not args.profile:
+        run()
+        return
+
+    from src.profiling import SubsystemProfiler
+
+    profiler = SubsystemProfiler()
+    with profiler:
+        run()
+
+    os.makedirs(args.profile_out, exist_ok=True)
+    summary_path = os.path.join(args.profile_out, 'summary.txt')
+    stacks_path = os.path.join(args.profile_out, 'stacks.collapsed')
+    profiler.write_summary(summary_path)
+    profiler.write_collapsed(stacks_path)
+
+    print("-" * 50)
+    print(profiler.summary(limit=10))
+    print(f"Profile written to {summary_path} and {stacks_path}")
 
 
 if __name__ == '__main__':
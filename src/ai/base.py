@@ -4,15 +4,18 @@ AI players interface with the game through a filtered view - they cannot
 see opponent's hidden (face-down) cards, just like human players.
 
 The AI receives game state snapshots filtered for their player number,
-ensuring fair play.
+ensuring fair play. Trusted AIs running in the same process as the server
+(offline simulation) can instead read a PlayerView of the live game, which
+applies the same redaction at access time without serializing the state.
 """
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from typing import List, Optional, Dict, Any, TYPE_CHECKING
 
-from ..game import Game
-from ..commands import Command
+from ..game import Game, PlayerView, legal_to_command
+from ..commands import Command, CommandType
 from ..interaction import InteractionKind
+from .threat_map import ThreatMap
 
 if TYPE_CHECKING:
     from ..match import MatchServer
@@ -37,32 +40,64 @@ class AIPlayer(ABC):
     Subclasses implement choose_action() to decide what to do.
     """
 
-    def __init__(self, server: 'MatchServer', player: int):
+    def __init__(self, server: 'MatchServer', player: int, trusted: bool = False):
         """Initialize AI player.
 
         Args:
             server: The match server to send commands to
             player: Player number (1 or 2)
+            trusted: Read the live game through a PlayerView instead of
+                     rebuilding it from snapshots (in-process servers only)
         """
         self.server = server
         self.player = player
+        self.trusted = trusted
         self._cached_game: Optional[Game] = None
+        self._cached_game_key: Optional[tuple] = None
+        self._threat_map: Optional[ThreatMap] = None
+        # Candidate actions/positions scored so far (search statistics)
+        self.nodes_evaluated = 0
 
     @property
     def game(self) -> Optional[Game]:
         """Get filtered game state (reconstructed from snapshot).
 
-        This ensures AI can't see opponent's hidden cards.
+        This ensures AI can't see opponent's hidden cards. The view is
+        rebuilt only when the server state version changes, so callers
+        must not leave changes in it. Trusted AIs get a PlayerView of the
+        live game instead.
         """
-        if self.server.game is None:
+        server_game = self.server.game
+        if server_game is None:
             return None
 
+        if self.trusted:
+            if self._cached_game is None or self._cached_game_key != id(server_game):
+                self._cached_game = PlayerView(server_game, self.player)
+                self._cached_game_key = id(server_game)
+            return self._cached_game
+
+        # Reuse the view until the server state changes
+        key = (id(server_game), server_game.state_version)
+        if self._cached_game is not None and self._cached_game_key == key:
+            return self._cached_game
+
         # Get filtered snapshot for this player
         snapshot = self.server.get_snapshot(for_player=self.player)
         # Reconstruct game from filtered snapshot
         self._cached_game = Game.from_dict(snapshot)
+        self._cached_game_key = key
         return self._cached_game
 
+    def get_threat_map(self) -> Optional[ThreatMap]:
+        """Get the threat map for the current state (rebuilt when the state changes)."""
+        if self.server.game is None:
+            return None
+        version = self.server.game.state_version
+        if self._threat_map is None or self._threat_map.state_version != version:
+            self._threat_map = ThreatMap(self.game, self.player)
+        return self._threat_map
+
     @property
     def opponent(self) -> int:
         """Get opponent's player number."""
@@ -120,309 +155,152 @@ class AIPlayer(ABC):
 
         return actions
 
+    def _card_name(self, game: Game, card_id: int) -> str:
+        card = game.board.get_card_by_id(card_id)
+        return card.name if card else f"card_{card_id}"
+
+    def _pos_name(self, game: Game, pos: int) -> str:
+        card = game.board.get_card(pos)
+        return card.name if card else f"pos_{pos}"
+
     def _get_interaction_actions(self, game: Game) -> List[AIAction]:
         """Get valid actions for current interaction."""
-        from ..commands import (
-            cmd_choose_card, cmd_choose_position, cmd_confirm,
-            cmd_skip, cmd_choose_amount
-        )
+        legal = game.legal_commands(self.player)
+        kind = game.interaction.kind
+
+        # Description templates per interaction kind
+        choice_label = {
+            InteractionKind.SELECT_DEFENDER: "defend with",
+            InteractionKind.SELECT_VALHALLA_TARGET: "valhalla buff",
+            InteractionKind.SELECT_COUNTER_SHOT: "counter shot",
+            InteractionKind.SELECT_MOVEMENT_SHOT: "movement shot",
+            InteractionKind.SELECT_ABILITY_TARGET: "target",
+            InteractionKind.SELECT_UNTAP: "untap",
+        }
+        confirm_labels = {
+            InteractionKind.CONFIRM_HEAL: ("accept", "decline"),
+            InteractionKind.CONFIRM_UNTAP: ("accept", "decline"),
+            InteractionKind.CHOOSE_STENCH: ("tap to avoid stench", "take stench damage"),
+            InteractionKind.CHOOSE_EXCHANGE: ("full damage exchange", "reduced damage"),
+        }
+        skip_label = {
+            InteractionKind.SELECT_DEFENDER: "skip defense",
+            InteractionKind.SELECT_MOVEMENT_SHOT: "skip shot",
+            InteractionKind.SELECT_UNTAP: "skip untap",
+        }
 
         actions = []
-        inter = game.interaction
-
-        if inter.kind == InteractionKind.SELECT_DEFENDER:
-            # Can choose a defender or skip
-            for card_id in inter.valid_card_ids:
-                card = game.board.get_card_by_id(card_id)
-                name = card.name if card else f"card_{card_id}"
-                actions.append(AIAction(
-                    cmd_choose_card(self.player, card_id),
-                    f"defend with {name}"
-                ))
-            if inter.is_skippable:
-                actions.append(AIAction(
-                    cmd_skip(self.player),
-                    "skip defense"
-                ))
-
-        elif inter.kind == InteractionKind.SELECT_VALHALLA_TARGET:
-            # Must choose an ally for valhalla buff
-            for card_id in inter.valid_card_ids:
-                card = game.board.get_card_by_id(card_id)
-                name = card.name if card else f"card_{card_id}"
-                actions.append(AIAction(
-                    cmd_choose_card(self.player, card_id),
-                    f"valhalla buff {name}"
-                ))
-
-        elif inter.kind == InteractionKind.SELECT_COUNTER_SHOT:
-            # Must choose target for counter shot
-            for pos in inter.valid_positions:
-                card = game.board.get_card(pos)
-                name = card.name if card else f"pos_{pos}"
-                actions.append(AIAction(
-                    cmd_choose_position(self.player, pos),
-                    f"counter shot {name}"
-                ))
-
-        elif inter.kind == InteractionKind.SELECT_MOVEMENT_SHOT:
-            # Optional shot - can choose target or skip
-            for pos in inter.valid_positions:
-                card = game.board.get_card(pos)
-                name = card.name if card else f"pos_{pos}"
-                actions.append(AIAction(
-                    cmd_choose_position(self.player, pos),
-                    f"movement shot {name}"
-                ))
-            if inter.is_skippable:
-                actions.append(AIAction(
-                    cmd_skip(self.player),
-                    "skip shot"
-                ))
-
-        elif inter.kind == InteractionKind.SELECT_ABILITY_TARGET:
-            # Choose target for ability
-            for pos in inter.valid_positions:
-                card = game.board.get_card(pos)
-                name = card.name if card else f"pos_{pos}"
-                actions.append(AIAction(
-                    cmd_choose_position(self.player, pos),
-                    f"target {name}"
-                ))
-
-        elif inter.kind == InteractionKind.SELECT_UNTAP:
-            # Choose card to untap or skip
-            for pos in inter.valid_positions:
-                card = game.board.get_card(pos)
-                name = card.name if card else f"pos_{pos}"
-                actions.append(AIAction(
-                    cmd_choose_position(self.player, pos),
-                    f"untap {name}"
-                ))
-            if inter.is_skippable:
-                actions.append(AIAction(
-                    cmd_skip(self.player),
-                    "skip untap"
-                ))
-
-        elif inter.kind in (InteractionKind.CONFIRM_HEAL, InteractionKind.CONFIRM_UNTAP):
-            # Yes/No choice
-            actions.append(AIAction(
-                cmd_confirm(self.player, True),
-                "accept"
-            ))
-            actions.append(AIAction(
-                cmd_confirm(self.player, False),
-                "decline"
-            ))
-
-        elif inter.kind == InteractionKind.CHOOSE_STENCH:
-            # Tap (True) or take damage (False)
-            actions.append(AIAction(
-                cmd_confirm(self.player, True),
-                "tap to avoid stench"
-            ))
-            actions.append(AIAction(
-                cmd_confirm(self.player, False),
-                "take stench damage"
-            ))
-
-        elif inter.kind == InteractionKind.CHOOSE_EXCHANGE:
-            # Full damage (True) or reduced (False)
-            actions.append(AIAction(
-                cmd_confirm(self.player, True),
-                "full damage exchange"
-            ))
-            actions.append(AIAction(
-                cmd_confirm(self.player, False),
-                "reduced damage"
-            ))
-
-        elif inter.kind == InteractionKind.SELECT_COUNTERS:
-            # Choose amount of counters
-            for amount in range(inter.min_amount, inter.max_amount + 1):
-                actions.append(AIAction(
-                    cmd_choose_amount(self.player, amount),
-                    f"use {amount} counters"
-                ))
+        for entry in legal:
+            cmd_type, card_id, arg = entry
+            if cmd_type == CommandType.CHOOSE_CARD:
+                desc = f"{choice_label[kind]} {self._card_name(game, card_id)}"
+            elif cmd_type == CommandType.CHOOSE_POSITION:
+                desc = f"{choice_label[kind]} {self._pos_name(game, arg)}"
+            elif cmd_type == CommandType.CONFIRM:
+                yes, no = confirm_labels[kind]
+                desc = yes if arg else no
+            elif cmd_type == CommandType.CHOOSE_AMOUNT:
+                desc = f"use {arg} counters"
+            else:
+                desc = skip_label.get(kind, "skip")
+            actions.append(AIAction(legal_to_command(self.player, entry), desc))
 
         return actions
 
     def _get_priority_actions(self, game: Game) -> List[AIAction]:
         """Get valid actions during priority phase."""
-        from ..commands import cmd_pass_priority, cmd_use_instant
-
         actions = []
-
-        # Can always pass priority
-        actions.append(AIAction(
-            cmd_pass_priority(self.player),
-            "pass priority"
-        ))
-
-        # Check for instant abilities (luck)
-        my_cards = game.board.get_all_cards(self.player)
-        for card in my_cards:
-            if card.can_act and card.has_ability("luck"):
-                # Luck can modify dice: atk/def + plus1/minus1/reroll
-                for target in ["atk", "def"]:
-                    for action in ["plus1", "minus1", "reroll"]:
-                        option = f"{target}_{action}"
-                        actions.append(AIAction(
-                            cmd_use_instant(self.player, card.id, "luck", option),
-                            f"{card.name} luck {option}"
-                        ))
-
+        for entry in game.legal_commands(self.player):
+            cmd_type, card_id, arg = entry
+            if cmd_type == CommandType.PASS_PRIORITY:
+                desc = "pass priority"
+            else:
+                ability_id, option = arg
+                desc = f"{self._card_name(game, card_id)} {ability_id} {option}"
+            actions.append(AIAction(legal_to_command(self.player, entry), desc))
         return actions
 
     def _get_movement_actions(self, game: Game) -> List[AIAction]:
         """Get valid movement actions."""
-        from ..commands import cmd_move
-
         actions = []
-        my_cards = game.board.get_all_cards(self.player)
-
-        for card in my_cards:
-            if card.can_act and card.curr_move > 0:
-                valid_moves = game.board.get_valid_moves(card)
-                for pos in valid_moves:
-                    actions.append(AIAction(
-                        cmd_move(self.player, card.id, pos),
-                        f"move {card.name} to {pos}"
-                    ))
-
+        for entry in game.legal_commands(self.player).of_type(CommandType.MOVE):
+            _, card_id, pos = entry
+            actions.append(AIAction(
+                legal_to_command(self.player, entry),
+                f"move {self._card_name(game, card_id)} to {pos}"
+            ))
         return actions
 
     def _get_attack_actions(self, game: Game) -> List[AIAction]:
         """Get valid attack actions."""
-        from ..commands import cmd_attack, cmd_prepare_flyer_attack
+        legal = game.legal_commands(self.player)
+        forced = game.has_forced_attack
 
         actions = []
-        my_cards = game.board.get_all_cards(self.player)
-
-        # Check for forced attacks first
-        if game.has_forced_attack:
-            # Must attack with a specific card
-            for card_id, targets in game.forced_attackers.items():
-                card = game.board.get_card_by_id(card_id)
-                if card and card.player == self.player and card.can_act:
-                    for target_pos in targets:
-                        target = game.board.get_card(target_pos)
-                        name = target.name if target else f"pos_{target_pos}"
-                        actions.append(AIAction(
-                            cmd_attack(self.player, card.id, target_pos),
-                            f"{card.name} forced attack {name}"
-                        ))
-            if actions:
-                return actions  # Only forced attacks allowed when we have them
-
-        # Normal attacks (exclude allies)
-        for card in my_cards:
-            if card.can_act:
-                targets = game.get_attack_targets(card, include_allies=False)
-                for target_pos in targets:
-                    target = game.board.get_card(target_pos)
-                    if target and target.player != self.player:  # Double check - don't attack allies
-                        actions.append(AIAction(
-                            cmd_attack(self.player, card.id, target_pos),
-                            f"{card.name} attack {target.name}"
-                        ))
+        for entry in legal.of_type(CommandType.ATTACK):
+            _, card_id, pos = entry
+            target = game.board.get_card(pos)
+            name = self._card_name(game, card_id)
+            if forced and card_id in game.forced_attackers:
+                desc = f"{name} forced attack {self._pos_name(game, pos)}"
+            elif target and target.player != self.player:  # Don't attack allies
+                desc = f"{name} attack {target.name}"
+            else:
+                continue
+            actions.append(AIAction(legal_to_command(self.player, entry), desc))
 
         # Prepare flyer attack (when opponent has only flyers)
-        for card in my_cards:
-            if game.can_prepare_flyer_attack(card):
-                actions.append(AIAction(
-                    cmd_prepare_flyer_attack(self.player, card.id),
-                    f"{card.name} prepare flyer attack"
-                ))
+        for entry in legal.of_type(CommandType.PREPARE_FLYER_ATTACK):
+            actions.append(AIAction(
+                legal_to_command(self.player, entry),
+                f"{self._card_name(game, entry[1])} prepare flyer attack"
+            ))
 
         return actions
 
     def _get_ability_actions(self, game: Game) -> List[AIAction]:
         """Get valid ability actions."""
-        from ..commands import cmd_use_ability
-        from ..abilities import ABILITIES, AbilityType, TargetType
+        from ..abilities import ABILITIES, TargetType, EffectType
 
         actions = []
-        my_cards = game.board.get_all_cards(self.player)
-
-        for card in my_cards:
-            if not card.can_act:
-                continue
-
-            for ability_id in card.stats.ability_ids:
-                ability = ABILITIES.get(ability_id)
-                if not ability or ability.ability_type != AbilityType.ACTIVE:
-                    continue
-
-                # Skip instant abilities (like luck) - they use cmd_use_instant in priority phase
-                if ability.is_instant:
-                    continue
-
-                # Check if ability can be used
-                if not card.can_use_ability(ability_id):
+        for entry in game.legal_commands(self.player).of_type(CommandType.USE_ABILITY):
+            _, card_id, ability_id = entry
+            card = game.board.get_card_by_id(card_id)
+            ability = ABILITIES[ability_id]
+
+            if ability.target_type != TargetType.SELF:
+                targets = game._get_ability_targets(card, ability)
+                # Determine if this is a healing/buff ability (targets allies)
+                # or offensive ability (targets enemies)
+                is_heal_ability = (
+                    ability.heal_amount > 0 or
+                    ability.effect_type == EffectType.HEAL_TARGET or
+                    'heal' in ability_id
+                )
+                if is_heal_ability:
+                    # Heal abilities target allies - check if any ally targets exist
+                    wanted = [t for t in targets
+                              if game.board.get_card(t) and
+                              game.board.get_card(t).player == self.player]
+                else:
+                    # All other targeted abilities default to targeting enemies
+                    wanted = [t for t in targets
+                              if game.board.get_card(t) and
+                              game.board.get_card(t).player != self.player]
+                if not wanted:
                     continue
 
-                # For abilities that need targets, check if valid targets exist
-                # For self-targeting abilities, no target needed
-                if ability.target_type == TargetType.SELF:
-                    actions.append(AIAction(
-                        cmd_use_ability(self.player, card.id, ability_id),
-                        f"{card.name} use {ability_id}"
-                    ))
-                else:
-                    # Ability needs target - verify targets exist before adding
-                    targets = game._get_ability_targets(card, ability)
-                    if targets:
-                        # Determine if this is a healing/buff ability (targets allies)
-                        # or offensive ability (targets enemies)
-                        from ..abilities import EffectType
-                        is_heal_ability = (
-                            ability.heal_amount > 0 or
-                            ability.effect_type == EffectType.HEAL_TARGET or
-                            'heal' in ability_id
-                        )
-
-                        if is_heal_ability:
-                            # Heal abilities target allies - check if any damaged allies exist
-                            ally_targets = [
-                                t for t in targets
-                                if game.board.get_card(t) and
-                                game.board.get_card(t).player == self.player
-                            ]
-                            if not ally_targets:
-                                continue  # Skip - no ally targets for heal
-                        else:
-                            # All other targeted abilities default to targeting enemies
-                            enemy_targets = [
-                                t for t in targets
-                                if game.board.get_card(t) and
-                                game.board.get_card(t).player != self.player
-                            ]
-                            if not enemy_targets:
-                                continue  # Skip - no enemy targets
-
-                        actions.append(AIAction(
-                            cmd_use_ability(self.player, card.id, ability_id),
-                            f"{card.name} use {ability_id}"
-                        ))
+            actions.append(AIAction(
+                legal_to_command(self.player, entry),
+                f"{card.name} use {ability_id}"
+            ))
 
         return actions
 
     def _get_turn_actions(self, game: Game) -> List[AIAction]:
         """Get turn management actions (end turn)."""
-        from ..commands import cmd_end_turn
-
-        actions = []
-
-        # Can end turn if no forced attacks
-        if not game.has_forced_attack:
-            actions.append(AIAction(
-                cmd_end_turn(self.player),
-                "end turn"
-            ))
-
-        return actions
+        return [AIAction(legal_to_command(self.player, entry), "end turn")
+                for entry in game.legal_commands(self.player).of_type(CommandType.END_TURN)]
 
     def execute_action(self, action: AIAction) -> bool:
         """Execute an action and return success status."""
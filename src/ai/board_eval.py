@@ -0,0 +1,346 @@
+"""Vectorized batch board evaluation for AI search.
+
+Candidate boards are encoded struct-of-arrays style: one row per candidate
+board, one column per card. Positions vary between rows, while the other
+fields (player, HP, attack tiers, tapped, flags) are broadcast from the base
+board, so a batch of thousands of move combinations costs one small array
+per field.
+
+evaluate_batch() scores the whole batch in a single NumPy pass using the same
+terms as UtilityAI._evaluate_position (material, HP ratio, formation,
+position abilities, attack opportunities, threats, advancement, center
+control and adjacency). Cell relations come from precomputed neighbor
+matrices instead of per-card board scans.
+
+Targeting follows Board.get_attack_targets: ground cards reach the 8
+surrounding cells, flyers reach everything unless the enemy has a visible
+flyer_taunt card, restricted_strike only reaches the cell in front, and a
+prepared flyer attack adds the enemy flying zone.
+
+NumPy is optional. When it is missing HAS_NUMPY is False and UtilityAI falls
+back to scoring each candidate's position with the scalar evaluator; both
+paths then keep the same beam through top_indices().
+"""
+from dataclasses import dataclass
+from typing import Dict, List, Sequence, Tuple, TYPE_CHECKING
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    np = None
+    HAS_NUMPY = False
+
+if TYPE_CHECKING:
+    from ..game import Game
+    from ..card import Card
+
+
+# Slot indices: 0-29 main board, 30-39 flying zones, 40 = not on board
+GROUND_SLOTS = 30
+BOARD_SLOTS = 40
+NO_POS = 40
+
+# Per-card flag bits
+FLAG_WEBBED = 1 << 0
+FLAG_FACE_DOWN = 1 << 1
+FLAG_FORMATION = 1 << 2   # Has a formation ability
+FLAG_TANK = 1 << 3        # High front_row_score - wants adjacent enemies
+FLAG_RANGED = 1 << 4      # Low front_row_score - wants distance
+FLAG_FLYER_TAUNT = 1 << 5  # Visible flyer_taunt - enemy flyers must attack it
+FLAG_RESTRICTED = 1 << 6  # restricted_strike - attacks only straight ahead
+FLAG_HUNTS_FLYERS = 1 << 7  # Prepared flyer attack
+
+
+def _build_tables():
+    """Precompute slot relation matrices (41x41, last row/col is NO_POS)."""
+    size = NO_POS + 1
+    ortho = np.zeros((size, size), dtype=bool)
+    king = np.zeros((size, size), dtype=bool)
+    for a in range(GROUND_SLOTS):
+        ac, ar = a % 5, a // 5
+        for b in range(GROUND_SLOTS):
+            dc, dr = abs(ac - b % 5), abs(ar - b // 5)
+            if dc + dr == 1:
+                ortho[a, b] = True
+            if max(dc, dr) == 1:
+                king[a, b] = True
+
+    # Who can hit whom: ground cards hit the 8 surrounding cells,
+    # flyers hit anything on the board or in either flying zone
+    reach = king.copy()
+    reach[GROUND_SLOTS:BOARD_SLOTS, :BOARD_SLOTS] = True
+    for i in range(BOARD_SLOTS):
+        reach[i, i] = False
+
+    # restricted_strike: only the cell straight ahead, indexed by player
+    front = np.zeros((3, size, size), dtype=bool)
+    for a in range(GROUND_SLOTS):
+        if a + 5 < GROUND_SLOTS:
+            front[1, a, a + 5] = True
+        if a - 5 >= 0:
+            front[2, a, a - 5] = True
+
+    rows = np.full(size, -1, dtype=np.int8)
+    cols = np.full(size, -1, dtype=np.int8)
+    rows[:GROUND_SLOTS] = np.arange(GROUND_SLOTS) // 5
+    cols[:GROUND_SLOTS] = np.arange(GROUND_SLOTS) % 5
+    return ortho, reach, front, rows, cols
+
+
+if HAS_NUMPY:
+    ORTHO, REACH, FRONT, ROWS, COLS = _build_tables()
+
+
+@dataclass
+class BoardBatch:
+    """A batch of candidate boards in struct-of-arrays form.
+
+    All per-card arrays have shape (boards, cards); attack is
+    (boards, cards, 3). Only position is guaranteed to be writable -
+    the other fields may be broadcast views of the base board.
+    """
+    viewer: int                  # Player the batch is scored for
+    card_ids: List[int]          # Column -> card id
+    position: 'np.ndarray'       # Slot index, NO_POS if off board
+    player: 'np.ndarray'
+    hp: 'np.ndarray'
+    max_hp: 'np.ndarray'
+    cost: 'np.ndarray'
+    attack: 'np.ndarray'
+    tapped: 'np.ndarray'
+    flags: 'np.ndarray'
+    position_bonus: 'np.ndarray'  # (cards, 41) position-ability score per slot
+
+    @property
+    def size(self) -> int:
+        """Number of boards in the batch."""
+        return self.position.shape[0]
+
+    def column(self, card_id: int) -> int:
+        """Get the column index for a card id."""
+        return self.card_ids.index(card_id)
+
+
+def _card_flags(card: 'Card') -> int:
+    """Compute flag bits for a card."""
+    from ..abilities import get_ability
+    from .utility_ai import front_row_score
+
+    flags = 0
+    if card.webbed:
+        flags |= FLAG_WEBBED
+    if card.face_down:
+        flags |= FLAG_FACE_DOWN
+    for aid in card.stats.ability_ids:
+        ability = get_ability(aid)
+        if ability and ability.is_formation:
+            flags |= FLAG_FORMATION
+            break
+    if card.has_ability("flyer_taunt") and not card.face_down:
+        flags |= FLAG_FLYER_TAUNT
+    if card.has_ability("restricted_strike"):
+        flags |= FLAG_RESTRICTED
+    if card.can_attack_flyer and not card.stats.is_flying:
+        flags |= FLAG_HUNTS_FLYERS
+    frs = front_row_score(card)
+    if frs > 30:
+        flags |= FLAG_TANK
+    elif frs < 10:
+        flags |= FLAG_RANGED
+    return flags
+
+
+def encode_board(game: 'Game', player: int) -> BoardBatch:
+    """Encode the current board as a batch of one, scored for player."""
+    from .utility_ai import position_ability_bonus
+
+    cards = game.board.get_all_cards()
+    count = len(cards)
+
+    position_bonus = np.zeros((count, NO_POS + 1), dtype=np.float32)
+    for k, card in enumerate(cards):
+        if card.player != player:
+            continue
+        for pos in range(GROUND_SLOTS):
+            position_bonus[k, pos] = position_ability_bonus(card, pos, player)
+
+    def row(values, dtype):
+        return np.array(values, dtype=dtype).reshape(1, count)
+
+    return BoardBatch(
+        viewer=player,
+        card_ids=[c.id for c in cards],
+        position=row([c.position if c.position is not None else NO_POS for c in cards], np.int16),
+        player=row([c.player for c in cards], np.int8),
+        hp=row([c.curr_life for c in cards], np.int16),
+        max_hp=row([c.life for c in cards], np.int16),
+        cost=row([c.stats.cost for c in cards], np.int16),
+        attack=np.array([c.stats.attack for c in cards], dtype=np.int16).reshape(1, count, 3),
+        tapped=row([c.tapped for c in cards], bool),
+        flags=row([_card_flags(c) for c in cards], np.uint8),
+        position_bonus=position_bonus,
+    )
+
+
+def expand_moves(base: BoardBatch, combos: List[Dict[int, int]]) -> BoardBatch:
+    """Build a batch with one board per move combination.
+
+    Each combo maps card_id -> target position. All combos must move the
+    same set of cards (as produced by UtilityAI._generate_move_combinations).
+    """
+    n = len(combos)
+    count = len(base.card_ids)
+
+    position = np.repeat(base.position, n, axis=0)
+    if n and combos[0]:
+        keys = list(combos[0])
+        columns = [base.column(cid) for cid in keys]
+        position[:, columns] = np.array([[c[k] for k in keys] for c in combos], dtype=np.int16)
+
+    def spread(arr):
+        return np.broadcast_to(arr, (n,) + arr.shape[1:])
+
+    return BoardBatch(
+        viewer=base.viewer,
+        card_ids=base.card_ids,
+        position=position,
+        player=spread(base.player),
+        hp=spread(base.hp),
+        max_hp=spread(base.max_hp),
+        cost=spread(base.cost),
+        attack=spread(base.attack),
+        tapped=spread(base.tapped),
+        flags=spread(base.flags),
+        position_bonus=base.position_bonus,
+    )
+
+
+def _attack_reach(batch: BoardBatch, pos: 'np.ndarray', alive: 'np.ndarray') -> 'np.ndarray':
+    """Which card could attack which, as a (boards, cards, cards) mask."""
+    flags = batch.flags
+    player = batch.player.astype(np.intp)
+    pi = pos[:, :, None]
+    pj = pos[:, None, :]
+    reach = REACH[pi, pj]
+
+    ground = pos < GROUND_SLOTS
+    restricted = ground & ((flags & FLAG_RESTRICTED) != 0)
+    reach = np.where(restricted[:, :, None], FRONT[player[:, :, None], pi, pj], reach)
+
+    hunter = ground & ((flags & FLAG_HUNTS_FLYERS) != 0)
+    flying_target = (pj >= GROUND_SLOTS) & (pj < BOARD_SLOTS)
+    reach = reach | (hunter[:, :, None] & flying_target)
+
+    # Flyers facing a visible flyer_taunt card may only attack taunters
+    taunt = alive & ground & ((flags & FLAG_FLYER_TAUNT) != 0)
+    other_side = batch.player[:, :, None] != batch.player[:, None, :]
+    taunted = (taunt[:, None, :] & other_side).any(2)
+    flyer = (pos >= GROUND_SLOTS) & (pos < BOARD_SLOTS)
+    forced = (flyer & taunted)[:, :, None]
+    return np.where(forced, taunt[:, None, :], reach)
+
+
+def evaluate_batch(batch: BoardBatch, weights: Dict[str, float]) -> 'np.ndarray':
+    """Score every board in the batch from batch.viewer's perspective.
+
+    Returns a float array of shape (boards,).
+    """
+    me = batch.viewer
+    pos = batch.position.astype(np.intp)
+    hp = batch.hp
+    flags = batch.flags
+    count = pos.shape[1]
+    score = np.zeros(batch.size, dtype=np.float64)
+    if count == 0:
+        return score
+
+    alive = (pos < NO_POS) & (hp > 0)
+    mine = alive & (batch.player == me)
+    enemy = alive & (batch.player == 3 - me)
+    ground = pos < GROUND_SLOTS
+
+    # Material advantage
+    cost = batch.cost
+    score += ((cost * mine).sum(1) - (cost * enemy).sum(1)) * weights['material']
+
+    # HP advantage
+    my_hp = (hp * mine).sum(1)
+    my_max = (batch.max_hp * mine).sum(1)
+    enemy_hp = (hp * enemy).sum(1)
+    enemy_max = (batch.max_hp * enemy).sum(1)
+    has_both = (my_max > 0) & (enemy_max > 0)
+    ratio = my_hp / np.maximum(my_max, 1) - enemy_hp / np.maximum(enemy_max, 1)
+    score += np.where(has_both, ratio, 0.0) * weights['hp_ratio'] * 10
+
+    # Pairwise slot relations between cards of the same board
+    ortho = ORTHO[pos[:, :, None], pos[:, None, :]]
+    reach = _attack_reach(batch, pos, alive)
+
+    # Formations: formation card orthogonally next to a friendly formation card
+    formation = alive & ground & ((flags & FLAG_FORMATION) != 0)
+    same_side = batch.player[:, :, None] == batch.player[:, None, :]
+    in_formation = formation & (ortho & same_side & formation[:, None, :]).any(2)
+    score += (in_formation & mine).sum(1) * weights['formation']
+
+    # Position-dependent abilities (precomputed per card and slot)
+    bonus = batch.position_bonus[np.arange(count)[None, :], pos]
+    score += (bonus * mine).sum(1)
+
+    # Attack opportunities and kill potential
+    can_act = alive & ~batch.tapped & ((flags & FLAG_WEBBED) == 0)
+    hits = reach & (mine & can_act)[:, :, None] & enemy[:, None, :]
+    score += hits.any(2).sum(1) * weights['attack_opportunity']
+    strong = batch.attack[:, :, 2]
+    kills = hits & (hp[:, None, :] <= strong[:, :, None])
+    score += kills.sum((1, 2)) * weights['kill_potential']
+
+    # Threats against us
+    threats = reach & (enemy & ~batch.tapped)[:, :, None] & mine[:, None, :]
+    score += threats.sum((1, 2)) * weights['threat']
+
+    # Board advancement and center control
+    my_ground = mine & ground
+    rows = ROWS[pos]
+    advancement = rows if me == 1 else 5 - rows
+    score += (advancement * my_ground).sum(1) * weights['advancement']
+    score += ((COLS[pos] == 2) & my_ground).sum(1) * weights['center_control']
+
+    # Adjacency: tanks want enemies next to them, ranged cards do not
+    adjacent_enemies = (ortho & enemy[:, None, :]).sum(2)
+    role = ((flags & FLAG_TANK) != 0).astype(np.int8) - ((flags & FLAG_RANGED) != 0)
+    score += (adjacent_enemies * role * my_ground).sum(1) * weights['row_placement']
+
+    return score
+
+
+def count_moves(base: BoardBatch, batch: BoardBatch) -> Tuple['np.ndarray', 'np.ndarray']:
+    """Count moved and advancing cards per board relative to base.
+
+    Returns (moved, advanced) integer arrays of shape (boards,). A move is
+    advancing when it ends on the main board in a row closer to the enemy.
+    """
+    old = base.position.astype(np.intp)
+    new = batch.position.astype(np.intp)
+    moved = new != old
+    old_rows = ROWS[old]
+    new_rows = ROWS[new]
+    if batch.viewer == 1:
+        forward = new_rows > old_rows
+    else:
+        forward = (new_rows < old_rows) & (new_rows >= 0)
+    advanced = moved & (new < GROUND_SLOTS) & forward
+    return moved.sum(1), advanced.sum(1)
+
+
+def top_indices(scores: Sequence[float], n: int) -> List[int]:
+    """Indices of the n highest scores, best first; ties keep index order.
+
+    Works on NumPy arrays and on plain lists (the scalar evaluator), and
+    picks the same indices for both.
+    """
+    if n <= 0 or len(scores) == 0:
+        return []
+    if HAS_NUMPY and isinstance(scores, np.ndarray):
+        return np.argsort(-scores, kind='stable')[:n].tolist()
+    return sorted(range(len(scores)), key=lambda i: -scores[i])[:n]
@@ -24,15 +24,17 @@ class RandomAI(AIPlayer):
 
     name = "Random"
 
-    def __init__(self, server: 'MatchServer', player: int, seed: int = None):
+    def __init__(self, server: 'MatchServer', player: int, seed: int = None,
+                 trusted: bool = False):
         """Initialize random AI.
 
         Args:
             server: The match server
             player: Player number (1 or 2)
             seed: Optional random seed for reproducibility
+            trusted: Read the live game through a PlayerView
         """
-        super().__init__(server, player)
+        super().__init__(server, player, trusted)
         self.rng = random.Random(seed)
 
     def choose_action(self) -> Optional[AIAction]:
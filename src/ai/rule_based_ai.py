@@ -128,8 +128,9 @@ class RuleBasedAI(AIPlayer):
 
     name = "Rule-based"
 
-    def __init__(self, server: 'MatchServer', player: int, seed: int = None):
-        super().__init__(server, player)
+    def __init__(self, server: 'MatchServer', player: int, seed: int = None,
+                 trusted: bool = False):
+        super().__init__(server, player, trusted)
         self.rng = random.Random(seed)
 
     def choose_action(self) -> Optional[AIAction]:
@@ -152,6 +153,7 @@ class RuleBasedAI(AIPlayer):
 
         # Normal turn - score and pick best action
         scored_actions = [(self._score_action(a), a) for a in actions]
+        self.nodes_evaluated += len(actions)
         scored_actions.sort(key=lambda x: x[0], reverse=True)
 
         # Get all actions with the highest score
@@ -301,50 +303,6 @@ class RuleBasedAI(AIPlayer):
         # Other abilities
         return 70
 
-    def _get_distance_to_nearest_enemy(self, pos: int) -> int:
-        """Calculate Manhattan distance from position to nearest enemy.
-
-        Returns large number if no enemies exist.
-        """
-        game = self.game
-        if pos is None or pos >= 30:  # Flying zone - use special handling
-            return 100
-
-        row = pos // 5
-        col = pos % 5
-
-        min_dist = 100
-        enemy_player = 2 if self.player == 1 else 1
-
-        for enemy in game.board.get_all_cards(enemy_player):
-            if enemy.position is None or enemy.position >= 30:
-                continue  # Skip flying enemies for ground distance
-            enemy_row = enemy.position // 5
-            enemy_col = enemy.position % 5
-            dist = abs(row - enemy_row) + abs(col - enemy_col)
-            min_dist = min(min_dist, dist)
-
-        return min_dist
-
-    def _count_adjacent_enemies(self, pos: int) -> int:
-        """Count enemy cards adjacent to a position (orthogonal only)."""
-        if pos is None or pos >= 30:
-            return 0
-
-        game = self.game
-        row, col = pos // 5, pos % 5
-        count = 0
-
-        for dr, dc in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
-            nr, nc = row + dr, col + dc
-            if 0 <= nr < 6 and 0 <= nc < 5:
-                adj_pos = nr * 5 + nc
-                adj_card = game.board.get_card(adj_pos)
-                if adj_card and adj_card.player != self.player:
-                    count += 1
-
-        return count
-
     def _has_formation_ability(self, card) -> bool:
         """Check if card has a formation ability."""
         from ..abilities import get_ability
@@ -394,8 +352,9 @@ class RuleBasedAI(AIPlayer):
         has_formation = self._has_formation_ability(card)
 
         # Calculate distances for later use
-        current_dist = self._get_distance_to_nearest_enemy(from_pos)
-        new_dist = self._get_distance_to_nearest_enemy(to_pos)
+        threats = self.get_threat_map()
+        current_dist = threats.distance_to_enemy(from_pos)
+        new_dist = threats.distance_to_enemy(to_pos)
 
         # RANGE-AWARE POSITIONING for ranged/heal cards
         # These cards want to stay within their optimal attack range
@@ -448,11 +407,7 @@ class RuleBasedAI(AIPlayer):
 
         # Don't move if card can attack from current position (for non-ranged)
         if not wants_distance:
-            current_targets = game.get_attack_targets(card)
-            enemy_targets = [t for t in current_targets
-                            if game.board.get_card(t) and
-                            game.board.get_card(t).player != self.player]
-            if enemy_targets:
+            if threats.enemy_targets(card):
                 # Already in attack range - low priority to move
                 # Unless moving improves formation
                 if has_formation:
@@ -472,10 +427,7 @@ class RuleBasedAI(AIPlayer):
                            if game.board.get_card(t) and
                            game.board.get_card(t).player != self.player]
 
-        current_targets = game.get_attack_targets(card)
-        current_enemy_targets = [t for t in current_targets
-                                if game.board.get_card(t) and
-                                game.board.get_card(t).player != self.player]
+        current_enemy_targets = threats.enemy_targets(card)
 
         if new_enemy_targets and not current_enemy_targets:
             # Move enables new attacks - high priority!
@@ -488,8 +440,8 @@ class RuleBasedAI(AIPlayer):
 
         # Adjacent enemy heuristic based on card type
         # Tanks want more adjacent enemies, ranged want fewer
-        current_adj = self._count_adjacent_enemies(from_pos)
-        new_adj = self._count_adjacent_enemies(to_pos)
+        current_adj = threats.adjacent_enemy_count(from_pos)
+        new_adj = threats.adjacent_enemy_count(to_pos)
 
         adj_bonus = 0
         if is_tank:
@@ -0,0 +1,225 @@
+"""Per-state threat and influence map shared by the AI players.
+
+A ThreatMap answers "what happens to one of my cards standing on cell X"
+for every cell at once: which enemies can attack it, how much damage they
+are expected to deal, how many of my cards could step in as defenders and
+how many enemy ranged/magic abilities reach it. It also keeps per-cell
+adjacency and distance to the enemy plus the enemy targets of each of my
+cards.
+
+The map is built in one pass over the board. AIPlayer.get_threat_map()
+caches it per Game.state_version, so scoring many candidate actions in the
+same state costs a single build instead of repeated board scans.
+
+Cell reach follows Board.get_attack_targets, extended to empty cells:
+ground cards reach the 8 surrounding cells (restricted_strike only the
+cell ahead), a prepared flyer attack adds the flying zone, and flyers
+reach every cell unless a visible flyer_taunt card forces them onto it.
+"""
+from typing import Dict, List, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from ..game import Game
+    from ..card import Card
+
+
+GROUND_CELLS = 30
+BOARD_CELLS = 40
+FAR_AWAY = 100  # Distance when there is no ground enemy
+
+
+def _king_neighbors(pos: int) -> List[int]:
+    """Ground cells around a ground cell, diagonals included."""
+    row, col = pos // 5, pos % 5
+    result = []
+    for dr in (-1, 0, 1):
+        for dc in (-1, 0, 1):
+            if dr == 0 and dc == 0:
+                continue
+            nr, nc = row + dr, col + dc
+            if 0 <= nr < 6 and 0 <= nc < 5:
+                result.append(nr * 5 + nc)
+    return result
+
+
+def _ortho_neighbors(pos: int) -> List[int]:
+    """Ground cells orthogonally adjacent to a ground cell."""
+    row, col = pos // 5, pos % 5
+    result = []
+    for dr, dc in ((-1, 0), (1, 0), (0, -1), (0, 1)):
+        nr, nc = row + dr, col + dc
+        if 0 <= nr < 6 and 0 <= nc < 5:
+            result.append(nr * 5 + nc)
+    return result
+
+
+KING_NEIGHBORS = [_king_neighbors(p) for p in range(GROUND_CELLS)]
+ORTHO_NEIGHBORS = [_ortho_neighbors(p) for p in range(GROUND_CELLS)]
+
+
+def _is_flying_pos(pos: int) -> bool:
+    return GROUND_CELLS <= pos < BOARD_CELLS
+
+
+class ThreatMap:
+    """Threat and influence of the board from one player's perspective.
+
+    All per-cell lists are indexed by board position (0-39) and describe a
+    card of `player` standing on that cell.
+    """
+
+    def __init__(self, game: 'Game', player: int):
+        self.player = player
+        self.opponent = 3 - player
+        self.state_version = getattr(game, 'state_version', 0)
+
+        # Enemy card ids that could attack a card of ours on each cell
+        self.attackers: List[List[int]] = [[] for _ in range(BOARD_CELLS)]
+        # Sum of expected damage from those attackers
+        self.expected_damage: List[float] = [0.0] * BOARD_CELLS
+        # How many of our untapped cards could intercept an attack on the cell
+        self.defender_coverage: List[int] = [0] * BOARD_CELLS
+        # Enemy ranged/magic abilities whose range covers the cell
+        self.ranged_exposure: List[int] = [0] * BOARD_CELLS
+        # Enemy cards orthogonally adjacent (ground cells only)
+        self.adjacent_enemies: List[int] = [0] * BOARD_CELLS
+        # Manhattan distance to the nearest ground enemy (ground cells only)
+        self.enemy_distance: List[int] = [FAR_AWAY] * BOARD_CELLS
+        # Our card id -> enemy positions it can attack right now
+        self.targets: Dict[int, List[int]] = {}
+
+        self._build(game)
+
+    # =========================================================================
+    # QUERIES
+    # =========================================================================
+
+    def threat_count(self, pos: int) -> int:
+        """Number of untapped enemies that can attack the cell."""
+        if pos is None or not 0 <= pos < BOARD_CELLS:
+            return 0
+        return len(self.attackers[pos])
+
+    def adjacent_enemy_count(self, pos: int) -> int:
+        """Enemy cards orthogonally adjacent to a ground cell."""
+        if pos is None or pos >= GROUND_CELLS:
+            return 0
+        return self.adjacent_enemies[pos]
+
+    def distance_to_enemy(self, pos: int) -> int:
+        """Manhattan distance to the nearest ground enemy (100 if none or flying)."""
+        if pos is None or pos >= GROUND_CELLS:
+            return FAR_AWAY
+        return self.enemy_distance[pos]
+
+    def enemy_targets(self, card: 'Card') -> List[int]:
+        """Enemy positions one of our cards can attack from where it stands."""
+        return self.targets.get(card.id, [])
+
+    # =========================================================================
+    # BUILD
+    # =========================================================================
+
+    def _build(self, game: 'Game'):
+        from ..abilities import get_ability, TargetType
+        from .utility_ai import calculate_expected_damage
+
+        board = game.board
+        mine = [c for c in board.get_all_cards(self.player) if c.is_alive and c.position is not None]
+        enemies = [c for c in board.get_all_cards(self.opponent) if c.is_alive and c.position is not None]
+
+        # Our visible flyer_taunt cards pull all enemy flyer attacks
+        taunters = [c.position for c in mine
+                    if c.position < GROUND_CELLS
+                    and c.has_ability("flyer_taunt") and not c.face_down]
+        forward = 1 if self.opponent == 1 else -1
+
+        for enemy in enemies:
+            pos = enemy.position
+
+            # Adjacency and distance to enemies on the ground
+            if pos < GROUND_CELLS:
+                for adj in ORTHO_NEIGHBORS[pos]:
+                    self.adjacent_enemies[adj] += 1
+                erow, ecol = pos // 5, pos % 5
+                for cell in range(GROUND_CELLS):
+                    dist = abs(cell // 5 - erow) + abs(cell % 5 - ecol)
+                    if dist < self.enemy_distance[cell]:
+                        self.enemy_distance[cell] = dist
+
+            # Ranged and magic abilities
+            for aid in enemy.stats.ability_ids:
+                ability = get_ability(aid)
+                if not ability or ability.target_type != TargetType.ENEMY:
+                    continue
+                if ability.range < 2 and not ability.is_magic:
+                    continue
+                for cell in self._ability_cells(pos, ability):
+                    self.ranged_exposure[cell] += 1
+
+            if enemy.tapped:
+                continue
+
+            # Melee reach
+            if _is_flying_pos(pos):
+                if taunters:
+                    cells = taunters
+                else:
+                    cells = [c for c in range(BOARD_CELLS) if c != pos]
+            elif enemy.has_ability("restricted_strike"):
+                ahead = pos + 5 * forward
+                cells = [ahead] if 0 <= ahead < GROUND_CELLS else []
+            else:
+                cells = list(KING_NEIGHBORS[pos])
+                if enemy.can_attack_flyer and not enemy.stats.is_flying:
+                    first = 30 if self.player == 1 else 35
+                    cells.extend(range(first, first + 5))
+
+            expected = calculate_expected_damage(enemy.stats.attack)
+            for cell in cells:
+                self.attackers[cell].append(enemy.id)
+                self.expected_damage[cell] += expected
+
+        # Defender coverage: untapped, unwebbed cards next to the cell
+        # (flyers can cover any flying cell and intercept flyer attacks)
+        flyers = 0
+        for card in mine:
+            if card.tapped or card.webbed:
+                continue
+            if _is_flying_pos(card.position):
+                flyers += 1
+                continue
+            for adj in KING_NEIGHBORS[card.position]:
+                self.defender_coverage[adj] += 1
+        for cell in range(BOARD_CELLS):
+            self.defender_coverage[cell] += flyers
+        for card in mine:
+            if _is_flying_pos(card.position) and not card.tapped and not card.webbed:
+                self.defender_coverage[card.position] -= 1
+
+        # Our own attack targets, exact
+        for card in mine:
+            if not card.can_act:
+                continue
+            self.targets[card.id] = [t for t in game.get_attack_targets(card)
+                                     if board.get_card(t) and board.get_card(t).player == self.opponent]
+
+    @staticmethod
+    def _ability_cells(pos: int, ability) -> List[int]:
+        """Cells covered by a ranged or magic ability used from pos."""
+        if _is_flying_pos(pos):
+            return []
+        row, col = pos // 5, pos % 5
+        cells = []
+        for cell in range(GROUND_CELLS):
+            if cell == pos:
+                continue
+            dr, dc = abs(cell // 5 - row), abs(cell % 5 - col)
+            if ability.range <= 1:
+                if max(dr, dc) == 1:
+                    cells.append(cell)
+            elif dr + dc <= ability.range and max(dr, dc) >= ability.min_range:
+                cells.append(cell)
+        if ability.can_target_flying:
+            cells.extend(range(GROUND_CELLS, BOARD_CELLS))
+        return cells
@@ -22,6 +22,8 @@ from copy import deepcopy
 from itertools import product
 
 from .base import AIPlayer, AIAction
+from .threat_map import ThreatMap
+from .board_eval import HAS_NUMPY, encode_board, expand_moves, evaluate_batch, count_moves, top_indices
 from ..game import Game
 from ..card import Card
 from ..board import Board
@@ -128,6 +130,46 @@ def front_row_score(card: Card) -> float:
     return score
 
 
+def position_ability_bonus(card: Card, pos: int, player: int) -> float:
+    """Score position-dependent abilities of a card standing at pos."""
+    score = 0.0
+    if pos is None or pos >= 30:
+        return score  # Flying cards handled separately
+
+    row = pos // 5
+    col = pos % 5
+
+    # Convert to relative row (0=back, 2=front for the player)
+    if player == 1:
+        rel_row = row  # P1: row 0-2 maps to back-front
+    else:
+        rel_row = 5 - row  # P2: row 5-3 maps to back-front
+
+    from ..abilities import get_ability
+
+    for ability_id in card.stats.ability_ids:
+        ability = get_ability(ability_id)
+        if not ability:
+            continue
+
+        # Check row requirements
+        if ability.requires_own_row is not None:
+            if rel_row == ability.requires_own_row:
+                score += WEIGHTS['position_ability']
+
+        # Check edge column
+        if ability.requires_edge_column:
+            if col in [0, 4]:
+                score += WEIGHTS['position_ability']
+
+        # Check center column
+        if ability.requires_center_column:
+            if col == 2:
+                score += WEIGHTS['position_ability']
+
+    return score
+
+
 @dataclass
 class CardMoveOptions:
     """All move options for a single card."""
@@ -165,8 +207,9 @@ class UtilityAI(AIPlayer):
 
     name = "Utility-based"
 
-    def __init__(self, server, player: int, seed: int = None, beam_width: int = 50):
-        super().__init__(server, player)
+    def __init__(self, server, player: int, seed: int = None, beam_width: int = 50,
+                 trusted: bool = False):
+        super().__init__(server, player, trusted)
         self.rng = random.Random(seed)
         self.beam_width = beam_width  # Top positions to evaluate for attacks
         self._planned_moves: List[Tuple[int, int]] = []  # [(card_id, target_pos), ...]
@@ -293,54 +336,18 @@ class UtilityAI(AIPlayer):
         current_pos = self._evaluate_current_position(game, attack_actions)
         current_attack_count = len(attack_actions)
 
-        # Score each combination and keep top N (beam search)
-        scored_positions: List[ScoredPosition] = []
-
-        for combo in all_combinations:
-            # Check if this combo actually moves anything
-            actual_moves = sum(1 for cid, pos in combo.items()
-                             if game.board.get_card_by_id(cid) and
-                             game.board.get_card_by_id(cid).position != pos)
-
-            # Simulate this combination
-            sim_game = self._simulate_combination(game, combo)
-            if sim_game is None:
-                continue
-
-            # Score the position
-            position_score = self._evaluate_position(sim_game)
-
-            # Count attack opportunities after moving
-            attack_score, best_attack = self._evaluate_attacks_from_position(sim_game, game)
-
-            # Significant bonus for moves that change the board state
-            if actual_moves > 0:
-                # Per-move bonus to encourage exploration
-                position_score += 15 * actual_moves
-
-                # Extra bonus if moving toward enemies (advancing)
-                for cid, target_pos in combo.items():
-                    card = game.board.get_card_by_id(cid)
-                    if card and card.position != target_pos and target_pos < 30:
-                        curr_row = card.position // 5 if card.position < 30 else -1
-                        new_row = target_pos // 5
-                        # P1 wants higher rows, P2 wants lower rows
-                        if self.player == 1 and new_row > curr_row:
-                            position_score += 10  # Advancing bonus
-                        elif self.player == 2 and new_row < curr_row:
-                            position_score += 10  # Advancing bonus
-
-            scored_positions.append(ScoredPosition(
-                moves=combo,
-                position_score=position_score,
-                attack_score=attack_score,
-                total_score=position_score + attack_score,
-                best_attack=best_attack
-            ))
+        # Score every combination's position, then check attacks for the top N
+        # (beam search) - both evaluators prune the same way
+        if HAS_NUMPY and len(all_combinations) > 1:
+            scores = self._position_scores_batch(game, all_combinations)
+        else:
+            scores = self._position_scores(game, all_combinations)
 
-        # Keep top N by total score
-        scored_positions.sort(key=lambda p: p.total_score, reverse=True)
-        top_positions = scored_positions[:self.beam_width]
+        top_positions = []
+        for idx in top_indices(scores, self.beam_width):
+            scored = self._score_combination(game, all_combinations[idx], float(scores[idx]))
+            if scored:
+                top_positions.append(scored)
 
         # Add current position (no moves)
         if current_pos:
@@ -366,6 +373,80 @@ class UtilityAI(AIPlayer):
 
         return best
 
+    def _score_combination(self, game: Game, combo: Dict[int, int],
+                           position_score: Optional[float] = None) -> Optional[ScoredPosition]:
+        """Simulate one movement combination and score it with attacks.
+
+        If position_score is given (already computed by the batch evaluator,
+        move bonuses included), the scalar position evaluation is skipped.
+        """
+        self.nodes_evaluated += 1
+        sim_game = self._simulate_combination(game, combo)
+        if sim_game is None:
+            return None
+
+        threats = ThreatMap(sim_game, self.player)
+        if position_score is None:
+            position_score = self._evaluate_position(sim_game, threats)
+            position_score += self._move_bonus(game, combo)
+
+        # Count attack opportunities after moving
+        attack_score, best_attack = self._evaluate_attacks_from_position(sim_game, threats)
+
+        return ScoredPosition(
+            moves=combo,
+            position_score=position_score,
+            attack_score=attack_score,
+            total_score=position_score + attack_score,
+            best_attack=best_attack
+        )
+
+    def _move_bonus(self, game: Game, combo: Dict[int, int]) -> float:
+        """Bonus for moves that change the board state."""
+        bonus = 0.0
+        for cid, target_pos in combo.items():
+            card = game.board.get_card_by_id(cid)
+            if not card or card.position == target_pos:
+                continue
+            # Per-move bonus to encourage exploration
+            bonus += 15
+
+            # Extra bonus if moving toward enemies (advancing)
+            if target_pos < 30:
+                curr_row = card.position // 5 if card.position < 30 else -1
+                new_row = target_pos // 5
+                # P1 wants higher rows, P2 wants lower rows
+                if self.player == 1 and new_row > curr_row:
+                    bonus += 10  # Advancing bonus
+                elif self.player == 2 and new_row < curr_row:
+                    bonus += 10  # Advancing bonus
+        return bonus
+
+    def _position_scores(self, game: Game, combos: List[Dict[int, int]]) -> List[float]:
+        """Position score (move bonuses included) of every combination, one by one.
+
+        Combinations that cannot be simulated score -inf.
+        """
+        self.nodes_evaluated += len(combos)
+        scores = []
+        for combo in combos:
+            sim_game = self._simulate_combination(game, combo)
+            if sim_game is None:
+                scores.append(float('-inf'))
+                continue
+            scores.append(self._evaluate_position(sim_game) + self._move_bonus(game, combo))
+        return scores
+
+    def _position_scores_batch(self, game: Game, combos: List[Dict[int, int]]) -> 'np.ndarray':
+        """Position score of every combination in one vectorized pass (see _position_scores)."""
+        base = encode_board(game, self.player)
+        batch = expand_moves(base, combos)
+        self.nodes_evaluated += len(combos)
+
+        scores = evaluate_batch(batch, WEIGHTS)
+        moved, advanced = count_moves(base, batch)
+        return scores + 15 * moved + 10 * advanced
+
     def _get_all_move_options(self, game: Game, move_actions: List[AIAction]) -> List[CardMoveOptions]:
         """Get all move options for each moveable card."""
         # Group move actions by card
@@ -466,12 +547,21 @@ class UtilityAI(AIPlayer):
         """Simulate a combination of moves and return resulting game state."""
         try:
             sim_game = Game.from_dict(game.to_dict())
+            sim_game.headless = True
 
+            # Lift all moving cards first so cards can swap or chain into
+            # each other's cells, then put them down at their targets
+            moving = []
             for card_id, target_pos in moves.items():
                 card = sim_game.board.get_card_by_id(card_id)
                 if card and card.position != target_pos:
-                    sim_game.board.move_card(card, target_pos)
-                    card.curr_move = max(0, card.curr_move - 1)
+                    sim_game.board.remove_card(card.position)
+                    moving.append((card, target_pos))
+
+            for card, target_pos in moving:
+                if not sim_game.board.place_card(card, target_pos):
+                    return None
+                card.curr_move = max(0, card.curr_move - 1)
 
             sim_game.recalculate_formations()
             return sim_game
@@ -479,7 +569,7 @@ class UtilityAI(AIPlayer):
             return None
 
     def _evaluate_attacks_from_position(self, sim_game: Game,
-                                         original_game: Game) -> Tuple[float, Optional[AIAction]]:
+                                         threats: ThreatMap) -> Tuple[float, Optional[AIAction]]:
         """Evaluate best attack from a simulated position."""
         best_score = 0.0
         best_attack = None
@@ -488,14 +578,9 @@ class UtilityAI(AIPlayer):
         my_cards = sim_game.board.get_all_cards(self.player)
 
         for card in my_cards:
-            if card.tapped or not card.can_act:
-                continue
-
-            # Get attack targets
-            targets = sim_game.get_attack_targets(card)
-            for target_pos in targets:
+            for target_pos in threats.enemy_targets(card):
                 target = sim_game.board.get_card(target_pos)
-                if not target or target.player == self.player:
+                if not target:
                     continue
 
                 # Score this attack
@@ -550,7 +635,8 @@ class UtilityAI(AIPlayer):
     def _evaluate_current_position(self, game: Game,
                                     attack_actions: List[AIAction]) -> Optional[ScoredPosition]:
         """Evaluate the current position without any moves."""
-        position_score = self._evaluate_position(game)
+        self.nodes_evaluated += 1
+        position_score = self._evaluate_position(game, self.get_threat_map())
 
         best_attack = self._pick_best_attack(attack_actions) if attack_actions else None
         attack_score = self._evaluate_attack(game, best_attack) if best_attack else 0.0
@@ -563,8 +649,14 @@ class UtilityAI(AIPlayer):
             best_attack=best_attack
         )
 
-    def _evaluate_position(self, game: Game) -> float:
-        """Evaluate a board position from this player's perspective."""
+    def _evaluate_position(self, game: Game, threats: Optional[ThreatMap] = None) -> float:
+        """Evaluate a board position from this player's perspective.
+
+        Pass threats when a map for this exact board already exists;
+        otherwise one is built for the (usually simulated) game.
+        """
+        if threats is None:
+            threats = ThreatMap(game, self.player)
         score = 0.0
         my_cards = game.board.get_all_cards(self.player)
         enemy_cards = game.board.get_all_cards(self.opponent)
@@ -595,26 +687,18 @@ class UtilityAI(AIPlayer):
 
         # Attack opportunities
         for card in my_cards:
-            if card.can_act:
-                targets = game.get_attack_targets(card)
-                enemy_targets = [t for t in targets
-                               if game.board.get_card(t) and
-                               game.board.get_card(t).player != self.player]
-                if enemy_targets:
-                    score += WEIGHTS['attack_opportunity']
-                    # Bonus for kill potential
-                    for t in enemy_targets:
-                        target = game.board.get_card(t)
-                        if target and target.curr_life <= card.stats.attack[2]:
-                            score += WEIGHTS['kill_potential']
+            enemy_targets = threats.enemy_targets(card)
+            if enemy_targets:
+                score += WEIGHTS['attack_opportunity']
+                # Bonus for kill potential
+                for t in enemy_targets:
+                    target = game.board.get_card(t)
+                    if target and target.curr_life <= card.stats.attack[2]:
+                        score += WEIGHTS['kill_potential']
 
         # Threats against us
-        for card in enemy_cards:
-            if not card.tapped:
-                targets = game.get_attack_targets(card)
-                my_positions = [c.position for c in my_cards]
-                threatened = [t for t in targets if t in my_positions]
-                score += len(threatened) * WEIGHTS['threat']
+        for card in my_cards:
+            score += threats.threat_count(card.position) * WEIGHTS['threat']
 
         # Board advancement
         for card in my_cards:
@@ -640,7 +724,7 @@ class UtilityAI(AIPlayer):
                 continue  # Skip flying cards
 
             # Count adjacent enemy cards
-            adjacent_enemies = self._count_adjacent_enemies(game, card.position)
+            adjacent_enemies = threats.adjacent_enemy_count(card.position)
 
             frs = front_row_score(card)
             # High front_row_score cards should have more adjacent enemies
@@ -653,63 +737,9 @@ class UtilityAI(AIPlayer):
 
         return score
 
-    def _count_adjacent_enemies(self, game: Game, pos: int) -> int:
-        """Count enemy cards adjacent to a position."""
-        if pos is None or pos >= 30:
-            return 0
-
-        row, col = pos // 5, pos % 5
-        count = 0
-
-        # Check all 4 adjacent positions
-        for dr, dc in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
-            nr, nc = row + dr, col + dc
-            if 0 <= nr < 6 and 0 <= nc < 5:
-                adj_pos = nr * 5 + nc
-                adj_card = game.board.get_card(adj_pos)
-                if adj_card and adj_card.player != self.player:
-                    count += 1
-
-        return count
-
     def _evaluate_position_abilities(self, game: Game, card: Card) -> float:
         """Evaluate bonuses from position-dependent abilities."""
-        score = 0.0
-        if card.position is None or card.position >= 30:
-            return score  # Flying cards handled separately
-
-        row = card.position // 5
-        col = card.position % 5
-
-        # Convert to relative row (0=back, 2=front for the player)
-        if self.player == 1:
-            rel_row = row  # P1: row 0-2 maps to back-front
-        else:
-            rel_row = 5 - row  # P2: row 5-3 maps to back-front
-
-        from ..abilities import get_ability
-
-        for ability_id in card.stats.ability_ids:
-            ability = get_ability(ability_id)
-            if not ability:
-                continue
-
-            # Check row requirements
-            if ability.requires_own_row is not None:
-                if rel_row == ability.requires_own_row:
-                    score += WEIGHTS['position_ability']
-
-            # Check edge column
-            if ability.requires_edge_column:
-                if col in [0, 4]:
-                    score += WEIGHTS['position_ability']
-
-            # Check center column
-            if ability.requires_center_column:
-                if col == 2:
-                    score += WEIGHTS['position_ability']
-
-        return score
+        return position_ability_bonus(card, card.position, self.player)
 
     def _evaluate_attack(self, game: Game, action: AIAction) -> float:
         """Evaluate an attack action's value using expected damage."""
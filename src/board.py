@@ -1,6 +1,6 @@
 """Board management for the game."""
 from typing import List, Optional, Set
-from .card import Card
+from .card import Card, CARD_SCHEMA
 from .constants import BOARD_COLS, BOARD_ROWS
 
 
@@ -428,31 +428,27 @@ class Board:
         return None
 
     def to_dict(self) -> dict:
-        """Serialize board state to dictionary for network/storage."""
+        """Serialize board state to dictionary for network/storage.
+
+        Cells and flying zones list only occupied slots, as [index, card] pairs.
+        """
         return {
-            'cells': [card.to_dict() if card else None for card in self.cells],
-            'flying_p1': [card.to_dict() if card else None for card in self.flying_p1],
-            'flying_p2': [card.to_dict() if card else None for card in self.flying_p2],
+            'schema': CARD_SCHEMA,
+            'cells': _pack_slots(self.cells),
+            'flying_p1': _pack_slots(self.flying_p1),
+            'flying_p2': _pack_slots(self.flying_p2),
             'graveyard_p1': [card.to_dict() for card in self.graveyard_p1],
             'graveyard_p2': [card.to_dict() for card in self.graveyard_p2],
         }
 
     @classmethod
     def from_dict(cls, data: dict) -> 'Board':
-        """Deserialize board state from dictionary."""
+        """Deserialize board state from dictionary (any CARD_SCHEMA)."""
         board = cls()
-        board.cells = [
-            Card.from_dict(card_data) if card_data else None
-            for card_data in data.get('cells', [None] * 30)
-        ]
-        board.flying_p1 = [
-            Card.from_dict(card_data) if card_data else None
-            for card_data in data.get('flying_p1', [None] * cls.FLYING_SLOTS)
-        ]
-        board.flying_p2 = [
-            Card.from_dict(card_data) if card_data else None
-            for card_data in data.get('flying_p2', [None] * cls.FLYING_SLOTS)
-        ]
+        unpack = _unpack_slots if data.get('schema', 1) >= 2 else _unpack_full_slots
+        board.cells = unpack(data.get('cells', []), len(board.cells))
+        board.flying_p1 = unpack(data.get('flying_p1', []), cls.FLYING_SLOTS)
+        board.flying_p2 = unpack(data.get('flying_p2', []), cls.FLYING_SLOTS)
         board.graveyard_p1 = [
             Card.from_dict(card_data) for card_data in data.get('graveyard_p1', [])
         ]
@@ -460,3 +456,21 @@ class Board:
             Card.from_dict(card_data) for card_data in data.get('graveyard_p2', [])
         ]
         return board
+
+
+def _pack_slots(slots: List[Optional[Card]]) -> list:
+    """Occupied slots as [index, card dict] pairs."""
+    return [[i, card.to_dict()] for i, card in enumerate(slots) if card]
+
+
+def _unpack_slots(pairs: list, size: int) -> List[Optional[Card]]:
+    """Inverse of _pack_slots."""
+    slots: List[Optional[Card]] = [None] * size
+    for i, card_data in pairs:
+        slots[i] = Card.from_dict(card_data)
+    return slots
+
+
+def _unpack_full_slots(slots: list, size: int) -> List[Optional[Card]]:
+    """CARD_SCHEMA 1 slot list: every slot, None when empty."""
+    return [Card.from_dict(card_data) if card_data else None for card_data in slots] or [None] * size
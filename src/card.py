@@ -1,5 +1,6 @@
 """Card class and CardStats dataclass."""
-from dataclasses import dataclass, field
+import operator
+from dataclasses import dataclass, field, fields
 from typing import Optional, Tuple, List, Dict, Any, TYPE_CHECKING
 
 from .constants import CardType, Element
@@ -18,6 +19,43 @@ def get_card_stats(def_id: str) -> Optional['CardStats']:
     return _CARD_REGISTRY.get(def_id)
 
 
+# Layout of Card.to_dict / Board.to_dict. 1: every field under its full name
+# and every board slot listed; 2: short keys, default-valued fields and empty
+# slots left out. from_dict reads both.
+CARD_SCHEMA = 2
+
+# Card.to_dict fields stored only when they differ from the default:
+# (attribute, key, default). def_id, player and id are always stored;
+# curr_life/curr_move default to the card's stats, cooldowns to {}.
+_SPARSE_FIELDS: Tuple[Tuple[str, str, Any], ...] = (
+    ('tapped', 't', False),
+    ('position', 'at', None),
+    ('temp_attack_bonus', 'ta', 0),
+    ('temp_ranged_bonus', 'tr', 0),
+    ('temp_dice_bonus', 'td', 0),
+    ('has_direct', 'dr', False),
+    ('defender_buff_attack', 'ba', 0),
+    ('defender_buff_dice', 'bd', 0),
+    ('defender_buff_turns', 'bt', 0),
+    ('killed_by_enemy', 'k', False),
+    ('valhalla_triggered', 'v', False),
+    ('webbed', 'w', False),
+    ('counters', 'c', 0),
+    ('in_formation', 'f', False),
+    ('stunned', 's', False),
+    ('armor_remaining', 'a', 0),
+    ('formation_armor_remaining', 'fa', 0),
+    ('formation_armor_max', 'fm', 0),
+    ('can_attack_flyer', 'af', False),
+    ('can_attack_flyer_until_turn', 'au', 0),
+    ('face_down', 'fd', False),
+)
+_SPARSE_KEYS = tuple(key for _, key, _ in _SPARSE_FIELDS)
+_SPARSE_DEFAULT_VALUES = tuple(default for _, _, default in _SPARSE_FIELDS)
+_SPARSE_ATTRS: Dict[str, str] = {key: attr for attr, key, _ in _SPARSE_FIELDS}
+_sparse_values = operator.attrgetter(*(attr for attr, _, _ in _SPARSE_FIELDS))
+
+
 @dataclass
 class CardStats:
     """Base card statistics (immutable definition)."""
@@ -283,43 +321,44 @@ class Card:
         card.curr_move = 0
         return card
 
+    def copy(self) -> 'Card':
+        """Independent copy of this card's state (plain attribute access, see to_dict)."""
+        card = Card.__new__(Card)
+        for attr, value in zip(_CARD_ATTRS, _card_values(self)):
+            setattr(card, attr, value)
+        card.ability_cooldowns = dict(self.ability_cooldowns)
+        return card
+
     def __repr__(self):
         return f"Card({self.name}, P{self.player}, HP:{self.curr_life}/{self.life})"
 
     def to_dict(self) -> Dict[str, Any]:
-        """Serialize card instance state for network/storage.
+        """Serialize card instance state for network/storage (CARD_SCHEMA 2).
 
         Only serializes instance state, not the card definition (looked up by def_id).
+        Short keys; fields at their default value are left out.
         """
-        return {
-            'def_id': self.def_id,
-            'player': self.player,
-            'id': self.id,
-            'curr_life': self.curr_life,
-            'curr_move': self.curr_move,
-            'tapped': self.tapped,
-            'position': self.position,
-            'ability_cooldowns': self.ability_cooldowns.copy(),
-            'temp_attack_bonus': self.temp_attack_bonus,
-            'temp_ranged_bonus': self.temp_ranged_bonus,
-            'temp_dice_bonus': self.temp_dice_bonus,
-            'has_direct': self.has_direct,
-            'defender_buff_attack': self.defender_buff_attack,
-            'defender_buff_dice': self.defender_buff_dice,
-            'defender_buff_turns': self.defender_buff_turns,
-            'killed_by_enemy': self.killed_by_enemy,
-            'valhalla_triggered': self.valhalla_triggered,
-            'webbed': self.webbed,
-            'counters': self.counters,
-            'in_formation': self.in_formation,
-            'stunned': self.stunned,
-            'armor_remaining': self.armor_remaining,
-            'formation_armor_remaining': self.formation_armor_remaining,
-            'formation_armor_max': self.formation_armor_max,
-            'can_attack_flyer': self.can_attack_flyer,
-            'can_attack_flyer_until_turn': self.can_attack_flyer_until_turn,
-            'face_down': self.face_down,
-        }
+        stats = self.stats
+        data = {'d': self.def_id, 'p': self.player, 'i': self.id}
+        if self.curr_life != stats.life:
+            data['l'] = self.curr_life
+        if self.curr_move != stats.move:
+            data['m'] = self.curr_move
+        if self.ability_cooldowns:
+            data['cd'] = self.ability_cooldowns.copy()
+        values = _sparse_values(self)
+        if values != _SPARSE_DEFAULT_VALUES:
+            data.update({key: value for key, value, default
+                         in zip(_SPARSE_KEYS, values, _SPARSE_DEFAULT_VALUES) if value != default})
+        return data
+
+    @staticmethod
+    def hidden_dict(player: int, card_id: int, position: Optional[int]) -> Dict[str, Any]:
+        """Redacted to_dict of a face-down card (read back as a placeholder)."""
+        data = {'p': player, 'i': card_id, 'fd': True, 'h': True}
+        if position is not None:
+            data['at'] = position
+        return data
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'Card':
@@ -327,7 +366,35 @@ class Card:
 
         Card definition is looked up from registry by def_id.
         For hidden/redacted cards from network, creates a placeholder.
+        Accepts both the compact layout and the full one of CARD_SCHEMA 1.
         """
+        if 'def_id' in data or 'hidden' in data:
+            return cls._from_full_dict(data)
+
+        # Handle redacted hidden cards (see hidden_dict)
+        if data.get('h'):
+            return cls.create_hidden_placeholder(
+                player=data['p'],
+                card_id=data.get('i', 0),
+                position=data.get('at'),
+            )
+
+        card = cls(def_id=data['d'], player=data['p'], id=data.get('i', 0))
+        # Override post_init values with saved state
+        card.curr_life = data.get('l', card.curr_life)
+        card.curr_move = data.get('m', card.curr_move)
+        card.ability_cooldowns = dict(data.get('cd', {}))
+        # Every other field already holds its default, except armor (stats.armor)
+        card.armor_remaining = 0
+        for key, value in data.items():
+            attr = _SPARSE_ATTRS.get(key)
+            if attr is not None:
+                setattr(card, attr, value)
+        return card
+
+    @classmethod
+    def _from_full_dict(cls, data: Dict[str, Any]) -> 'Card':
+        """Deserialize the CARD_SCHEMA 1 layout (full field names)."""
         # Handle redacted hidden cards (no def_id, has hidden flag)
         if data.get('hidden') and 'def_id' not in data:
             return cls.create_hidden_placeholder(
@@ -344,31 +411,17 @@ class Card:
         # Override post_init values with saved state
         card.curr_life = data.get('curr_life', card.curr_life)
         card.curr_move = data.get('curr_move', card.curr_move)
-        card.tapped = data.get('tapped', False)
-        card.position = data.get('position')
         card.ability_cooldowns = data.get('ability_cooldowns', {}).copy()
-        card.temp_attack_bonus = data.get('temp_attack_bonus', 0)
-        card.temp_ranged_bonus = data.get('temp_ranged_bonus', 0)
-        card.temp_dice_bonus = data.get('temp_dice_bonus', 0)
-        card.has_direct = data.get('has_direct', False)
-        card.defender_buff_attack = data.get('defender_buff_attack', 0)
-        card.defender_buff_dice = data.get('defender_buff_dice', 0)
-        card.defender_buff_turns = data.get('defender_buff_turns', 0)
-        card.killed_by_enemy = data.get('killed_by_enemy', False)
-        card.valhalla_triggered = data.get('valhalla_triggered', False)
-        card.webbed = data.get('webbed', False)
-        card.counters = data.get('counters', 0)
-        card.in_formation = data.get('in_formation', False)
-        card.stunned = data.get('stunned', False)
-        card.armor_remaining = data.get('armor_remaining', 0)
-        card.formation_armor_remaining = data.get('formation_armor_remaining', 0)
-        card.formation_armor_max = data.get('formation_armor_max', 0)
-        card.can_attack_flyer = data.get('can_attack_flyer', False)
-        card.can_attack_flyer_until_turn = data.get('can_attack_flyer_until_turn', 0)
-        card.face_down = data.get('face_down', False)
+        for attr, _, default in _SPARSE_FIELDS:
+            setattr(card, attr, data.get(attr, default))
         return card
 
 
+# Every dataclass field, read in one call by Card.copy()
+_CARD_ATTRS = tuple(f.name for f in fields(Card))
+_card_values = operator.attrgetter(*_CARD_ATTRS)
+
+
 def create_card(name: str, player: int, card_id: int) -> Card:
     """Create a card instance from the database.
 
@@ -215,6 +215,16 @@ class EventType(Enum):
     LOG_MESSAGE = auto()
 
 
+# Events that only drive presentation - dropped by headless games
+UI_HINT_EVENTS = frozenset({
+    EventType.ARROW_ADDED,
+    EventType.ARROWS_CLEARED,
+    EventType.LOG_MESSAGE,
+    EventType.INTERACTION_STARTED,
+    EventType.INTERACTION_ENDED,
+})
+
+
 @dataclass
 class Event:
     """
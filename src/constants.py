@@ -60,6 +60,7 @@ class AppState(Enum):
     NETWORK_LOBBY = auto()   # Network game lobby (connect/create/join)
     NETWORK_WAITING = auto() # Waiting for opponent to join
     NETWORK_GAME = auto()    # Network game in progress
+    REPLAY = auto()          # Replay list and viewer
 
 
 # Available resolutions
@@ -217,6 +218,25 @@ class UILayout:
     CHAT_TITLE_FONT_SIZE = 16
     CHAT_MESSAGE_PADDING = 4
 
+    # -------------------------------------------------------------------------
+    # REPLAY VIEWER (left side, where the network chat is)
+    # -------------------------------------------------------------------------
+    REPLAY_PANEL_X = 10
+    REPLAY_PANEL_Y = 60
+    REPLAY_PANEL_WIDTH = 200   # Stays left of the P2 side panels
+    REPLAY_LINE_HEIGHT = 20
+    REPLAY_BUTTON_HEIGHT = 24
+    REPLAY_SCRUB_HEIGHT = 14
+    REPLAY_LIST_X = 340
+    REPLAY_LIST_Y = 100
+    REPLAY_LIST_WIDTH = 600
+    REPLAY_LIST_ROW_HEIGHT = 40
+    REPLAY_LIST_ROWS = 12
+    REPLAY_PANEL_BG = (30, 30, 38)
+    REPLAY_SCRUB_BG = (50, 50, 60)
+    REPLAY_SCRUB_FILL = (120, 100, 140)
+    REPLAY_SCRUB_TICK = (90, 90, 100)
+
     # -------------------------------------------------------------------------
     # LOBBY CHAT (network lobby screen)
     # -------------------------------------------------------------------------
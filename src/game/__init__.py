@@ -11,6 +11,8 @@ The Game class is split into multiple mixins for maintainability:
 - priority.py: Priority system, instant abilities
 - movement.py: Card movement, flyer attacks
 - commands.py: Command processing
+- legal.py: Cached legal command generation
+- view.py: Read-only player view of a live game (trusted AIs)
 
 The Game class inherits from all mixins and GameBase.
 """
@@ -26,13 +28,16 @@ from .triggers import TriggersMixin
 from .priority import PriorityMixin
 from .movement import MovementMixin
 from .commands import CommandsMixin
+from .legal import LegalCommandsMixin, LegalCommands, legal_to_command
+from .view import PlayerView
 
 if TYPE_CHECKING:
     from ..card import Card
 
 
 # Re-export for backward compatibility
-__all__ = ['Game', 'CombatResult', 'DiceContext', 'StackItem']
+__all__ = ['Game', 'CombatResult', 'DiceContext', 'StackItem', 'LegalCommands', 'legal_to_command',
+           'PlayerView']
 
 
 class Game(
@@ -44,7 +49,8 @@ class Game(
     TriggersMixin,
     PriorityMixin,
     MovementMixin,
-    CommandsMixin
+    CommandsMixin,
+    LegalCommandsMixin
 ):
     """Main game state and logic - combines all functionality via mixins."""
 
@@ -1,4 +1,5 @@
 """Core game state and base class for mixins."""
+from collections import deque
 from typing import List, Optional, Dict, Any, Tuple, TYPE_CHECKING
 from dataclasses import dataclass, field
 
@@ -9,10 +10,11 @@ from ..player_state import PlayerState
 from ..commands import (
     Event, evt_log_message, evt_card_damaged, evt_card_healed,
     evt_arrow_added, evt_arrows_cleared, evt_card_died, evt_game_over,
-    evt_interaction_started, evt_interaction_ended
+    evt_interaction_started, evt_interaction_ended, UI_HINT_EVENTS
 )
 
 if TYPE_CHECKING:
+    import random
     from ..interaction import Interaction
 
 
@@ -132,6 +134,12 @@ class StackItem:
 class GameBase:
     """Base game state - core initialization and serialization."""
 
+    MAX_MESSAGES = 100
+
+    # Headless games (simulations, AI lookahead, server bots) skip the
+    # message log and UI-hint events; state-changing events are kept
+    headless: bool = False
+
     def __init__(self):
         self.board = Board()
         self.phase = GamePhase.SETUP
@@ -164,8 +172,8 @@ class GameBase:
         # Card ID counter
         self._next_card_id = 1
 
-        # Message log
-        self.messages: List[str] = []
+        # Message log (last MAX_MESSAGES entries)
+        self.messages: deque = deque(maxlen=self.MAX_MESSAGES)
 
         # Network-transmissible events (Event objects from commands.py)
         self.events: List[Event] = []
@@ -179,15 +187,20 @@ class GameBase:
 
         # Server-authoritative dice rolls
         self._pending_rolls: List[int] = []
+        self.rng: Optional['random.Random'] = None  # Seeded dice (None = module random)
 
         # Track cards that have been offered untap this turn (to avoid re-prompting)
         self._untap_offered_this_turn: set = set()
 
+        # Bumped after every processed command - key for per-state caches
+        self.state_version: int = 0
+        self._legal_cache: Dict[int, Any] = {}  # player -> LegalCommands
+
     def log(self, msg: str, emit_event: bool = True):
         """Add a message to the log."""
+        if self.headless:
+            return
         self.messages.append(msg)
-        if len(self.messages) > 100:  # Keep last 100 messages
-            self.messages.pop(0)
         if emit_event:
             self.emit_event(evt_log_message(msg))
 
@@ -214,9 +227,10 @@ class GameBase:
             'forced_attackers': {str(k): v for k, v in self.forced_attackers.items()},
             'interaction': self.interaction.to_dict() if self.interaction else None,
             '_pending_rolls': self._pending_rolls,
-            'messages': self.messages,
+            'messages': list(self.messages),
             'last_combat': self.last_combat.to_dict() if self.last_combat else None,
             '_untap_offered_this_turn': list(self._untap_offered_this_turn),
+            'state_version': self.state_version,
         }
 
         if include_ui_state:
@@ -238,16 +252,10 @@ class GameBase:
         snapshot.pop('_next_card_id', None)
 
         # Redact face_down opponent cards (hide their info)
-        for i, card_data in enumerate(snapshot['board']['cells']):
-            if card_data and card_data.get('player') == opponent:
-                if card_data.get('face_down', False):
-                    snapshot['board']['cells'][i] = {
-                        'id': card_data['id'],
-                        'player': opponent,
-                        'face_down': True,
-                        'position': card_data.get('position'),
-                        'hidden': True,
-                    }
+        for slot in snapshot['board']['cells']:
+            card_data = slot[1]
+            if card_data['p'] == opponent and card_data.get('fd', False):
+                slot[1] = Card.hidden_dict(opponent, card_data['i'], card_data.get('at'))
 
         player_state = self.player_states.get(player)
         if player_state:
@@ -299,14 +307,17 @@ class GameBase:
         game.pending_dice_roll = DiceContext.from_dict(data['pending_dice_roll']) if data.get('pending_dice_roll') else None
         game.instant_stack = [StackItem.from_dict(item) for item in data.get('instant_stack', [])]
         game._next_card_id = data.get('_next_card_id', 1)
-        game.messages = data.get('messages', [])
+        game.messages = deque(data.get('messages', []), maxlen=cls.MAX_MESSAGES)
         game.events = []
         game.forced_attackers = {int(k): v for k, v in data.get('forced_attackers', {}).items()}
 
         from ..interaction import Interaction
         game.interaction = Interaction.from_dict(data['interaction']) if data.get('interaction') else None
         game._pending_rolls = data.get('_pending_rolls', [])
+        game.rng = None  # MatchServer.restore() re-seeds it from the checkpoint
         game._untap_offered_this_turn = set(data.get('_untap_offered_this_turn', []))
+        game.state_version = data.get('state_version', 0)
+        game._legal_cache = {}
 
         return game
 
@@ -369,6 +380,8 @@ class GameBase:
 
     def emit_event(self, event: Event):
         """Emit a network-transmissible event."""
+        if self.headless and event.type in UI_HINT_EVENTS:
+            return
         self.events.append(event)
 
     def pop_events(self) -> List[Event]:
@@ -391,7 +404,7 @@ class GameBase:
 
     def emit_arrow(self, from_pos: int, to_pos: int, arrow_type: str = 'attack'):
         """Emit an arrow event for network sync."""
-        if from_pos is not None and to_pos is not None:
+        if from_pos is not None and to_pos is not None and not self.headless:
             self.emit_event(evt_arrow_added(from_pos, to_pos, arrow_type))
 
     def emit_clear_arrows(self):
@@ -409,6 +422,8 @@ class GameBase:
     def set_interaction(self, interaction: 'Interaction'):
         """Set the current interaction and emit event."""
         self.interaction = interaction
+        if self.headless:
+            return
         self.emit_event(evt_interaction_started(
             kind=interaction.kind.name,
             valid_positions=list(interaction.valid_positions) if interaction.valid_positions else None,
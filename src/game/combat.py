@@ -23,7 +23,7 @@ class CombatMixin:
         """Roll a D6."""
         if self._pending_rolls:
             return self._pending_rolls.pop(0)
-        return random.randint(1, 6)
+        return (self.rng or random).randint(1, 6)
 
     def inject_rolls(self, rolls: List[int]):
         """Inject dice rolls for server-authoritative gameplay."""
@@ -378,7 +378,7 @@ class CombatMixin:
                     reduced_tier = def_tier - 1
                     self.log(f"Обмен ударами! {def_strength} контратака + {atk_strength} атака")
                     self.log(f"Защитник может ослабить до {tier_names[reduced_tier]} без удара атакующего")
-                return False
+                return True
 
             if force_reduced and is_exchange:
                 tier_names = ["слабая", "средняя", "сильная"]
@@ -13,6 +13,14 @@ class CommandsMixin:
 
     def process_command(self, cmd: Command, server_only: bool = False) -> Tuple[bool, List[Event]]:
         """Process a player command. Returns (success, events)."""
+        try:
+            return self._dispatch_command(cmd, server_only)
+        finally:
+            # Invalidate anything cached for the previous state
+            self.state_version += 1
+
+    def _dispatch_command(self, cmd: Command, server_only: bool) -> Tuple[bool, List[Event]]:
+        """Validate and route a command to its handler."""
         # Game over - no commands accepted
         if self.phase == GamePhase.GAME_OVER:
             return False, self.pop_events()
@@ -50,20 +58,16 @@ class CommandsMixin:
         # Route by command type
         if cmd.type == CommandType.MOVE:
             if cmd.card_id is not None and cmd.position is not None:
-                card = self.board.get_card_by_id(cmd.card_id)
-                if card and card.can_act:
-                    card_valid_moves = self.board.get_valid_moves(card)
-                    if cmd.position in card_valid_moves:
-                        return self.move_card(card, cmd.position), self.pop_events()
+                if cmd.position in self.legal_commands(cmd.player).moves_for(cmd.card_id):
+                    card = self.board.get_card_by_id(cmd.card_id)
+                    return self.move_card(card, cmd.position), self.pop_events()
             return False, self.pop_events()
 
         elif cmd.type == CommandType.ATTACK:
             if cmd.card_id is not None and cmd.position is not None:
-                card = self.board.get_card_by_id(cmd.card_id)
-                if card:
-                    card_valid_attacks = self.get_attack_targets(card)
-                    if cmd.position in card_valid_attacks:
-                        return self.attack(card, cmd.position), self.pop_events()
+                if cmd.position in self.legal_commands(cmd.player).attacks_for(cmd.card_id):
+                    card = self.board.get_card_by_id(cmd.card_id)
+                    return self.attack(card, cmd.position), self.pop_events()
             return False, self.pop_events()
 
         elif cmd.type == CommandType.PREPARE_FLYER_ATTACK:
@@ -0,0 +1,252 @@
+"""Legal command generation - one cached source of truth for what a player may do.
+
+Legal commands are compact tuples (type, card_id, arg), where arg depends
+on the type:
+    MOVE / ATTACK / CHOOSE_POSITION  -> target position
+    USE_ABILITY                      -> ability id
+    USE_INSTANT                      -> (ability id, option)
+    CONFIRM                          -> confirmed flag
+    CHOOSE_AMOUNT                    -> amount
+    anything else                    -> None
+
+Game.legal_commands(player) returns a LegalCommands view that is cached until
+the next processed command (Game.state_version). Per-card move and attack
+tables are filled lazily, so validating a single command only looks at the
+card involved.
+"""
+from typing import Any, Dict, Iterator, List, Optional, Tuple, TYPE_CHECKING
+
+from ..commands import Command, CommandType
+from ..constants import GamePhase
+from ..interaction import InteractionKind
+
+if TYPE_CHECKING:
+    from . import Game
+
+
+LegalCommand = Tuple[CommandType, Optional[int], Any]
+
+
+class LegalCommands:
+    """Legal commands for one player in one game state."""
+
+    def __init__(self, game: 'Game', player: int):
+        self.game = game
+        self.player = player
+        self.state_version = game.state_version
+        self._moves: Dict[int, Tuple[int, ...]] = {}
+        self._attacks: Dict[int, Tuple[int, ...]] = {}
+        self._commands: Optional[Tuple[LegalCommand, ...]] = None
+        self._lookup: Optional[frozenset] = None
+
+    # =========================================================================
+    # PER-CARD TABLES (independent of whose turn it is)
+    # =========================================================================
+
+    def moves_for(self, card_id: int) -> Tuple[int, ...]:
+        """Positions the card may move to."""
+        moves = self._moves.get(card_id)
+        if moves is None:
+            card = self.game.board.get_card_by_id(card_id)
+            if card and card.player == self.player and card.can_act:
+                moves = tuple(self.game.board.get_valid_moves(card))
+            else:
+                moves = ()
+            self._moves[card_id] = moves
+        return moves
+
+    def attacks_for(self, card_id: int) -> Tuple[int, ...]:
+        """Positions the card may attack (allies included - friendly fire)."""
+        attacks = self._attacks.get(card_id)
+        if attacks is None:
+            card = self.game.board.get_card_by_id(card_id)
+            if card and card.player == self.player:
+                attacks = tuple(self.game.get_attack_targets(card))
+            else:
+                attacks = ()
+            self._attacks[card_id] = attacks
+        return attacks
+
+    # =========================================================================
+    # FULL COMMAND LIST (respects turn, priority and interactions)
+    # =========================================================================
+
+    @property
+    def commands(self) -> Tuple[LegalCommand, ...]:
+        """All commands the player may send right now."""
+        if self._commands is None:
+            self._commands = tuple(self._generate())
+        return self._commands
+
+    def of_type(self, cmd_type: CommandType) -> List[LegalCommand]:
+        """Legal commands of one type."""
+        return [c for c in self.commands if c[0] == cmd_type]
+
+    def __iter__(self) -> Iterator[LegalCommand]:
+        return iter(self.commands)
+
+    def __len__(self) -> int:
+        return len(self.commands)
+
+    def __contains__(self, item: LegalCommand) -> bool:
+        if self._lookup is None:
+            self._lookup = frozenset(self.commands)
+        return item in self._lookup
+
+    def _generate(self) -> List[LegalCommand]:
+        game = self.game
+        if game.phase != GamePhase.MAIN:
+            return []
+
+        if game.interaction:
+            if game.interaction.acting_player == self.player:
+                return self._interaction_commands()
+            return []
+
+        if game.priority_phase:
+            if game.priority_player == self.player:
+                return self._priority_commands()
+            return []
+
+        if game.current_player != self.player:
+            return []
+
+        result = []
+        my_cards = game.board.get_all_cards(self.player)
+
+        # Movement
+        for card in my_cards:
+            for pos in self.moves_for(card.id):
+                result.append((CommandType.MOVE, card.id, pos))
+
+        # Attacks - only forced ones while we have any
+        forced = []
+        for card_id, targets in game.forced_attackers.items():
+            card = game.board.get_card_by_id(card_id)
+            if card and card.player == self.player and card.can_act:
+                forced.extend((CommandType.ATTACK, card_id, pos) for pos in targets)
+        if forced:
+            result.extend(forced)
+        else:
+            for card in my_cards:
+                if card.can_act:
+                    for pos in self.attacks_for(card.id):
+                        result.append((CommandType.ATTACK, card.id, pos))
+            for card in my_cards:
+                if game.can_prepare_flyer_attack(card):
+                    result.append((CommandType.PREPARE_FLYER_ATTACK, card.id, None))
+
+        # Abilities
+        result.extend(self._ability_commands(my_cards))
+
+        # End turn is blocked while a forced attack is pending
+        if not game.has_forced_attack:
+            result.append((CommandType.END_TURN, None, None))
+
+        return result
+
+    def _ability_commands(self, my_cards) -> List[LegalCommand]:
+        from ..abilities import ABILITIES, AbilityType, TargetType
+
+        result = []
+        for card in my_cards:
+            if not card.can_act:
+                continue
+            for ability_id in card.stats.ability_ids:
+                ability = ABILITIES.get(ability_id)
+                if not ability or ability.ability_type != AbilityType.ACTIVE:
+                    continue
+                # Instant abilities (like luck) go through USE_INSTANT in priority
+                if ability.is_instant:
+                    continue
+                if not card.can_use_ability(ability_id):
+                    continue
+                if ability.target_type != TargetType.SELF:
+                    if not self.game._get_ability_targets(card, ability):
+                        continue
+                result.append((CommandType.USE_ABILITY, card.id, ability_id))
+        return result
+
+    def _priority_commands(self) -> List[LegalCommand]:
+        result = [(CommandType.PASS_PRIORITY, None, None)]
+        for card in self.game.board.get_all_cards(self.player):
+            if card.can_act and card.has_ability("luck"):
+                for target in ("atk", "def"):
+                    for action in ("plus1", "minus1", "reroll"):
+                        result.append((CommandType.USE_INSTANT, card.id, ("luck", f"{target}_{action}")))
+        return result
+
+    def _interaction_commands(self) -> List[LegalCommand]:
+        inter = self.game.interaction
+        kind = inter.kind
+        result = []
+
+        if kind in (InteractionKind.SELECT_DEFENDER, InteractionKind.SELECT_VALHALLA_TARGET):
+            for card_id in inter.valid_card_ids:
+                result.append((CommandType.CHOOSE_CARD, card_id, None))
+        elif kind in (InteractionKind.SELECT_COUNTER_SHOT, InteractionKind.SELECT_MOVEMENT_SHOT,
+                      InteractionKind.SELECT_ABILITY_TARGET, InteractionKind.SELECT_UNTAP):
+            for pos in inter.valid_positions:
+                result.append((CommandType.CHOOSE_POSITION, None, pos))
+        elif kind in (InteractionKind.CONFIRM_HEAL, InteractionKind.CONFIRM_UNTAP,
+                      InteractionKind.CHOOSE_STENCH, InteractionKind.CHOOSE_EXCHANGE):
+            result.append((CommandType.CONFIRM, None, True))
+            result.append((CommandType.CONFIRM, None, False))
+        elif kind == InteractionKind.SELECT_COUNTERS:
+            for amount in range(inter.min_amount, inter.max_amount + 1):
+                result.append((CommandType.CHOOSE_AMOUNT, None, amount))
+
+        if inter.is_skippable and kind in (InteractionKind.SELECT_DEFENDER,
+                                           InteractionKind.SELECT_MOVEMENT_SHOT,
+                                           InteractionKind.SELECT_UNTAP):
+            result.append((CommandType.SKIP, None, None))
+        return result
+
+
+def legal_to_command(player: int, legal: LegalCommand) -> Command:
+    """Expand a compact legal command into a full Command."""
+    from ..commands import (
+        cmd_move, cmd_attack, cmd_prepare_flyer_attack, cmd_use_ability,
+        cmd_use_instant, cmd_end_turn, cmd_pass_priority, cmd_choose_card,
+        cmd_choose_position, cmd_confirm, cmd_skip, cmd_choose_amount,
+    )
+
+    cmd_type, card_id, arg = legal
+    if cmd_type == CommandType.MOVE:
+        return cmd_move(player, card_id, arg)
+    if cmd_type == CommandType.ATTACK:
+        return cmd_attack(player, card_id, arg)
+    if cmd_type == CommandType.PREPARE_FLYER_ATTACK:
+        return cmd_prepare_flyer_attack(player, card_id)
+    if cmd_type == CommandType.USE_ABILITY:
+        return cmd_use_ability(player, card_id, arg)
+    if cmd_type == CommandType.USE_INSTANT:
+        ability_id, option = arg
+        return cmd_use_instant(player, card_id, ability_id, option)
+    if cmd_type == CommandType.END_TURN:
+        return cmd_end_turn(player)
+    if cmd_type == CommandType.PASS_PRIORITY:
+        return cmd_pass_priority(player)
+    if cmd_type == CommandType.CHOOSE_CARD:
+        return cmd_choose_card(player, card_id)
+    if cmd_type == CommandType.CHOOSE_POSITION:
+        return cmd_choose_position(player, arg)
+    if cmd_type == CommandType.CONFIRM:
+        return cmd_confirm(player, arg)
+    if cmd_type == CommandType.SKIP:
+        return cmd_skip(player)
+    if cmd_type == CommandType.CHOOSE_AMOUNT:
+        return cmd_choose_amount(player, arg)
+    raise ValueError(f"Unknown legal command type: {cmd_type}")
+
+
+class LegalCommandsMixin:
+    """Mixin exposing the cached legal command generator."""
+
+    def legal_commands(self, player: int) -> LegalCommands:
+        """Get legal commands for a player, cached until the state changes."""
+        cached = self._legal_cache.get(player)
+        if cached is None or cached.state_version != self.state_version:
+            cached = LegalCommands(self, player)
+            self._legal_cache[player] = cached
+        return cached
@@ -0,0 +1,274 @@
+"""Read-only player view of a live game - for trusted in-process AIs.
+
+Networked and sandboxed AIs observe the game through snapshot_for_player()
+and Game.from_dict(), which serializes the whole state on every change. When
+the AI runs in the same process as the MatchServer (offline simulation) that
+round trip is pure overhead, so a PlayerView wraps the live Game instead:
+
+- Only an explicit allow-list of state values and read-only rule queries is
+  forwarded to the game and board. Everything else - commands, dice, logging,
+  board mutators, attributes the snapshot drops - raises AttributeError, and
+  nothing can be assigned through the view.
+- Every card lookup goes through the view: an opponent's face-down card is
+  replaced by a hidden placeholder, exactly like the redacted snapshot, and
+  every other card is a copy. Mutable state (interaction, forced attackers,
+  ...) is copied too. Copies are made on first access and reused until
+  state_version changes, so callers must not leave changes in them - the
+  same contract as the snapshot path.
+- The opponent's hand and player state are not reachable by any path.
+- to_dict() returns the redacted snapshot, so code that copies the game for
+  look-ahead (Game.from_dict(view.to_dict())) still gets a filtered copy.
+- Rule queries (legal_commands, get_attack_targets, ...) run on the live
+  game and return positions - the same answers the server gives when the
+  command is submitted. Cards passed to them are mapped back to the live
+  cards by id.
+"""
+import copy
+from itertools import chain
+from typing import Any, Dict, List, Optional, Tuple, TYPE_CHECKING
+
+from ..card import Card
+from ..player_state import PlayerState
+
+if TYPE_CHECKING:
+    from . import Game
+    from ..abilities import Ability
+
+
+# Immutable game values, forwarded as they are
+GAME_VALUES = frozenset({
+    'phase', 'current_player', 'turn_number', 'winner', 'priority_phase',
+    'priority_player', 'friendly_fire_target', 'state_version', 'headless',
+    'MAX_MESSAGES',
+})
+
+# Mutable game state, copied once per state version
+GAME_STATE = frozenset({
+    'interaction', 'forced_attackers', 'pending_valhalla', 'priority_passed',
+    'pending_dice_roll', 'instant_stack', 'messages', 'last_combat',
+})
+
+# Rule queries that take no cards and change nothing
+GAME_QUERIES = frozenset({
+    'legal_commands', 'opponent_has_only_flyers', 'has_forced_attack',
+    'has_blocking_interaction', 'awaiting_defender', 'awaiting_priority',
+    'awaiting_ability_target', 'awaiting_counter_selection',
+    'awaiting_exchange_choice', 'awaiting_valhalla', 'awaiting_counter_shot',
+    'awaiting_movement_shot', 'awaiting_heal_confirm', 'awaiting_untap_confirm',
+    'awaiting_select_untap', 'awaiting_stench_choice',
+})
+
+# Board geometry, forwarded as it is
+BOARD_QUERIES = frozenset({
+    'FLYING_P1_START', 'FLYING_P2_START', 'FLYING_SLOTS', 'pos_to_coords',
+    'coords_to_pos', 'is_valid_pos', 'is_flying_pos', 'get_flying_index',
+    'get_adjacent_cells', 'get_placement_zone', 'get_flying_placement_zone',
+    'check_winner',
+})
+
+
+class BoardView:
+    """Read-only board with the opponent's face-down cards masked."""
+
+    def __init__(self, view: 'PlayerView'):
+        object.__setattr__(self, '_view', view)
+
+    def __getattr__(self, name: str) -> Any:
+        if name not in BOARD_QUERIES:
+            raise AttributeError(f"'{name}' is not available on the board view")
+        return getattr(self._view._game.board, name)
+
+    def __setattr__(self, name: str, value: Any):
+        raise AttributeError("BoardView is read-only")
+
+    def _mask(self, card: Optional[Card]) -> Optional[Card]:
+        return self._view._mask(card)
+
+    def _mask_list(self, cards: List[Optional[Card]]) -> List[Optional[Card]]:
+        mask = self._view._mask
+        return [mask(c) for c in cards]
+
+    @property
+    def cells(self) -> List[Optional[Card]]:
+        return self._mask_list(self._view._game.board.cells)
+
+    @property
+    def flying_p1(self) -> List[Optional[Card]]:
+        return self._mask_list(self._view._game.board.flying_p1)
+
+    @property
+    def flying_p2(self) -> List[Optional[Card]]:
+        return self._mask_list(self._view._game.board.flying_p2)
+
+    @property
+    def graveyard_p1(self) -> List[Card]:
+        return self._mask_list(self._view._game.board.graveyard_p1)
+
+    @property
+    def graveyard_p2(self) -> List[Card]:
+        return self._mask_list(self._view._game.board.graveyard_p2)
+
+    def get_flying_zone(self, pos: int) -> Optional[List[Optional[Card]]]:
+        zone = self._view._game.board.get_flying_zone(pos)
+        return self._mask_list(zone) if zone is not None else None
+
+    def get_card(self, pos: int) -> Optional[Card]:
+        return self._mask(self._view._game.board.get_card(pos))
+
+    def get_card_by_id(self, card_id: int) -> Optional[Card]:
+        return self._mask(self._view._game.board.get_card_by_id(card_id))
+
+    def get_all_cards(self, player: Optional[int] = None, include_flying: bool = True) -> List[Card]:
+        return self._mask_list(self._view._game.board.get_all_cards(player, include_flying))
+
+    def get_flying_cards(self, player: Optional[int] = None) -> List[Card]:
+        return self._mask_list(self._view._game.board.get_flying_cards(player))
+
+    def get_valid_moves(self, card: Card) -> List[int]:
+        return self._view._game.board.get_valid_moves(self._view._live(card))
+
+    def get_attack_targets(self, card: Card, include_allies: bool = True) -> List[int]:
+        return self._view._game.board.get_attack_targets(self._view._live(card), include_allies)
+
+    def get_valid_defenders(self, attacker: Card, target: Card) -> List[Card]:
+        live = self._view._live
+        return self._mask_list(self._view._game.board.get_valid_defenders(live(attacker), live(target)))
+
+    def to_dict(self) -> dict:
+        return self._view.to_dict()['board']
+
+
+class PlayerView:
+    """Read-only, redaction-aware view of a live Game for one player."""
+
+    def __init__(self, game: 'Game', player: int):
+        object.__setattr__(self, '_game', game)
+        object.__setattr__(self, 'player', player)
+        object.__setattr__(self, 'board', BoardView(self))
+        object.__setattr__(self, '_cards', {})      # card id -> copy or placeholder
+        object.__setattr__(self, '_originals', {})  # card id -> live card
+        object.__setattr__(self, '_state', {})      # attribute -> copy
+        object.__setattr__(self, '_cache_version', game.state_version)
+
+    def __getattr__(self, name: str) -> Any:
+        if name in GAME_VALUES or name in GAME_QUERIES:
+            return getattr(self._game, name)
+        if name in GAME_STATE:
+            self._sync()
+            if name not in self._state:
+                self._state[name] = copy.deepcopy(getattr(self._game, name))
+            return self._state[name]
+        raise AttributeError(f"'{name}' is not visible to player {self.player}")
+
+    def __setattr__(self, name: str, value: Any):
+        raise AttributeError("PlayerView is read-only")
+
+    def _sync(self):
+        """Drop the copies made for an older state version."""
+        version = self._game.state_version
+        if self._cache_version != version:
+            self._cards.clear()
+            self._originals.clear()
+            self._state.clear()
+            object.__setattr__(self, '_cache_version', version)
+
+    def _mask(self, card: Optional[Card]) -> Optional[Card]:
+        """A copy of a live card; an opponent's face-down card becomes a placeholder."""
+        if card is None:
+            return None
+        self._sync()
+        masked = self._cards.get(card.id)
+        if masked is None:
+            if card.player != self.player and card.face_down:
+                masked = Card.create_hidden_placeholder(card.player, card.id, card.position)
+            else:
+                masked = card.copy()
+            self._cards[card.id] = masked
+            self._originals[card.id] = card
+        return masked
+
+    def _live(self, card: Card) -> Card:
+        """The live card behind one handed out by the view."""
+        self._sync()
+        return self._originals.get(card.id) or self._game.get_card_by_id(card.id) or card
+
+    def _hand(self, player: int) -> List[Card]:
+        if player != self.player:
+            raise AttributeError(f"'hand_p{player}' is not visible to player {self.player}")
+        return [self._mask(c) for c in self._game.get_player_state(player).hand]
+
+    @property
+    def hand_p1(self) -> List[Card]:
+        return self._hand(1)
+
+    @property
+    def hand_p2(self) -> List[Card]:
+        return self._hand(2)
+
+    def get_card(self, pos: int) -> Optional[Card]:
+        return self.board.get_card(pos)
+
+    def get_card_by_id(self, card_id: int) -> Optional[Card]:
+        """Look up a card on the board, in a graveyard or in the viewer's hand."""
+        if card_id is None:
+            return None
+        card = self.board.get_card_by_id(card_id)
+        if card is not None:
+            return card
+        board = self._game.board
+        own_hand = self._game.get_player_state(self.player).hand
+        for card in chain(board.graveyard_p1, board.graveyard_p2, own_hand):
+            if card.id == card_id:
+                return self._mask(card)
+        return None
+
+    def get_player_state(self, player: int) -> PlayerState:
+        if player != self.player:
+            raise ValueError(f"Player {self.player} view cannot read player {player}'s state")
+        return PlayerState(player=player, hand=self._hand(player))
+
+    @property
+    def current_player_state(self) -> PlayerState:
+        return self.get_player_state(self._game.current_player)
+
+    def get_current_hand(self) -> List[Card]:
+        return self.get_player_state(self._game.current_player).hand
+
+    @property
+    def counter_selection_card(self) -> Optional[Card]:
+        return self._mask(self._game.counter_selection_card)
+
+    # Rule queries about a card run on the live card with the same id
+
+    def get_attack_targets(self, card: Card, include_allies: bool = True) -> List[int]:
+        return self._game.get_attack_targets(self._live(card), include_allies)
+
+    def _get_ability_targets(self, card: Card, ability: 'Ability') -> List[int]:
+        return self._game._get_ability_targets(self._live(card), ability)
+
+    def get_usable_abilities(self, card: Card) -> List['Ability']:
+        return self._game.get_usable_abilities(self._live(card))
+
+    def get_ability_display_text(self, card: Card, ability: 'Ability') -> str:
+        return self._game.get_ability_display_text(self._live(card), ability)
+
+    def get_display_attack(self, card: Card) -> Tuple[int, int, int]:
+        return self._game.get_display_attack(self._live(card))
+
+    def can_prepare_flyer_attack(self, card: Card) -> bool:
+        return self._game.can_prepare_flyer_attack(self._live(card))
+
+    def get_forced_attacker_card(self, card: Card) -> Optional[List[int]]:
+        return self._game.get_forced_attacker_card(self._live(card))
+
+    def get_legal_instants(self, player: int) -> List[Tuple[Card, 'Ability']]:
+        return [(self._mask(card), ability) for card, ability in self._game.get_legal_instants(player)]
+
+    def to_dict(self, include_ui_state: bool = False) -> Dict[str, Any]:
+        """Redacted snapshot of the game (see Game.snapshot_for_player)."""
+        return self._game.snapshot_for_player(self.player)
+
+    def snapshot_for_player(self, player: int) -> Dict[str, Any]:
+        if player != self.player:
+            raise ValueError(f"Player {self.player} view cannot snapshot player {player}")
+        return self._game.snapshot_for_player(player)
@@ -28,12 +28,20 @@ Usage (future network):
     result = client.send_command(cmd)
 """
 
+import json
+import random
+import time
+import zlib
 from dataclasses import dataclass, field
-from typing import List, Optional, Tuple, Dict, Any
+from typing import List, Optional, Tuple, Dict, Any, TYPE_CHECKING
 from .game import Game
 from .commands import Command, Event, CommandType
 from .ui_state import GameClient
 
+if TYPE_CHECKING:
+    from .metrics import CommandMetrics
+    from .replay import Replay
+
 
 @dataclass
 class CommandResult:
@@ -92,21 +100,51 @@ class MatchServer:
         CommandType.END_TURN,
     ])
 
-    def __init__(self):
+    def __init__(self, headless: bool = False, metrics: Optional['CommandMetrics'] = None,
+                 seed: Optional[int] = None):
+        """Create a match server.
+
+        Args:
+            headless: Run games without the message log and UI-hint events
+                      (for simulations and server-side bots)
+            metrics: Record per-command timings here (None = no timing at all)
+            seed: Seed the game's dice, so the same setup and commands
+                  replay to the same state (None = unseeded)
+        """
         self.game: Optional[Game] = None
         self.command_log: List[Command] = []  # For replay support
+        self.headless = headless
+        self.metrics = metrics
+        self.seed = seed
+        self.initial_checkpoint: Optional[Dict[str, Any]] = None  # Seeded games only, for replays
+        self._last_command_type: Optional[CommandType] = None
+
+    def _new_game(self) -> Game:
+        game = Game()
+        game.headless = self.headless
+        if self.seed is not None:
+            game.rng = random.Random(self.seed)
+        return game
 
     def setup_game(self, p1_squad: list = None, p2_squad: list = None):
         """Initialize a new game."""
-        self.game = Game()
+        self.game = self._new_game()
         self.game.setup_game(p1_squad, p2_squad)
-        self.command_log = []
+        self._game_started()
 
     def setup_with_placement(self, p1_cards: list, p2_cards: list):
         """Initialize game with pre-placed cards."""
-        self.game = Game()
+        self.game = self._new_game()
         self.game.setup_game_with_placement(p1_cards, p2_cards)
+        self._game_started()
+
+    def _game_started(self):
         self.command_log = []
+        if self.seed is not None:
+            # Copied through JSON: checkpoint() shares lists with the live game
+            self.initial_checkpoint = json.loads(json.dumps(self.checkpoint()))
+        else:
+            self.initial_checkpoint = None
 
     def apply(self, cmd: Command, include_snapshot: bool = True) -> CommandResult:
         """Process a command and return the result.
@@ -121,15 +159,25 @@ class MatchServer:
         if self.game is None:
             return CommandResult(accepted=False, error="No game in progress")
 
+        metrics = self.metrics
+
         # Validate command type is allowed from remote clients
         if cmd.type not in self.ALLOWED_COMMANDS:
+            if metrics is not None:
+                metrics.record_process(cmd.type, 0.0, False, 0)
             return CommandResult(
                 accepted=False,
                 error=f"Command type {cmd.type} not allowed from client"
             )
 
         # Process command (server_only=True rejects UI commands)
-        accepted, events = self.game.process_command(cmd, server_only=True)
+        if metrics is None:
+            accepted, events = self.game.process_command(cmd, server_only=True)
+        else:
+            self._last_command_type = cmd.type
+            start = time.perf_counter()
+            accepted, events = self.game.process_command(cmd, server_only=True)
+            metrics.record_process(cmd.type, time.perf_counter() - start, accepted, len(events))
 
         # Log accepted commands for replay
         if accepted:
@@ -143,7 +191,12 @@ class MatchServer:
 
         if include_snapshot:
             # Filter snapshot for the player who sent the command
-            result.snapshot = self.get_snapshot(for_player=cmd.player)
+            if metrics is None:
+                result.snapshot = self.get_snapshot(for_player=cmd.player)
+            else:
+                start = time.perf_counter()
+                result.snapshot = self.get_snapshot(for_player=cmd.player)
+                metrics.record_snapshot(cmd.type, time.perf_counter() - start)
 
         return result
 
@@ -161,13 +214,69 @@ class MatchServer:
             return self.game.snapshot_for_player(for_player)
         return self.game.to_dict(include_ui_state=False)
 
+    def checkpoint(self) -> Dict[str, Any]:
+        """Full server state plus the dice generator, enough to resume the match."""
+        rng = self.game.rng if self.game is not None else None
+        return {
+            'commands': len(self.command_log),
+            'state': self.get_snapshot(),
+            'rng': list(rng.getstate()) if rng is not None else None,
+        }
+
+    def restore(self, checkpoint: Dict[str, Any], command_log: Optional[List[Command]] = None):
+        """Resume from checkpoint(); command_log is the history up to it, if known."""
+        game = Game.from_dict(checkpoint['state'])
+        game.headless = self.headless
+        if checkpoint.get('rng') is not None:
+            version, state, gauss = checkpoint['rng']
+            game.rng = random.Random()
+            game.rng.setstate((version, tuple(state), gauss))
+        self.game = game
+        self.command_log = list(command_log or [])
+
+    def hibernate(self) -> bytes:
+        """Compressed checkpoint and command history; see from_hibernation."""
+        data = {
+            'seed': self.seed,
+            'checkpoint': self.checkpoint(),
+            'commands': [cmd.to_dict() for cmd in self.command_log],
+            'initial': self.initial_checkpoint,
+        }
+        return zlib.compress(json.dumps(data, separators=(',', ':')).encode('utf-8'))
+
+    @classmethod
+    def from_hibernation(cls, blob: bytes, headless: bool = False,
+                         metrics: Optional['CommandMetrics'] = None) -> 'MatchServer':
+        """Rebuild a MatchServer from hibernate() output."""
+        data = json.loads(zlib.decompress(blob))
+        server = cls(headless=headless, metrics=metrics, seed=data['seed'])
+        server.restore(data['checkpoint'], [Command.from_dict(d) for d in data['commands']])
+        server.initial_checkpoint = data['initial']
+        return server
+
+    def replay(self, **meta) -> 'Replay':
+        """Replay of the game so far (needs a seed); meta goes into its header."""
+        from .replay import Replay, ReplayError
+        if self.initial_checkpoint is None:
+            raise ReplayError("Only seeded games can be replayed")
+        winner = self.game.winner if self.game is not None and self.game.winner else 0
+        return Replay.record(self.initial_checkpoint, self.command_log, self.seed,
+                             winner=winner, **meta)
+
     def get_state_hash(self) -> str:
-        """Get a hash of current state for validation."""
+        """Get a hash of current state for validation.
+
+        With metrics on, the time is recorded under the last applied command type.
+        """
         import hashlib
         import json
+        start = time.perf_counter() if self.metrics is not None else 0.0
         snapshot = self.get_snapshot()
         state_str = json.dumps(snapshot, sort_keys=True)
-        return hashlib.md5(state_str.encode()).hexdigest()[:16]
+        digest = hashlib.md5(state_str.encode()).hexdigest()[:16]
+        if self.metrics is not None and self._last_command_type is not None:
+            self.metrics.record_hash(self._last_command_type, time.perf_counter() - start)
+        return digest
 
 
 class LocalMatchClient:
@@ -327,9 +436,11 @@ def get_content_hash() -> str:
     Used in network handshake to ensure client and server have matching:
     - Card definitions (stats, abilities)
     - Ability definitions (effects, triggers)
+    - Card/board serialization layout (CARD_SCHEMA)
 
     If hashes don't match, client and server are incompatible.
     """
+    from .card import CARD_SCHEMA
     from .card_database import get_card_database_hash
     from .abilities import get_ability_registry_hash
     import hashlib
@@ -337,8 +448,8 @@ def get_content_hash() -> str:
     card_hash = get_card_database_hash()
     ability_hash = get_ability_registry_hash()
 
-    # Combine hashes
-    combined = f"{card_hash}:{ability_hash}"
+    # Combine hashes (the card schema decides the snapshot layout)
+    combined = f"{card_hash}:{ability_hash}:{CARD_SCHEMA}"
     return hashlib.md5(combined.encode()).hexdigest()[:16]
 
 
@@ -0,0 +1,178 @@
+"""Low-overhead timing metrics for the match server.
+
+Histograms use fixed bucket bounds, so recording a sample is a bisect and
+two integer increments - no allocation, no sorting. Percentiles are
+estimated from the bucket bounds, which is accurate enough to spot a slow
+command type.
+
+Usage:
+    metrics = CommandMetrics()
+    server = MatchServer(metrics=metrics)   # metrics=None (default) costs nothing
+    ...
+    print(metrics.format_table())
+"""
+import bisect
+import math
+from typing import Dict, Sequence
+
+from .commands import CommandType
+
+
+# Bucket upper bounds in microseconds (last bucket is open-ended)
+DEFAULT_BOUNDS_US: Sequence[float] = (
+    10, 20, 50, 100, 200, 500,
+    1_000, 2_000, 5_000, 10_000, 20_000, 50_000,
+    100_000, 200_000, 500_000, 1_000_000,
+)
+
+
+class Histogram:
+    """Fixed-bucket histogram of non-negative values."""
+
+    __slots__ = ('bounds', 'counts', 'count', 'total', 'max')
+
+    def __init__(self, bounds: Sequence[float] = DEFAULT_BOUNDS_US):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, value: float):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, pct: float) -> float:
+        """Upper bound of the bucket holding the pct-th percentile (max for the open bucket)."""
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(pct / 100 * self.count))
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank:
+                return min(self.bounds[i], self.max) if i < len(self.bounds) else self.max
+        return self.max
+
+    def merge(self, other: 'Histogram'):
+        """Add another histogram with the same bounds into this one."""
+        for i, n in enumerate(other.counts):
+            self.counts[i] += n
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+    def to_dict(self) -> dict:
+        return {
+            'bounds': list(self.bounds),
+            'counts': list(self.counts),
+            'count': self.count,
+            'total': self.total,
+            'max': self.max,
+        }
+
+
+class CommandTypeStats:
+    """Counters and timing histograms for one command type."""
+
+    __slots__ = ('accepted', 'rejected', 'events', 'process_us', 'snapshot_us', 'hash_us')
+
+    def __init__(self):
+        self.accepted = 0
+        self.rejected = 0
+        self.events = 0
+        self.process_us = Histogram()
+        self.snapshot_us = Histogram()
+        self.hash_us = Histogram()
+
+    @property
+    def total(self) -> int:
+        return self.accepted + self.rejected
+
+    def to_dict(self) -> dict:
+        return {
+            'accepted': self.accepted,
+            'rejected': self.rejected,
+            'events': self.events,
+            'process_us': self.process_us.to_dict(),
+            'snapshot_us': self.snapshot_us.to_dict(),
+            'hash_us': self.hash_us.to_dict(),
+        }
+
+
+class CommandMetrics:
+    """Per-CommandType metrics recorded by MatchServer.apply.
+
+    One instance can be shared by many MatchServers (GameServer does this)
+    to get process-wide numbers.
+    """
+
+    def __init__(self):
+        self.by_type: Dict[CommandType, CommandTypeStats] = {}
+
+    def _stats(self, cmd_type: CommandType) -> CommandTypeStats:
+        stats = self.by_type.get(cmd_type)
+        if stats is None:
+            stats = self.by_type[cmd_type] = CommandTypeStats()
+        return stats
+
+    def record_process(self, cmd_type: CommandType, seconds: float, accepted: bool, events: int):
+        stats = self._stats(cmd_type)
+        stats.process_us.record(seconds * 1_000_000)
+        stats.events += events
+        if accepted:
+            stats.accepted += 1
+        else:
+            stats.rejected += 1
+
+    def record_snapshot(self, cmd_type: CommandType, seconds: float):
+        self._stats(cmd_type).snapshot_us.record(seconds * 1_000_000)
+
+    def record_hash(self, cmd_type: CommandType, seconds: float):
+        self._stats(cmd_type).hash_us.record(seconds * 1_000_000)
+
+    def merge(self, other: 'CommandMetrics'):
+        """Add another instance's counts into this one (e.g. from a worker process)."""
+        for cmd_type, theirs in other.by_type.items():
+            ours = self._stats(cmd_type)
+            ours.accepted += theirs.accepted
+            ours.rejected += theirs.rejected
+            ours.events += theirs.events
+            ours.process_us.merge(theirs.process_us)
+            ours.snapshot_us.merge(theirs.snapshot_us)
+            ours.hash_us.merge(theirs.hash_us)
+
+    @property
+    def total_commands(self) -> int:
+        return sum(s.total for s in self.by_type.values())
+
+    def reset(self):
+        self.by_type.clear()
+
+    def to_dict(self) -> dict:
+        return {t.name: s.to_dict() for t, s in self.by_type.items()}
+
+    def format_table(self) -> str:
+        """Human-readable dump, one line per command type."""
+        lines = [
+            f"{'command':<22} {'count':>7} {'acc%':>6} {'ev/cmd':>7} "
+            f"{'p50us':>7} {'p95us':>7} {'p99us':>7} {'maxus':>8} {'snap95':>7} {'hash95':>7}",
+        ]
+        for cmd_type in sorted(self.by_type, key=lambda t: t.name):
+            s = self.by_type[cmd_type]
+            acc = s.accepted / s.total * 100 if s.total else 0.0
+            ev = s.events / s.total if s.total else 0.0
+            p = s.process_us
+            lines.append(
+                f"{cmd_type.name:<22} {s.total:>7} {acc:>6.1f} {ev:>7.1f} "
+                f"{p.percentile(50):>7.0f} {p.percentile(95):>7.0f} {p.percentile(99):>7.0f} "
+                f"{p.max:>8.0f} {s.snapshot_us.percentile(95):>7.0f} {s.hash_us.percentile(95):>7.0f}"
+            )
+        return "\n".join(lines)
@@ -1,6 +1,8 @@
 """Network module for multiplayer support."""
 
 from .protocol import MessageType, Message, FrameReader, FrameWriter
+from .compression import FrameCompression
 from .client import NetworkClient, ClientState
 from .server import GameServer, run_server
 from .session import PlayerSession, MatchSession, SessionState
+from .workers import MatchWorkerPool
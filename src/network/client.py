@@ -20,23 +20,29 @@ import ssl
 import logging
 import time
 from dataclasses import dataclass, field
-from typing import Callable, Dict, List, Optional, Any
+from typing import Callable, Dict, List, Optional, Any, Tuple
 from enum import Enum, auto
 from queue import Queue, Empty
 import threading
 
 from .protocol import (
-    Message, MessageType, FrameReader,
-    msg_hello, msg_ping, msg_create_match, msg_join_match,
+    Message, MessageType, FrameReader, READ_SIZE,
+    msg_hello, msg_ping, msg_pong, msg_create_match, msg_join_match,
     msg_command, msg_list_matches, msg_player_ready, msg_leave_match,
     msg_chat, msg_draw_offer, msg_draw_accept, msg_request_resync,
 )
+from .compression import FrameCompression, get_codec, supported_codecs
+from .latency import PING_INTERVAL, RttEstimator
+from .prediction import Predictor
 from ..match import get_content_hash, CommandResult
 from ..commands import Command, Event
 from ..game import Game
 
 logger = logging.getLogger(__name__)
 
+# Messages whose snapshot replaces the client's Game
+SNAPSHOT_MESSAGES = (MessageType.MATCH_JOINED, MessageType.GAME_START, MessageType.UPDATE, MessageType.RESYNC)
+
 
 class ClientState(Enum):
     """Client connection state."""
@@ -61,6 +67,8 @@ class NetworkClient:
     port: int = 7777
     use_tls: bool = False
     certfile: Optional[str] = None  # For certificate pinning
+    compression: bool = True  # Offer frame compression in HELLO
+    predict_commands: bool = False  # Apply own deterministic commands before the server answers
 
     # State
     state: ClientState = ClientState.DISCONNECTED
@@ -68,6 +76,7 @@ class NetworkClient:
     player_name: str = ""
     match_id: str = ""
     player_number: int = 0
+    resume_token: str = ""  # Seat secret from GAME_START, sent when joining match_id again
     error_message: str = ""
 
     # Game state (updated from server)
@@ -80,17 +89,21 @@ class NetworkClient:
     _loop: Optional[asyncio.AbstractEventLoop] = None
     _thread: Optional[threading.Thread] = None
     _running: bool = False
+    _compression: Optional[FrameCompression] = None  # Codec agreed in WELCOME
 
     # Command tracking
     _command_seq: int = 0
     _server_seq: int = 0
-    _last_command_time: float = 0.0  # Time of last command sent
     _last_update_time: float = 0.0  # Time of last update received from server
-    _pending_response: bool = False  # True if waiting for server response
+    _unacked: Dict[int, Tuple[Command, float]] = field(default_factory=dict)  # seq -> (command, sent at)
     _resync_requested: bool = False  # True if we already requested resync for this timeout
+    _resync_seq: int = 0  # Last command seq sent before the outstanding resync request
+    _predictor: Optional[Predictor] = None  # Commands applied locally, awaiting their UPDATE
+    _confirmed_game: Optional[Game] = None  # Last Game from the server, without predictions
 
-    # Thread-safe queues
-    _outgoing: Queue = field(default_factory=Queue)
+    # Outgoing: asyncio queue fed from the main thread via call_soon_threadsafe
+    # Incoming: thread-safe queue drained by poll() on the main thread
+    _outgoing: Optional[asyncio.Queue] = None
     _incoming: Queue = field(default_factory=Queue)
 
     # Callbacks (called from main thread via poll)
@@ -115,9 +128,12 @@ class NetworkClient:
     # Lobby state
     lobby_user_count: int = 0
 
+    # Latency to the server (updated by the network thread on every PONG)
+    rtt: RttEstimator = field(default_factory=RttEstimator)
+
     def __post_init__(self):
-        self._outgoing = Queue()
         self._incoming = Queue()
+        self._predictor = Predictor()
 
     # =========================================================================
     # PUBLIC API (called from main thread)
@@ -134,6 +150,12 @@ class NetworkClient:
         self.use_tls = use_tls
         self.state = ClientState.CONNECTING
         self.error_message = ""
+        self.rtt = RttEstimator()
+
+        # Loop and queue exist before the thread starts, so messages queued
+        # while connecting are sent right after the handshake
+        self._loop = asyncio.new_event_loop()
+        self._outgoing = asyncio.Queue()
 
         # Start network thread
         self._running = True
@@ -158,10 +180,11 @@ class NetworkClient:
         self._queue_message(msg_create_match(squad, placed_cards))
 
     def join_match(self, match_id: str, squad: List[str], placed_cards: List[dict] = None):
-        """Join an existing match."""
+        """Join an existing match (rejoins our seat if it is the match we were playing)."""
         if self.state != ClientState.IN_LOBBY:
             return
-        self._queue_message(msg_join_match(match_id, squad, placed_cards))
+        resume_token = self.resume_token if match_id == self.match_id else None
+        self._queue_message(msg_join_match(match_id, squad, placed_cards, resume_token))
 
     def list_matches(self):
         """Request list of open matches."""
@@ -189,6 +212,7 @@ class NetworkClient:
         self._queue_message(msg_leave_match())
         self.state = ClientState.IN_LOBBY
         self.match_id = ""
+        self.resume_token = ""
         self.player_number = 0
         self.game = None
 
@@ -198,9 +222,12 @@ class NetworkClient:
             return
 
         self._command_seq += 1
-        self._last_command_time = time.time()
-        self._pending_response = True
+        self._unacked[self._command_seq] = (cmd, time.time())
         self._resync_requested = False
+        if self.predict_commands:
+            predicted = self._predictor.predict(self.game, self._command_seq, cmd)
+            if predicted is not None:
+                self.game = predicted[0]
         self._queue_message(msg_command(cmd, self._command_seq))
 
     def send_chat(self, text: str):
@@ -229,25 +256,58 @@ class NetworkClient:
         if self.state != ClientState.IN_MATCH:
             return
         logger.info("Requesting resync from server")
+        self._resync_seq = self._command_seq
         self._queue_message(msg_request_resync())
 
-    # Timeout for command response before auto-resync (seconds)
+    # Timeout for command response before auto-resync (seconds): COMMAND_TIMEOUT
+    # until the first RTT sample, then the retransmission timeout plus the
+    # server's processing margin, clamped to [MIN, MAX]
     COMMAND_TIMEOUT = 3.0
-    # Timeout for any server activity before auto-resync (seconds)
+    MIN_COMMAND_TIMEOUT = 1.5
+    MAX_COMMAND_TIMEOUT = 10.0
+    COMMAND_PROCESSING_MARGIN = 1.0
+    # Timeout for any server activity before auto-resync (seconds), stretched on slow links
     INACTIVITY_TIMEOUT = 15.0
+    MAX_INACTIVITY_TIMEOUT = 30.0
+
+    @property
+    def command_timeout(self) -> float:
+        """Seconds to wait for a command's answer before requesting a resync."""
+        return self.rtt.timeout(self.COMMAND_TIMEOUT, self.MIN_COMMAND_TIMEOUT,
+                                self.MAX_COMMAND_TIMEOUT, margin=self.COMMAND_PROCESSING_MARGIN)
+
+    @property
+    def inactivity_timeout(self) -> float:
+        """Seconds without game updates before requesting a resync."""
+        return self.rtt.timeout(self.INACTIVITY_TIMEOUT, self.INACTIVITY_TIMEOUT,
+                                self.MAX_INACTIVITY_TIMEOUT, margin=self.INACTIVITY_TIMEOUT)
+
+    @property
+    def ping_ms(self) -> Optional[int]:
+        """Smoothed round trip to the server in milliseconds (None until measured)."""
+        if not self.rtt.samples:
+            return None
+        return round(self.rtt.srtt * 1000)
 
     def poll(self):
         """Process pending messages from network thread.
 
-        Call this from your game loop to handle callbacks.
+        Call this from your game loop to handle callbacks. Games arrive
+        already built by the network thread; if several queued up since the
+        last call, only the newest one is applied (callbacks still see
+        every update's events).
         """
+        pending = []
         while True:
             try:
-                msg_type, data = self._incoming.get_nowait()
+                pending.append(self._incoming.get_nowait())
             except Empty:
                 break
 
-            self._handle_incoming(msg_type, data)
+        latest = max((i for i, (_, data) in enumerate(pending)
+                      if isinstance(data, dict) and data.get('game') is not None), default=-1)
+        for i, (msg_type, data) in enumerate(pending):
+            self._handle_incoming(msg_type, data, apply_game=i >= latest)
 
         # Check for command timeout and auto-resync
         self._check_command_timeout()
@@ -261,10 +321,10 @@ class NetworkClient:
 
         now = time.time()
 
-        # Check for pending command timeout
-        if self._pending_response:
-            elapsed = now - self._last_command_time
-            if elapsed >= self.COMMAND_TIMEOUT:
+        # Check for pending command timeout (oldest command still in flight)
+        if self._unacked:
+            elapsed = now - next(iter(self._unacked.values()))[1]
+            if elapsed >= self.command_timeout:
                 logger.warning(f"Command timed out after {elapsed:.1f}s, requesting resync")
                 self._resync_requested = True
                 if self.on_resync_requested:
@@ -275,7 +335,7 @@ class NetworkClient:
         # Check for general inactivity (no updates from server)
         if self._last_update_time > 0:
             inactivity = now - self._last_update_time
-            if inactivity >= self.INACTIVITY_TIMEOUT:
+            if inactivity >= self.inactivity_timeout:
                 logger.warning(f"No server activity for {inactivity:.1f}s, requesting resync")
                 self._resync_requested = True
                 if self.on_resync_requested:
@@ -283,10 +343,47 @@ class NetworkClient:
                 self.request_resync()
 
     def _queue_message(self, msg: Optional[Message]):
-        """Queue message for sending."""
-        self._outgoing.put(msg)
+        """Queue message for sending (wakes the network thread immediately)."""
+        loop = self._loop
+        if loop is None:
+            return  # Not connected
+        try:
+            loop.call_soon_threadsafe(self._outgoing.put_nowait, msg)
+        except RuntimeError:
+            pass  # Loop closed while disconnecting
+
+    @property
+    def commands_in_flight(self) -> int:
+        """Commands sent but not yet acknowledged by the server."""
+        return len(self._unacked)
+
+    def _ack(self, seq: int, refresh: bool = True):
+        """Forget commands the server has handled, up to and including seq."""
+        for acked in [s for s in self._unacked if s <= seq]:
+            del self._unacked[acked]
+        if self._predictor.ack(seq) and refresh and self._confirmed_game is not None:
+            # A predicted command was answered without a state update: undo it
+            self.game = self._predictor.reconcile(self._confirmed_game)
+
+    def _set_confirmed_game(self, game: Game):
+        """Adopt a Game from the server, re-applying our commands still in flight."""
+        self._confirmed_game = game
+        self.game = self._predictor.reconcile(game)
+
+    def _retransmit_unacked(self):
+        """Resend commands the server had not seen when it answered our resync or rejoin.
+
+        The server drops (and acknowledges) seqs it already handled, so
+        resending is always safe.
+        """
+        for seq, (cmd, _) in list(self._unacked.items()):
+            if seq > self._resync_seq:
+                break
+            logger.info(f"Retransmitting command seq={seq}")
+            self._unacked[seq] = (cmd, time.time())
+            self._queue_message(msg_command(cmd, seq))
 
-    def _handle_incoming(self, msg_type: str, data: Any):
+    def _handle_incoming(self, msg_type: str, data: Any, apply_game: bool = True):
         """Handle incoming message in main thread."""
         if msg_type == 'connected':
             self.state = ClientState.IN_LOBBY
@@ -309,12 +406,22 @@ class NetworkClient:
                 self.on_match_created(data)
 
         elif msg_type == 'match_joined':
+            # Back in the match we were playing: keep the commands in flight
+            rejoined = (data['match_id'] == self.match_id and data['player'] == self.player_number
+                        and data.get('game') is not None)
             self.match_id = data['match_id']
             self.player_number = data['player']
             self.state = ClientState.IN_MATCH
-            # Reconstruct game from snapshot
-            if data.get('snapshot'):
-                self.game = Game.from_dict(data['snapshot'])
+            if rejoined:
+                self._resync_seq = self._command_seq
+                self._ack(data.get('ack', 0), refresh=False)
+            else:
+                self._predictor.clear()
+                self._unacked.clear()
+            if apply_game and data.get('game') is not None:
+                self._set_confirmed_game(data['game'])
+            if rejoined:
+                self._retransmit_unacked()
             if self.on_match_joined:
                 self.on_match_joined(data['player'], data.get('snapshot', {}))
 
@@ -350,39 +457,43 @@ class NetworkClient:
 
         elif msg_type == 'game_start':
             self.state = ClientState.IN_MATCH
+            self.resume_token = data.get('resume_token', '')
             self._last_update_time = time.time()
-            if data.get('snapshot'):
-                self.game = Game.from_dict(data['snapshot'])
+            if apply_game and data.get('game') is not None:
+                self._set_confirmed_game(data['game'])
             if self.on_game_start:
                 self.on_game_start(data.get('snapshot', {}))
 
         elif msg_type == 'update':
-            # Response received, clear pending state
-            self._pending_response = False
             self._resync_requested = False
             self._last_update_time = time.time()
-            # Reconstruct CommandResult
-            result = CommandResult(
-                accepted=data.get('accepted', False),
-                events=[Event.from_dict(e) for e in data.get('events', [])],
-                snapshot=data.get('snapshot'),
-                error=data.get('error'),
-            )
-            # Update local game state
-            if result.snapshot:
-                self.game = Game.from_dict(result.snapshot)
+            new_game = data.get('game') if apply_game else None
+            if data.get('command_seq'):
+                self._ack(data['command_seq'], refresh=new_game is None)
+            if new_game is not None:
+                self._set_confirmed_game(new_game)
             if self.on_update:
-                self.on_update(result)
+                self.on_update(data['result'])
+
+        elif msg_type == 'command_ack':
+            self._last_update_time = time.time()
+            self._ack(data.get('ack', 0))
+            if data.get('error'):
+                self.error_message = data['error']
+                if self.on_error:
+                    self.on_error(data['error'])
 
         elif msg_type == 'resync':
-            # Resync received, clear pending state
-            self._pending_response = False
             self._resync_requested = False
             self._last_update_time = time.time()
             if data.get('snapshot'):
-                self.game = Game.from_dict(data['snapshot'])
-                if self.on_resync:
-                    self.on_resync(data['snapshot'])
+                self._predictor.clear()  # Full resync drops predictions
+                if apply_game and data.get('game') is not None:
+                    self._set_confirmed_game(data['game'])
+            self._ack(data.get('ack', 0))
+            self._retransmit_unacked()
+            if data.get('snapshot') and self.on_resync:
+                self.on_resync(data['snapshot'])
 
         elif msg_type == 'game_over':
             # Update game state
@@ -417,7 +528,6 @@ class NetworkClient:
 
     def _run_network_thread(self):
         """Run the async network loop in background thread."""
-        self._loop = asyncio.new_event_loop()
         asyncio.set_event_loop(self._loop)
 
         try:
@@ -483,13 +593,17 @@ class NetworkClient:
     async def _handshake(self, frame_reader: FrameReader):
         """Perform hello/welcome handshake."""
         content_hash = get_content_hash()
-        hello = msg_hello(self.player_name, content_hash)
+        self._compression = None
+        hello = msg_hello(self.player_name, content_hash,
+                          supported_codecs() if self.compression else None)
         await self._send_message(hello)
 
         # Wait for welcome (use shared frame_reader to preserve buffered data)
         msg = await self._receive_message(frame_reader)
         if msg.type == MessageType.WELCOME:
             self.player_id = msg.payload.get('player_id', '')
+            self._compression = get_codec(msg.payload.get('compression'))
+            frame_reader.compression = self._compression
             self._incoming.put(('connected', None))
         elif msg.type == MessageType.ERROR:
             raise ConnectionError(msg.payload.get('error', 'Handshake failed'))
@@ -499,62 +613,53 @@ class NetworkClient:
     async def _receive_loop(self, frame_reader: FrameReader):
         """Loop receiving messages from server."""
         # First process any messages already buffered from handshake
-        while True:
-            msg = frame_reader.get_message()
-            if msg is None:
-                break
-            await self._handle_server_message(msg)
+        await self._handle_server_messages(frame_reader.get_messages())
 
         # Then continue reading new data
         while self._running:
-            data = await self._reader.read(4096)
+            data = await self._reader.read(READ_SIZE)
             if not data:
                 self._incoming.put(('disconnected', 'Connection closed'))
                 break
 
             frame_reader.feed(data)
-
-            while True:
-                msg = frame_reader.get_message()
-                if msg is None:
-                    break
-                await self._handle_server_message(msg)
+            await self._handle_server_messages(frame_reader.get_messages())
 
     async def _send_loop(self):
-        """Loop sending queued messages to server."""
+        """Send queued messages as soon as they arrive, one write per burst."""
         while self._running:
-            # Check queue with timeout to allow shutdown
-            try:
-                msg = await asyncio.get_event_loop().run_in_executor(
-                    None,
-                    lambda: self._outgoing.get(timeout=0.1)
-                )
-            except Empty:
-                continue
-            except RuntimeError:
-                # Executor shut down during exit
-                break
+            msg = await self._outgoing.get()
+
+            # Take everything queued meanwhile; None is the shutdown signal
+            frames = []
+            while msg is not None:
+                frames.append(msg.to_bytes(self._compression))
+                if self._outgoing.empty():
+                    break
+                msg = self._outgoing.get_nowait()
+
+            if frames:
+                try:
+                    self._writer.write(b''.join(frames))
+                    await self._writer.drain()
+                except Exception:
+                    break  # Connection error
 
             if msg is None:
                 break  # Shutdown signal
 
-            try:
-                await self._send_message(msg)
-            except Exception:
-                break  # Connection error
-
     async def _ping_loop(self):
-        """Send periodic pings."""
+        """Send periodic timestamped pings."""
         while self._running:
-            await asyncio.sleep(5)
+            await asyncio.sleep(PING_INTERVAL)
             try:
-                await self._send_message(msg_ping())
+                await self._send_message(msg_ping(time.monotonic()))
             except Exception:
                 break
 
     async def _send_message(self, msg: Message):
         """Send message to server."""
-        self._writer.write(msg.to_bytes())
+        self._writer.write(msg.to_bytes(self._compression))
         await self._writer.drain()
 
     async def _receive_message(self, frame_reader: FrameReader) -> Message:
@@ -566,7 +671,7 @@ class NetworkClient:
 
         # Need to read more data
         while True:
-            data = await self._reader.read(4096)
+            data = await self._reader.read(READ_SIZE)
             if not data:
                 raise ConnectionError("Connection closed")
 
@@ -575,10 +680,29 @@ class NetworkClient:
             if msg:
                 return msg
 
-    async def _handle_server_message(self, msg: Message):
-        """Handle message from server."""
+    async def _handle_server_messages(self, messages: List[Message]):
+        """Handle a burst of messages; only its newest snapshot is built into a Game."""
+        latest = max((i for i, msg in enumerate(messages)
+                      if msg.type in SNAPSHOT_MESSAGES and msg.payload.get('snapshot')), default=-1)
+        for i, msg in enumerate(messages):
+            await self._handle_server_message(msg, build_game=i == latest)
+
+    async def _handle_server_message(self, msg: Message, build_game: bool = True):
+        """Handle message from server.
+
+        Snapshots are rebuilt into Game objects here, off the main thread.
+        The Game is handed over through the incoming queue and never
+        touched by this thread again.
+        """
+        snapshot = msg.payload.get('snapshot') if msg.type in SNAPSHOT_MESSAGES else None
+        game = Game.from_dict(snapshot) if snapshot and build_game else None
+
         if msg.type == MessageType.PONG:
-            pass  # Keepalive response, ignore
+            self.rtt.record_pong(msg.payload)
+
+        elif msg.type == MessageType.PING:
+            # Server measuring its RTT to us: answer straight from this thread
+            self._outgoing.put_nowait(msg_pong(msg.payload.get('t'), time.time()))
 
         elif msg.type == MessageType.ERROR:
             self._incoming.put(('error', msg.payload.get('error', 'Unknown error')))
@@ -590,7 +714,9 @@ class NetworkClient:
             self._incoming.put(('match_joined', {
                 'match_id': msg.match_id,
                 'player': msg.payload.get('player', 0),
-                'snapshot': msg.payload.get('snapshot'),
+                'snapshot': snapshot,
+                'game': game,
+                'ack': msg.payload.get('ack', 0),
             }))
 
         elif msg.type == MessageType.PLAYER_JOINED:
@@ -615,17 +741,37 @@ class NetworkClient:
 
         elif msg.type == MessageType.GAME_START:
             self._incoming.put(('game_start', {
-                'snapshot': msg.payload.get('snapshot'),
+                'snapshot': snapshot,
+                'game': game,
+                'resume_token': msg.payload.get('resume_token', ''),
             }))
 
         elif msg.type == MessageType.UPDATE:
             self._server_seq = msg.seq
-            self._incoming.put(('update', msg.payload))
+            result = CommandResult(
+                accepted=msg.payload.get('accepted', False),
+                events=[Event.from_dict(e) for e in msg.payload.get('events', [])],
+                snapshot=snapshot,
+                error=msg.payload.get('error'),
+            )
+            self._incoming.put(('update', {
+                'result': result,
+                'game': game,
+                'command_seq': msg.payload.get('command_seq', 0),
+            }))
 
         elif msg.type == MessageType.RESYNC:
             self._server_seq = msg.seq
             self._incoming.put(('resync', {
-                'snapshot': msg.payload.get('snapshot'),
+                'snapshot': snapshot,
+                'game': game,
+                'ack': msg.payload.get('ack', 0),
+            }))
+
+        elif msg.type == MessageType.COMMAND_ACK:
+            self._incoming.put(('command_ack', {
+                'ack': msg.payload.get('ack', 0),
+                'error': msg.payload.get('error'),
             }))
 
         elif msg.type == MessageType.GAME_OVER:
@@ -0,0 +1,106 @@
+"""Optional per-frame compression for the network protocol.
+
+A frame whose length prefix has the top bit set (COMPRESSED_FLAG) carries
+a raw DEFLATE stream instead of plain JSON. Connections start
+uncompressed: the client lists the codecs it knows in HELLO and the server
+names the one it picked in WELCOME. After that either side may compress
+frames of at least COMPRESSION_THRESHOLD bytes; plain frames stay valid.
+
+Every frame is compressed on its own, so one encoded broadcast can go to
+many sessions and a skipped frame never breaks the next one. Small frames
+still shrink thanks to a preset dictionary built from the game content
+(card names, ability ids, snapshot and card keys). The dictionary digest
+is part of the codec name, so peers with different content never agree.
+
+Usage:
+    codec = negotiate(hello.payload.get('compression', []))
+    data = msg.to_bytes(codec)
+    reader.compression = codec
+"""
+
+import functools
+import hashlib
+import json
+import zlib
+from typing import Iterable, List, Optional, Union
+
+COMPRESSED_FLAG = 0x80000000      # Top bit of the length prefix
+COMPRESSION_THRESHOLD = 128       # Smaller JSON bodies are always sent plain
+COMPRESSION_LEVEL = 6
+
+
+class FrameCompression:
+    """Raw DEFLATE with a preset dictionary, one independent stream per frame."""
+
+    def __init__(self, zdict: bytes, level: int = COMPRESSION_LEVEL):
+        self.zdict = zdict
+        self.level = level
+        self.name = f"zlib-{hashlib.sha1(zdict).hexdigest()[:8]}"
+
+    def compress(self, data: bytes) -> bytes:
+        compressor = zlib.compressobj(self.level, zlib.DEFLATED, -zlib.MAX_WBITS, zdict=self.zdict)
+        return compressor.compress(data) + compressor.flush()
+
+    def decompress(self, data: Union[bytes, memoryview], max_size: int) -> bytes:
+        """Inflate one frame; ValueError if it is corrupt or inflates past max_size."""
+        decompressor = zlib.decompressobj(-zlib.MAX_WBITS, zdict=self.zdict)
+        try:
+            out = decompressor.decompress(data, max_size)
+        except zlib.error as e:
+            raise ValueError(f"Corrupt compressed frame: {e}") from e
+        if decompressor.unconsumed_tail:
+            raise ValueError(f"Compressed frame inflates past {max_size} bytes")
+        if not decompressor.eof:
+            raise ValueError("Truncated compressed frame")
+        return out
+
+    def __repr__(self) -> str:
+        return f"FrameCompression({self.name})"
+
+
+def build_dictionary() -> bytes:
+    """Preset dictionary from game content, most frequent strings last."""
+    from ..abilities import ABILITIES
+    from ..card import Card
+    from ..card_database import CARD_DATABASE
+    from ..game import Game
+
+    def quoted(values: Iterable[str]) -> str:
+        return "".join(json.dumps(v, ensure_ascii=False) for v in sorted(values))
+
+    sample_card = Card(def_id=next(iter(sorted(CARD_DATABASE))), player=1).to_dict()
+    envelope = {'type': 'UPDATE', 'match_id': None, 'seq': 0, 'payload': {
+        'accepted': True, 'events': [], 'snapshot': None, 'snapshot_hash': '', 'error': None}}
+    parts = [
+        quoted(ABILITIES),
+        quoted(CARD_DATABASE),
+        json.dumps(envelope, ensure_ascii=False),
+        json.dumps(Game().snapshot_for_player(1), ensure_ascii=False),
+        json.dumps(sample_card, ensure_ascii=False),
+    ]
+    return "".join(parts).encode('utf-8')
+
+
+@functools.lru_cache(maxsize=1)
+def default_compression() -> FrameCompression:
+    """The codec this build offers and accepts (built once per process)."""
+    return FrameCompression(build_dictionary())
+
+
+def supported_codecs() -> List[str]:
+    """Codec names to offer in HELLO, in order of preference."""
+    return [default_compression().name]
+
+
+def negotiate(offered: Iterable[str]) -> Optional[FrameCompression]:
+    """Pick the first offered codec we support, or None for plain frames."""
+    codec = default_compression()
+    return codec if codec.name in offered else None
+
+
+def get_codec(name: Optional[str]) -> Optional[FrameCompression]:
+    """Codec named by the server in WELCOME (None if absent or unknown)."""
+    if not name:
+        return None
+    codec = default_compression()
+    return codec if codec.name == name else None
@@ -0,0 +1,249 @@
+"""Durable match journal for crash recovery of GameServer.
+
+Every started match gets an append-only file <match_id>.journal in the
+journal directory, one JSON record per line:
+
+    {"type": "start", "match_id", "seed", "content_hash", "players", "setup", "resume_tokens"}
+    {"type": "command", "command": {...}, "seq": n}  # every accepted command, client seq
+    {"type": "checkpoint", "commands": n, "state": {...}, "rng": [...]}
+
+Records are written straight to the file (no userspace buffer), so a
+killed process loses nothing. fsync is batched: GameServer syncs all
+dirty journals every SYNC_INTERVAL seconds, so a power loss costs at most
+that much play. A checkpoint (full server state plus the dice generator)
+is written every CHECKPOINT_INTERVAL commands to keep recovery short.
+
+On startup GameServer reads every journal, restores the last checkpoint,
+replays the commands after it, and waits for the players to rejoin with
+the match code and their seat's resume token. The journal of a finished or abandoned match is deleted.
+A torn last line (crash mid-write) is ignored and cut off.
+
+Usage:
+    store = JournalStore("journal")
+    journal = store.create(match_id, seed, content_hash, players, setup, resume_tokens)
+    journal.command(cmd, seq)
+    if journal.checkpoint_due:
+        journal.checkpoint(server.checkpoint())
+    sync_fds(store.flush_dirty())      # Batched, in an executor
+"""
+
+import json
+import logging
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from ..commands import Command
+
+logger = logging.getLogger(__name__)
+
+JOURNAL_SUFFIX = '.journal'
+CHECKPOINT_INTERVAL = 50   # Accepted commands between state checkpoints
+SYNC_INTERVAL = 0.2        # Seconds between batched fsyncs
+
+
+@dataclass
+class RecoveredMatch:
+    """A match read back from its journal."""
+    match_id: str
+    seed: int
+    content_hash: str
+    players: Dict[int, str]            # player number -> name
+    setup: Dict[str, Any]              # squads and placements as sent to start_match_server
+    resume_tokens: Dict[int, str] = field(default_factory=dict)  # player number -> seat secret
+    commands: List[Command] = field(default_factory=list)
+    client_seqs: Dict[int, int] = field(default_factory=dict)  # player -> seq of their last command
+    checkpoint: Optional[Dict[str, Any]] = None
+    valid_size: int = 0                # Bytes up to the last complete record
+
+
+class MatchJournal:
+    """Append-only journal of one match."""
+
+    def __init__(self, store: 'JournalStore', path: Path, commands: int = 0, since_checkpoint: int = 0):
+        self.store = store
+        self.path = path
+        self.commands = commands
+        self.since_checkpoint = since_checkpoint
+        self._file = open(path, 'ab', buffering=0)
+
+    def _append(self, record: Dict[str, Any]):
+        if self._file is None:
+            return
+        line = json.dumps(record, ensure_ascii=False, separators=(',', ':')) + '\n'
+        self._file.write(line.encode('utf-8'))
+        self.store.dirty.add(self)
+
+    def command(self, cmd: Command, seq: int = 0):
+        """Record an accepted command and the client seq it arrived with."""
+        self._append({'type': 'command', 'command': cmd.to_dict(), 'seq': seq})
+        self.commands += 1
+        self.since_checkpoint += 1
+
+    @property
+    def checkpoint_due(self) -> bool:
+        return self.since_checkpoint >= self.store.checkpoint_interval
+
+    def checkpoint(self, checkpoint: Dict[str, Any]):
+        """Record MatchServer.checkpoint() output."""
+        self._append({'type': 'checkpoint', **checkpoint})
+        self.since_checkpoint = 0
+
+    def fileno(self) -> int:
+        return self._file.fileno()
+
+    def close(self, delete: bool = False):
+        """Stop writing; delete=True removes the file (match over)."""
+        if self._file is None:
+            return
+        self._file.close()
+        self._file = None
+        self.store.dirty.discard(self)
+        self.store.journals.pop(self.path.stem, None)
+        if delete:
+            try:
+                self.path.unlink()
+            except OSError as e:
+                logger.warning(f"Could not delete journal {self.path}: {e}")
+
+
+class JournalStore:
+    """Directory of match journals."""
+
+    def __init__(self, directory: str, checkpoint_interval: int = CHECKPOINT_INTERVAL):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.checkpoint_interval = checkpoint_interval
+        self.journals: Dict[str, MatchJournal] = {}  # match_id -> open journal
+        self.dirty: set = set()
+
+    def path(self, match_id: str) -> Path:
+        return self.directory / f"{match_id}{JOURNAL_SUFFIX}"
+
+    def create(self, match_id: str, seed: int, content_hash: str, players: Dict[int, str],
+               setup: Dict[str, Any], resume_tokens: Dict[int, str]) -> MatchJournal:
+        """Start the journal of a new match (replaces a stale file with the same id)."""
+        path = self.path(match_id)
+        path.unlink(missing_ok=True)
+        journal = MatchJournal(self, path)
+        journal._append({
+            'type': 'start',
+            'match_id': match_id,
+            'seed': seed,
+            'content_hash': content_hash,
+            'players': {str(p): name for p, name in players.items()},
+            'setup': setup,
+            'resume_tokens': {str(p): token for p, token in resume_tokens.items()},
+        })
+        self._sync_directory()
+        self.journals[match_id] = journal
+        return journal
+
+    def reopen(self, recovered: RecoveredMatch) -> MatchJournal:
+        """Continue a recovered journal, cutting off a torn last record."""
+        path = self.path(recovered.match_id)
+        with open(path, 'r+b') as f:
+            f.truncate(recovered.valid_size)
+        since = len(recovered.commands)
+        if recovered.checkpoint is not None:
+            since -= recovered.checkpoint['commands']
+        journal = MatchJournal(self, path, len(recovered.commands), since)
+        self.journals[recovered.match_id] = journal
+        return journal
+
+    def flush_dirty(self) -> List[int]:
+        """Duplicated descriptors of journals written since the last call (caller fsyncs and closes them)."""
+        fds = [os.dup(journal.fileno()) for journal in self.dirty]
+        self.dirty.clear()
+        return fds
+
+    def sync(self):
+        """fsync every dirty journal now (blocking)."""
+        sync_fds(self.flush_dirty())
+
+    def close_all(self):
+        """Close every journal, keeping the files for recovery."""
+        self.sync()
+        for journal in list(self.journals.values()):
+            journal.close()
+
+    def _sync_directory(self):
+        """Make a new file's directory entry durable (POSIX only)."""
+        try:
+            fd = os.open(self.directory, os.O_RDONLY)
+        except OSError:
+            return  # Windows cannot open directories
+        try:
+            os.fsync(fd)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
+
+    # =========================================================================
+    # RECOVERY
+    # =========================================================================
+
+    def recover(self) -> List[RecoveredMatch]:
+        """Read every journal in the directory (unreadable ones are skipped)."""
+        recovered = []
+        for path in sorted(self.directory.glob(f"*{JOURNAL_SUFFIX}")):
+            try:
+                match = read_journal(path)
+            except (OSError, ValueError, KeyError, TypeError) as e:
+                logger.error(f"Skipping corrupt journal {path.name}: {e}")
+                continue
+            if match is not None:
+                recovered.append(match)
+        return recovered
+
+
+def read_journal(path: Path) -> Optional[RecoveredMatch]:
+    """Parse one journal; None if it has no complete start record."""
+    data = path.read_bytes()
+    match: Optional[RecoveredMatch] = None
+    offset = 0
+    while True:
+        end = data.find(b'\n', offset)
+        if end < 0:
+            break  # Torn or empty tail
+        try:
+            record = json.loads(data[offset:end])
+        except ValueError:
+            break  # Torn write followed by garbage: stop at the last good record
+        offset = end + 1
+
+        kind = record.get('type')
+        if kind == 'start':
+            match = RecoveredMatch(
+                match_id=record['match_id'],
+                seed=record['seed'],
+                content_hash=record.get('content_hash', ''),
+                players={int(p): name for p, name in record.get('players', {}).items()},
+                setup=record['setup'],
+                resume_tokens={int(p): token for p, token in record.get('resume_tokens', {}).items()},
+            )
+        elif match is None:
+            raise ValueError("journal does not begin with a start record")
+        elif kind == 'command':
+            cmd = Command.from_dict(record['command'])
+            match.commands.append(cmd)
+            if record.get('seq'):
+                match.client_seqs[cmd.player] = record['seq']
+        elif kind == 'checkpoint':
+            record.pop('type')
+            match.checkpoint = record
+        match.valid_size = offset
+    return match
+
+
+def sync_fds(fds: List[int]):
+    """fsync and close descriptors from JournalStore.flush_dirty (run off the event loop)."""
+    for fd in fds:
+        try:
+            os.fsync(fd)
+        except OSError as e:
+            logger.warning(f"Journal fsync failed: {e}")
+        finally:
+            os.close(fd)
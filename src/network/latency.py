@@ -0,0 +1,86 @@
+"""Round-trip time and clock offset measured on the PING/PONG channel.
+
+Either side may ping: PING carries the sender's monotonic clock in 't',
+PONG echoes it back together with the responder's wall clock in 'now'.
+The sender then knows the round trip exactly (its own clock on both ends)
+and can estimate how far the peer's wall clock is from its own.
+
+RTT is smoothed as in TCP (RFC 6298): srtt and rttvar are moving averages,
+and srtt + 4 * rttvar is a timeout that a healthy link almost never
+exceeds. Jitter is the RFC 3550 estimate: the smoothed difference between
+consecutive samples.
+
+Usage:
+    ping = msg_ping(time.monotonic())
+    ...
+    estimator.record_pong(pong.payload)
+    timeout = estimator.timeout(default=3.0, minimum=1.0, maximum=10.0)
+"""
+
+import time
+from typing import Any, Dict, Optional
+
+PING_INTERVAL = 5.0     # Seconds between keepalive pings, both directions
+
+ALPHA = 1 / 8           # srtt gain (RFC 6298)
+BETA = 1 / 4            # rttvar gain (RFC 6298)
+JITTER_GAIN = 1 / 16    # RFC 3550
+
+
+class RttEstimator:
+    """Smoothed RTT, jitter and clock offset of one connection (seconds)."""
+
+    def __init__(self):
+        self.samples = 0
+        self.last = 0.0
+        self.srtt = 0.0
+        self.rttvar = 0.0
+        self.jitter = 0.0
+        self.min_rtt = 0.0
+        self.offset = 0.0   # Peer wall clock minus ours, from the fastest round trip
+
+    def record(self, rtt: float, peer_time: Optional[float] = None):
+        """Add one round trip; peer_time is the peer's wall clock when it answered."""
+        rtt = max(0.0, rtt)
+        if self.samples == 0:
+            self.srtt = rtt
+            self.rttvar = rtt / 2
+            self.min_rtt = rtt
+        else:
+            self.rttvar += BETA * (abs(self.srtt - rtt) - self.rttvar)
+            self.srtt += ALPHA * (rtt - self.srtt)
+            self.jitter += JITTER_GAIN * (abs(rtt - self.last) - self.jitter)
+        if peer_time is not None and (self.samples == 0 or rtt <= self.min_rtt):
+            # The peer answered about halfway through the round trip
+            self.offset = peer_time - (time.time() - rtt / 2)
+        self.min_rtt = min(self.min_rtt, rtt)
+        self.last = rtt
+        self.samples += 1
+
+    def record_pong(self, payload: Dict[str, Any]) -> Optional[float]:
+        """Record a PONG answering one of our pings; the RTT, or None if it carried no timestamp."""
+        sent = payload.get('t')
+        if sent is None:
+            return None
+        rtt = time.monotonic() - sent
+        self.record(rtt, payload.get('now'))
+        return rtt
+
+    @property
+    def rto(self) -> float:
+        """Time by which a reply is overdue (srtt + 4 * rttvar)."""
+        return self.srtt + 4 * self.rttvar
+
+    def timeout(self, default: float, minimum: float, maximum: float, margin: float = 0.0) -> float:
+        """rto + margin clamped to [minimum, maximum]; default until the first sample."""
+        if not self.samples:
+            return default
+        return min(maximum, max(minimum, self.rto + margin))
+
+    def to_dict(self) -> Dict[str, float]:
+        """Milliseconds, for display and logs."""
+        return {
+            'rtt_ms': round(self.srtt * 1000, 1),
+            'jitter_ms': round(self.jitter * 1000, 1),
+            'offset_ms': round(self.offset * 1000, 1),
+        }
@@ -0,0 +1,172 @@
+"""Server metrics and plain-text exposition for GameServer.
+
+Counters are plain dict increments on the hot path; rendering happens only
+when someone asks. The text format follows the Prometheus exposition
+format so any local scraper (or curl) can read it:
+
+    curl http://127.0.0.1:9777/metrics      # --metrics-port 9777
+    kill -USR1 <pid>                        # dump to the server log
+"""
+from typing import Dict, TYPE_CHECKING
+
+from ..metrics import Histogram
+from .session import SessionState
+
+if TYPE_CHECKING:
+    from .server import GameServer
+
+
+QUANTILES = (50, 95, 99)
+
+
+class ServerMetrics:
+    """Traffic, latency and health counters for one GameServer."""
+
+    def __init__(self):
+        self.messages_in: Dict[str, int] = {}
+        self.bytes_in: Dict[str, int] = {}
+        self.messages_out: Dict[str, int] = {}
+        self.bytes_out: Dict[str, int] = {}
+        self.handler_us: Dict[str, Histogram] = {}
+        self.loop_lag_us = Histogram()
+        self.rtt_us = Histogram()
+        self.heartbeat_timeouts = 0
+        self.resync_requests = 0
+        self.resyncs_sent = 0
+        self.slow_clients_dropped = 0
+        self.lossy_skipped = 0
+        self.hibernations = 0
+        self.rehydrations = 0
+
+    def record_in(self, msg_type: str, size: int):
+        self.messages_in[msg_type] = self.messages_in.get(msg_type, 0) + 1
+        self.bytes_in[msg_type] = self.bytes_in.get(msg_type, 0) + size
+
+    def record_out(self, msg_type: str, size: int):
+        self.messages_out[msg_type] = self.messages_out.get(msg_type, 0) + 1
+        self.bytes_out[msg_type] = self.bytes_out.get(msg_type, 0) + size
+
+    def record_handler(self, msg_type: str, seconds: float):
+        hist = self.handler_us.get(msg_type)
+        if hist is None:
+            hist = self.handler_us[msg_type] = Histogram()
+        hist.record(seconds * 1_000_000)
+
+    def record_loop_lag(self, seconds: float):
+        self.loop_lag_us.record(max(0.0, seconds) * 1_000_000)
+
+    def record_rtt(self, seconds: float):
+        self.rtt_us.record(seconds * 1_000_000)
+
+    # =========================================================================
+    # EXPOSITION
+    # =========================================================================
+
+    def render(self, server: 'GameServer') -> str:
+        """Render all metrics (plus the server's live gauges) as text."""
+        out = []
+
+        def metric(name: str, kind: str, help_text: str):
+            out.append(f"# HELP berserk_{name} {help_text}")
+            out.append(f"# TYPE berserk_{name} {kind}")
+
+        def sample(name: str, value, **labels):
+            if labels:
+                label_str = ",".join(f'{k}="{v}"' for k, v in labels.items())
+                out.append(f"berserk_{name}{{{label_str}}} {value}")
+            else:
+                out.append(f"berserk_{name} {value}")
+
+        def summary(name: str, hist: Histogram, **labels):
+            for q in QUANTILES:
+                sample(name, f"{hist.percentile(q):.0f}", **labels, quantile=f"{q / 100:g}")
+            sample(f"{name}_count", hist.count, **labels)
+            sample(f"{name}_sum", f"{hist.total:.0f}", **labels)
+
+        # Sessions and matches
+        metric("sessions", "gauge", "Authenticated player sessions")
+        sample("sessions", len(server.sessions))
+        by_state = {state.name: 0 for state in SessionState}
+        for session in server.sessions.values():
+            by_state[session.state.name] += 1
+        metric("sessions_by_state", "gauge", "Sessions per state")
+        for state, count in by_state.items():
+            sample("sessions_by_state", count, state=state)
+
+        matches = {'waiting': 0, 'ready': 0, 'playing': 0, 'finished': 0}
+        for match in server.matches.values():
+            if match.is_finished:
+                matches['finished'] += 1
+            elif match.is_started:
+                matches['playing'] += 1
+            elif match.is_full:
+                matches['ready'] += 1
+            else:
+                matches['waiting'] += 1
+        metric("matches", "gauge", "Matches per state")
+        for state, count in matches.items():
+            sample("matches", count, state=state)
+        metric("hibernated_matches", "gauge", "Matches kept only as compressed state")
+        sample("hibernated_matches", sum(1 for match in server.matches.values() if match.is_hibernated))
+        if server.pool is not None:
+            metric("worker_matches", "gauge", "Matches assigned per worker process")
+            for index, count in enumerate(server.pool.load):
+                sample("worker_matches", count, worker=index)
+
+        # Traffic
+        for name, counters, help_text in (
+            ("messages_in_total", self.messages_in, "Messages received per type"),
+            ("bytes_in_total", self.bytes_in, "Bytes received per message type"),
+            ("messages_out_total", self.messages_out, "Messages sent per type"),
+            ("bytes_out_total", self.bytes_out, "Bytes sent per message type"),
+        ):
+            metric(name, "counter", help_text)
+            for msg_type in sorted(counters):
+                sample(name, counters[msg_type], type=msg_type)
+
+        # Latency
+        metric("handler_latency_us", "summary", "Message handler latency per type (microseconds)")
+        for msg_type in sorted(self.handler_us):
+            summary("handler_latency_us", self.handler_us[msg_type], type=msg_type)
+
+        metric("event_loop_lag_us", "summary", "Event loop scheduling lag (microseconds)")
+        summary("event_loop_lag_us", self.loop_lag_us)
+
+        metric("rtt_us", "summary", "Heartbeat round trip to clients (microseconds)")
+        summary("rtt_us", self.rtt_us)
+        measured = [s for s in server.sessions.values() if s.rtt.samples]
+        srtt, jitter = Histogram(), Histogram()
+        for session in measured:
+            srtt.record(session.rtt.srtt * 1_000_000)
+            jitter.record(session.rtt.jitter * 1_000_000)
+        metric("session_srtt_us", "summary", "Smoothed RTT across connected sessions (microseconds)")
+        summary("session_srtt_us", srtt)
+        metric("session_jitter_us", "summary", "RTT jitter across connected sessions (microseconds)")
+        summary("session_jitter_us", jitter)
+
+        if server.command_metrics is not None:
+            metric("command_latency_us", "summary", "MatchServer.apply process time per command (microseconds)")
+            for cmd_type, stats in sorted(server.command_metrics.by_type.items(), key=lambda kv: kv[0].name):
+                summary("command_latency_us", stats.process_us, command=cmd_type.name)
+            metric("commands_total", "counter", "Commands per type and outcome")
+            for cmd_type, stats in sorted(server.command_metrics.by_type.items(), key=lambda kv: kv[0].name):
+                sample("commands_total", stats.accepted, command=cmd_type.name, outcome="accepted")
+                sample("commands_total", stats.rejected, command=cmd_type.name, outcome="rejected")
+
+        # Health
+        metric("heartbeat_timeouts_total", "counter", "Sessions dropped by heartbeat timeout")
+        sample("heartbeat_timeouts_total", self.heartbeat_timeouts)
+        metric("resync_requests_total", "counter", "Resync requests from clients")
+        sample("resync_requests_total", self.resync_requests)
+        metric("resyncs_sent_total", "counter", "Full snapshots sent as resync")
+        sample("resyncs_sent_total", self.resyncs_sent)
+        metric("slow_clients_dropped_total", "counter", "Clients dropped for not reading their messages")
+        sample("slow_clients_dropped_total", self.slow_clients_dropped)
+        metric("lossy_skipped_total", "counter", "Lobby status messages skipped for lagging clients")
+        sample("lossy_skipped_total", self.lossy_skipped)
+        metric("hibernations_total", "counter", "Idle matches compressed")
+        sample("hibernations_total", self.hibernations)
+        metric("rehydrations_total", "counter", "Hibernated matches rebuilt on demand")
+        sample("rehydrations_total", self.rehydrations)
+
+        return "\n".join(out) + "\n"
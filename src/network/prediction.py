@@ -0,0 +1,91 @@
+"""Client-side prediction of the player's own commands.
+
+A predicted command is applied to a copy of the local Game as soon as it
+is sent, so the board reacts without waiting for the round trip. The
+command stays in a pending log keyed by its client seq until the server's
+UPDATE for that seq arrives (the update carries it as 'command_seq').
+Every authoritative Game then becomes the new base, and the commands
+still in flight are re-applied on top of it. If one of them no longer
+applies, the prediction is dropped and the server state is shown as is.
+
+Only commands whose outcome the client can compute are predicted: no
+dice (a roll aborts the prediction) and nothing that depends on cards the
+opponent keeps hidden.
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+from ..commands import Command, CommandType, Event
+from ..game import Game
+
+# Deterministic commands worth predicting (selections never reach the server)
+PREDICTED_COMMANDS = frozenset([
+    CommandType.MOVE,
+    CommandType.PREPARE_FLYER_ATTACK,
+    CommandType.END_TURN,
+])
+
+
+class _DiceRolled(Exception):
+    """Raised inside a predicted command that needs a die roll."""
+
+
+def _forbid_dice() -> int:
+    raise _DiceRolled()
+
+
+def _clone(game: Game) -> Game:
+    clone = Game.from_dict(game.to_dict())
+    clone.headless = game.headless
+    return clone
+
+
+def apply_predicted(game: Game, cmd: Command) -> Optional[List[Event]]:
+    """Apply cmd to game in place; None if it was rejected or rolled dice (game is then unusable)."""
+    game.roll_dice = _forbid_dice
+    try:
+        accepted, events = game.process_command(cmd, server_only=True)
+    except _DiceRolled:
+        return None
+    finally:
+        del game.roll_dice
+    return events if accepted else None
+
+
+class Predictor:
+    """Pending-command log and reconciliation for one match."""
+
+    def __init__(self):
+        self.pending: Dict[int, Command] = {}  # client seq -> command, in send order
+
+    def predict(self, game: Game, seq: int, cmd: Command) -> Optional[Tuple[Game, List[Event]]]:
+        """Predicted (game, events) after cmd, or None to wait for the server."""
+        if cmd.type not in PREDICTED_COMMANDS or game is None:
+            return None
+        trial = _clone(game)
+        events = apply_predicted(trial, cmd)
+        if events is None:
+            return None
+        self.pending[seq] = cmd
+        return trial, events
+
+    def ack(self, seq: int) -> bool:
+        """The server has answered every command up to seq; True if any prediction was dropped."""
+        acked = [s for s in self.pending if s <= seq]
+        for pending_seq in acked:
+            del self.pending[pending_seq]
+        return bool(acked)
+
+    def reconcile(self, authoritative: Game) -> Game:
+        """Game to show: the server state plus commands still in flight."""
+        if not self.pending:
+            return authoritative
+        game = _clone(authoritative)
+        for cmd in self.pending.values():
+            if apply_predicted(game, cmd) is None:
+                self.clear()  # Rolled back - the server's answer will follow
+                return authoritative
+        return game
+
+    def clear(self):
+        self.pending.clear()
@@ -2,6 +2,8 @@
 
 Wire format:
     [4-byte big-endian length][JSON payload]
+    [4-byte length | 0x80000000][raw DEFLATE of the JSON]   (after negotiation,
+                                                          see compression.py)
 
 Message envelope:
     {
@@ -10,13 +12,32 @@ Message envelope:
         "seq": 42,             (client_seq for commands, server_seq for updates)
         "payload": { ... }     (type-specific data)
     }
+
+Command acknowledgements:
+    Every COMMAND is answered by exactly one UPDATE (payload 'command_seq')
+    or COMMAND_ACK (payload 'ack'), in order, so a client can keep several
+    commands in flight. RESYNC carries 'ack', the highest client seq the
+    server has handled.
+
+Resuming a match:
+    GAME_START carries 'resume_token', a secret for the receiving seat. A
+    player who lost the connection gets the seat back by sending it in
+    JOIN_MATCH; the player name alone is never enough. The MATCH_JOINED
+    of a rejoin carries 'ack' like RESYNC, so commands still in flight
+    when the connection dropped are sent again.
+
+Latency:
+    Both sides ping every few seconds; PONG echoes the ping's timestamp so
+    each side keeps its own smoothed RTT (see latency.py).
 """
 
 import json
 import struct
 from dataclasses import dataclass, field
 from enum import Enum, auto
-from typing import Any, Dict, List, Optional, TYPE_CHECKING
+from typing import Any, Dict, List, Optional, Tuple, Union, TYPE_CHECKING
+
+from .compression import COMPRESSED_FLAG, COMPRESSION_THRESHOLD, FrameCompression
 
 if TYPE_CHECKING:
     from ..commands import Command, Event
@@ -50,13 +71,14 @@ class MessageType(Enum):
     GAME_START = auto()     # Server → Client: game is starting, initial snapshot
     COMMAND = auto()        # Client → Server: game command
     UPDATE = auto()         # Server → Client: events + snapshot after command
+    COMMAND_ACK = auto()    # Server → Client: command seq handled without an update
     RESYNC = auto()         # Server → Client: full snapshot (on reconnect/desync)
     REQUEST_RESYNC = auto() # Client → Server: request full snapshot
     GAME_OVER = auto()      # Server → Client: game ended
 
     # Health
-    PING = auto()           # Client → Server: keepalive
-    PONG = auto()           # Server → Client: keepalive response
+    PING = auto()           # Bidirectional: keepalive with timestamp
+    PONG = auto()           # Bidirectional: keepalive response (RTT sample)
 
     # Chat
     CHAT = auto()           # Bidirectional: chat message
@@ -81,8 +103,12 @@ class Message:
     seq: int = 0
     payload: Dict[str, Any] = field(default_factory=dict)
 
-    def to_bytes(self) -> bytes:
-        """Serialize message to bytes with length prefix."""
+    def to_bytes(self, compression: Optional[FrameCompression] = None) -> bytes:
+        """Serialize message to bytes with length prefix.
+
+        With a negotiated codec, bodies over the threshold are compressed
+        when that makes them smaller.
+        """
         data = {
             'type': self.type.name,
             'match_id': self.match_id,
@@ -90,13 +116,21 @@ class Message:
             'payload': self.payload,
         }
         json_bytes = json.dumps(data, ensure_ascii=False).encode('utf-8')
+        if compression is not None and len(json_bytes) >= COMPRESSION_THRESHOLD:
+            packed = compression.compress(json_bytes)
+            if len(packed) < len(json_bytes):
+                return struct.pack('>I', len(packed) | COMPRESSED_FLAG) + packed
         length = len(json_bytes)
         return struct.pack('>I', length) + json_bytes
 
     @classmethod
-    def from_bytes(cls, data: bytes) -> 'Message':
-        """Deserialize message from JSON bytes (without length prefix)."""
-        obj = json.loads(data.decode('utf-8'))
+    def from_bytes(cls, data: Union[bytes, bytearray, memoryview]) -> 'Message':
+        """Deserialize message from JSON bytes (without length prefix).
+
+        Accepts any buffer, so a memoryview into a receive buffer decodes
+        without copying the frame first.
+        """
+        obj = json.loads(str(data, 'utf-8'))
         return cls(
             type=MessageType[obj['type']],
             match_id=obj.get('match_id'),
@@ -109,55 +143,114 @@ class Message:
 # FRAME READER/WRITER - handles length-prefixed framing over TCP
 # =============================================================================
 
+# Socket read size: a burst of full snapshots fits in a few reads
+READ_SIZE = 64 * 1024
+
+
 class FrameReader:
     """Reads length-prefixed frames from a stream.
 
+    Consumed frames only advance a read offset; the buffer is compacted
+    once the dead prefix is large (or everything has been read), so a
+    burst of frames costs one copy of the data instead of a shift per
+    frame. Messages are decoded straight from memoryview slices.
+
     Usage:
         reader = FrameReader()
         reader.feed(data_from_socket)
-        while True:
-            frame = reader.get_frame()
-            if frame is None:
-                break
-            message = Message.from_bytes(frame)
+        for message in reader.get_messages():
+            handle(message)
     """
 
     HEADER_SIZE = 4  # 4 bytes for length (big-endian uint32)
     MAX_FRAME_SIZE = 1024 * 1024  # 1MB max message size
+    COMPACT_THRESHOLD = 64 * 1024  # Dead prefix bytes before the buffer is compacted
+
+    _HEADER = struct.Struct('>I')
 
-    def __init__(self):
+    def __init__(self, compression: Optional[FrameCompression] = None):
         self._buffer = bytearray()
+        self._offset = 0  # Start of the first unconsumed byte
+        self.compression = compression  # Set once negotiated in HELLO/WELCOME
 
     def feed(self, data: bytes):
         """Add received data to buffer."""
+        if self._offset:
+            if self._offset == len(self._buffer):
+                self._buffer.clear()
+                self._offset = 0
+            elif self._offset >= self.COMPACT_THRESHOLD:
+                del self._buffer[:self._offset]
+                self._offset = 0
         self._buffer.extend(data)
 
-    def get_frame(self) -> Optional[bytes]:
-        """Extract next complete frame from buffer, or None if incomplete."""
-        if len(self._buffer) < self.HEADER_SIZE:
+    @property
+    def buffered(self) -> int:
+        """Bytes received but not yet returned as frames."""
+        return len(self._buffer) - self._offset
+
+    def _next_frame(self) -> Optional[Tuple[int, int, bool]]:
+        """(start, end, compressed) of the next complete frame body, consuming it; None if incomplete."""
+        if len(self._buffer) - self._offset < self.HEADER_SIZE:
             return None
 
-        # Read length prefix
-        length = struct.unpack('>I', self._buffer[:self.HEADER_SIZE])[0]
+        # Read length prefix (top bit marks a compressed body)
+        prefix = self._HEADER.unpack_from(self._buffer, self._offset)[0]
+        compressed = bool(prefix & COMPRESSED_FLAG)
+        length = prefix & ~COMPRESSED_FLAG
 
         if length > self.MAX_FRAME_SIZE:
             raise ValueError(f"Frame too large: {length} bytes")
+        if compressed and self.compression is None:
+            raise ValueError("Compressed frame before compression was negotiated")
 
-        total_size = self.HEADER_SIZE + length
-        if len(self._buffer) < total_size:
+        start = self._offset + self.HEADER_SIZE
+        end = start + length
+        if end > len(self._buffer):
             return None  # Incomplete frame
 
-        # Extract frame
-        frame = bytes(self._buffer[self.HEADER_SIZE:total_size])
-        del self._buffer[:total_size]
-        return frame
+        self._offset = end
+        return start, end, compressed
+
+    def _decode(self, view: memoryview, bounds: Tuple[int, int, bool]) -> Message:
+        start, end, compressed = bounds
+        if compressed:
+            return Message.from_bytes(self.compression.decompress(view[start:end], self.MAX_FRAME_SIZE))
+        return Message.from_bytes(view[start:end])
+
+    def get_frame(self) -> Optional[bytes]:
+        """Extract next complete frame from buffer (decompressed), or None if incomplete."""
+        bounds = self._next_frame()
+        if bounds is None:
+            return None
+        start, end, compressed = bounds
+        if compressed:
+            with memoryview(self._buffer) as view:
+                return self.compression.decompress(view[start:end], self.MAX_FRAME_SIZE)
+        return bytes(self._buffer[start:end])
 
     def get_message(self) -> Optional[Message]:
         """Get next complete message, or None if incomplete."""
-        frame = self.get_frame()
-        if frame is None:
+        bounds = self._next_frame()
+        if bounds is None:
             return None
-        return Message.from_bytes(frame)
+        with memoryview(self._buffer) as view:
+            return self._decode(view, bounds)
+
+    def get_messages_with_sizes(self) -> List[Tuple[Message, int]]:
+        """All complete messages with their wire size (header included)."""
+        messages = []
+        with memoryview(self._buffer) as view:
+            while True:
+                bounds = self._next_frame()
+                if bounds is None:
+                    break
+                messages.append((self._decode(view, bounds), self.HEADER_SIZE + bounds[1] - bounds[0]))
+        return messages
+
+    def get_messages(self) -> List[Message]:
+        """All complete messages currently buffered (empty list if none)."""
+        return [msg for msg, _ in self.get_messages_with_sizes()]
 
 
 class FrameWriter:
@@ -170,31 +263,32 @@ class FrameWriter:
     """
 
     @staticmethod
-    def pack(message: Message) -> bytes:
+    def pack(message: Message, compression: Optional[FrameCompression] = None) -> bytes:
         """Pack message into length-prefixed frame."""
-        return message.to_bytes()
+        return message.to_bytes(compression)
 
 
 # =============================================================================
 # MESSAGE BUILDERS - convenience functions for creating messages
 # =============================================================================
 
-def msg_hello(player_name: str, content_hash: str) -> Message:
-    """Client hello with player name and content hash for version check."""
+def msg_hello(player_name: str, content_hash: str, compression: List[str] = None) -> Message:
+    """Client hello with player name, content hash for version check and offered codecs."""
     return Message(
         type=MessageType.HELLO,
         payload={
             'player_name': player_name,
             'content_hash': content_hash,
+            'compression': compression or [],
         }
     )
 
 
-def msg_welcome(player_id: str) -> Message:
-    """Server welcome response."""
+def msg_welcome(player_id: str, compression: Optional[str] = None) -> Message:
+    """Server welcome response with the chosen codec (None = plain frames)."""
     return Message(
         type=MessageType.WELCOME,
-        payload={'player_id': player_id}
+        payload={'player_id': player_id, 'compression': compression}
     )
 
 
@@ -206,12 +300,16 @@ def msg_create_match(squad: List[str], placed_cards: List[Dict[str, Any]] = None
     )
 
 
-def msg_join_match(match_id: str, squad: List[str], placed_cards: List[Dict[str, Any]] = None) -> Message:
-    """Join an existing match with squad and placement."""
+def msg_join_match(match_id: str, squad: List[str], placed_cards: List[Dict[str, Any]] = None,
+                   resume_token: Optional[str] = None) -> Message:
+    """Join an existing match with squad and placement, or reclaim a seat with its resume token."""
+    payload = {'squad': squad, 'placed_cards': placed_cards or []}
+    if resume_token:
+        payload['resume_token'] = resume_token
     return Message(
         type=MessageType.JOIN_MATCH,
         match_id=match_id,
-        payload={'squad': squad, 'placed_cards': placed_cards or []}
+        payload=payload
     )
 
 
@@ -223,14 +321,15 @@ def msg_match_created(match_id: str) -> Message:
     )
 
 
-def msg_match_joined(match_id: str, player: int, snapshot: Dict[str, Any]) -> Message:
-    """Successfully joined match."""
+def msg_match_joined(match_id: str, player: int, snapshot: Dict[str, Any], ack: int = 0) -> Message:
+    """Successfully joined match; on a rejoin ack is the last client command seq handled."""
     return Message(
         type=MessageType.MATCH_JOINED,
         match_id=match_id,
         payload={
             'player': player,
             'snapshot': snapshot,
+            'ack': ack,
         }
     )
 
@@ -258,11 +357,11 @@ def msg_player_left(player: int, player_name: str, reason: str = "disconnected")
     )
 
 
-def msg_game_start(snapshot: Dict[str, Any]) -> Message:
-    """Game is starting."""
+def msg_game_start(snapshot: Dict[str, Any], resume_token: str = "") -> Message:
+    """Game is starting; resume_token lets this seat rejoin after a disconnect."""
     return Message(
         type=MessageType.GAME_START,
-        payload={'snapshot': snapshot}
+        payload={'snapshot': snapshot, 'resume_token': resume_token}
     )
 
 
@@ -275,8 +374,12 @@ def msg_command(cmd: 'Command', seq: int) -> Message:
     )
 
 
-def msg_update(result: 'CommandResult', seq: int, snapshot_hash: str) -> Message:
-    """Game state update after command."""
+def msg_update(result: 'CommandResult', seq: int, snapshot_hash: str, command_seq: int = 0) -> Message:
+    """Game state update after command.
+
+    command_seq is the client seq of the command this answers (0 when the
+    update reports the opponent's command).
+    """
     return Message(
         type=MessageType.UPDATE,
         seq=seq,
@@ -286,16 +389,25 @@ def msg_update(result: 'CommandResult', seq: int, snapshot_hash: str) -> Message
             'snapshot': result.snapshot,
             'snapshot_hash': snapshot_hash,
             'error': result.error,
+            'command_seq': command_seq,
         }
     )
 
 
-def msg_resync(snapshot: Dict[str, Any], seq: int) -> Message:
-    """Full resync snapshot."""
+def msg_resync(snapshot: Dict[str, Any], seq: int, ack: int = 0) -> Message:
+    """Full resync snapshot; ack is the last client command seq handled."""
     return Message(
         type=MessageType.RESYNC,
         seq=seq,
-        payload={'snapshot': snapshot}
+        payload={'snapshot': snapshot, 'ack': ack}
+    )
+
+
+def msg_command_ack(ack: int, error: Optional[str] = None) -> Message:
+    """Command handled without a state update (duplicate or invalid)."""
+    return Message(
+        type=MessageType.COMMAND_ACK,
+        payload={'ack': ack, 'error': error}
     )
 
 
@@ -312,14 +424,18 @@ def msg_game_over(winner: int) -> Message:
     )
 
 
-def msg_ping() -> Message:
-    """Keepalive ping."""
-    return Message(type=MessageType.PING)
+def msg_ping(sent_at: Optional[float] = None) -> Message:
+    """Keepalive ping, timestamped with the sender's monotonic clock."""
+    payload = {'t': sent_at} if sent_at is not None else {}
+    return Message(type=MessageType.PING, payload=payload)
 
 
-def msg_pong() -> Message:
-    """Keepalive pong."""
-    return Message(type=MessageType.PONG)
+def msg_pong(echo: Optional[float] = None, now: Optional[float] = None) -> Message:
+    """Keepalive pong, echoing the ping's timestamp plus our wall clock."""
+    payload = {}
+    if echo is not None:
+        payload = {'t': echo, 'now': now}
+    return Message(type=MessageType.PONG, payload=payload)
 
 
 def msg_error(error: str) -> Message:
@@ -5,30 +5,52 @@ Handles:
 - Lobby (create/join matches)
 - Match sessions (routes commands to MatchServer)
 - Heartbeat and reconnection
+- Metrics (local-only text listener and SIGUSR1 dump)
+- Optional match sharding across worker processes (--workers N)
 """
 
 import asyncio
+import signal
 import ssl
 import logging
 import secrets
 import time
 from dataclasses import replace
-from typing import Dict, Optional
+from typing import Any, Dict, List, Optional
 from pathlib import Path
 
 from .protocol import (
-    Message, MessageType, FrameReader,
-    msg_welcome, msg_error, msg_pong, msg_match_created, msg_match_joined,
+    Message, MessageType, FrameReader, READ_SIZE,
+    msg_welcome, msg_error, msg_ping, msg_pong, msg_match_created, msg_match_joined,
     msg_player_joined, msg_player_left, msg_game_start, msg_update, msg_resync,
     msg_game_over, msg_match_list, msg_player_ready_status, msg_chat, msg_draw_offered,
-    msg_lobby_status,
+    msg_lobby_status, msg_command_ack,
 )
 from .session import PlayerSession, MatchSession, SessionState
+from .compression import negotiate
+from .latency import PING_INTERVAL
+from .journal import JournalStore, RecoveredMatch, SYNC_INTERVAL, sync_fds
+from .metrics import ServerMetrics
+from .workers import (
+    MatchWorkerPool, CommandOutcome, start_match_server, restore_match_server, run_command,
+)
 from ..match import MatchServer, get_content_hash
 from ..commands import Command, Event
+from ..metrics import CommandMetrics
 
 logger = logging.getLogger(__name__)
 
+LOOP_LAG_INTERVAL = 0.5  # Seconds between event loop lag probes
+
+# Slow consumers: a client that stops reading must not stall anyone else
+SEND_TIMEOUT = 5.0                 # Seconds one drain may take before the client is dropped
+MAX_SEND_BUFFER = 1024 * 1024      # Bytes queued for one client before it is dropped
+LAGGING_BUFFER = 64 * 1024         # Bytes queued above which a client counts as lagging
+LOSSY_MESSAGES = frozenset({MessageType.LOBBY_STATUS})  # Superseded by the next one - skipped for laggers
+
+RESUME_GRACE = 600.0  # Seconds a match recovered from its journal waits for its players
+HIBERNATE_AFTER = 300.0  # Seconds without commands before a started match is compressed
+
 
 class GameServer:
     """Main game server handling lobby and matches.
@@ -36,6 +58,13 @@ class GameServer:
     Usage:
         server = GameServer(host='0.0.0.0', port=7777)
         await server.start()
+
+    With workers > 0 this process keeps the lobby and connections and
+    started matches run in that many worker processes (see workers.py).
+    With journal_dir set, started matches survive a restart (see journal.py).
+    Started matches idle for hibernate_after seconds (finished ones, or ones
+    waiting for a disconnected player) keep only a compressed checkpoint
+    until they are needed again.
     """
 
     def __init__(
@@ -44,18 +73,47 @@ class GameServer:
         port: int = 7777,
         certfile: Optional[str] = None,
         keyfile: Optional[str] = None,
+        collect_metrics: bool = True,
+        metrics_interval: float = 300.0,
+        metrics_port: Optional[int] = None,
+        workers: int = 0,
+        compression: bool = True,
+        journal_dir: Optional[str] = None,
+        hibernate_after: float = HIBERNATE_AFTER,
     ):
         self.host = host
         self.port = port
         self.certfile = certfile
         self.keyfile = keyfile
 
+        # Per-command timing shared by all matches (None = off, zero cost)
+        self.command_metrics: Optional[CommandMetrics] = CommandMetrics() if collect_metrics else None
+        self.metrics_interval = metrics_interval  # Seconds between metric logs (0 = never)
+
+        # Traffic/latency/health counters, served on 127.0.0.1:metrics_port
+        self.metrics = ServerMetrics()
+        self.metrics_port = metrics_port
+        self._metrics_server: Optional[asyncio.Server] = None
+
+        # Match worker processes (None = run matches in this process)
+        self.workers = workers
+        self.pool: Optional[MatchWorkerPool] = None
+
+        # Accept frame compression offered in HELLO
+        self.compression = compression
+
+        # Append-only journals of started matches (None = matches die with the process)
+        self.journal: Optional[JournalStore] = JournalStore(journal_dir) if journal_dir else None
+
+        # Idle seconds before a started match is hibernated (0 = never)
+        self.hibernate_after = hibernate_after
+
         # Active sessions and matches
         self.sessions: Dict[str, PlayerSession] = {}  # player_id -> session
         self.matches: Dict[str, MatchSession] = {}    # match_id -> match
 
-        # Lobby chat history (last N messages)
-        self.lobby_chat_history: list = []
+        # Lobby chat history (last N messages, already encoded)
+        self.lobby_chat_history: List[bytes] = []
         self.lobby_chat_max_history = 50
 
         # Server state
@@ -77,6 +135,13 @@ class GameServer:
         """Start the server."""
         ssl_ctx = self._create_ssl_context()
 
+        if self.workers > 0:
+            self.pool = MatchWorkerPool(self.workers, collect_metrics=self.command_metrics is not None)
+            await self.pool.start()
+
+        if self.journal:
+            await self._recover_matches()
+
         self._server = await asyncio.start_server(
             self._handle_connection,
             self.host,
@@ -92,6 +157,14 @@ class GameServer:
         # Start background tasks
         asyncio.create_task(self._heartbeat_loop())
         asyncio.create_task(self._cleanup_loop())
+        if self.command_metrics is not None and self.metrics_interval > 0:
+            asyncio.create_task(self._metrics_loop())
+        asyncio.create_task(self._loop_lag_loop())
+        if self.journal:
+            asyncio.create_task(self._journal_sync_loop())
+        if self.hibernate_after > 0:
+            asyncio.create_task(self._hibernate_loop())
+        await self._start_metrics_endpoint()
 
         async with self._server:
             await self._server.serve_forever()
@@ -102,11 +175,21 @@ class GameServer:
         if self._server:
             self._server.close()
             await self._server.wait_closed()
+        if self._metrics_server:
+            self._metrics_server.close()
+            await self._metrics_server.wait_closed()
+
+        # Keep journals of running matches for the next start
+        if self.journal:
+            self.journal.close_all()
 
         # Close all sessions
         for session in list(self.sessions.values()):
             await session.close()
 
+        if self.pool:
+            await self.pool.stop()
+
         logger.info("Server stopped")
 
     # =========================================================================
@@ -139,7 +222,7 @@ class GameServer:
             # Read data from socket
             try:
                 data = await asyncio.wait_for(
-                    session.reader.read(4096),
+                    session.reader.read(READ_SIZE),
                     timeout=30.0  # Read timeout
                 )
             except asyncio.TimeoutError:
@@ -151,12 +234,11 @@ class GameServer:
 
             # Feed data to frame reader
             frame_reader.feed(data)
+            frame_reader.compression = session.compression
 
             # Process complete messages
-            while True:
-                msg = frame_reader.get_message()
-                if msg is None:
-                    break
+            for msg, size in frame_reader.get_messages_with_sizes():
+                self.metrics.record_in(msg.type.name, size)
                 await self._handle_message(session, msg)
 
     async def _handle_disconnect(self, session: PlayerSession):
@@ -188,7 +270,7 @@ class GameServer:
 
             # Clean up empty match
             if match.is_empty:
-                del self.matches[session.match_id]
+                self._remove_match(session.match_id)
                 logger.info(f"Match {session.match_id} removed (empty)")
 
         await session.close()
@@ -208,6 +290,7 @@ class GameServer:
         handlers = {
             MessageType.HELLO: self._handle_hello,
             MessageType.PING: self._handle_ping,
+            MessageType.PONG: self._handle_pong,
             MessageType.CREATE_MATCH: self._handle_create_match,
             MessageType.JOIN_MATCH: self._handle_join_match,
             MessageType.LEAVE_MATCH: self._handle_leave_match,
@@ -223,21 +306,59 @@ class GameServer:
 
         handler = handlers.get(msg.type)
         if handler:
+            start = time.perf_counter()
             try:
                 await handler(session, msg)
             except Exception as e:
                 logger.error(f"Error handling {msg.type}: {e}")
                 await self._send(session, msg_error(str(e)))
+            self.metrics.record_handler(msg.type.name, time.perf_counter() - start)
         else:
             logger.warning(f"Unknown message type: {msg.type}")
 
     async def _send(self, session: PlayerSession, msg: Message):
         """Send message to a session."""
+        data = msg.to_bytes(session.compression)
+        self.metrics.record_out(msg.type.name, len(data))
+        await self._deliver(session, data)
+
+    async def _broadcast(self, sessions, msg: Message, data: Optional[bytes] = None):
+        """Encode once per codec (plain frames may reuse data), then write to every session concurrently."""
+        encoded = {None: data} if data is not None else {}
+        lossy = msg.type in LOSSY_MESSAGES
+        deliveries = []
+        for session in sessions:
+            if lossy and session.buffered_bytes > LAGGING_BUFFER:
+                self.metrics.lossy_skipped += 1
+                continue
+            frame = encoded.get(session.compression)
+            if frame is None:
+                frame = encoded[session.compression] = msg.to_bytes(session.compression)
+            self.metrics.record_out(msg.type.name, len(frame))
+            deliveries.append(self._deliver(session, frame))
+        if deliveries:
+            await asyncio.gather(*deliveries)
+
+    async def _deliver(self, session: PlayerSession, data: bytes):
+        """Write pre-encoded bytes, giving up on clients that fall too far behind."""
+        if session.buffered_bytes > MAX_SEND_BUFFER:
+            self._drop_slow(session, "send buffer full")
+            return
         try:
-            await session.send(msg.to_bytes())
-        except ConnectionError:
+            await asyncio.wait_for(session.send(data), SEND_TIMEOUT)
+        except asyncio.TimeoutError:
+            self._drop_slow(session, f"drain took over {SEND_TIMEOUT:g}s")
+        except (ConnectionError, OSError):
             session.state = SessionState.DISCONNECTED
 
+    def _drop_slow(self, session: PlayerSession, reason: str):
+        """Abort a slow consumer; its connection loop then runs the normal disconnect."""
+        if session.state == SessionState.DISCONNECTED:
+            return
+        logger.warning(f"Dropping slow client {session.player_name or session.address}: {reason}")
+        self.metrics.slow_clients_dropped += 1
+        session.abort()
+
     # =========================================================================
     # HANDLER: CONNECTION
     # =========================================================================
@@ -262,23 +383,33 @@ class GameServer:
 
         self.sessions[session.player_id] = session
 
-        await self._send(session, msg_welcome(session.player_id))
+        # Welcome goes out plain; compression applies from the next frame
+        codec = negotiate(msg.payload.get('compression', [])) if self.compression else None
+        await self._send(session, msg_welcome(session.player_id, codec.name if codec else None))
+        session.compression = codec
         logger.info(f"Player authenticated: {player_name} ({session.player_id})")
 
         # Send lobby status directly to new user first
         await self._send(session, msg_lobby_status(len(self.sessions)))
 
         # Send chat history to new user
-        for chat_msg in self.lobby_chat_history:
-            await self._send(session, chat_msg)
+        for data in self.lobby_chat_history:
+            self.metrics.record_out(MessageType.CHAT.name, len(data))
+            await self._deliver(session, data)
 
         # Broadcast updated user count to all (including new user again, but that's fine)
         await self._broadcast_lobby_status()
 
     async def _handle_ping(self, session: PlayerSession, msg: Message):
-        """Handle ping - respond with pong."""
+        """Handle ping - respond with pong echoing its timestamp."""
         session.last_pong = time.time()  # Update activity timestamp
-        await self._send(session, msg_pong())
+        await self._send(session, msg_pong(msg.payload.get('t'), time.time()))
+
+    async def _handle_pong(self, session: PlayerSession, msg: Message):
+        """Answer to our heartbeat ping - one RTT sample."""
+        rtt = session.rtt.record_pong(msg.payload)
+        if rtt is not None:
+            self.metrics.record_rtt(rtt)
 
     # =========================================================================
     # HANDLER: LOBBY
@@ -334,6 +465,12 @@ class GameServer:
             await self._send(session, msg_error(f"Match not found: {match_id}"))
             return
 
+        # A player coming back to a running match (after a disconnect or a server restart)
+        rejoin_player = match.rejoin_slot(msg.payload.get('resume_token'))
+        if rejoin_player:
+            await self._rejoin_match(session, match, rejoin_player)
+            return
+
         if match.is_full:
             await self._send(session, msg_error("Match is full"))
             return
@@ -371,6 +508,28 @@ class GameServer:
 
         logger.info(f"Match {match_id}: {session.player_name} joined, waiting for ready")
 
+    async def _rejoin_match(self, session: PlayerSession, match: MatchSession, player: int):
+        """Seat a returning player and send them the current game."""
+        match.set_session(player, session)
+        session.match_id = match.match_id
+        session.player_number = player
+        session.state = SessionState.IN_MATCH
+        # The client keeps its seq counter: resent commands we already handled are dropped
+        session.last_client_seq = match.client_seqs.get(player, 0)
+
+        self._wake(match)
+        if self.pool:
+            snapshot = await self.pool.snapshot(match.match_id, player)
+        else:
+            snapshot = match.server.get_snapshot(for_player=player)
+        await self._send(session, msg_match_joined(match.match_id, player, snapshot, ack=session.last_client_seq))
+        opponent = match.get_opponent_session(player)
+        if opponent:
+            await self._send(session, msg_player_joined(3 - player, opponent.player_name))
+            await self._send(opponent, msg_player_joined(player, session.player_name))
+        await self._send(session, msg_game_start(snapshot, match.resume_tokens[player]))
+        logger.info(f"Match {match.match_id}: {session.player_name} rejoined as P{player}")
+
     async def _handle_leave_match(self, session: PlayerSession, msg: Message):
         """Handle leave match request."""
         if session.state != SessionState.IN_MATCH:
@@ -394,7 +553,7 @@ class GameServer:
 
             # Clean up empty match
             if match.is_empty:
-                del self.matches[session.match_id]
+                self._remove_match(session.match_id)
 
         session.match_id = None
         session.player_number = 0
@@ -473,86 +632,125 @@ class GameServer:
         if not match.is_full:
             return
 
-        # Create game server
-        match.server = MatchServer()
-
-        # Use placement data if available, otherwise auto-place
-        if match.host_placed_cards and match.guest_placed_cards:
-            # Convert dicts back to Card objects
-            from ..card import Card
-            p1_cards = [Card.from_dict(d) for d in match.host_placed_cards]
-            p2_cards = [Card.from_dict(d) for d in match.guest_placed_cards]
-            match.server.setup_with_placement(p1_cards, p2_cards)
-        else:
-            match.server.setup_game(match.host_squad, match.guest_squad)
+        match.is_started = True  # Before any await - a second PLACEMENT_DONE must not restart it
+        match.seed = secrets.randbits(32)
+        match.player_names = {player: match.get_session(player).player_name for player in (1, 2)}
+        match.resume_tokens = {player: secrets.token_urlsafe(16) for player in (1, 2)}
 
-        match.is_started = True
+        try:
+            snapshots = await self._set_up_match(match)
+        except Exception as e:
+            # Back to waiting for placement; a repeated PLACEMENT_DONE retries
+            logger.error(f"Could not start match {match.match_id}: {e}")
+            match.is_started = False
+            match.server = None
+            match.resume_tokens = {}
+            if self.pool:
+                self.pool.release(match.match_id)
+            await self._broadcast_match(match, msg_error("Could not start match, try again"))
+            return
 
         # Send game start to both players
         for player_num in [1, 2]:
             session = match.get_session(player_num)
             if session:
-                snapshot = match.server.get_snapshot(for_player=player_num)
-                await self._send(session, msg_game_start(snapshot))
+                await self._send(session, msg_game_start(snapshots[player_num], match.resume_tokens[player_num]))
 
         logger.info(f"Match {match.match_id} started")
 
+    async def _set_up_match(self, match: MatchSession) -> Dict[int, Dict[str, Any]]:
+        """Set up the game on a worker or here and open its journal; both players' snapshots."""
+        # Placement data if available, otherwise auto-place
+        if self.pool:
+            snapshots = await self.pool.start_match(
+                match.match_id, match.host_squad, match.guest_squad,
+                match.host_placed_cards, match.guest_placed_cards, seed=match.seed)
+        else:
+            match.server = MatchServer(metrics=self.command_metrics, seed=match.seed)
+            snapshots = start_match_server(
+                match.server, match.host_squad, match.guest_squad,
+                match.host_placed_cards, match.guest_placed_cards)
+
+        if self.journal:
+            match.journal = self.journal.create(
+                match.match_id, match.seed, self._content_hash, match.player_names, {
+                    'host_squad': match.host_squad,
+                    'guest_squad': match.guest_squad,
+                    'host_placed_cards': match.host_placed_cards,
+                    'guest_placed_cards': match.guest_placed_cards,
+                }, match.resume_tokens)
+        return snapshots
+
+    async def _run_command(self, match: MatchSession, cmd: Command, with_opponent: bool) -> CommandOutcome:
+        """Apply a command in this process or on the match's worker."""
+        if self.pool:
+            return await self.pool.command(match.match_id, cmd, with_opponent)
+        return run_command(match.server, cmd, with_opponent)
+
     async def _handle_command(self, session: PlayerSession, msg: Message):
-        """Handle game command from client."""
+        """Handle game command from client.
+
+        Answers with exactly one UPDATE or COMMAND_ACK per command.
+        """
         if session.state != SessionState.IN_MATCH:
-            await self._send(session, msg_error("Not in match"))
+            await self._send(session, msg_command_ack(msg.seq, "Not in match"))
             return
 
         match = self.matches.get(session.match_id)
-        if not match or not match.server:
-            await self._send(session, msg_error("Match not found"))
+        if not match or not match.is_started:
+            await self._send(session, msg_command_ack(msg.seq, "Match not found"))
             return
 
-        # Check for duplicate command
+        # Retransmitted command: already handled, just acknowledge it
         if session.is_duplicate_command(msg.seq):
             logger.warning(f"Duplicate command seq={msg.seq} from {session.player_name}")
+            await self._send(session, msg_command_ack(msg.seq))
             return
+        match.client_seqs[session.player_number] = msg.seq  # Survives a rejoin
 
         # Deserialize and validate command
         cmd_data = msg.payload.get('command', {})
         try:
             cmd = Command.from_dict(cmd_data)
         except Exception as e:
-            await self._send(session, msg_error(f"Invalid command: {e}"))
+            await self._send(session, msg_command_ack(msg.seq, f"Invalid command: {e}"))
             return
 
         # Force player number from session (security) - Command is frozen, so create new one
         cmd = replace(cmd, player=session.player_number)
 
-        # Process command
-        result = match.server.apply(cmd, include_snapshot=True)
-        snapshot_hash = match.server.get_state_hash()
-
-        # Send update to command sender
-        seq = session.next_server_seq()
-        await self._send(session, msg_update(result, seq, snapshot_hash))
-
-        # Broadcast to opponent if command was accepted
-        if result.accepted:
+        # One command at a time per match, so both players see updates in order
+        async with match.lock:
+            self._wake(match)
             opponent = match.get_opponent_session(session.player_number)
-            if opponent:
-                # Get opponent's view of the snapshot
-                opponent_snapshot = match.server.get_snapshot(for_player=opponent.player_number)
+            outcome = await self._run_command(match, cmd, with_opponent=opponent is not None)
+            result = outcome.result
+            if result.accepted and match.journal:
+                await self._journal_command(match, cmd, msg.seq)
+
+            # Send update to command sender
+            seq = session.next_server_seq()
+            await self._send(session, msg_update(result, seq, outcome.snapshot_hash, command_seq=msg.seq))
+
+            # Broadcast to opponent if command was accepted
+            if result.accepted and opponent:
+                # Opponent's view of the snapshot
                 opponent_result = type(result)(
                     accepted=result.accepted,
                     events=result.events,
-                    snapshot=opponent_snapshot,
+                    snapshot=outcome.opponent_snapshot,
                     error=result.error,
                 )
                 opp_seq = opponent.next_server_seq()
-                await self._send(opponent, msg_update(opponent_result, opp_seq, snapshot_hash))
+                await self._send(opponent, msg_update(opponent_result, opp_seq, outcome.snapshot_hash))
 
-        # Check for game over
-        if match.server.game and match.server.game.winner:
-            match.is_finished = True
-            match.winner = match.server.game.winner
-            await self._broadcast_match(match, msg_game_over(match.winner))
-            logger.info(f"Match {match.match_id} ended, winner: P{match.winner}")
+            # Check for game over
+            if outcome.winner:
+                match.is_finished = True
+                match.winner = outcome.winner
+                self._close_journal(match)
+                await self._broadcast_match(match, msg_game_over(match.winner))
+                logger.info(f"Match {match.match_id} ended, winner: P{match.winner}")
 
     async def _handle_resync_request(self, session: PlayerSession, msg: Message):
         """Handle resync request - send full snapshot."""
@@ -560,12 +758,18 @@ class GameServer:
             return
 
         match = self.matches.get(session.match_id)
-        if not match or not match.server:
+        if not match or not match.is_started:
             return
 
-        snapshot = match.server.get_snapshot(for_player=session.player_number)
+        self.metrics.resync_requests += 1
+        self._wake(match)
+        if self.pool:
+            snapshot = await self.pool.snapshot(match.match_id, session.player_number)
+        else:
+            snapshot = match.server.get_snapshot(for_player=session.player_number)
         seq = session.next_server_seq()
-        await self._send(session, msg_resync(snapshot, seq))
+        await self._send(session, msg_resync(snapshot, seq, ack=session.last_client_seq))
+        self.metrics.resyncs_sent += 1
 
     async def _handle_chat(self, session: PlayerSession, msg: Message):
         """Handle chat message - broadcast to match or lobby."""
@@ -632,55 +836,183 @@ class GameServer:
         # End game in draw
         match.is_finished = True
         match.winner = 0  # 0 = draw
+        self._close_journal(match)
         await self._broadcast_match(match, msg_game_over(0))
         logger.info(f"Match {match.match_id} ended in draw (accepted by P{session.player_number})")
 
+    def _remove_match(self, match_id: str):
+        """Drop a match (and its game on the worker, when sharded)."""
+        match = self.matches.pop(match_id, None)
+        if match is None:
+            return  # Both players' disconnects raced to remove it
+        self._close_journal(match)
+        if self.pool:
+            self.pool.release(match_id)
+
+    # =========================================================================
+    # HIBERNATION
+    # =========================================================================
+
+    def _wake(self, match: MatchSession):
+        """Note activity on a match, rehydrating it if it was hibernated."""
+        match.last_activity = time.time()
+        if not match.is_hibernated:
+            return
+        if match.hibernated_state is not None:
+            match.server = MatchServer.from_hibernation(match.hibernated_state, metrics=self.command_metrics)
+            match.hibernated_state = None
+        # A worker rebuilds its copy on the request that follows
+        match.is_hibernated = False
+        self.metrics.rehydrations += 1
+        logger.info(f"Match {match.match_id} woke from hibernation")
+
+    async def _hibernate(self, match: MatchSession):
+        """Replace the live game of a match with its compressed state."""
+        async with match.lock:
+            if match.is_hibernated or match.match_id not in self.matches:
+                return
+            if self.pool:
+                size = await self.pool.hibernate(match.match_id)
+            else:
+                match.hibernated_state = match.server.hibernate()
+                match.server = None
+                size = len(match.hibernated_state)
+            match.is_hibernated = True
+        self.metrics.hibernations += 1
+        logger.info(f"Match {match.match_id} hibernated ({size} bytes)")
+
+    async def _hibernate_idle(self):
+        """Hibernate every started match idle for hibernate_after seconds."""
+        now = time.time()
+        idle = [
+            match for match in self.matches.values()
+            if match.is_started and not match.is_hibernated and not match.lock.locked()
+            and now - match.last_activity >= self.hibernate_after
+        ]
+        for match in idle:
+            try:
+                await self._hibernate(match)
+            except Exception as e:
+                logger.error(f"Could not hibernate match {match.match_id}: {e}")
+
+    async def _hibernate_loop(self):
+        interval = min(60.0, max(1.0, self.hibernate_after / 4))
+        while self._running:
+            await asyncio.sleep(interval)
+            await self._hibernate_idle()
+
+    # =========================================================================
+    # JOURNAL
+    # =========================================================================
+
+    async def _journal_command(self, match: MatchSession, cmd: Command, seq: int):
+        """Append an accepted command, checkpointing the full state now and then."""
+        match.journal.command(cmd, seq)
+        if match.journal.checkpoint_due:
+            if self.pool:
+                checkpoint = await self.pool.checkpoint(match.match_id)
+            else:
+                checkpoint = match.server.checkpoint()
+            match.journal.checkpoint(checkpoint)
+
+    def _close_journal(self, match: MatchSession):
+        """The match is over or abandoned: its journal is no longer needed."""
+        if match.journal:
+            match.journal.close(delete=True)
+            match.journal = None
+
+    async def _journal_sync_loop(self):
+        """Batch fsyncs of every journal written since the last round."""
+        loop = asyncio.get_running_loop()
+        while self._running:
+            await asyncio.sleep(SYNC_INTERVAL)
+            fds = self.journal.flush_dirty()
+            if fds:
+                await loop.run_in_executor(None, sync_fds, fds)
+
+    async def _recover_matches(self):
+        """Rebuild matches left running by the previous process."""
+        for recovered in self.journal.recover():
+            try:
+                await self._recover_match(recovered)
+            except Exception as e:
+                logger.error(f"Could not recover match {recovered.match_id}: {e}")
+
+    async def _recover_match(self, recovered: RecoveredMatch):
+        path = self.journal.path(recovered.match_id)
+        if recovered.content_hash != self._content_hash:
+            logger.warning(f"Journal {path.name} was written with other game content, skipping")
+            path.rename(path.with_suffix('.stale'))
+            return
+
+        match = MatchSession(
+            match_id=recovered.match_id,
+            host_squad=recovered.setup['host_squad'],
+            guest_squad=recovered.setup['guest_squad'],
+            host_placed_cards=recovered.setup['host_placed_cards'],
+            guest_placed_cards=recovered.setup['guest_placed_cards'],
+            is_started=True,
+            host_ready=True,
+            guest_ready=True,
+            seed=recovered.seed,
+            player_names=recovered.players,
+            resume_tokens=recovered.resume_tokens,
+            client_seqs=recovered.client_seqs,
+            resumable_until=time.time() + RESUME_GRACE,
+        )
+        if self.pool:
+            await self.pool.restore_match(recovered.match_id, recovered.seed, recovered.setup,
+                                          recovered.checkpoint, recovered.commands)
+        else:
+            match.server = MatchServer(metrics=self.command_metrics, seed=recovered.seed)
+            restore_match_server(match.server, recovered.setup, recovered.checkpoint, recovered.commands)
+        match.journal = self.journal.reopen(recovered)
+        self.matches[match.match_id] = match
+        names = " vs ".join(recovered.players.get(p, '?') for p in (1, 2))
+        logger.info(f"Match {match.match_id} recovered ({len(recovered.commands)} commands, {names})")
+
     async def _broadcast_match(self, match: MatchSession, msg: Message):
         """Broadcast message to all players in a match."""
-        for player_num in [1, 2]:
-            session = match.get_session(player_num)
-            if session and session.state == SessionState.IN_MATCH:
-                await self._send(session, msg)
+        sessions = [match.get_session(player_num) for player_num in [1, 2]]
+        await self._broadcast(
+            [s for s in sessions if s and s.state == SessionState.IN_MATCH], msg)
 
     async def _broadcast_lobby_status(self):
         """Broadcast lobby status (user count) to all connected users."""
         user_count = len(self.sessions)
-        status_msg = msg_lobby_status(user_count)
-        for session in list(self.sessions.values()):
-            try:
-                await self._send(session, status_msg)
-            except Exception:
-                pass  # Session might be disconnecting
+        await self._broadcast(list(self.sessions.values()), msg_lobby_status(user_count))
 
     async def _broadcast_lobby_chat(self, sender: PlayerSession, text: str):
         """Broadcast chat message to all users in lobby (not in match)."""
         chat_msg = msg_chat(text, sender.player_name, 0)  # player_number=0 for lobby
 
         # Store in chat history
-        self.lobby_chat_history.append(chat_msg)
+        data = chat_msg.to_bytes()
+        self.lobby_chat_history.append(data)
         # Trim history if too long
         while len(self.lobby_chat_history) > self.lobby_chat_max_history:
             self.lobby_chat_history.pop(0)
 
-        for session in list(self.sessions.values()):
-            try:
-                await self._send(session, chat_msg)
-            except Exception:
-                pass
+        await self._broadcast(list(self.sessions.values()), chat_msg, data)
 
     # =========================================================================
     # BACKGROUND TASKS
     # =========================================================================
 
     async def _heartbeat_loop(self):
-        """Send periodic heartbeat checks."""
+        """Drop silent sessions and ping the rest to measure their RTT."""
         while self._running:
-            await asyncio.sleep(5)
+            await asyncio.sleep(PING_INTERVAL)
 
+            alive = []
             for session in list(self.sessions.values()):
                 if not session.is_alive:
                     logger.warning(f"Session timeout: {session.player_name}")
+                    self.metrics.heartbeat_timeouts += 1
                     await self._handle_disconnect(session)
+                else:
+                    alive.append(session)
+            await self._broadcast(alive, msg_ping(time.monotonic()))
 
     async def _cleanup_loop(self):
         """Clean up stale matches."""
@@ -690,14 +1022,89 @@ class GameServer:
             now = time.time()
             stale_matches = [
                 mid for mid, match in self.matches.items()
-                if match.is_empty or (not match.is_started and now - match.created_at > 300)
+                if (match.is_empty and now >= match.resumable_until)
+                or (not match.is_started and now - match.created_at > 300)
             ]
 
             for mid in stale_matches:
-                del self.matches[mid]
+                self._remove_match(mid)
                 logger.info(f"Cleaned up stale match: {mid}")
 
 
+    async def _metrics_loop(self):
+        """Periodically log per-command timings."""
+        while self._running:
+            await asyncio.sleep(self.metrics_interval)
+            await self._refresh_command_metrics()
+            if self.command_metrics.total_commands:
+                logger.info("Command metrics:\n" + self.dump_metrics())
+
+    async def _refresh_command_metrics(self):
+        """Pull per-command timings from the match workers (sharded mode only)."""
+        if self.pool is not None and self.command_metrics is not None:
+            try:
+                self.command_metrics = await self.pool.collect_metrics()
+            except Exception as e:
+                logger.warning(f"Could not collect worker metrics: {e}")
+
+    def dump_metrics(self) -> str:
+        """Per-command timing table (empty string when metrics are off)."""
+        if self.command_metrics is None:
+            return ""
+        return self.command_metrics.format_table()
+
+    async def _loop_lag_loop(self):
+        """Measure how late the event loop wakes a sleeping task."""
+        loop = asyncio.get_running_loop()
+        while self._running:
+            expected = loop.time() + LOOP_LAG_INTERVAL
+            await asyncio.sleep(LOOP_LAG_INTERVAL)
+            self.metrics.record_loop_lag(loop.time() - expected)
+
+    # =========================================================================
+    # METRICS ENDPOINT
+    # =========================================================================
+
+    def render_metrics(self) -> str:
+        """All server metrics in plain-text exposition format."""
+        return self.metrics.render(self)
+
+    async def _start_metrics_endpoint(self):
+        """Start the local metrics listener and the SIGUSR1 dump (where supported)."""
+        if self.metrics_port:
+            # Bound to loopback only - metrics are not for the public port
+            self._metrics_server = await asyncio.start_server(
+                self._handle_metrics_client, '127.0.0.1', self.metrics_port)
+            logger.info(f"Metrics on http://127.0.0.1:{self.metrics_port}/metrics")
+
+        if hasattr(signal, 'SIGUSR1'):
+            try:
+                asyncio.get_running_loop().add_signal_handler(
+                    signal.SIGUSR1, lambda: logger.info("Metrics dump:\n" + self.render_metrics()))
+            except (NotImplementedError, RuntimeError):
+                pass  # Not the main thread / unsupported loop
+
+    async def _handle_metrics_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Answer any request (HTTP GET or a bare connect) with the metrics text."""
+        try:
+            try:
+                await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), timeout=1.0)
+            except (asyncio.TimeoutError, asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+                pass  # Plain TCP scrapers send nothing
+            await self._refresh_command_metrics()
+            body = self.render_metrics().encode('utf-8')
+            writer.write(
+                b"HTTP/1.0 200 OK\r\n"
+                b"Content-Type: text/plain; version=0.0.4; charset=utf-8\r\n"
+                b"Content-Length: " + str(len(body)).encode() + b"\r\n\r\n" + body
+            )
+            await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+
 # =============================================================================
 # ENTRY POINT
 # =============================================================================
@@ -707,6 +1114,13 @@ def run_server(
     port: int = 7777,
     certfile: Optional[str] = None,
     keyfile: Optional[str] = None,
+    collect_metrics: bool = True,
+    metrics_interval: float = 300.0,
+    metrics_port: Optional[int] = None,
+    workers: int = 0,
+    compression: bool = True,
+    journal_dir: Optional[str] = None,
+    hibernate_after: float = HIBERNATE_AFTER,
 ):
     """Run the game server."""
     logging.basicConfig(
@@ -714,7 +1128,11 @@ def run_server(
         format='%(asctime)s [%(levelname)s] %(message)s',
     )
 
-    server = GameServer(host, port, certfile, keyfile)
+    server = GameServer(host, port, certfile, keyfile,
+                        collect_metrics=collect_metrics, metrics_interval=metrics_interval,
+                        metrics_port=metrics_port, workers=workers,
+                        compression=compression, journal_dir=journal_dir,
+                        hibernate_after=hibernate_after)
 
     try:
         asyncio.run(server.start())
@@ -730,6 +1148,23 @@ if __name__ == '__main__':
     parser.add_argument('--port', type=int, default=7777, help='Port to listen on')
     parser.add_argument('--cert', help='TLS certificate file')
     parser.add_argument('--key', help='TLS key file')
+    parser.add_argument('--no-metrics', action='store_true', help='Disable per-command timing')
+    parser.add_argument('--metrics-interval', type=float, default=300.0,
+                        help='Seconds between command metric logs (0 = never)')
+    parser.add_argument('--metrics-port', type=int, default=None,
+                        help='Serve plain-text metrics on 127.0.0.1:PORT')
+    parser.add_argument('--workers', type=int, default=0,
+                        help='Run matches in N worker processes (0 = in this process)')
+    parser.add_argument('--no-compression', action='store_true',
+                        help='Refuse frame compression offered by clients')
+    parser.add_argument('--journal', default=None, metavar='DIR',
+                        help='Journal started matches in DIR and resume them after a restart')
+    parser.add_argument('--hibernate-after', type=float, default=HIBERNATE_AFTER, metavar='SECONDS',
+                        help='Compress matches idle this long (0 = never)')
 
     args = parser.parse_args()
-    run_server(args.host, args.port, args.cert, args.key)
+    run_server(args.host, args.port, args.cert, args.key,
+               collect_metrics=not args.no_metrics, metrics_interval=args.metrics_interval,
+               metrics_port=args.metrics_port, workers=args.workers,
+               compression=not args.no_compression, journal_dir=args.journal,
+               hibernate_after=args.hibernate_after)
@@ -1,13 +1,18 @@
 """Player session and connection state management."""
 
 import asyncio
+import secrets
 import time
 from dataclasses import dataclass, field
-from typing import Optional, TYPE_CHECKING
+from typing import Dict, Optional, TYPE_CHECKING
 from enum import Enum, auto
 
+from .latency import PING_INTERVAL, RttEstimator
+
 if TYPE_CHECKING:
     from asyncio import StreamReader, StreamWriter
+    from .compression import FrameCompression
+    from .journal import MatchJournal
 
 
 class SessionState(Enum):
@@ -39,9 +44,13 @@ class PlayerSession:
     last_client_seq: int = 0
     server_seq: int = 0
 
-    # Heartbeat
+    # Frame codec agreed in HELLO/WELCOME (None = plain frames)
+    compression: Optional['FrameCompression'] = None
+
+    # Heartbeat: last_pong is the last time anything arrived from the client
     last_ping: float = field(default_factory=time.time)
     last_pong: float = field(default_factory=time.time)
+    rtt: RttEstimator = field(default_factory=RttEstimator)
 
     # Address for logging
     _address: str = ""
@@ -55,10 +64,21 @@ class PlayerSession:
     def address(self) -> str:
         return self._address
 
+    # Silence allowed before dropping the client: two missed pings plus the
+    # retransmission timeout, HEARTBEAT_TIMEOUT until the RTT is measured
+    HEARTBEAT_TIMEOUT = 15.0
+    MIN_HEARTBEAT_TIMEOUT = 2 * PING_INTERVAL + 1.0
+    MAX_HEARTBEAT_TIMEOUT = 30.0
+
+    @property
+    def heartbeat_timeout(self) -> float:
+        return self.rtt.timeout(self.HEARTBEAT_TIMEOUT, self.MIN_HEARTBEAT_TIMEOUT,
+                                self.MAX_HEARTBEAT_TIMEOUT, margin=2 * PING_INTERVAL)
+
     @property
     def is_alive(self) -> bool:
         """Check if connection is still alive based on heartbeat."""
-        return time.time() - self.last_pong < 15.0  # 15 second timeout
+        return time.time() - self.last_pong < self.heartbeat_timeout
 
     def next_server_seq(self) -> int:
         """Get next server sequence number."""
@@ -72,6 +92,12 @@ class PlayerSession:
         self.last_client_seq = client_seq
         return False
 
+    @property
+    def buffered_bytes(self) -> int:
+        """Bytes written but not yet taken by the client's socket."""
+        transport = self.writer.transport
+        return transport.get_write_buffer_size() if transport else 0
+
     async def send(self, data: bytes):
         """Send data to client."""
         try:
@@ -81,6 +107,13 @@ class PlayerSession:
             self.state = SessionState.DISCONNECTED
             raise
 
+    def abort(self):
+        """Drop the connection at once, discarding unsent data (slow consumers)."""
+        self.state = SessionState.DISCONNECTED
+        transport = self.writer.transport
+        if transport:
+            transport.abort()
+
     async def close(self):
         """Close the connection."""
         self.state = SessionState.DISCONNECTED
@@ -123,6 +156,27 @@ class MatchSession:
     # Draw offer state (which player offered, 0 = no offer)
     draw_offered_by: int = 0
 
+    # Serializes command handling so updates reach both players in order
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock, repr=False)
+
+    # Durability (see journal.py): dice seed, who plays which side, and the
+    # journal; a match recovered after a restart waits for its players
+    # until resumable_until. A disconnected seat is handed back only to
+    # the holder of its resume token (sent in GAME_START).
+    seed: int = 0
+    player_names: Dict[int, str] = field(default_factory=dict)
+    resume_tokens: Dict[int, str] = field(default_factory=dict, repr=False)
+    client_seqs: Dict[int, int] = field(default_factory=dict)  # player -> highest command seq handled
+    journal: Optional['MatchJournal'] = None
+    resumable_until: float = 0.0
+
+    # Hibernation: a started match idle for a while keeps only its compressed
+    # state (MatchServer.hibernate) until the next command, resync or rejoin.
+    # hibernated_state is the blob in-process; a worker keeps its own.
+    last_activity: float = field(default_factory=time.time)
+    is_hibernated: bool = False
+    hibernated_state: Optional[bytes] = field(default=None, repr=False)
+
     @property
     def is_full(self) -> bool:
         """Check if match has both players."""
@@ -155,6 +209,24 @@ class MatchSession:
         """Get opponent's session."""
         return self.get_session(3 - player)  # 1 -> 2, 2 -> 1
 
+    def set_session(self, player: int, session: PlayerSession):
+        """Seat a session as player 1 or 2."""
+        if player == 1:
+            self.host_session = session
+        elif player == 2:
+            self.guest_session = session
+
+    def rejoin_slot(self, resume_token: Optional[str]) -> int:
+        """Free seat in a running match whose resume token this is (0 = none)."""
+        if not isinstance(resume_token, str) or not resume_token or not self.is_started or self.is_finished:
+            return 0
+        offered = resume_token.encode('utf-8')
+        for player in (1, 2):
+            token = self.resume_tokens.get(player)
+            if token and self.get_session(player) is None and secrets.compare_digest(token.encode('utf-8'), offered):
+                return player
+        return 0
+
     def remove_player(self, session: PlayerSession):
         """Remove a player from the match."""
         if self.host_session == session:
@@ -0,0 +1,350 @@
+"""Match worker processes for a sharded GameServer.
+
+With --workers N the front process keeps the lobby and every client
+connection, and each started match lives in one of N worker processes
+that run its MatchServer. Command processing, snapshots and state hashes
+then use all cores instead of one event loop.
+
+Front and worker talk over a local socket pair with length-prefixed
+pickle frames:
+
+    request:  (req_id, op, args)
+    reply:    (req_id, ok, value)   # ok=False: value is the error text
+
+Ops: start, restore, command, snapshot, checkpoint, hibernate, close,
+metrics. The client protocol is unchanged - the front builds the same
+messages from the replies. A hibernated match is rebuilt by the first
+op that needs it.
+"""
+
+import asyncio
+import itertools
+import logging
+import multiprocessing
+import pickle
+import signal
+import socket
+import struct
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+from ..card import Card
+from ..commands import Command
+from ..match import MatchServer, CommandResult
+from ..metrics import CommandMetrics
+
+logger = logging.getLogger(__name__)
+
+HEADER = struct.Struct('>I')
+
+
+class WorkerError(Exception):
+    """A worker rejected a request or is gone."""
+
+
+@dataclass
+class CommandOutcome:
+    """Everything the front needs to answer a COMMAND message."""
+    result: CommandResult
+    snapshot_hash: str
+    opponent_snapshot: Optional[Dict[str, Any]]
+    winner: int
+
+
+# =============================================================================
+# MATCH OPERATIONS (shared by in-process and worker modes)
+# =============================================================================
+
+def start_match_server(server: MatchServer, host_squad: list, guest_squad: list,
+                       host_placed_cards: list, guest_placed_cards: list) -> Dict[int, Dict[str, Any]]:
+    """Set up a match and return each player's starting snapshot."""
+    if host_placed_cards and guest_placed_cards:
+        p1_cards = [Card.from_dict(d) for d in host_placed_cards]
+        p2_cards = [Card.from_dict(d) for d in guest_placed_cards]
+        server.setup_with_placement(p1_cards, p2_cards)
+    else:
+        server.setup_game(host_squad, guest_squad)
+    return {player: server.get_snapshot(for_player=player) for player in (1, 2)}
+
+
+def restore_match_server(server: MatchServer, setup: Dict[str, Any],
+                         checkpoint: Optional[Dict[str, Any]], commands: List[Command]):
+    """Rebuild a journaled match: last checkpoint (or the setup) plus the commands after it."""
+    metrics, server.metrics = server.metrics, None  # Replayed commands are not new traffic
+    try:
+        if checkpoint is not None:
+            done = checkpoint['commands']
+            server.restore(checkpoint, commands[:done])
+        else:
+            done = 0
+            start_match_server(server, setup['host_squad'], setup['guest_squad'],
+                               setup['host_placed_cards'], setup['guest_placed_cards'])
+        for cmd in commands[done:]:
+            server.apply(cmd, include_snapshot=False)
+    finally:
+        server.metrics = metrics
+
+
+def run_command(server: MatchServer, cmd: Command, with_opponent: bool) -> CommandOutcome:
+    """Apply a command; include the opponent's view when it will be broadcast."""
+    result = server.apply(cmd, include_snapshot=True)
+    snapshot_hash = server.get_state_hash()
+    opponent_snapshot = None
+    if result.accepted and with_opponent:
+        opponent_snapshot = server.get_snapshot(for_player=3 - cmd.player)
+    winner = server.game.winner if server.game and server.game.winner else 0
+    return CommandOutcome(result, snapshot_hash, opponent_snapshot, winner)
+
+
+# =============================================================================
+# FRAMING
+# =============================================================================
+
+def _frame(obj: Any) -> bytes:
+    data = pickle.dumps(obj, pickle.HIGHEST_PROTOCOL)
+    return HEADER.pack(len(data)) + data
+
+
+def _recv_exact(sock: socket.socket, size: int) -> Optional[bytes]:
+    buf = bytearray()
+    while len(buf) < size:
+        chunk = sock.recv(size - len(buf))
+        if not chunk:
+            return None
+        buf.extend(chunk)
+    return bytes(buf)
+
+
+# =============================================================================
+# WORKER PROCESS
+# =============================================================================
+
+def worker_main(sock: socket.socket, collect_metrics: bool):
+    """Serve match requests until the front closes the socket."""
+    # Ctrl+C goes to the whole process group; the front shuts us down
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    metrics = CommandMetrics() if collect_metrics else None
+    matches: Dict[str, MatchServer] = {}
+    hibernated: Dict[str, bytes] = {}  # match_id -> MatchServer.hibernate() blob
+
+    def server_for(match_id) -> MatchServer:
+        server = matches.get(match_id)
+        if server is None:
+            server = MatchServer.from_hibernation(hibernated.pop(match_id), metrics=metrics)
+            matches[match_id] = server
+        return server
+
+    def op_start(match_id, host_squad, guest_squad, host_placed, guest_placed, seed):
+        server = MatchServer(metrics=metrics, seed=seed)
+        matches[match_id] = server
+        return start_match_server(server, host_squad, guest_squad, host_placed, guest_placed)
+
+    def op_restore(match_id, seed, setup, checkpoint, commands):
+        server = MatchServer(metrics=metrics, seed=seed)
+        restore_match_server(server, setup, checkpoint, commands)
+        matches[match_id] = server
+
+    def op_command(match_id, cmd, with_opponent):
+        return run_command(server_for(match_id), cmd, with_opponent)
+
+    def op_snapshot(match_id, player):
+        return server_for(match_id).get_snapshot(for_player=player)
+
+    def op_checkpoint(match_id):
+        return server_for(match_id).checkpoint()
+
+    def op_hibernate(match_id):
+        if match_id in hibernated:
+            return len(hibernated[match_id])
+        blob = hibernated[match_id] = matches.pop(match_id).hibernate()
+        return len(blob)
+
+    def op_close(match_id):
+        matches.pop(match_id, None)
+        hibernated.pop(match_id, None)
+
+    def op_metrics():
+        return metrics
+
+    ops: Dict[str, Callable] = {
+        'start': op_start,
+        'restore': op_restore,
+        'command': op_command,
+        'snapshot': op_snapshot,
+        'checkpoint': op_checkpoint,
+        'hibernate': op_hibernate,
+        'close': op_close,
+        'metrics': op_metrics,
+    }
+
+    with sock:
+        while True:
+            header = _recv_exact(sock, HEADER.size)
+            if header is None:
+                break
+            body = _recv_exact(sock, HEADER.unpack(header)[0])
+            if body is None:
+                break
+            req_id, op, args = pickle.loads(body)
+            try:
+                reply = (req_id, True, ops[op](*args))
+            except KeyError as e:
+                reply = (req_id, False, f"Unknown match or op: {e}")
+            except Exception as e:
+                reply = (req_id, False, f"{type(e).__name__}: {e}")
+            sock.sendall(_frame(reply))
+
+
+# =============================================================================
+# FRONT SIDE
+# =============================================================================
+
+class MatchWorker:
+    """Front-side handle for one worker process."""
+
+    def __init__(self, index: int, collect_metrics: bool):
+        self.index = index
+        self.collect_metrics = collect_metrics
+        self.process: Optional[multiprocessing.Process] = None
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._read_task: Optional[asyncio.Task] = None
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._ids = itertools.count(1)
+        self._stopping = False
+
+    async def start(self):
+        front_sock, worker_sock = socket.socketpair()
+        # spawn, not fork: the front already runs an event loop and threads
+        ctx = multiprocessing.get_context('spawn')
+        self.process = ctx.Process(
+            target=worker_main, args=(worker_sock, self.collect_metrics),
+            name=f"match-worker-{self.index}", daemon=True,
+        )
+        self.process.start()
+        worker_sock.close()
+        self._reader, self._writer = await asyncio.open_connection(sock=front_sock)
+        self._read_task = asyncio.create_task(self._read_loop())
+
+    async def call(self, op: str, *args) -> Any:
+        """Send one request and wait for its reply."""
+        if self._writer is None or self._read_task.done():
+            raise WorkerError(f"Match worker {self.index} is not running")
+        req_id = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[req_id] = future
+        self._writer.write(_frame((req_id, op, args)))
+        await self._writer.drain()
+        ok, value = await future
+        if not ok:
+            raise WorkerError(value)
+        return value
+
+    async def _read_loop(self):
+        try:
+            while True:
+                header = await self._reader.readexactly(HEADER.size)
+                body = await self._reader.readexactly(HEADER.unpack(header)[0])
+                req_id, ok, value = pickle.loads(body)
+                future = self._pending.pop(req_id, None)
+                if future is not None and not future.done():
+                    future.set_result((ok, value))
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            if self._pending and not self._stopping:
+                logger.error(f"Match worker {self.index} exited with {len(self._pending)} pending requests")
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_result((False, f"Match worker {self.index} exited"))
+            self._pending.clear()
+
+    async def stop(self):
+        self._stopping = True
+        if self._writer is not None:
+            self._writer.close()
+        if self._read_task is not None:
+            await self._read_task
+        if self.process is not None:
+            await asyncio.get_running_loop().run_in_executor(None, self.process.join, 5.0)
+            if self.process.is_alive():
+                self.process.terminate()
+
+
+class MatchWorkerPool:
+    """Assigns matches to worker processes and relays their requests.
+
+    Usage:
+        pool = MatchWorkerPool(4)
+        await pool.start()
+        snapshots = await pool.start_match(match_id, ...)
+        outcome = await pool.command(match_id, cmd, with_opponent=True)
+    """
+
+    def __init__(self, workers: int, collect_metrics: bool = True):
+        self.workers = [MatchWorker(i, collect_metrics) for i in range(workers)]
+        self.assignments: Dict[str, int] = {}  # match_id -> worker index
+        self.load: List[int] = [0] * workers   # Matches per worker
+
+    async def start(self):
+        await asyncio.gather(*(worker.start() for worker in self.workers))
+        logger.info(f"Started {len(self.workers)} match workers")
+
+    async def stop(self):
+        await asyncio.gather(*(worker.stop() for worker in self.workers))
+
+    def _worker(self, match_id: str) -> MatchWorker:
+        index = self.assignments.get(match_id)
+        if index is None:
+            raise WorkerError(f"Match {match_id} has no worker")
+        return self.workers[index]
+
+    def _assign(self, match_id: str) -> MatchWorker:
+        """Place a match on the least loaded worker."""
+        index = min(range(len(self.workers)), key=lambda i: self.load[i])
+        self.assignments[match_id] = index
+        self.load[index] += 1
+        return self.workers[index]
+
+    async def start_match(self, match_id: str, host_squad: list, guest_squad: list,
+                          host_placed_cards: list, guest_placed_cards: list,
+                          seed: Optional[int] = None) -> Dict[int, Dict[str, Any]]:
+        """Set up a new match on the least loaded worker (seed: see MatchServer)."""
+        return await self._assign(match_id).call(
+            'start', match_id, host_squad, guest_squad, host_placed_cards, guest_placed_cards, seed)
+
+    async def restore_match(self, match_id: str, seed: int, setup: Dict[str, Any],
+                            checkpoint: Optional[Dict[str, Any]], commands: List[Command]):
+        """Rebuild a journaled match on the least loaded worker."""
+        await self._assign(match_id).call('restore', match_id, seed, setup, checkpoint, commands)
+
+    async def command(self, match_id: str, cmd: Command, with_opponent: bool) -> CommandOutcome:
+        return await self._worker(match_id).call('command', match_id, cmd, with_opponent)
+
+    async def snapshot(self, match_id: str, player: int) -> Dict[str, Any]:
+        return await self._worker(match_id).call('snapshot', match_id, player)
+
+    async def checkpoint(self, match_id: str) -> Dict[str, Any]:
+        return await self._worker(match_id).call('checkpoint', match_id)
+
+    async def hibernate(self, match_id: str) -> int:
+        """Compress an idle match on its worker; the size of its blob."""
+        return await self._worker(match_id).call('hibernate', match_id)
+
+    def release(self, match_id: str):
+        """Forget a match and free it on its worker (fire and forget)."""
+        index = self.assignments.pop(match_id, None)
+        if index is None:
+            return
+        self.load[index] -= 1
+        task = asyncio.get_running_loop().create_task(self.workers[index].call('close', match_id))
+        task.add_done_callback(lambda t: t.cancelled() or t.exception())  # Ignore worker errors
+
+    async def collect_metrics(self) -> CommandMetrics:
+        """Per-command timings merged across all workers."""
+        merged = CommandMetrics()
+        for metrics in await asyncio.gather(*(worker.call('metrics') for worker in self.workers)):
+            if metrics is not None:
+                merged.merge(metrics)
+        return merged
@@ -278,7 +278,9 @@ class NetworkUI:
 
     def _setup_client(self):
         """Initialize network client with callbacks."""
+        from .settings import get_predict_commands
         self.client = NetworkClient()
+        self.client.predict_commands = get_predict_commands()
         self.client.on_connected = self._on_connected
         self.client.on_disconnected = self._on_disconnected
         self.client.on_error = self._on_error
@@ -508,6 +510,11 @@ class NetworkUI:
         if self.state not in (LobbyState.CONNECT, LobbyState.CONNECTING):
             user_text = self.font_large.render(f"Онлайн: {self.lobby_user_count}", True, (100, 200, 100))
             self.screen.blit(user_text, (scaled(50), scaled(20)))
+            ping_ms = self.client.ping_ms if self.client else None
+            if ping_ms is not None:
+                ping_text = self.font_small.render(f"Пинг: {ping_ms} мс", True, (150, 150, 150))
+                self.screen.blit(ping_text, (scaled(50) + user_text.get_width() + scaled(20),
+                                             scaled(20) + user_text.get_height() - ping_text.get_height()))
 
         # Draw chat on left side when connected
         if self.state not in (LobbyState.CONNECT, LobbyState.CONNECTING) and self.chat:
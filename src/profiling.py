@@ -0,0 +1,202 @@
+"""Profiling with per-subsystem attribution.
+
+Wraps a workload in cProfile (exact self time per function) and a stack
+sampler thread (call stacks for flame graphs), then groups the self time
+into subsystem buckets so a slowdown points at "board queries" or
+"AI scoring" instead of a list of mixin method names.
+
+Usage:
+    from src.profiling import SubsystemProfiler
+
+    profiler = SubsystemProfiler()
+    with profiler:
+        run_workload()
+    profiler.write_summary("profile/summary.txt")
+    profiler.write_collapsed("profile/stacks.collapsed")
+
+The collapsed-stack file has one "frame;frame;...;frame count" line per
+distinct stack and can be fed to flamegraph.pl or speedscope.
+"""
+import cProfile
+import os
+import pstats
+import sys
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+
+# Function names counted as serialization wherever they are defined
+SERIALIZATION_FUNCS = frozenset({
+    'to_dict', 'from_dict', 'snapshot_for_player', 'get_snapshot',
+    'to_bytes', 'from_bytes', 'create_hidden_placeholder',
+})
+
+# (path fragment, bucket) - first match wins, checked after SERIALIZATION_FUNCS
+PATH_BUCKETS: List[Tuple[str, str]] = [
+    ('src/ai/squad_ai', 'squad AI'),
+    ('src/squad_builder', 'squad AI'),
+    ('src/ai/', 'AI scoring'),
+    ('src/game/combat', 'game/combat'),
+    ('src/game/triggers', 'game/combat'),
+    ('src/game/abilities', 'game/abilities'),
+    ('src/ability_handlers', 'game/abilities'),
+    ('src/abilities', 'game/abilities'),
+    ('src/game/priority', 'game/priority'),
+    ('src/board', 'board queries'),
+    ('src/game/legal', 'board queries'),
+    ('src/game/helpers', 'board queries'),
+    ('src/game/', 'game/other'),
+    ('src/card', 'game/other'),
+    ('src/interaction', 'game/other'),
+    ('src/match', 'game/other'),
+    ('src/network/protocol', 'serialization'),
+    ('json/', 'serialization'),
+    ('copy.py', 'serialization'),
+]
+
+BUCKETS = ['game/combat', 'game/abilities', 'game/priority', 'game/other',
+           'board queries', 'serialization', 'AI scoring', 'squad AI', 'other']
+
+SAMPLE_INTERVAL = 0.001  # Seconds between stack samples
+
+
+def classify(filename: str, funcname: str) -> str:
+    """Subsystem bucket for a function."""
+    if funcname in SERIALIZATION_FUNCS:
+        return 'serialization'
+    path = filename.replace('\\', '/')
+    for fragment, bucket in PATH_BUCKETS:
+        if fragment in path:
+            return bucket
+    return 'other'
+
+
+def _frame_label(filename: str, funcname: str) -> str:
+    """Short frame name for collapsed stacks: module:function."""
+    path = filename.replace('\\', '/')
+    if '/src/' in path:
+        path = 'src/' + path.split('/src/', 1)[1]
+    else:
+        path = os.path.basename(path)
+    if path.endswith('.py'):
+        path = path[:-3]
+    return f"{path}:{funcname}"
+
+
+class SubsystemProfiler:
+    """cProfile plus a stack sampler for one thread of work."""
+
+    def __init__(self, sample_interval: float = SAMPLE_INTERVAL):
+        self.sample_interval = sample_interval
+        self._profile = cProfile.Profile()
+        self._stacks: Dict[Tuple[str, ...], int] = {}
+        self._target_thread: Optional[int] = None
+        self._stop = threading.Event()
+        self._sampler: Optional[threading.Thread] = None
+        self.wall_time = 0.0
+        self._started = 0.0
+
+    def __enter__(self) -> 'SubsystemProfiler':
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    def start(self):
+        self._target_thread = threading.get_ident()
+        self._stop.clear()
+        self._sampler = threading.Thread(target=self._sample_loop, daemon=True)
+        self._sampler.start()
+        self._started = time.perf_counter()
+        self._profile.enable()
+
+    def stop(self):
+        self._profile.disable()
+        self.wall_time = time.perf_counter() - self._started
+        self._stop.set()
+        if self._sampler:
+            self._sampler.join()
+
+    # =========================================================================
+    # SAMPLING
+    # =========================================================================
+
+    def _sample_loop(self):
+        while not self._stop.wait(self.sample_interval):
+            frame = sys._current_frames().get(self._target_thread)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(_frame_label(code.co_filename, code.co_name))
+                frame = frame.f_back
+            key = tuple(reversed(stack))
+            self._stacks[key] = self._stacks.get(key, 0) + 1
+
+    # =========================================================================
+    # REPORTS
+    # =========================================================================
+
+    def bucket_times(self) -> Dict[str, float]:
+        """Self time per subsystem bucket, in seconds."""
+        stats = pstats.Stats(self._profile)
+        totals = {bucket: 0.0 for bucket in BUCKETS}
+        for (filename, _, funcname), (_, _, tottime, _, callers) in stats.stats.items():
+            if filename == '~' and callers:
+                # Builtins (dict.get, len, ...) are charged to their callers
+                share = sum(c[2] for c in callers.values()) or 1.0
+                for (c_file, _, c_func), caller in callers.items():
+                    weight = caller[2] / share
+                    totals[classify(c_file, c_func)] += tottime * weight
+            else:
+                totals[classify(filename, funcname)] += tottime
+        return totals
+
+    def top_functions(self, limit: int = 25) -> List[Tuple[str, str, int, float, float]]:
+        """(bucket, function, calls, self seconds, cumulative seconds), slowest self time first."""
+        stats = pstats.Stats(self._profile)
+        rows = []
+        for (filename, line, funcname), (_, ncalls, tottime, cumtime, _) in stats.stats.items():
+            label = f"{_frame_label(filename, funcname)}:{line}"
+            rows.append((classify(filename, funcname), label, ncalls, tottime, cumtime))
+        rows.sort(key=lambda r: r[3], reverse=True)
+        return rows[:limit]
+
+    def summary(self, limit: int = 25) -> str:
+        """Text report: bucket table followed by the hottest functions."""
+        totals = self.bucket_times()
+        profiled = sum(totals.values()) or 1.0
+        lines = [
+            f"Wall time: {self.wall_time:.3f}s (profiled self time {profiled:.3f}s)",
+            "",
+            f"{'subsystem':<16} {'seconds':>9} {'share':>7}",
+            "-" * 34,
+        ]
+        for bucket, seconds in sorted(totals.items(), key=lambda kv: kv[1], reverse=True):
+            lines.append(f"{bucket:<16} {seconds:>9.3f} {seconds / profiled * 100:>6.1f}%")
+
+        lines += [
+            "",
+            f"Top {limit} functions by self time:",
+            f"{'subsystem':<16} {'calls':>9} {'self s':>8} {'cum s':>8}  function",
+            "-" * 70,
+        ]
+        for bucket, label, calls, tottime, cumtime in self.top_functions(limit):
+            lines.append(f"{bucket:<16} {calls:>9} {tottime:>8.3f} {cumtime:>8.3f}  {label}")
+        return "\n".join(lines) + "\n"
+
+    def collapsed_stacks(self) -> List[str]:
+        """Sampled stacks in collapsed format (root first)."""
+        return [f"{';'.join(stack)} {count}"
+                for stack, count in sorted(self._stacks.items(), key=lambda kv: -kv[1])]
+
+    def write_summary(self, path: str):
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(self.summary())
+
+    def write_collapsed(self, path: str):
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write("\n".join(self.collapsed_stacks()) + "\n")
@@ -50,6 +50,7 @@ class MenusMixin:
             ("local_game", "Hotseat", True),
             ("network_game", "Игра по сети", True),
             ("deck_builder", "Создание колоды", True),
+            ("replays", "Повторы", True),
             ("settings", "Настройки", True),
             ("exit", "Выход", True),
         ]
@@ -132,6 +133,7 @@ class MenusMixin:
             ("local_game", "Hotseat", True),
             ("network_game", "Игра по сети", True),
             ("deck_builder", "Создание колоды", True),
+            ("replays", "Повторы", True),
             ("settings", "Настройки", True),
             ("exit", "Выход", True),
         ]
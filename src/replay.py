@@ -0,0 +1,530 @@
+"""Replay files: a finished match as seed, commands and keyframes.
+
+A replay is enough to rebuild every state of a seeded match (see
+MatchServer(seed=...)): the initial state plus the accepted commands
+replay deterministically. Keyframes (MatchServer.checkpoint() every
+KEYFRAME_INTERVAL commands) make seeking cheap: load the nearest one and
+apply at most KEYFRAME_INTERVAL - 1 commands.
+
+File layout (integers are unsigned LEB128 varints unless noted):
+
+    b'BRPL' | version (1 byte) | index offset (8 bytes, big-endian)
+    header length | header JSON   content_hash, seed, players, winner, final_hash, ...
+    command count | packed commands
+    keyframes     length | zlib(JSON checkpoint), back to back
+    index         count | (command index, turn, offset) per keyframe
+                  count | (turn, first command index) per turn
+
+A packed command is its CommandType value, the player, a byte of
+presence flags and then the present fields: ints zigzag-encoded,
+strings as length + UTF-8. Keyframes are only decompressed when a seek
+needs them.
+
+Usage:
+    replay = server.replay(players={1: "Host", 2: "Guest"})
+    replay.save("match.brpl")
+
+    player = ReplayPlayer(Replay.load("match.brpl"))
+    game = player.seek_turn(5)
+    events = player.step()
+
+    python -m src.replay verify replays/*.brpl --workers 8
+"""
+
+import bisect
+import hashlib
+import json
+import struct
+import zlib
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .commands import Command, CommandType, Event
+from .game import Game
+
+MAGIC = b'BRPL'
+REPLAY_SUFFIX = '.brpl'
+VERSION = 2                # Bump when CommandType members, the layout or CARD_SCHEMA change
+KEYFRAME_INTERVAL = 32     # Commands between keyframes
+_PREAMBLE = struct.Struct('>4sBQ')
+_COMMAND_TYPES = list(CommandType)
+
+# Presence flags of a packed command
+_F_CARD_ID = 0x01
+_F_POSITION = 0x02
+_F_ABILITY_ID = 0x04
+_F_TARGET_ID = 0x08
+_F_AMOUNT = 0x10
+_F_OPTION = 0x20
+_F_CONFIRMED = 0x40
+_F_CONFIRMED_TRUE = 0x80
+
+# State that depends on headless mode, not on the game
+_UNVERIFIED_KEYS = ('messages',)
+
+
+class ReplayError(ValueError):
+    """Malformed replay file."""
+
+
+# =============================================================================
+# ENCODING
+# =============================================================================
+
+def _put_varint(out: bytearray, value: int):
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _get_varint(data: memoryview, pos: int) -> Tuple[int, int]:
+    result = shift = 0
+    while True:
+        if pos >= len(data):
+            raise ReplayError("Truncated varint")
+        byte = data[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return result, pos
+        shift += 7
+
+
+def _put_int(out: bytearray, value: int):
+    _put_varint(out, (value << 1) ^ (value >> 63))  # Zigzag: small negatives stay short
+
+
+def _get_int(data: memoryview, pos: int) -> Tuple[int, int]:
+    value, pos = _get_varint(data, pos)
+    return (value >> 1) ^ -(value & 1), pos
+
+
+def _put_str(out: bytearray, value: str):
+    raw = value.encode('utf-8')
+    _put_varint(out, len(raw))
+    out += raw
+
+
+def _get_str(data: memoryview, pos: int) -> Tuple[str, int]:
+    size, pos = _get_varint(data, pos)
+    return str(data[pos:pos + size], 'utf-8'), pos + size
+
+
+def pack_command(out: bytearray, cmd: Command):
+    """Append one command in packed form."""
+    flags = 0
+    if cmd.card_id is not None:
+        flags |= _F_CARD_ID
+    if cmd.position is not None:
+        flags |= _F_POSITION
+    if cmd.ability_id is not None:
+        flags |= _F_ABILITY_ID
+    if cmd.target_id is not None:
+        flags |= _F_TARGET_ID
+    if cmd.amount is not None:
+        flags |= _F_AMOUNT
+    if cmd.option is not None:
+        flags |= _F_OPTION
+    if cmd.confirmed is not None:
+        flags |= _F_CONFIRMED | (_F_CONFIRMED_TRUE if cmd.confirmed else 0)
+
+    _put_varint(out, _COMMAND_TYPES.index(cmd.type))
+    _put_varint(out, cmd.player)
+    out.append(flags)
+    if flags & _F_CARD_ID:
+        _put_int(out, cmd.card_id)
+    if flags & _F_POSITION:
+        _put_int(out, cmd.position)
+    if flags & _F_ABILITY_ID:
+        _put_str(out, cmd.ability_id)
+    if flags & _F_TARGET_ID:
+        _put_int(out, cmd.target_id)
+    if flags & _F_AMOUNT:
+        _put_int(out, cmd.amount)
+    if flags & _F_OPTION:
+        _put_str(out, cmd.option)
+
+
+def unpack_command(data: memoryview, pos: int) -> Tuple[Command, int]:
+    """Read one packed command starting at pos; returns it and the next position."""
+    type_index, pos = _get_varint(data, pos)
+    player, pos = _get_varint(data, pos)
+    if type_index >= len(_COMMAND_TYPES) or pos >= len(data):
+        raise ReplayError("Bad command record")
+    flags = data[pos]
+    pos += 1
+    fields: Dict[str, Any] = {}
+    if flags & _F_CARD_ID:
+        fields['card_id'], pos = _get_int(data, pos)
+    if flags & _F_POSITION:
+        fields['position'], pos = _get_int(data, pos)
+    if flags & _F_ABILITY_ID:
+        fields['ability_id'], pos = _get_str(data, pos)
+    if flags & _F_TARGET_ID:
+        fields['target_id'], pos = _get_int(data, pos)
+    if flags & _F_AMOUNT:
+        fields['amount'], pos = _get_int(data, pos)
+    if flags & _F_OPTION:
+        fields['option'], pos = _get_str(data, pos)
+    if flags & _F_CONFIRMED:
+        fields['confirmed'] = bool(flags & _F_CONFIRMED_TRUE)
+    return Command(_COMMAND_TYPES[type_index], player, **fields), pos
+
+
+def _compress(checkpoint: Dict[str, Any]) -> bytes:
+    return zlib.compress(json.dumps(checkpoint, separators=(',', ':')).encode('utf-8'))
+
+
+def state_hash(state: Dict[str, Any]) -> str:
+    """Hash of a full state, ignoring what only headless mode changes."""
+    state = {k: v for k, v in state.items() if k not in _UNVERIFIED_KEYS}
+    return hashlib.md5(json.dumps(state, sort_keys=True).encode()).hexdigest()[:16]
+
+
+# =============================================================================
+# REPLAY
+# =============================================================================
+
+@dataclass
+class Keyframe:
+    """Index entry of one keyframe; the checkpoint itself is decoded on demand."""
+    command_index: int   # Commands applied before this state
+    turn: int
+    offset: int          # Absolute file offset of the compressed blob
+
+
+@dataclass
+class Replay:
+    """A recorded match (header, commands and keyframe index)."""
+    header: Dict[str, Any]
+    commands: List[Command]
+    keyframes: List[Keyframe] = field(default_factory=list)
+    turn_starts: List[Tuple[int, int]] = field(default_factory=list)  # (turn, first command index)
+    _data: bytes = field(default=b'', repr=False)
+    _blobs: Dict[int, bytes] = field(default_factory=dict, repr=False)  # Keyframes not yet saved
+
+    @property
+    def seed(self) -> int:
+        return self.header['seed']
+
+    @property
+    def content_hash(self) -> str:
+        return self.header.get('content_hash', '')
+
+    # -------------------------------------------------------------------------
+    # Recording
+    # -------------------------------------------------------------------------
+
+    @classmethod
+    def record(cls, initial: Dict[str, Any], commands: Iterable[Command], seed: int,
+               keyframe_interval: int = KEYFRAME_INTERVAL, **meta) -> 'Replay':
+        """Build a replay by re-simulating from the initial checkpoint.
+
+        meta goes into the header (players, winner, ...); content_hash and
+        final_hash are filled in.
+        """
+        from .match import MatchServer, get_content_hash
+
+        server = MatchServer(seed=seed)
+        server.restore(initial)
+        commands = list(commands)
+        blobs = {0: _compress(initial)}
+        keyframes = [Keyframe(0, initial['state'].get('turn_number', 0), 0)]
+        turn_starts = [(server.game.turn_number, 0)]
+        for i, cmd in enumerate(commands, 1):
+            if not server.apply(cmd, include_snapshot=False).accepted:
+                raise ReplayError(f"Command {i} was rejected while recording: {cmd}")
+            if server.game.turn_number != turn_starts[-1][0]:
+                turn_starts.append((server.game.turn_number, i))
+            if i % keyframe_interval == 0:
+                # Compressed at once: checkpoint dicts share lists with the live game
+                blobs[i] = _compress(server.checkpoint())
+                keyframes.append(Keyframe(i, server.game.turn_number, 0))
+
+        header = {
+            'content_hash': get_content_hash(),
+            'seed': seed,
+            **meta,
+            'commands': len(commands),
+            'turns': server.game.turn_number,
+            'final_hash': state_hash(server.get_snapshot()),
+        }
+        return cls(header, commands, keyframes, turn_starts, _blobs=blobs)
+
+    # -------------------------------------------------------------------------
+    # Serialization
+    # -------------------------------------------------------------------------
+
+    def to_bytes(self) -> bytes:
+        out = bytearray(_PREAMBLE.size)
+        raw_header = json.dumps(self.header, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        _put_varint(out, len(raw_header))
+        out += raw_header
+
+        _put_varint(out, len(self.commands))
+        for cmd in self.commands:
+            pack_command(out, cmd)
+
+        keyframes = []
+        for keyframe in self.keyframes:
+            blob = self._blob(keyframe)
+            keyframes.append(Keyframe(keyframe.command_index, keyframe.turn, len(out)))
+            _put_varint(out, len(blob))
+            out += blob
+
+        index_offset = len(out)
+        _put_varint(out, len(keyframes))
+        for keyframe in keyframes:
+            _put_varint(out, keyframe.command_index)
+            _put_varint(out, keyframe.turn)
+            _put_varint(out, keyframe.offset)
+        _put_varint(out, len(self.turn_starts))
+        for turn, index in self.turn_starts:
+            _put_varint(out, turn)
+            _put_varint(out, index)
+
+        _PREAMBLE.pack_into(out, 0, MAGIC, VERSION, index_offset)
+        return bytes(out)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'Replay':
+        """Parse header, commands and index; keyframes stay compressed."""
+        if len(data) < _PREAMBLE.size:
+            raise ReplayError("Not a replay file")
+        magic, version, index_offset = _PREAMBLE.unpack_from(data)
+        if magic != MAGIC:
+            raise ReplayError("Not a replay file")
+        if version != VERSION:
+            raise ReplayError(f"Unsupported replay version {version}")
+
+        view = memoryview(data)
+        size, pos = _get_varint(view, _PREAMBLE.size)
+        header = json.loads(str(view[pos:pos + size], 'utf-8'))
+        count, pos = _get_varint(view, pos + size)
+        commands = []
+        for _ in range(count):
+            cmd, pos = unpack_command(view, pos)
+            commands.append(cmd)
+
+        count, pos = _get_varint(view, index_offset)
+        keyframes = []
+        for _ in range(count):
+            command_index, pos = _get_varint(view, pos)
+            turn, pos = _get_varint(view, pos)
+            offset, pos = _get_varint(view, pos)
+            keyframes.append(Keyframe(command_index, turn, offset))
+        count, pos = _get_varint(view, pos)
+        turn_starts = []
+        for _ in range(count):
+            turn, pos = _get_varint(view, pos)
+            index, pos = _get_varint(view, pos)
+            turn_starts.append((turn, index))
+        if not keyframes or keyframes[0].command_index != 0:
+            raise ReplayError("Replay has no initial keyframe")
+        return cls(header, commands, keyframes, turn_starts, _data=data)
+
+    def save(self, path: str):
+        with open(path, 'wb') as f:
+            f.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path: str) -> 'Replay':
+        with open(path, 'rb') as f:
+            return cls.from_bytes(f.read())
+
+    def _blob(self, keyframe: Keyframe) -> bytes:
+        blob = self._blobs.get(keyframe.command_index)
+        if blob is None:
+            view = memoryview(self._data)
+            size, pos = _get_varint(view, keyframe.offset)
+            blob = view[pos:pos + size]
+        return blob
+
+    def checkpoint(self, keyframe: Keyframe) -> Dict[str, Any]:
+        """Freshly decoded checkpoint of a keyframe (safe to hand to MatchServer.restore)."""
+        return json.loads(zlib.decompress(self._blob(keyframe)))
+
+    def keyframe_before(self, command_index: int) -> Keyframe:
+        """Latest keyframe at or before command_index."""
+        best = self.keyframes[0]
+        for keyframe in self.keyframes:
+            if keyframe.command_index > command_index:
+                break
+            best = keyframe
+        return best
+
+    def turn_of(self, command_index: int) -> int:
+        """Turn in which the state after command_index commands is."""
+        i = bisect.bisect_right(self.turn_starts, command_index, key=lambda start: start[1])
+        return self.turn_starts[max(0, i - 1)][0] if self.turn_starts else 0
+
+    def turn_start(self, turn: int) -> int:
+        """Index of the first command played in turn (clamped to the recorded turns)."""
+        index = 0
+        for start_turn, start_index in self.turn_starts:
+            if start_turn > turn:
+                break
+            index = start_index
+        return index
+
+
+# =============================================================================
+# PLAYBACK
+# =============================================================================
+
+class ReplayPlayer:
+    """Steps and seeks through a replay on a private MatchServer.
+
+    With cache_turns=True the state at every turn start reached by
+    stepping is kept (compressed), so scrubbing back to a seen turn is a
+    single restore.
+    """
+
+    def __init__(self, replay: Replay, headless: bool = False, cache_turns: bool = False):
+        from .match import MatchServer
+
+        self.replay = replay
+        self.server = MatchServer(headless=headless, seed=replay.seed)
+        self.position = 0  # Commands applied so far
+        self.cache_turns = cache_turns
+        self._turn_starts = {index for _, index in replay.turn_starts}
+        self._cache: Dict[int, bytes] = {}  # Command index -> compressed checkpoint
+        self._load(0, replay.checkpoint(replay.keyframes[0]))
+
+    @property
+    def game(self) -> Game:
+        return self.server.game
+
+    @property
+    def length(self) -> int:
+        return len(self.replay.commands)
+
+    @property
+    def at_end(self) -> bool:
+        return self.position >= self.length
+
+    @property
+    def turn(self) -> int:
+        return self.game.turn_number
+
+    def _load(self, command_index: int, checkpoint: Dict[str, Any]):
+        self.server.restore(checkpoint, self.replay.commands[:command_index])
+        self.position = command_index
+
+    def step(self) -> List[Event]:
+        """Apply the next command; its events (empty at the end)."""
+        if self.at_end:
+            return []
+        cmd = self.replay.commands[self.position]
+        result = self.server.apply(cmd, include_snapshot=False)
+        if not result.accepted:
+            raise ReplayError(f"Command {self.position + 1} rejected on replay: {result.error}")
+        self.position += 1
+        if self.cache_turns and self.position in self._turn_starts and self.position not in self._cache:
+            self._cache[self.position] = _compress(self.server.checkpoint())
+        return result.events
+
+    def seek(self, command_index: int) -> Game:
+        """State after command_index commands; restores the nearest saved state unless stepping forward is shorter."""
+        command_index = max(0, min(command_index, self.length))
+        keyframe = self.replay.keyframe_before(command_index)
+        start = max((i for i in self._cache if i <= command_index), default=0)
+        if start <= keyframe.command_index:
+            start = keyframe.command_index
+        if not (start <= self.position <= command_index):
+            if start in self._cache and start != keyframe.command_index:
+                self._load(start, json.loads(zlib.decompress(self._cache[start])))
+            else:
+                self._load(start, self.replay.checkpoint(keyframe))
+        while self.position < command_index:
+            self.step()
+        return self.game
+
+    def seek_turn(self, turn: int) -> Game:
+        """State at the start of turn."""
+        return self.seek(self.replay.turn_start(turn))
+
+    def verify(self) -> Optional[str]:
+        """Re-simulate headless from the initial keyframe; None if every keyframe and the end match."""
+        from .match import MatchServer, get_content_hash
+
+        replay = self.replay
+        if replay.content_hash and replay.content_hash != get_content_hash():
+            return "recorded with different game content"
+        server = MatchServer(headless=True, seed=replay.seed)
+        server.restore(replay.checkpoint(replay.keyframes[0]))
+        keyframes = {kf.command_index: kf for kf in replay.keyframes[1:]}
+        for i, cmd in enumerate(replay.commands, 1):
+            if not server.apply(cmd, include_snapshot=False).accepted:
+                return f"command {i} rejected"
+            keyframe = keyframes.get(i)
+            if keyframe is not None and (
+                    state_hash(server.get_snapshot()) != state_hash(replay.checkpoint(keyframe)['state'])):
+                return f"state diverges before keyframe at command {i}"
+        if state_hash(server.get_snapshot()) != replay.header.get('final_hash'):
+            return "final state differs"
+        return None
+
+
+def list_replays(directory: str) -> List[str]:
+    """Replay files in directory, newest first."""
+    import os
+    try:
+        names = [n for n in os.listdir(directory) if n.endswith(REPLAY_SUFFIX)]
+    except OSError:
+        return []
+    paths = [os.path.join(directory, n) for n in names]
+    return sorted(paths, key=os.path.getmtime, reverse=True)
+
+
+def verify_file(path: str) -> Optional[str]:
+    """Verify one replay file; None if it replays exactly."""
+    try:
+        return ReplayPlayer(Replay.load(path), headless=True).verify()
+    except (OSError, ReplayError, ValueError, KeyError) as e:
+        return f"{type(e).__name__}: {e}"
+
+
+def verify_replays(paths: List[str], workers: int = 0) -> Dict[str, Optional[str]]:
+    """Verify many replays, optionally across worker processes; path -> error or None."""
+    if workers > 0:
+        import multiprocessing
+        with multiprocessing.get_context('spawn').Pool(workers) as pool:
+            return dict(zip(paths, pool.map(verify_file, paths, chunksize=16)))
+    return {path: verify_file(path) for path in paths}
+
+
+def main():
+    import argparse
+    import glob
+    import time
+
+    parser = argparse.ArgumentParser(description='Inspect and verify replay files')
+    sub = parser.add_subparsers(dest='action', required=True)
+    info = sub.add_parser('info', help='Print a replay header')
+    info.add_argument('path')
+    verify = sub.add_parser('verify', help='Re-simulate replays and check every keyframe')
+    verify.add_argument('paths', nargs='+', help='Files or glob patterns')
+    verify.add_argument('--workers', type=int, default=0, help='Worker processes (0 = this process)')
+    args = parser.parse_args()
+
+    if args.action == 'info':
+        replay = Replay.load(args.path)
+        print(json.dumps(replay.header, ensure_ascii=False, indent=2))
+        print(f"{len(replay.commands)} commands, {len(replay.keyframes)} keyframes, "
+              f"{len(replay.turn_starts)} turns")
+        return
+
+    paths = [p for pattern in args.paths for p in (sorted(glob.glob(pattern)) or [pattern])]
+    start = time.perf_counter()
+    results = verify_replays(paths, args.workers)
+    failed = {path: error for path, error in results.items() if error}
+    for path, error in failed.items():
+        print(f"FAIL {path}: {error}")
+    print(f"{len(paths) - len(failed)}/{len(paths)} replays verified in {time.perf_counter() - start:.1f}s")
+    raise SystemExit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
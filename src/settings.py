@@ -7,6 +7,7 @@ from typing import Tuple, Optional
 # Settings file location (in user's home directory)
 SETTINGS_DIR = Path.home() / ".berserk_vibe"
 SETTINGS_FILE = SETTINGS_DIR / "settings.json"
+REPLAYS_DIR = SETTINGS_DIR / "replays"    # Replays of finished local games
 
 # Default settings
 DEFAULT_SETTINGS = {
@@ -14,6 +15,7 @@ DEFAULT_SETTINGS = {
     "fullscreen": False,
     "nickname": "",
     "sound_enabled": True,
+    "predict_commands": False,
 }
 
 
@@ -102,3 +104,9 @@ def set_sound_enabled(enabled: bool):
     settings = load_settings()
     settings["sound_enabled"] = enabled
     save_settings(settings)
+
+
+def get_predict_commands() -> bool:
+    """Get saved setting for local prediction of network commands."""
+    settings = load_settings()
+    return settings.get("predict_commands", False)
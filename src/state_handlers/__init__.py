@@ -14,6 +14,7 @@ from .squad_place import SquadPlaceHandler
 from .game_handler import GameHandler
 from .network_lobby import NetworkLobbyHandler
 from .network_game import NetworkGameHandler
+from .replay_viewer import ReplayHandler
 
 __all__ = [
     'StateHandler',
@@ -25,4 +26,5 @@ __all__ = [
     'GameHandler',
     'NetworkLobbyHandler',
     'NetworkGameHandler',
+    'ReplayHandler',
 ]
@@ -310,9 +310,28 @@ class GameHandler(StateHandler):
         if game.phase == GamePhase.GAME_OVER and not renderer.game_over_popup:
             winner = game.board.check_winner()
             renderer.show_game_over_popup(winner if winner is not None else 0)
+            self._save_replay()
 
         return None
 
+    def _save_replay(self):
+        """Save the finished game to the replays folder (seeded games only)."""
+        import time
+        from ..replay import REPLAY_SUFFIX, ReplayError
+        from ..settings import REPLAYS_DIR
+
+        server = self.ctx.server
+        if not server or server.seed is None:
+            return
+        renderer = self.ctx.renderer
+        players = {1: renderer.ai_name_p1 or "Игрок 1", 2: renderer.ai_name_p2 or "Игрок 2"}
+        try:
+            replay = server.replay(players=players)
+            REPLAYS_DIR.mkdir(parents=True, exist_ok=True)
+            replay.save(str(REPLAYS_DIR / f"{time.strftime('%Y%m%d-%H%M%S')}{REPLAY_SUFFIX}"))
+        except (OSError, ReplayError) as e:
+            print(f"Failed to save replay: {e}")
+
     def _update_ai(self):
         """Let AI take action if it's AI's turn."""
         # Determine which AI should act
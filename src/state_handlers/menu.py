@@ -1,6 +1,7 @@
 """Menu state handler."""
 
 import random
+import secrets
 import time
 import pygame
 from typing import Optional, TYPE_CHECKING
@@ -152,6 +153,9 @@ class MenuHandler(StateHandler):
         elif btn == 'network_game':
             return AppState.NETWORK_LOBBY
 
+        elif btn == 'replays':
+            return AppState.REPLAY
+
         elif btn == 'settings':
             return AppState.SETTINGS
 
@@ -250,7 +254,6 @@ class MenuHandler(StateHandler):
         from ..match import MatchServer, LocalMatchClient
         from ..ai import RandomAI, RuleBasedAI, UtilityAI, build_ai_squad
         from ..card_database import create_starter_deck, create_starter_deck_p2
-        from ..game import Game
         from ..deck_builder import DeckBuilder
         from ..deck_builder_renderer import DeckBuilderRenderer
         from ..app_context import create_local_game_state
@@ -287,13 +290,11 @@ class MenuHandler(StateHandler):
         squad_names_p1, placement_p1 = build_ai_squad(player=1, deck_cards=deck_p1)
         squad_names_p2, placement_p2 = build_ai_squad(player=2, deck_cards=deck_p2)
 
-        server = MatchServer()
-        game = Game()
-        server.game = game
-
+        # Seeded so the finished game can be saved as a replay
+        server = MatchServer(seed=secrets.randbits(32))
         p1_cards = list(placement_p1.values())
         p2_cards = list(placement_p2.values())
-        game.setup_game_with_placement(p1_cards, p2_cards)
+        server.setup_with_placement(p1_cards, p2_cards)
 
         client_p1 = LocalMatchClient(server, player=1)
         client_p2 = LocalMatchClient(server, player=2)
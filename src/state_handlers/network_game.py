@@ -302,8 +302,15 @@ class NetworkGameHandler(StateHandler):
 
     def _send_command(self, cmd) -> bool:
         """Send a command to the network client."""
-        if self.ctx.network_client:
-            self.ctx.network_client.send_command(cmd)
+        network_client = self.ctx.network_client
+        if network_client:
+            network_client.send_command(cmd)
+            # Show a locally predicted result right away
+            if network_client.game is not None and network_client.game is not self.ctx.network_game:
+                self.ctx.network_game = network_client.game
+                if self.ctx.network_game_client:
+                    self.ctx.network_game_client.game = network_client.game
+                    self.ctx.network_game_client.refresh_selection()
             return True
         return False
 
@@ -435,6 +442,14 @@ class NetworkGameHandler(StateHandler):
         text_y = btn_y + (btn_h - text_surface.get_height()) // 2
         renderer.screen.blit(text_surface, (text_x, text_y))
 
+        # Connection quality below the button
+        network_client = self.ctx.network_client
+        if network_client and network_client.ping_ms is not None:
+            jitter_ms = round(network_client.rtt.jitter * 1000)
+            ping_surface = renderer.font_small.render(
+                f"Пинг: {network_client.ping_ms} мс (±{jitter_ms})", True, UILayout.DRAW_BUTTON_WAITING_TEXT)
+            renderer.screen.blit(ping_surface, (btn_x, btn_y + btn_h + 6))
+
     def on_enter(self) -> None:
         """Called when entering network game state."""
         self.ctx.show_pause_menu = False
@@ -74,7 +74,9 @@ class NetworkLobbyHandler(StateHandler):
         def on_game_start(player: int, snapshot: dict):
             """Called when game actually starts."""
             ctx.network_player = player
-            ctx.network_game = Game.from_dict(snapshot)
+            client = ctx.network_ui.client
+            # The client already built the Game on its network thread
+            ctx.network_game = client.game if client and client.game else Game.from_dict(snapshot)
             ctx.network_game_client = GameClient(ctx.network_game, player)
             ctx.network_client = ctx.network_ui.client
             ctx.network_prep_state = None
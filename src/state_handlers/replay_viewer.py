@@ -0,0 +1,444 @@
+"""Replay viewer state handler."""
+
+import os
+import pygame
+from typing import Any, Dict, List, Optional, Tuple, TYPE_CHECKING
+
+from .base import StateHandler
+from .helpers import handle_game_scroll, process_game_events
+from ..constants import UILayout, scaled
+
+if TYPE_CHECKING:
+    from ..app_context import AppContext
+    from ..constants import AppState
+    from ..replay import ReplayPlayer
+    from ..ui_state import GameClient
+
+SPEEDS = (0.5, 1.0, 2.0, 4.0, 8.0)  # Playback speed multipliers
+ACTIONS_PER_SECOND = 2.0            # Commands shown per second at x1
+MAX_STEPS_PER_FRAME = 8
+
+
+class ReplayHandler(StateHandler):
+    """Handler for the replay viewer.
+
+    Handles:
+    - List of saved replays (newest first)
+    - Play/pause, stepping and playback speed
+    - Turn-level scrub bar (seeks from keyframes and cached turn starts)
+    - Card popups and side panel scrolling, as in spectator mode
+    """
+
+    def __init__(self, ctx: 'AppContext'):
+        super().__init__(ctx)
+        self.entries: List[Tuple[str, Dict[str, Any]]] = []  # (path, header)
+        self.list_rects: List[Tuple[int, pygame.Rect]] = []
+        self.back_rect: Optional[pygame.Rect] = None
+        self.error: Optional[str] = None
+
+        self.player: Optional['ReplayPlayer'] = None
+        self.client: Optional['GameClient'] = None
+        self.players: Dict[int, str] = {}
+        self.playing = False
+        self.speed_index = 1
+        self.buttons: List[Tuple[str, pygame.Rect]] = []
+        self.scrub_rect: Optional[pygame.Rect] = None
+        self.scrubbing = False
+        self._clock = 0.0
+        self._dt = 0.016
+
+    # =========================================================================
+    # LOADING
+    # =========================================================================
+
+    def _scan(self):
+        """Read the headers of the newest replays."""
+        from ..replay import Replay, ReplayError, list_replays
+        from ..settings import REPLAYS_DIR
+
+        self.entries = []
+        for path in list_replays(str(REPLAYS_DIR))[:UILayout.REPLAY_LIST_ROWS]:
+            try:
+                self.entries.append((path, Replay.load(path).header))
+            except (OSError, ReplayError, ValueError) as e:
+                print(f"Skipping replay {path}: {e}")
+
+    def _open(self, path: str):
+        """Load a replay and show its first state."""
+        from ..match import get_content_hash
+        from ..replay import Replay, ReplayError, ReplayPlayer
+        from ..ui_state import GameClient
+
+        try:
+            replay = Replay.load(path)
+            if replay.content_hash and replay.content_hash != get_content_hash():
+                self.error = "Повтор записан другой версией игры"
+                return
+            self.player = ReplayPlayer(replay, cache_turns=True)
+        except (OSError, ReplayError, ValueError, KeyError) as e:
+            print(f"Failed to open replay {path}: {e}")
+            self.error = "Не удалось открыть повтор"
+            return
+
+        self.error = None
+        self.players = {int(p): name for p, name in replay.header.get('players', {}).items()}
+        self.client = GameClient(self.player.game, player=1)
+        self.playing = False
+        self._clock = 0.0
+        self.ctx.renderer.clear_all_effects()
+
+    def _close(self):
+        """Back to the replay list."""
+        self.player = None
+        self.client = None
+        self.playing = False
+        self.scrubbing = False
+        self.ctx.renderer.hide_popup()
+        self.ctx.renderer.clear_all_effects()
+
+    # =========================================================================
+    # PLAYBACK
+    # =========================================================================
+
+    @property
+    def speed(self) -> float:
+        return SPEEDS[self.speed_index]
+
+    def _sync_client(self):
+        """Point the GameClient at the player's current Game (replaced on every restore)."""
+        self.client.game = self.player.game
+
+    def _seek(self, command_index: int):
+        from ..replay import ReplayError
+
+        try:
+            self.player.seek(command_index)
+        except ReplayError as e:
+            print(f"Replay seek failed: {e}")
+            self.error = "Повтор повреждён"
+            self.playing = False
+        self._sync_client()
+        self.ctx.renderer.clear_all_effects()
+
+    def _seek_turn_offset(self, offset: int):
+        """Jump to the start of the turn offset turns away from the current one."""
+        turns = self.player.replay.turn_starts
+        current = self.player.replay.turn_of(self.player.position)
+        index = next((i for i, (turn, _) in enumerate(turns) if turn == current), 0)
+        # Going back from the middle of a turn first rewinds to its start
+        if offset < 0 and self.player.position != turns[index][1]:
+            offset += 1
+        index = max(0, min(len(turns) - 1, index + offset))
+        self._seek(turns[index][1])
+
+    def _step(self) -> bool:
+        """Show the next command with its effects; False at the end."""
+        from ..replay import ReplayError
+
+        if self.player.at_end:
+            return False
+        try:
+            events = self.player.step()
+        except ReplayError as e:
+            print(f"Replay step failed: {e}")
+            self.error = "Повтор повреждён"
+            return False
+        self._sync_client()
+        process_game_events(self.player.game, self.ctx.renderer, events)
+        return True
+
+    def _scrub_to(self, mx: int):
+        """Seek to the turn under mx on the scrub bar."""
+        turns = self.player.replay.turn_starts
+        if not turns or not self.scrub_rect:
+            return
+        fraction = (mx - self.scrub_rect.x) / max(1, self.scrub_rect.width)
+        index = max(0, min(len(turns) - 1, int(fraction * len(turns))))
+        if turns[index][1] != self.player.position:
+            self._seek(turns[index][1])
+
+    # =========================================================================
+    # EVENTS
+    # =========================================================================
+
+    def handle_event(self, event: pygame.event.Event) -> Optional['AppState']:
+        """Handle replay list and viewer events."""
+        from ..constants import AppState
+
+        renderer = self.ctx.renderer
+
+        if event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_ESCAPE:
+                if renderer.popup_card:
+                    renderer.hide_popup()
+                elif self.player:
+                    self._close()
+                else:
+                    return AppState.MENU
+                return None
+            if self.player:
+                self._handle_viewer_key(event.key)
+            return None
+
+        elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+            mx, my = renderer.screen_to_game_coords(*event.pos)
+            if not self.player:
+                return self._handle_list_click(mx, my)
+            self._handle_viewer_click(mx, my)
+            return None
+
+        elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 3 and self.player:
+            mx, my = renderer.screen_to_game_coords(*event.pos)
+            card = renderer.get_card_at_screen_pos(self.player.game, mx, my)
+            if card is None:
+                card = renderer.get_graveyard_card_at_pos(self.player.game, mx, my)
+            if card:
+                renderer.show_popup(card)
+            return None
+
+        elif event.type == pygame.MOUSEBUTTONUP and event.button == 1:
+            self.scrubbing = False
+            renderer.stop_popup_drag()
+            renderer.stop_log_scrollbar_drag()
+            return None
+
+        elif event.type == pygame.MOUSEMOTION and self.player:
+            mx, my = renderer.screen_to_game_coords(*event.pos)
+            if self.scrubbing:
+                self._scrub_to(mx)
+            if renderer.dragging_popup:
+                renderer.drag_popup(mx, my)
+            renderer.drag_log_scrollbar(my)
+            return None
+
+        elif event.type == pygame.MOUSEWHEEL and self.player:
+            mx, my = renderer.screen_to_game_coords(*pygame.mouse.get_pos())
+            handle_game_scroll(self.player.game, self.client, renderer, mx, my, event.y)
+            return None
+
+        return None
+
+    def _handle_viewer_key(self, key: int):
+        """Keyboard controls of the viewer."""
+        if key == pygame.K_SPACE:
+            self._toggle_play()
+        elif key == pygame.K_RIGHT:
+            self.playing = False
+            self._step()
+        elif key == pygame.K_LEFT:
+            self.playing = False
+            self._seek(self.player.position - 1)
+        elif key == pygame.K_PAGEUP:
+            self._seek_turn_offset(-1)
+        elif key == pygame.K_PAGEDOWN:
+            self._seek_turn_offset(1)
+        elif key == pygame.K_HOME:
+            self._seek(0)
+        elif key == pygame.K_END:
+            self._seek(self.player.length)
+        elif key in (pygame.K_UP, pygame.K_EQUALS, pygame.K_KP_PLUS):
+            self.speed_index = min(len(SPEEDS) - 1, self.speed_index + 1)
+        elif key in (pygame.K_DOWN, pygame.K_MINUS, pygame.K_KP_MINUS):
+            self.speed_index = max(0, self.speed_index - 1)
+        elif key == pygame.K_TAB:
+            self.client.ui.viewing_player = 2 if self.client.ui.viewing_player == 1 else 1
+
+    def _toggle_play(self):
+        if self.player.at_end:
+            self._seek(0)
+        self.playing = not self.playing
+        self._clock = 0.0
+
+    def _handle_list_click(self, mx: int, my: int) -> Optional['AppState']:
+        """Click on the replay list."""
+        from ..constants import AppState
+
+        if self.back_rect and self.back_rect.collidepoint(mx, my):
+            return AppState.MENU
+        for index, rect in self.list_rects:
+            if rect.collidepoint(mx, my):
+                self._open(self.entries[index][0])
+                break
+        return None
+
+    def _handle_viewer_click(self, mx: int, my: int):
+        """Click in the viewer: popup, control buttons or scrub bar."""
+        renderer = self.ctx.renderer
+        if renderer.popup_card:
+            renderer.hide_popup()
+            return
+        if self.scrub_rect and self.scrub_rect.inflate(0, scaled(8)).collidepoint(mx, my):
+            self.scrubbing = True
+            self.playing = False
+            self._scrub_to(mx)
+            return
+        btn = next((btn_id for btn_id, rect in self.buttons if rect.collidepoint(mx, my)), None)
+        if btn == 'play':
+            self._toggle_play()
+        elif btn == 'prev_turn':
+            self._seek_turn_offset(-1)
+        elif btn == 'next_turn':
+            self._seek_turn_offset(1)
+        elif btn == 'slower':
+            self.speed_index = max(0, self.speed_index - 1)
+        elif btn == 'faster':
+            self.speed_index = min(len(SPEEDS) - 1, self.speed_index + 1)
+        elif btn == 'flip':
+            self.client.ui.viewing_player = 2 if self.client.ui.viewing_player == 1 else 1
+        elif btn == 'close':
+            self._close()
+        else:
+            renderer.handle_side_panel_click(mx, my)
+
+    # =========================================================================
+    # UPDATE / RENDER
+    # =========================================================================
+
+    def update(self, dt: float) -> Optional['AppState']:
+        """Advance playback."""
+        self._dt = dt
+        if not self.player or not self.playing:
+            return None
+        self._clock += dt * ACTIONS_PER_SECOND * self.speed
+        steps = min(int(self._clock), MAX_STEPS_PER_FRAME)
+        self._clock -= int(self._clock)
+        for _ in range(steps):
+            if not self._step():
+                self.playing = False
+                break
+        return None
+
+    def render(self) -> None:
+        """Render the replay list or the game with playback controls."""
+        if not self.player:
+            self._render_list()
+            return
+
+        renderer = self.ctx.renderer
+        game = self.player.game
+        renderer.draw(game, self._dt, self.client.ui, skip_flip=True)
+        self._draw_controls(renderer)
+
+        def draw_native_ui(w, c):
+            renderer.draw_ui_native(game)
+        renderer.finalize_frame(native_ui_callback=draw_native_ui)
+
+    def _render_list(self):
+        """Draw the list of saved replays."""
+        from ..constants import COLOR_BG, COLOR_TEXT
+        from ..ui import draw_button_simple
+
+        renderer = self.ctx.renderer
+        screen = renderer.screen
+        screen.fill(COLOR_BG)
+
+        x = scaled(UILayout.REPLAY_LIST_X)
+        y = scaled(UILayout.REPLAY_LIST_Y)
+        width = scaled(UILayout.REPLAY_LIST_WIDTH)
+        row_height = scaled(UILayout.REPLAY_LIST_ROW_HEIGHT)
+
+        title = renderer.font_large.render("Повторы", True, COLOR_TEXT)
+        screen.blit(title, (x, y - title.get_height() - scaled(15)))
+
+        self.list_rects = []
+        for i, (path, header) in enumerate(self.entries):
+            rect = pygame.Rect(x, y + i * row_height, width, row_height - scaled(6))
+            draw_button_simple(screen, rect, self._describe(path, header), renderer.font_small)
+            self.list_rects.append((i, rect))
+
+        if not self.entries:
+            empty = renderer.font_medium.render("Нет сохранённых повторов", True, (150, 150, 160))
+            screen.blit(empty, (x, y))
+
+        if self.error:
+            error = renderer.font_small.render(self.error, True, (255, 120, 120))
+            screen.blit(error, (x, y + UILayout.REPLAY_LIST_ROWS * row_height))
+
+        self.back_rect = pygame.Rect(x, y + (UILayout.REPLAY_LIST_ROWS + 1) * row_height,
+                                     scaled(160), scaled(UILayout.REPLAY_BUTTON_HEIGHT))
+        draw_button_simple(screen, self.back_rect, "Назад", renderer.font_medium)
+        renderer.finalize_frame()
+
+    def _describe(self, path: str, header: Dict[str, Any]) -> str:
+        """One-line summary of a replay for the list."""
+        players = header.get('players', {})
+        p1, p2 = players.get('1', "Игрок 1"), players.get('2', "Игрок 2")
+        winner = header.get('winner', 0)
+        result = f"победа: {players.get(str(winner), winner)}" if winner else "ничья"
+        name = os.path.splitext(os.path.basename(path))[0]
+        return f"{name}   {p1} — {p2}   ходов: {header.get('turns', '?')}   {result}"
+
+    def _draw_controls(self, renderer):
+        """Draw the playback panel on the left side."""
+        from ..constants import COLOR_TEXT
+        from ..ui import draw_button_simple
+
+        screen = renderer.screen
+        player = self.player
+        replay = player.replay
+        x = scaled(UILayout.REPLAY_PANEL_X)
+        y = scaled(UILayout.REPLAY_PANEL_Y)
+        width = scaled(UILayout.REPLAY_PANEL_WIDTH)
+        line = scaled(UILayout.REPLAY_LINE_HEIGHT)
+        button_h = scaled(UILayout.REPLAY_BUTTON_HEIGHT)
+        gap = scaled(4)
+
+        last_turn = replay.turn_starts[-1][0] if replay.turn_starts else 0
+        lines = [
+            f"{self.players.get(1, 'Игрок 1')} — {self.players.get(2, 'Игрок 2')}",
+            f"Ход {replay.turn_of(player.position)} из {last_turn}",
+            f"Действие {player.position} из {player.length}",
+            f"Скорость x{self.speed:g}",
+        ]
+        panel_h = len(lines) * line + 3 * (button_h + gap) + scaled(UILayout.REPLAY_SCRUB_HEIGHT) + 6 * gap
+        pygame.draw.rect(screen, UILayout.REPLAY_PANEL_BG,
+                         pygame.Rect(x - gap, y - gap, width + 2 * gap, panel_h + 2 * gap))
+
+        for text in lines:
+            screen.blit(renderer.font_small.render(text, True, COLOR_TEXT), (x, y))
+            y += line
+
+        # Scrub bar: one segment per turn
+        y += gap
+        self.scrub_rect = pygame.Rect(x, y, width, scaled(UILayout.REPLAY_SCRUB_HEIGHT))
+        pygame.draw.rect(screen, UILayout.REPLAY_SCRUB_BG, self.scrub_rect)
+        turns = replay.turn_starts
+        if turns:
+            index = next((i for i, (turn, _) in enumerate(turns) if turn == player.turn), 0)
+            fill = pygame.Rect(x, y, width * (index + 1) // len(turns), self.scrub_rect.height)
+            pygame.draw.rect(screen, UILayout.REPLAY_SCRUB_FILL, fill)
+            if len(turns) <= width // 4:
+                for i in range(1, len(turns)):
+                    tick_x = x + width * i // len(turns)
+                    pygame.draw.line(screen, UILayout.REPLAY_SCRUB_TICK,
+                                     (tick_x, y), (tick_x, y + self.scrub_rect.height - 1))
+        y += self.scrub_rect.height + 2 * gap
+
+        rows = [
+            [('prev_turn', "<<"), ('play', "Пауза" if self.playing else "Пуск"), ('next_turn', ">>")],
+            [('slower', "-"), ('flip', "Сторона"), ('faster', "+")],
+            [('close', "К списку")],
+        ]
+        self.buttons = []
+        for row in rows:
+            button_w = (width - gap * (len(row) - 1)) // len(row)
+            for i, (btn_id, text) in enumerate(row):
+                rect = pygame.Rect(x + i * (button_w + gap), y, button_w, button_h)
+                draw_button_simple(screen, rect, text, renderer.font_small)
+                self.buttons.append((btn_id, rect))
+            y += button_h + gap
+
+        if self.error:
+            screen.blit(renderer.font_small.render(self.error, True, (255, 120, 120)), (x, y + gap))
+
+    def on_enter(self) -> None:
+        """Called when entering the replay viewer: refresh the list."""
+        self.error = None
+        self._close()
+        self._scan()
+        self.ctx.renderer.hide_game_over_popup()
+
+    def on_exit(self) -> None:
+        """Called when leaving the replay viewer."""
+        self._close()
+        self.entries = []
@@ -1,6 +1,7 @@
 """Squad placement state handler."""
 
 import random
+import secrets
 import time
 import pygame
 from typing import Optional, TYPE_CHECKING
@@ -125,7 +126,7 @@ class SquadPlaceHandler(StateHandler):
                     ai_cards = list(ai_placement.values())
 
                     # Start the game
-                    server = MatchServer()
+                    server = MatchServer(seed=secrets.randbits(32))
                     server.setup_with_placement(placed_cards, ai_cards)
 
                     client_p1 = LocalMatchClient(server, player=1)
@@ -170,7 +171,7 @@ class SquadPlaceHandler(StateHandler):
             else:
                 self.ctx.local_game_state['placed_cards_p2'] = placed_cards
                 # Start the game!
-                server = MatchServer()
+                server = MatchServer(seed=secrets.randbits(32))
                 server.setup_with_placement(
                     self.ctx.local_game_state['placed_cards_p1'],
                     self.ctx.local_game_state['placed_cards_p2']
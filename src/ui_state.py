@@ -150,7 +150,7 @@ def compute_valid_moves(game: 'Game', card_id: int) -> List[int]:
     card = game.get_card_by_id(card_id)
     if card is None or not card.can_act:
         return []
-    return game.board.get_valid_moves(card)
+    return list(game.legal_commands(card.player).moves_for(card_id))
 
 
 def compute_attack_targets(game: 'Game', card_id: int) -> List[int]:
@@ -161,7 +161,7 @@ def compute_attack_targets(game: 'Game', card_id: int) -> List[int]:
     card = game.get_card_by_id(card_id)
     if card is None:
         return []
-    return game.get_attack_targets(card)
+    return list(game.legal_commands(card.player).attacks_for(card_id))
 
 
 def compute_forced_attacks(game: 'Game', card_id: int) -> List[int]:
@@ -1,12 +1,24 @@
 """Pytest fixtures for Berserk game testing."""
+import asyncio
+import random
+import socket
 import pytest
-from typing import Optional, List
+from typing import Callable, Dict, Optional, List, Tuple
 
+from simulate import create_random_deck
+from src.ai import RuleBasedAI, build_ai_squad
 from src.game import Game
 from src.card import Card
 from src.board import Board
 from src.card_database import CARD_DATABASE
+from src.commands import Command
 from src.constants import GamePhase
+from src.match import MatchServer
+from src.network.protocol import (
+    FrameReader, Message, MessageType, msg_hello, msg_create_match, msg_join_match,
+    msg_player_ready, msg_placement_done,
+)
+from src.network.workers import start_match_server
 
 
 @pytest.fixture
@@ -147,6 +159,140 @@ def korpit(place_card) -> Card:
     return place_card("Корпит", player=1, pos=30)  # Flying P1 slot 0
 
 
+# =============================================================================
+# MATCH AND NETWORK FIXTURES
+# =============================================================================
+
+@pytest.fixture(scope='session')
+def match_setup():
+    """Factory fixture for a reproducible match setup (AI-built squads).
+
+    Returns the dict GameServer journals: host/guest squads and placed cards.
+
+    Usage:
+        setup = match_setup(3)
+        server = start_match(setup, seed=7)
+    """
+    def _setup(seed: int) -> dict:
+        rng = random.Random(seed)
+        squads = {p: build_ai_squad(p, create_random_deck(rng)) for p in (1, 2)}
+        return {
+            'host_squad': squads[1][0],
+            'guest_squad': squads[2][0],
+            'host_placed_cards': [card.to_dict() for card in squads[1][1].values()],
+            'guest_placed_cards': [card.to_dict() for card in squads[2][1].values()],
+        }
+    return _setup
+
+
+@pytest.fixture(scope='session')
+def start_match():
+    """Factory fixture to start a MatchServer from a match_setup() dict."""
+    def _start(setup: dict, seed: Optional[int] = None) -> MatchServer:
+        server = MatchServer(seed=seed)
+        start_match_server(server, setup['host_squad'], setup['guest_squad'],
+                           setup['host_placed_cards'], setup['guest_placed_cards'])
+        return server
+    return _start
+
+
+@pytest.fixture(scope='session')
+def play_ai():
+    """Factory fixture letting two trusted RuleBasedAIs play a started match.
+
+    Usage:
+        accepted = play_ai(server, 60)  # Up to 60 accepted commands
+    """
+    def _play(server: MatchServer, count: int) -> List[Command]:
+        ais = {p: RuleBasedAI(server, p, seed=p, trusted=True) for p in (1, 2)}
+        accepted = []
+        while len(accepted) < count and server.game.phase == GamePhase.MAIN:
+            ai = next((ai for ai in ais.values() if ai.is_my_turn()), None)
+            action = ai.choose_action() if ai else None
+            if action is None:
+                break
+            if server.apply(action.command, include_snapshot=False).accepted:
+                accepted.append(action.command)
+        return accepted
+    return _play
+
+
+@pytest.fixture(scope='session')
+def free_port():
+    """Factory fixture returning a free local TCP port on each call."""
+    def _port() -> int:
+        with socket.socket() as s:
+            s.bind(('127.0.0.1', 0))
+            return s.getsockname()[1]
+    return _port
+
+
+# (writer, expect) pair of a raw protocol connection
+RawClient = Tuple[asyncio.StreamWriter, Callable]
+
+
+class RawClients:
+    """Raw protocol connections to a GameServer, for use inside a test's event loop."""
+
+    def __init__(self):
+        self.writers: List[asyncio.StreamWriter] = []
+
+    async def connect(self, port: int, name: Optional[str] = None) -> RawClient:
+        """Connect (and say hello as name); expect(msg_type) skips other messages."""
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        self.writers.append(writer)
+        frames = FrameReader()
+
+        async def expect(msg_type: MessageType) -> Message:
+            while True:
+                msg = frames.get_message()
+                if msg is None:
+                    frames.feed(await reader.read(65536))
+                elif msg.type == msg_type:
+                    return msg
+        if name is not None:
+            writer.write(msg_hello(name, "").to_bytes())
+        return writer, expect
+
+    async def place_match(self, port: int, setup: dict) -> Tuple[str, Dict[int, RawClient]]:
+        """Host and Guest create, join, ready and place a match_setup() match.
+
+        Returns the match id and both players' clients.
+        """
+        clients = {1: await self.connect(port, "Host"), 2: await self.connect(port, "Guest")}
+        (host, host_expect), (guest, _) = clients[1], clients[2]
+        host.write(msg_create_match(setup['host_squad']).to_bytes())
+        match_id = (await host_expect(MessageType.MATCH_CREATED)).match_id
+        guest.write(msg_join_match(match_id, setup['guest_squad']).to_bytes())
+        for player, cards in ((1, setup['host_placed_cards']), (2, setup['guest_placed_cards'])):
+            writer = clients[player][0]
+            writer.write(msg_player_ready().to_bytes())
+            writer.write(msg_placement_done(cards).to_bytes())
+        return match_id, clients
+
+    async def open_match(self, port: int, setup: dict) -> Tuple[str, Dict[int, RawClient], Dict[int, Message]]:
+        """place_match() and wait until it starts; also returns both GAME_START messages."""
+        match_id, clients = await self.place_match(port, setup)
+        starts = {player: await clients[player][1](MessageType.GAME_START) for player in (1, 2)}
+        return match_id, clients, starts
+
+    def close(self):
+        for writer in self.writers:
+            writer.close()
+        self.writers.clear()
+
+
+@pytest.fixture
+def raw_clients() -> RawClients:
+    """Raw protocol clients; close() them before the test's event loop ends.
+
+    Usage:
+        match_id, clients, starts = await raw_clients.open_match(server.port, match_setup(5))
+        writer, expect = clients[starts[1].payload['snapshot']['current_player']]
+    """
+    return RawClients()
+
+
 # =============================================================================
 # HELPER FUNCTIONS
 # =============================================================================
@@ -9,6 +9,7 @@ covered by the simpler ability tests. Avoid duplicating tests from:
 """
 import pytest
 from tests.conftest import assert_hp, assert_tapped, assert_untapped, assert_card_dead, assert_card_alive, resolve_combat
+from src.commands import cmd_attack
 
 
 class TestFlyerTapping:
@@ -398,6 +399,16 @@ class TestExchangeMechanic:
         game.attack(attacker, defender.position)
         assert game.awaiting_exchange_choice is True
 
+    def test_attack_offering_exchange_is_accepted(self, game, place_card, set_rolls):
+        """An attack that stops at the exchange choice still counts as accepted."""
+        attacker = place_card("Циклоп", player=1, pos=10)
+        defender = place_card("Кобольд", player=2, pos=15)
+
+        set_rolls(5, 3)
+        accepted, _ = game.process_command(cmd_attack(1, attacker.id, defender.position))
+        assert accepted is True
+        assert game.awaiting_exchange_choice is True
+
     def test_exchange_reduce_damage(self, game, place_card, set_rolls):
         """Choosing to reduce damage in exchange should halve damage taken."""
         attacker = place_card("Циклоп", player=1, pos=10)
@@ -0,0 +1,20 @@
+"""Smoke tests for the benchmark suites (every benchmark runs once)."""
+from benchmark import run_benchmarks
+from benchmark_ai import AI_TYPES, harvest_corpus, run_benchmark
+
+
+class TestBenchmarkSuite:
+    """Test that every benchmark runs on a small corpus."""
+
+    def test_every_engine_suite_runs_once(self):
+        results = run_benchmarks(repeat=1, seeds=(0,))
+        suites = {r.name.split('.')[0] for r in results}
+        assert suites == {'process_command', 'serialization', 'board', 'ai', 'protocol'}
+        assert 'process_command.ATTACK' in {r.name for r in results}
+        assert all(r.ops > 0 and r.median_us > 0 for r in results)
+
+    def test_every_ai_decides_on_corpus(self):
+        corpus = harvest_corpus(seeds=(0,), per_category=1)
+        results = run_benchmark(corpus, list(AI_TYPES))
+        assert [r.ai for r in results] == list(AI_TYPES)
+        assert all(r.decisions > 0 for r in results)
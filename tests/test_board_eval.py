@@ -0,0 +1,114 @@
+"""Tests for vectorized batch board evaluation."""
+import pytest
+
+pytest.importorskip("numpy")
+
+from src.match import MatchServer
+from src.ai.utility_ai import UtilityAI, WEIGHTS
+from src.ai.board_eval import encode_board, expand_moves, evaluate_batch, count_moves, top_indices
+
+
+def make_ai(game, player=1):
+    server = MatchServer()
+    server.game = game
+    return UtilityAI(server, player=player)
+
+
+class TestBatchMatchesScalar:
+    """Batch scores must equal UtilityAI._evaluate_position."""
+
+    def test_simple_board(self, game, place_card):
+        """Mixed ground board scores the same for both players."""
+        place_card("Циклоп", player=1, pos=10)
+        place_card("Друид", player=1, pos=11)
+        place_card("Гном-басаарг", player=2, pos=15)
+        place_card("Кобольд", player=2, pos=16, damage=3)
+        game.recalculate_formations()
+
+        for player in (1, 2):
+            ai = make_ai(game, player)
+            batch = evaluate_batch(encode_board(game, player), WEIGHTS)
+            assert batch[0] == pytest.approx(ai._evaluate_position(game))
+
+    def test_flyer_taunt(self, game, place_card):
+        """Flyers facing flyer_taunt only threaten the taunting card."""
+        place_card("Корпит", player=1, pos=30)
+        place_card("Циклоп", player=1, pos=0)
+        place_card("Паук-пересмешник", player=2, pos=25)
+        place_card("Кобольд", player=2, pos=29)
+
+        for player in (1, 2):
+            ai = make_ai(game, player)
+            batch = evaluate_batch(encode_board(game, player), WEIGHTS)
+            assert batch[0] == pytest.approx(ai._evaluate_position(game))
+
+    def test_move_combinations(self, game, place_card):
+        """Each expanded board scores like the simulated move."""
+        cyclops = place_card("Циклоп", player=1, pos=10)
+        druid = place_card("Друид", player=1, pos=5)
+        place_card("Гном-басаарг", player=2, pos=20)
+        ai = make_ai(game)
+
+        combos = [
+            {cyclops.id: 10, druid.id: 5},
+            {cyclops.id: 15, druid.id: 10},
+            {cyclops.id: 11, druid.id: 6},
+        ]
+        base = encode_board(game, 1)
+        batch = expand_moves(base, combos)
+        scores = evaluate_batch(batch, WEIGHTS)
+        moved, advanced = count_moves(base, batch)
+
+        assert list(moved) == [0, 2, 2]
+        assert list(advanced) == [0, 2, 0]
+        for combo, score in zip(combos, scores):
+            sim_game = ai._simulate_combination(game, combo)
+            assert sim_game is not None
+            assert score == pytest.approx(ai._evaluate_position(sim_game))
+
+
+class TestSearchMatchesScalar:
+    """UtilityAI picks the same position with and without NumPy."""
+
+    def test_same_beam_and_best_position(self, game, place_card, monkeypatch):
+        place_card("Циклоп", player=1, pos=10)
+        place_card("Друид", player=1, pos=6)
+        place_card("Кобольд", player=1, pos=8)
+        place_card("Гном-басаарг", player=2, pos=20)
+        place_card("Кобольд", player=2, pos=22, damage=2)
+        game.recalculate_formations()
+
+        def search(has_numpy):
+            monkeypatch.setattr("src.ai.utility_ai.HAS_NUMPY", has_numpy)
+            ai = UtilityAI(MatchServer(), player=1, beam_width=3)
+            ai.server.game = game
+            actions = ai.get_valid_actions()
+            moves = [a for a in actions if a.command.type.name == 'MOVE']
+            attacks = [a for a in actions if a.command.type.name == 'ATTACK']
+            best = ai._search_best_position(ai.game, moves, attacks)
+            return best, ai.nodes_evaluated
+
+        (vector, vector_nodes), (scalar, scalar_nodes) = search(True), search(False)
+        assert vector.moves == scalar.moves
+        assert vector.total_score == pytest.approx(scalar.total_score)
+        assert vector_nodes == scalar_nodes
+
+
+class TestTopIndices:
+    """Test beam selection."""
+
+    def test_best_first(self):
+        """Returns the n best indices in descending score order."""
+        import numpy as np
+        scores = np.array([1.0, 5.0, 3.0, 4.0])
+        assert top_indices(scores, 2) == [1, 3]
+        assert top_indices(scores, 10) == [1, 3, 2, 0]
+        assert top_indices(scores, 0) == []
+
+    def test_plain_list_matches_array(self):
+        """The scalar path's lists give the same indices, ties in index order."""
+        import numpy as np
+        scores = [2.0, 5.0, 2.0, float('-inf'), 5.0, 2.0]
+        for n in (1, 2, 3, 6):
+            assert top_indices(scores, n) == top_indices(np.array(scores), n)
+        assert top_indices(scores, 3) == [1, 4, 0]
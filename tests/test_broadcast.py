@@ -0,0 +1,118 @@
+"""Tests for GameServer broadcast fan-out and slow consumer handling."""
+import asyncio
+
+from src.game import Game
+from src.network import server as server_module
+from src.network.compression import default_compression
+from src.network.protocol import Message, msg_chat, msg_lobby_status, msg_resync
+from src.network.server import GameServer
+from src.network.session import PlayerSession, SessionState
+
+
+class FakeTransport:
+    def __init__(self, buffered: int = 0):
+        self.buffered = buffered
+        self.aborted = False
+
+    def get_write_buffer_size(self) -> int:
+        return self.buffered
+
+    def abort(self):
+        self.aborted = True
+
+
+class FakeWriter:
+    """StreamWriter stand-in; a stalled writer never finishes drain()."""
+
+    def __init__(self, stalled: bool = False, buffered: int = 0):
+        self.transport = FakeTransport(buffered)
+        self.stalled = stalled
+        self.data = []
+
+    def get_extra_info(self, name):
+        return None
+
+    def write(self, data: bytes):
+        self.data.append(data)
+
+    async def drain(self):
+        if self.stalled:
+            await asyncio.Event().wait()
+
+
+def _session(name: str, **writer_kwargs) -> PlayerSession:
+    session = PlayerSession(reader=None, writer=FakeWriter(**writer_kwargs))
+    session.player_name = name
+    session.state = SessionState.IN_LOBBY
+    return session
+
+
+class TestBroadcast:
+    """Test encode-once fan-out, timeouts and lagging clients."""
+
+    def test_encodes_once_for_all_recipients(self, monkeypatch):
+        encodes = []
+        original = Message.to_bytes
+
+        def counting_to_bytes(msg, compression=None):
+            encodes.append(msg.type)
+            return original(msg, compression)
+
+        monkeypatch.setattr(Message, 'to_bytes', counting_to_bytes)
+        server = GameServer()
+        sessions = [_session(f"P{i}") for i in range(5)]
+        asyncio.run(server._broadcast(sessions, msg_chat("hi", "P0")))
+
+        assert len(encodes) == 1
+        payloads = {s.writer.data[0] for s in sessions}
+        assert len(payloads) == 1
+        assert server.metrics.messages_out['CHAT'] == 5
+
+    def test_slow_client_does_not_stall_others(self, monkeypatch):
+        monkeypatch.setattr(server_module, 'SEND_TIMEOUT', 0.05)
+        server = GameServer()
+        fast = [_session("Fast1"), _session("Fast2")]
+        slow = _session("Slow", stalled=True)
+
+        async def scenario():
+            loop = asyncio.get_running_loop()
+            start = loop.time()
+            await server._broadcast([fast[0], slow, fast[1]], msg_chat("hi", "Fast1"))
+            return loop.time() - start
+
+        elapsed = asyncio.run(scenario())
+        assert elapsed < 1.0
+        assert all(s.writer.data for s in fast)
+        assert slow.writer.transport.aborted
+        assert slow.state == SessionState.DISCONNECTED
+        assert server.metrics.slow_clients_dropped == 1
+
+    def test_lagging_client_skips_lobby_status_and_full_buffer_is_dropped(self):
+        server = GameServer()
+        ok = _session("Ok")
+        lagging = _session("Lagging", buffered=server_module.LAGGING_BUFFER + 1)
+        full = _session("Full", buffered=server_module.MAX_SEND_BUFFER + 1)
+
+        async def scenario():
+            await server._broadcast([ok, lagging], msg_lobby_status(2))
+            await server._broadcast([ok, lagging, full], msg_chat("hi", "Ok"))
+
+        asyncio.run(scenario())
+        assert len(ok.writer.data) == 2
+        assert len(lagging.writer.data) == 1  # Chat only - status was skipped
+        assert server.metrics.lossy_skipped == 1
+        assert full.writer.transport.aborted and not full.writer.data
+
+    def test_encodes_once_per_codec(self):
+        codec = default_compression()
+        server = GameServer()
+        plain = [_session("Plain1"), _session("Plain2")]
+        packed = [_session("Packed1"), _session("Packed2")]
+        for session in packed:
+            session.compression = codec
+        msg = msg_resync(Game().snapshot_for_player(1), 1)
+        asyncio.run(server._broadcast(plain + packed, msg))
+
+        assert plain[0].writer.data == plain[1].writer.data == [msg.to_bytes()]
+        assert packed[0].writer.data == packed[1].writer.data == [msg.to_bytes(codec)]
+        assert server.metrics.bytes_out['RESYNC'] == 2 * len(msg.to_bytes()) + 2 * len(msg.to_bytes(codec))
@@ -116,6 +116,25 @@ class TestTappedTargets:
         assert_hp(defender, initial_hp - expected_damage)
 
 
+class TestRebuiltGame:
+    """Test combat in a game rebuilt from its dict."""
+
+    def test_attack_after_from_dict(self, game, place_card):
+        """A game from Game.from_dict rolls dice without a seeded rng."""
+        from src.game import Game
+        place_card("Циклоп", player=1, pos=10)
+        defender = place_card("Гном-басаарг", player=2, pos=15, tapped=True)
+
+        rebuilt = Game.from_dict(game.to_dict())
+        assert rebuilt.rng is None
+        attacker = rebuilt.board.get_card(10)
+        rebuilt.attack(attacker, defender.position)
+        resolve_combat(rebuilt)
+
+        assert_tapped(attacker)
+        assert rebuilt.board.get_card(15).curr_life < defender.curr_life
+
+
 class TestAttackerTapping:
     """Test that attackers tap after attacking."""
 
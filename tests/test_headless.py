@@ -0,0 +1,34 @@
+"""Tests for headless mode (no log strings or UI hint events)."""
+from src.commands import EventType, cmd_attack
+from src.match import MatchServer
+
+
+class TestHeadless:
+    """Test Game.headless and MatchServer(headless=True)."""
+
+    def test_no_log_or_ui_events(self, game, place_card, set_rolls):
+        """Headless games keep state events but drop log and arrow events."""
+        game.headless = True
+        cyclops = place_card("Циклоп", player=1, pos=10)
+        dwarf = place_card("Гном-басаарг", player=2, pos=15)
+        set_rolls(6, 1)
+
+        accepted, events = game.process_command(cmd_attack(1, cyclops.id, dwarf.position))
+        assert accepted
+        types = {e.type for e in events}
+        assert EventType.LOG_MESSAGE not in types
+        assert EventType.ARROW_ADDED not in types
+        assert len(game.messages) == 0
+
+    def test_messages_capped(self, game):
+        """The message log keeps only the newest entries."""
+        for i in range(game.MAX_MESSAGES + 5):
+            game.log(str(i))
+        assert len(game.messages) == game.MAX_MESSAGES
+        assert game.messages[-1] == str(game.MAX_MESSAGES + 4)
+
+    def test_server_passes_flag(self):
+        """MatchServer propagates headless to the games it creates."""
+        server = MatchServer(headless=True)
+        server.setup_game()
+        assert server.game.headless
@@ -0,0 +1,90 @@
+"""Tests for hibernation of idle matches."""
+import asyncio
+import json
+
+import pytest
+
+from src.commands import cmd_end_turn
+from src.match import MatchServer
+from src.network.protocol import MessageType, msg_command, msg_request_resync
+from src.network.server import GameServer
+
+
+class TestMatchServerHibernation:
+    """Test the compressed round trip of a MatchServer."""
+
+    def test_round_trip_continues_identically(self, match_setup, start_match, play_ai):
+        setup = match_setup(4)
+        servers = []
+        for _ in range(2):
+            server = start_match(setup, seed=21)
+            play_ai(server, 60)
+            servers.append(server)
+        live, original = servers
+
+        blob = original.hibernate()
+        woken = MatchServer.from_hibernation(blob)
+        assert woken.get_state_hash() == live.get_state_hash()
+        assert woken.command_log == live.command_log
+        assert woken.initial_checkpoint == live.initial_checkpoint
+        assert len(blob) < len(json.dumps(live.get_snapshot()))  # Two full states and the log, compressed
+
+        # Dice generator state survives: both continue with the same rolls
+        play_ai(live, 80)
+        play_ai(woken, 80)
+        assert woken.get_state_hash() == live.get_state_hash()
+        assert woken.replay().header['final_hash'] == live.replay().header['final_hash']
+
+
+class TestServerHibernation:
+    """Test that GameServer hibernates idle matches and wakes them on demand."""
+
+    @pytest.mark.parametrize('workers', [0, 1])
+    def test_idle_match_wakes_on_resync_and_command(self, workers, match_setup, free_port, raw_clients):
+        async def scenario():
+            server = GameServer(host='127.0.0.1', port=free_port(), workers=workers)
+            task = asyncio.create_task(server.start())
+            try:
+                while server._server is None:
+                    await asyncio.sleep(0.01)
+
+                match_id, clients, starts = await raw_clients.open_match(server.port, match_setup(5))
+                current = starts[1].payload['snapshot']['current_player']
+                opponent = 3 - current
+                writer, expect = clients[current]
+                other, other_expect = clients[opponent]
+                writer.write(msg_command(cmd_end_turn(current), 1).to_bytes())
+                before = (await expect(MessageType.UPDATE)).payload['snapshot']
+                await other_expect(MessageType.UPDATE)
+
+                match = server.matches[match_id]
+                while match.lock.locked():  # Still sending the opponent's update
+                    await asyncio.sleep(0.01)
+                await server._hibernate_idle()
+                assert not match.is_hibernated  # Not idle yet
+
+                match.last_activity -= server.hibernate_after
+                await server._hibernate_idle()
+                hibernated = (match.is_hibernated, match.server is None)
+
+                writer.write(msg_request_resync().to_bytes())
+                resync = (await expect(MessageType.RESYNC)).payload['snapshot']
+                awake = not match.is_hibernated
+
+                match.last_activity -= server.hibernate_after
+                await server._hibernate_idle()
+                other.write(msg_command(cmd_end_turn(opponent), 1).to_bytes())
+                update = (await other_expect(MessageType.UPDATE)).payload
+                return before, hibernated, resync, awake, update, server.metrics
+            finally:
+                raw_clients.close()
+                await server.stop()
+                task.cancel()
+
+        before, hibernated, resync, awake, update, metrics = asyncio.run(asyncio.wait_for(scenario(), 20.0))
+        assert hibernated == (True, True)
+        assert resync == before
+        assert awake
+        assert update['accepted']
+        assert update['snapshot']['turn_number'] == before['turn_number'] + 1
+        assert (metrics.hibernations, metrics.rehydrations) == (2, 2)
@@ -0,0 +1,116 @@
+"""Tests for the durable match journal and crash recovery."""
+import asyncio
+
+import pytest
+
+from src.commands import cmd_end_turn
+from src.match import MatchServer
+from src.network.journal import JournalStore, read_journal
+from src.network.protocol import MessageType, msg_join_match, msg_command
+from src.network.server import GameServer
+from src.network.workers import restore_match_server
+
+
+class TestJournalFile:
+    """Test the on-disk format."""
+
+    def test_round_trip_with_checkpoint_and_torn_tail(self, tmp_path, match_setup, start_match, play_ai):
+        store = JournalStore(str(tmp_path), checkpoint_interval=2)
+        setup = match_setup(1)
+        commands = play_ai(start_match(setup, seed=7), 3)
+        server = start_match(setup, seed=7)
+        journal = store.create('ABC123', 7, 'hash', {1: "Host", 2: "Guest"}, setup, {1: "t1", 2: "t2"})
+        for cmd in commands:
+            server.apply(cmd, include_snapshot=False)
+            journal.command(cmd)
+            if journal.checkpoint_due:
+                journal.checkpoint(server.checkpoint())
+        store.sync()
+        with open(journal.path, 'ab') as f:
+            f.write(b'{"type":"command","comm')  # Crash mid-write
+
+        recovered = read_journal(journal.path)
+        assert recovered.match_id == 'ABC123'
+        assert recovered.seed == 7
+        assert recovered.resume_tokens == {1: "t1", 2: "t2"}
+        assert recovered.players == {1: "Host", 2: "Guest"}
+        assert len(recovered.commands) == journal.commands
+        assert recovered.checkpoint['commands'] == 2
+
+        journal.close()
+        reopened = store.reopen(recovered)
+        assert reopened.path.stat().st_size == recovered.valid_size
+        assert reopened.since_checkpoint == journal.commands - 2
+        reopened.close(delete=True)
+        assert not reopened.path.exists()
+
+    def test_replay_matches_original(self, match_setup, start_match, play_ai):
+        setup = match_setup(2)
+        server = start_match(setup, seed=11)
+        commands = play_ai(server, 120)
+        checkpoint = None
+        for done in (0, len(commands) // 2):
+            if done:
+                replay = start_match(setup, seed=11)
+                for cmd in commands[:done]:
+                    replay.apply(cmd, include_snapshot=False)
+                checkpoint = replay.checkpoint()
+            restored = MatchServer(seed=11)
+            restore_match_server(restored, setup, checkpoint, commands)
+            assert restored.get_state_hash() == server.get_state_hash()
+            assert len(restored.command_log) == len(commands)
+
+
+class TestServerRecovery:
+    """Test that a restarted GameServer resumes journaled matches."""
+
+    @pytest.mark.parametrize('workers', [0, 1])
+    def test_match_survives_restart(self, tmp_path, workers, match_setup, free_port, raw_clients):
+        port = free_port()
+
+        async def run_server():
+            server = GameServer(host='127.0.0.1', port=port, journal_dir=str(tmp_path), workers=workers)
+            task = asyncio.create_task(server.start())
+            while server._server is None:
+                await asyncio.sleep(0.01)
+            return server, task
+
+        async def scenario():
+            server, task = await run_server()
+            try:
+                match_id, clients, starts = await raw_clients.open_match(port, match_setup(3))
+                guest_token = starts[2].payload['resume_token']
+                current = starts[1].payload['snapshot']['current_player']
+                writer, expect = clients[current]
+                writer.write(msg_command(cmd_end_turn(current), 1).to_bytes())
+                before = (await expect(MessageType.UPDATE)).payload['snapshot']
+            finally:
+                await server.stop()  # Same as a crash for the journal: the file stays
+                task.cancel()
+                raw_clients.close()
+
+            server, task = await run_server()
+            try:
+                assert match_id in server.matches
+                # Same name as the guest, but no seat token
+                impostor, impostor_expect = await raw_clients.connect(port, "Guest")
+                impostor.write(msg_join_match(match_id, []).to_bytes())
+                refused = await impostor_expect(MessageType.ERROR)
+                guest, guest_expect = await raw_clients.connect(port, "Guest")
+                guest.write(msg_join_match(match_id, [], resume_token=guest_token).to_bytes())
+                joined = await guest_expect(MessageType.MATCH_JOINED)
+                resumed = await guest_expect(MessageType.GAME_START)
+                return before, joined, resumed, refused, guest_token, current
+            finally:
+                await server.stop()
+                task.cancel()
+                raw_clients.close()
+
+        before, joined, resumed, refused, guest_token, current = asyncio.run(asyncio.wait_for(scenario(), 20.0))
+        assert joined.payload['player'] == 2
+        assert joined.payload['ack'] == (1 if current == 2 else 0)  # Guest's handled seq, from the journal
+        assert resumed.payload['resume_token'] == guest_token
+        after = resumed.payload['snapshot']
+        assert after['turn_number'] == before['turn_number']
+        assert after['current_player'] == before['current_player']
+        assert refused.payload['error'] == "Match already started"
@@ -0,0 +1,93 @@
+"""Tests for RTT measurement on the PING/PONG channel."""
+import asyncio
+import time
+
+from src.network.client import NetworkClient
+from src.network.latency import RttEstimator
+from src.network.protocol import MessageType, msg_ping, msg_pong
+from src.network.session import PlayerSession
+
+
+class _Writer:
+    def get_extra_info(self, name):
+        return None
+
+
+class TestRttEstimator:
+    """Test smoothing, jitter and adaptive timeouts."""
+
+    def test_first_sample_seeds_estimate(self):
+        rtt = RttEstimator()
+        assert rtt.timeout(3.0, 1.0, 10.0) == 3.0  # No sample yet
+        rtt.record(0.1)
+        assert rtt.srtt == 0.1
+        assert abs(rtt.rto - 0.3) < 1e-9  # srtt + 4 * (rtt / 2)
+        assert rtt.timeout(3.0, 1.0, 10.0) == 1.0
+
+    def test_smoothing_and_jitter(self):
+        steady, jittery = RttEstimator(), RttEstimator()
+        for i in range(50):
+            steady.record(0.05)
+            jittery.record(0.02 if i % 2 else 0.08)
+        assert abs(steady.srtt - 0.05) < 1e-6
+        assert steady.jitter < 1e-6
+        assert abs(jittery.srtt - 0.05) < 0.01
+        assert jittery.jitter > 0.03
+        assert jittery.rto > steady.rto
+
+    def test_timeout_clamped(self):
+        rtt = RttEstimator()
+        rtt.record(5.0)
+        assert rtt.timeout(3.0, 1.0, 10.0) == 10.0
+
+    def test_clock_offset_from_fastest_round_trip(self):
+        rtt = RttEstimator()
+        rtt.record(0.5, peer_time=time.time() + 100.0)
+        rtt.record(0.01, peer_time=time.time() + 60.0)
+        rtt.record(0.3, peer_time=time.time() - 50.0)  # Slower: ignored
+        assert abs(rtt.offset - 60.0) < 0.1
+
+    def test_pong_echoes_ping_timestamp(self):
+        sent = time.monotonic() - 0.2
+        ping = msg_ping(sent)
+        pong = msg_pong(ping.payload['t'], time.time())
+        rtt = RttEstimator()
+        assert rtt.record_pong(pong.payload) >= 0.2
+        assert rtt.record_pong(msg_pong().payload) is None
+        assert rtt.samples == 1
+
+
+class TestEndpoints:
+    """Test client and session use of the estimate."""
+
+    def test_client_answers_server_ping_and_records_pong(self):
+        client = NetworkClient()
+
+        async def scenario():
+            client._outgoing = asyncio.Queue()
+            await client._handle_server_message(msg_ping(123.0))
+            await client._handle_server_message(msg_pong(time.monotonic() - 0.05, time.time()))
+            return client._outgoing.get_nowait()
+
+        answer = asyncio.run(scenario())
+        assert answer.type == MessageType.PONG
+        assert answer.payload['t'] == 123.0
+        assert client.ping_ms >= 50
+
+    def test_command_timeout_follows_rtt(self):
+        client = NetworkClient()
+        assert client.command_timeout == client.COMMAND_TIMEOUT
+        client.rtt.record(0.02)
+        assert client.command_timeout == client.MIN_COMMAND_TIMEOUT
+        for _ in range(20):
+            client.rtt.record(2.0)
+        assert client.MIN_COMMAND_TIMEOUT < client.command_timeout <= client.MAX_COMMAND_TIMEOUT
+        assert client.inactivity_timeout > client.INACTIVITY_TIMEOUT
+
+    def test_session_heartbeat_adapts(self):
+        session = PlayerSession(reader=None, writer=_Writer())
+        assert session.heartbeat_timeout == PlayerSession.HEARTBEAT_TIMEOUT
+        session.rtt.record(0.02)
+        assert session.heartbeat_timeout == PlayerSession.MIN_HEARTBEAT_TIMEOUT
+        session.last_pong = time.time() - PlayerSession.MIN_HEARTBEAT_TIMEOUT - 1
+        assert not session.is_alive
@@ -0,0 +1,51 @@
+"""Tests for the cached legal command generator."""
+from src.commands import CommandType, cmd_move, cmd_end_turn
+from src.game import legal_to_command
+
+
+class TestLegalCommands:
+    """Test Game.legal_commands()."""
+
+    def test_moves_and_attacks(self, game, place_card):
+        """Moves go to empty adjacent cells, attacks include allies."""
+        cyclops = place_card("Циклоп", player=1, pos=10)
+        druid = place_card("Друид", player=1, pos=11)
+        dwarf = place_card("Гном-басаарг", player=2, pos=15)
+        legal = game.legal_commands(1)
+
+        assert set(legal.moves_for(cyclops.id)) == {5}
+        assert set(legal.attacks_for(druid.id)) == {cyclops.position, dwarf.position}
+        assert (CommandType.MOVE, cyclops.id, 5) in legal
+        assert (CommandType.ATTACK, cyclops.id, dwarf.position) in legal
+        assert (CommandType.END_TURN, None, None) in legal
+
+    def test_not_my_turn(self, game, place_card):
+        """The waiting player has no legal commands."""
+        place_card("Гном-басаарг", player=2, pos=15)
+        assert len(game.legal_commands(2)) == 0
+
+    def test_cached_per_state_version(self, game, place_card):
+        """Same object until a command is processed."""
+        place_card("Циклоп", player=1, pos=10)
+        first = game.legal_commands(1)
+        assert game.legal_commands(1) is first
+
+        game.process_command(cmd_end_turn(1))
+        assert game.legal_commands(1) is not first
+
+    def test_process_command_uses_legal_moves(self, game, place_card):
+        """Illegal move is rejected, legal move is accepted."""
+        cyclops = place_card("Циклоп", player=1, pos=10)
+        place_card("Гном-басаарг", player=2, pos=15)
+
+        accepted, _ = game.process_command(cmd_move(1, cyclops.id, 15))
+        assert not accepted
+        accepted, _ = game.process_command(cmd_move(1, cyclops.id, 5))
+        assert accepted
+        assert cyclops.position == 5
+
+    def test_legal_to_command(self, game, place_card):
+        """Compact tuples expand into full commands."""
+        cyclops = place_card("Циклоп", player=1, pos=10)
+        cmd = legal_to_command(1, (CommandType.MOVE, cyclops.id, 5))
+        assert cmd == cmd_move(1, cyclops.id, 5)
@@ -0,0 +1,120 @@
+"""Tests for match sharding across worker processes."""
+import asyncio
+
+import pytest
+
+from src.commands import CommandType, cmd_end_turn
+from src.network.protocol import MessageType, msg_placement_done, msg_command
+from src.network.server import GameServer
+from src.network.workers import MatchWorkerPool, WorkerError
+
+
+class TestMatchWorkerPool:
+    """Test the worker pool relay directly."""
+
+    def test_start_command_and_release(self, match_setup):
+        async def scenario():
+            pool = MatchWorkerPool(2)
+            await pool.start()
+            try:
+                setup = match_setup(1)
+                snapshots = await pool.start_match(
+                    'M1', setup['host_squad'], setup['guest_squad'],
+                    setup['host_placed_cards'], setup['guest_placed_cards'])
+                current = snapshots[1]['current_player']
+
+                outcome = await pool.command('M1', cmd_end_turn(current), with_opponent=True)
+                rejected = await pool.command('M1', cmd_end_turn(current), with_opponent=True)
+                metrics = await pool.collect_metrics()
+
+                with pytest.raises(WorkerError):
+                    await pool.command('NOPE', cmd_end_turn(1), with_opponent=True)
+
+                load_before = sum(pool.load)
+                pool.release('M1')
+                return snapshots, outcome, rejected, metrics, load_before, sum(pool.load)
+            finally:
+                await pool.stop()
+
+        snapshots, outcome, rejected, metrics, load_before, load_after = asyncio.run(scenario())
+        assert set(snapshots) == {1, 2}
+        assert outcome.result.accepted
+        assert outcome.opponent_snapshot is not None
+        assert outcome.winner == 0
+        assert not rejected.result.accepted
+        assert rejected.opponent_snapshot is None
+        assert metrics.by_type[CommandType.END_TURN].accepted == 1
+        assert metrics.by_type[CommandType.END_TURN].rejected == 1
+        assert (load_before, load_after) == (1, 0)
+
+
+class TestShardedGameServer:
+    """Test a match over the real protocol with workers enabled."""
+
+    def test_match_runs_on_worker(self, match_setup, free_port, raw_clients):
+        async def scenario():
+            server = GameServer(host='127.0.0.1', port=free_port(), workers=1)
+            task = asyncio.create_task(server.start())
+            try:
+                for _ in range(200):
+                    if server._server is not None:
+                        break
+                    await asyncio.sleep(0.02)
+
+                _, clients, starts = await raw_clients.open_match(server.port, match_setup(1))
+                current = starts[1].payload['snapshot']['current_player']
+                clients[current][0].write(msg_command(cmd_end_turn(current), 1).to_bytes())
+                host_update = await clients[1][1](MessageType.UPDATE)
+                guest_update = await clients[2][1](MessageType.UPDATE)
+                return list(server.pool.load), host_update, guest_update
+            finally:
+                raw_clients.close()
+                await server.stop()
+                task.cancel()
+
+        load, host_update, guest_update = asyncio.run(scenario())
+        assert load == [1]
+        assert host_update.payload['accepted'] and guest_update.payload['accepted']
+        assert host_update.payload['snapshot_hash'] == guest_update.payload['snapshot_hash']
+
+    def test_failed_start_can_be_retried(self, match_setup, free_port, raw_clients):
+        """A worker error while starting leaves the match waiting for placement."""
+        async def scenario():
+            server = GameServer(host='127.0.0.1', port=free_port(), workers=1)
+            task = asyncio.create_task(server.start())
+            try:
+                for _ in range(200):
+                    if server._server is not None:
+                        break
+                    await asyncio.sleep(0.02)
+
+                start_match = server.pool.start_match
+
+                async def failing_start(match_id, *args, **kwargs):
+                    server.pool.start_match = start_match
+                    server.pool._assign(match_id)
+                    raise WorkerError("worker died")
+                server.pool.start_match = failing_start
+
+                setup = match_setup(1)
+                match_id, clients = await raw_clients.place_match(server.port, setup)
+                (_, host_expect), (guest, guest_expect) = clients[1], clients[2]
+                error = await host_expect(MessageType.ERROR)
+                await guest_expect(MessageType.ERROR)
+                match = server.matches[match_id]
+                after_failure = (match.is_started, list(server.pool.load), match.resume_tokens)
+
+                guest.write(msg_placement_done(setup['guest_placed_cards']).to_bytes())
+                start = await host_expect(MessageType.GAME_START)
+                await guest_expect(MessageType.GAME_START)
+                return error, after_failure, start, list(server.pool.load)
+            finally:
+                raw_clients.close()
+                await server.stop()
+                task.cancel()
+
+        error, after_failure, start, load = asyncio.run(asyncio.wait_for(scenario(), 30))
+        assert error.payload['error'] == "Could not start match, try again"
+        assert after_failure == (False, [0], {})
+        assert start.payload['resume_token']
+        assert load == [1]
@@ -0,0 +1,54 @@
+"""Tests for per-command timing metrics."""
+from src.commands import CommandType, cmd_end_turn, cmd_select_card
+from src.match import MatchServer
+from src.metrics import CommandMetrics, Histogram
+
+
+class TestHistogram:
+    """Test fixed-bucket histograms."""
+
+    def test_record_and_percentiles(self):
+        hist = Histogram(bounds=(10, 100, 1000))
+        for value in (5, 5, 50, 500, 5000):
+            hist.record(value)
+
+        assert hist.counts == [2, 1, 1, 1]
+        assert hist.count == 5
+        assert hist.max == 5000
+        assert hist.percentile(50) == 100
+        assert hist.percentile(99) == 5000  # Open bucket reports the max
+
+    def test_merge(self):
+        a, b = Histogram(bounds=(10,)), Histogram(bounds=(10,))
+        a.record(1)
+        b.record(20)
+        a.merge(b)
+        assert a.counts == [1, 1] and a.count == 2
+
+
+class TestCommandMetrics:
+    """Test MatchServer instrumentation."""
+
+    def test_off_by_default(self):
+        server = MatchServer()
+        assert server.metrics is None
+
+    def test_records_per_command_type(self):
+        metrics = CommandMetrics()
+        server = MatchServer(metrics=metrics)
+        server.setup_game()
+        server.game.auto_place_for_testing()
+
+        player = server.game.current_player
+        server.apply(cmd_end_turn(3 - player))  # Not their turn - rejected
+        server.apply(cmd_end_turn(player))
+        server.get_state_hash()
+        server.apply(cmd_select_card(player, 1))  # UI command - not allowed
+
+        end_turn = metrics.by_type[CommandType.END_TURN]
+        assert end_turn.accepted == 1 and end_turn.rejected == 1
+        assert end_turn.process_us.count == 2
+        assert end_turn.snapshot_us.count == 2
+        assert end_turn.hash_us.count == 1
+        assert metrics.by_type[CommandType.SELECT_CARD].rejected == 1
+        assert "END_TURN" in metrics.format_table()
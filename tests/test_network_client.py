@@ -0,0 +1,213 @@
+"""Tests for NetworkClient's network thread plumbing."""
+import asyncio
+import time
+
+from src.commands import cmd_end_turn
+from src.game import Game
+from src.match import CommandResult
+from src.network.client import ClientState, NetworkClient
+from src.network.protocol import (
+    FrameReader, MessageType, msg_chat, msg_ping, msg_resync, msg_update, msg_command,
+    msg_request_resync,
+)
+from src.network.server import GameServer
+
+
+class RecordingWriter:
+    def __init__(self):
+        self.writes = []
+
+    def write(self, data: bytes):
+        self.writes.append(data)
+
+    async def drain(self):
+        pass
+
+
+class TestSendLoop:
+    """Test the event-driven outgoing queue."""
+
+    def test_burst_is_one_write(self):
+        client = NetworkClient()
+        client._writer = RecordingWriter()
+        client._running = True
+
+        async def scenario():
+            client._outgoing = asyncio.Queue()
+            for i in range(3):
+                client._outgoing.put_nowait(msg_chat(f"m{i}", "P1"))
+            client._outgoing.put_nowait(msg_ping())
+            client._outgoing.put_nowait(None)
+            await asyncio.wait_for(client._send_loop(), 1.0)
+
+        asyncio.run(scenario())
+        assert len(client._writer.writes) == 1
+        reader = FrameReader()
+        reader.feed(client._writer.writes[0])
+        assert [m.type for m in reader.get_messages()] == [MessageType.CHAT] * 3 + [MessageType.PING]
+
+    def test_queued_from_main_thread_reaches_server(self, free_port):
+        async def scenario():
+            server = GameServer(host='127.0.0.1', port=free_port())
+            task = asyncio.create_task(server.start())
+            created = []
+            client = NetworkClient()
+            client.on_match_created = created.append
+            try:
+                while server._server is None:
+                    await asyncio.sleep(0.01)
+                client.connect('127.0.0.1', server.port, "Tester")
+                while client.state != ClientState.IN_LOBBY:
+                    client.poll()
+                    await asyncio.sleep(0.001)
+
+                start = time.perf_counter()
+                client.create_match(["Кобольд"])
+                while not created:
+                    client.poll()
+                    await asyncio.sleep(0.001)
+                return created, time.perf_counter() - start
+            finally:
+                client.disconnect()
+                await server.stop()
+                task.cancel()
+
+        created, elapsed = asyncio.run(asyncio.wait_for(scenario(), 10.0))
+        assert len(created) == 1
+        assert elapsed < 0.5
+
+
+class TestSnapshotDecoding:
+    """Test Game reconstruction on the network thread and coalescing."""
+
+    def _update(self, turn: int, seq: int):
+        snapshot = Game().snapshot_for_player(1)
+        snapshot['turn_number'] = turn
+        return msg_update(CommandResult(accepted=True, snapshot=snapshot), seq, "hash")
+
+    def test_only_newest_snapshot_in_burst_is_built(self):
+        client = NetworkClient()
+        burst = [self._update(1, 1), msg_chat("hi", "P2"), self._update(2, 2), msg_resync(None, 3)]
+        asyncio.run(client._handle_server_messages(burst))
+
+        queued = [client._incoming.get_nowait() for _ in range(4)]
+        assert [t for t, _ in queued] == ['update', 'chat', 'update', 'resync']
+        assert queued[0][1]['game'] is None
+        assert queued[0][1]['result'].snapshot['turn_number'] == 1
+        assert isinstance(queued[2][1]['game'], Game)
+        assert queued[2][1]['game'].turn_number == 2
+
+    def test_poll_applies_latest_game_and_reports_every_update(self):
+        client = NetworkClient()
+        results = []
+        client.on_update = lambda result: results.append((result, client.game))
+        for turn, seq in ((1, 1), (2, 2)):
+            asyncio.run(client._handle_server_messages([self._update(turn, seq)]))
+
+        client.poll()
+        assert len(results) == 2
+        assert results[0][1] is None  # Superseded snapshot is never applied
+        assert client.game.turn_number == 2
+        assert results[1][1] is client.game
+
+
+class TestCommandAcks:
+    """Test the unacknowledged command window."""
+
+    def _client(self):
+        client = NetworkClient()
+        client.state = ClientState.IN_MATCH
+        sent = []
+        client._queue_message = sent.append
+        return client, sent
+
+    def test_pipelined_commands_acked_in_order(self):
+        client, sent = self._client()
+        errors = []
+        client.on_error = errors.append
+        for _ in range(3):
+            client.send_command(cmd_end_turn(1))
+        assert client.commands_in_flight == 3
+        assert [m.seq for m in sent] == [1, 2, 3]
+
+        # An opponent update acknowledges nothing
+        client._handle_incoming('update', {'result': CommandResult(accepted=True), 'game': None, 'command_seq': 0})
+        assert client.commands_in_flight == 3
+
+        client._handle_incoming('update', {'result': CommandResult(accepted=True), 'game': None, 'command_seq': 2})
+        assert client.commands_in_flight == 1
+        client._handle_incoming('command_ack', {'ack': 3, 'error': "Invalid command: x"})
+        assert client.commands_in_flight == 0
+        assert errors == ["Invalid command: x"]
+
+    def test_timeout_counts_from_oldest_unacked(self):
+        client, sent = self._client()
+        client.send_command(cmd_end_turn(1))
+        client.send_command(cmd_end_turn(1))
+        client._handle_incoming('update', {'result': CommandResult(accepted=True), 'game': None, 'command_seq': 1})
+        client.poll()
+        assert sent[-1].type == MessageType.COMMAND  # Still within the timeout
+
+        cmd, _ = client._unacked[2]
+        client._unacked[2] = (cmd, time.time() - client.COMMAND_TIMEOUT - 1)
+        client.poll()
+        assert sent[-1].type == MessageType.REQUEST_RESYNC
+
+    def test_resync_retransmits_commands_the_server_missed(self):
+        client, sent = self._client()
+        for _ in range(3):
+            client.send_command(cmd_end_turn(1))
+        client.request_resync()
+        client.send_command(cmd_end_turn(1))  # Sent after the request: still in flight
+        del sent[:]
+
+        client._handle_incoming('resync', {'snapshot': None, 'game': None, 'ack': 1})
+        assert [m.seq for m in sent] == [2, 3]
+        assert client.commands_in_flight == 3
+
+    def test_rejoin_keeps_and_retransmits_commands_in_flight(self):
+        client, sent = self._client()
+        client.match_id, client.player_number = 'ABC123', 1
+        for _ in range(3):
+            client.send_command(cmd_end_turn(1))
+        client.state = ClientState.IN_LOBBY  # Connection lost, joined again
+        del sent[:]
+
+        rejoin = {'match_id': 'ABC123', 'player': 1, 'snapshot': {'turn_number': 1}, 'game': Game(), 'ack': 1}
+        client._handle_incoming('match_joined', rejoin)
+        client._handle_incoming('game_start', {'snapshot': {}, 'game': None, 'resume_token': 't'})
+        assert [m.seq for m in sent] == [2, 3]
+        assert client.commands_in_flight == 2
+
+        # A different match starts from an empty window
+        client._handle_incoming('match_joined', {'match_id': 'XYZ789', 'player': 2, 'snapshot': {}, 'game': None})
+        assert client.commands_in_flight == 0
+
+    def test_server_acks_duplicates_and_reports_ack_in_resync(self, match_setup, free_port, raw_clients):
+        async def scenario():
+            server = GameServer(host='127.0.0.1', port=free_port())
+            task = asyncio.create_task(server.start())
+            try:
+                while server._server is None:
+                    await asyncio.sleep(0.01)
+
+                _, clients, starts = await raw_clients.open_match(server.port, match_setup(1))
+                current = starts[1].payload['snapshot']['current_player']
+                writer, expect = clients[current]
+
+                writer.write(msg_command(cmd_end_turn(current), 1).to_bytes())
+                update = await expect(MessageType.UPDATE)
+                writer.write(msg_command(cmd_end_turn(current), 1).to_bytes())  # Retransmission
+                duplicate = await expect(MessageType.COMMAND_ACK)
+                writer.write(msg_request_resync().to_bytes())
+                resync = await expect(MessageType.RESYNC)
+                return update, duplicate, resync
+            finally:
+                raw_clients.close()
+                await server.stop()
+                task.cancel()
+
+        update, duplicate, resync = asyncio.run(asyncio.wait_for(scenario(), 10.0))
+        assert update.payload['command_seq'] == 1
+        assert duplicate.payload == {'ack': 1, 'error': None}
+        assert resync.payload['ack'] == 1
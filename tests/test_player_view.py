@@ -0,0 +1,111 @@
+"""Tests for the read-only player view used by trusted AIs."""
+import pytest
+
+from src.ai import RuleBasedAI
+from src.game import Game, PlayerView
+from src.match import MatchServer
+
+
+class TestPlayerView:
+    """Test redaction and read-only access."""
+
+    def test_face_down_opponent_masked(self, game, place_card):
+        """Opponent's face-down cards look like snapshot placeholders."""
+        mine = place_card("Циклоп", player=1, pos=10)
+        mine.face_down = True
+        hidden = place_card("Гном-басаарг", player=2, pos=15)
+        hidden.face_down = True
+        view = PlayerView(game, player=1)
+
+        masked = view.board.get_card(15)
+        assert masked is not hidden
+        assert masked.id == hidden.id and masked.face_down
+        assert masked.name == Game.from_dict(game.snapshot_for_player(1)).board.get_card(15).name
+        assert view.board.get_card_by_id(hidden.id) is masked
+        assert hidden.id in [c.id for c in view.board.get_all_cards(2)]
+        own = view.board.get_card(10)
+        assert own == mine and own is not mine  # Own cards are copies, not masked
+
+    def test_every_lookup_is_masked(self, game, place_card):
+        """No lookup path reveals an opponent's face-down or hand card."""
+        hidden = place_card("Гном-басаарг", player=2, pos=15)
+        hidden.face_down = True
+        in_hand = place_card("Циклоп", player=2, pos=20)
+        game.board.cells[20] = None
+        game.hand_p2.append(in_hand)
+        view = PlayerView(game, player=1)
+
+        looked_up = [
+            view.get_card(15),
+            view.get_card_by_id(hidden.id),
+            view.board.get_card(15),
+            view.board.get_card_by_id(hidden.id),
+            view.board.cells[15],
+            *[c for c in view.board.get_all_cards(2) if c.id == hidden.id],
+        ]
+        assert len(looked_up) == 6
+        assert all(c is not hidden and c.name == "???" for c in looked_up)
+
+        assert view.get_card_by_id(in_hand.id) is None
+        for name in ('hand_p2', 'player_states'):
+            with pytest.raises(AttributeError):
+                getattr(view, name)
+        with pytest.raises(ValueError):
+            view.get_player_state(2)
+        assert view.hand_p1 == game.hand_p1  # Own hand stays readable
+
+    def test_read_only(self, game):
+        """Nothing can be assigned and hidden attributes are not readable."""
+        view = PlayerView(game, player=1)
+        with pytest.raises(AttributeError):
+            view.current_player = 2
+        with pytest.raises(AttributeError):
+            view.board.cells = []
+        with pytest.raises(AttributeError):
+            view._pending_rolls
+
+    def test_cannot_change_game(self, game, place_card):
+        """Mutators are not reachable and changes to copies do not reach the game."""
+        card = place_card("Циклоп", player=1, pos=10)
+        view = PlayerView(game, player=1)
+        before = game.to_dict()
+
+        for name in ('process_command', 'roll_dice', 'log', 'attack', 'end_turn'):
+            with pytest.raises(AttributeError):
+                getattr(view, name)
+        for name in ('remove_card', 'place_card', 'move_card', 'send_to_graveyard'):
+            with pytest.raises(AttributeError):
+                getattr(view.board, name)
+
+        view.board.get_card(10).curr_life = 0
+        view.get_player_state(1).hand.append(card)
+        view.forced_attackers[card.id] = [15]
+        assert game.to_dict() == before
+        assert view.get_attack_targets(view.board.get_card(10)) == game.get_attack_targets(card)
+
+    def test_to_dict_is_redacted(self, game, place_card):
+        """Copies made through the view are filtered snapshots."""
+        hidden = place_card("Гном-басаарг", player=2, pos=15)
+        hidden.face_down = True
+        view = PlayerView(game, player=1)
+
+        assert view.to_dict() == game.snapshot_for_player(1)
+        with pytest.raises(ValueError):
+            view.snapshot_for_player(2)
+
+
+class TestTrustedAI:
+    """Test AIPlayer(trusted=True)."""
+
+    def test_same_actions_as_snapshot_path(self):
+        """Trusted and snapshot-based AIs see the same legal actions."""
+        server = MatchServer(headless=True)
+        server.setup_game()
+        server.game.auto_place_for_testing()
+
+        trusted = RuleBasedAI(server, player=1, trusted=True)
+        filtered = RuleBasedAI(server, player=1)
+
+        assert isinstance(trusted.game, PlayerView)
+        assert ([a.command for a in trusted.get_valid_actions()] ==
+                [a.command for a in filtered.get_valid_actions()])
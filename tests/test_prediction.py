@@ -0,0 +1,80 @@
+"""Tests for client-side command prediction and reconciliation."""
+from src.commands import cmd_attack, cmd_move
+from src.game import Game
+from src.match import CommandResult
+from src.network.client import ClientState, NetworkClient
+from src.network.prediction import Predictor, apply_predicted
+
+
+def _copy(game: Game) -> Game:
+    return Game.from_dict(game.to_dict())
+
+
+class TestPredictor:
+    """Test the pending log against a local Game."""
+
+    def test_move_predicted_on_a_copy(self, game, place_card):
+        cyclops = place_card("Циклоп", player=1, pos=10)
+        predictor = Predictor()
+
+        predicted, events = predictor.predict(game, 1, cmd_move(1, cyclops.id, 5))
+        assert predicted.board.get_card(5).id == cyclops.id
+        assert game.board.get_card(10) is cyclops  # Base state untouched
+        assert events
+        assert list(predictor.pending) == [1]
+
+    def test_attack_is_not_predicted(self, game, place_card):
+        cyclops = place_card("Циклоп", player=1, pos=10)
+        dwarf = place_card("Гном-басаарг", player=2, pos=15)
+        assert Predictor().predict(game, 1, cmd_attack(1, cyclops.id, dwarf.position)) is None
+        # Even when forced, a dice roll aborts the prediction
+        assert apply_predicted(_copy(game), cmd_attack(1, cyclops.id, dwarf.position)) is None
+
+    def test_reconcile_reapplies_unacked_commands(self, game, place_card):
+        cyclops = place_card("Циклоп", player=1, pos=10)
+        predictor = Predictor()
+        predictor.predict(game, 1, cmd_move(1, cyclops.id, 5))
+
+        # Opponent's update arrives before ours: keep showing our move
+        shown = predictor.reconcile(_copy(game))
+        assert shown.board.get_card(5).id == cyclops.id
+
+        # Our update arrives: server state is shown as is
+        predictor.ack(1)
+        authoritative, _ = Predictor().predict(game, 9, cmd_move(1, cyclops.id, 5))
+        assert predictor.reconcile(authoritative) is authoritative
+        assert not predictor.pending
+
+    def test_rollback_when_prediction_no_longer_applies(self, game, place_card):
+        cyclops = place_card("Циклоп", player=1, pos=10)
+        predictor = Predictor()
+        predictor.predict(game, 1, cmd_move(1, cyclops.id, 5))
+
+        authoritative = _copy(game)
+        authoritative.board.get_card_by_id(cyclops.id).curr_move = 0  # Server says it cannot move
+        assert predictor.reconcile(authoritative) is authoritative
+        assert not predictor.pending
+
+
+class TestClientPrediction:
+    """Test NetworkClient wiring."""
+
+    def test_send_predicts_and_update_reconciles(self, game, place_card):
+        cyclops = place_card("Циклоп", player=1, pos=10)
+        client = NetworkClient()
+        client.predict_commands = True
+        client.state = ClientState.IN_MATCH
+        client.game = game
+
+        client.send_command(cmd_move(1, cyclops.id, 5))
+        assert client.game is not game
+        assert client.game.board.get_card(5).id == cyclops.id
+
+        authoritative = _copy(game)
+        client._handle_incoming('update', {
+            'result': CommandResult(accepted=False, error="rejected"),
+            'game': authoritative,
+            'command_seq': 1,
+        })
+        assert client.game is authoritative  # Rejected: rolled back to the server state
+        assert not client._predictor.pending
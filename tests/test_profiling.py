@@ -0,0 +1,40 @@
+"""Tests for subsystem profiling."""
+from src.profiling import SubsystemProfiler, classify
+
+
+class TestClassify:
+    """Test bucket attribution."""
+
+    def test_paths(self):
+        assert classify("/x/src/game/combat.py", "perform_attack") == "game/combat"
+        assert classify("/x/src/board.py", "get_card") == "board queries"
+        assert classify("/x/src/ai/squad_ai.py", "score_card") == "squad AI"
+        assert classify("/x/src/ai/utility_ai.py", "_evaluate_position") == "AI scoring"
+        assert classify("/x/numpy/core.py", "dot") == "other"
+
+    def test_serialization_by_name(self):
+        """to_dict/from_dict count as serialization wherever they live."""
+        assert classify("/x/src/board.py", "to_dict") == "serialization"
+        assert classify("/x/src/card.py", "from_dict") == "serialization"
+
+
+class TestSubsystemProfiler:
+    """Test a profiled run."""
+
+    def test_profile_game_commands(self, game, place_card):
+        """Buckets and collapsed stacks are produced."""
+        from src.commands import cmd_end_turn
+
+        place_card("Циклоп", player=1, pos=10)
+        profiler = SubsystemProfiler(sample_interval=0.0005)
+        with profiler:
+            for _ in range(200):
+                game.to_dict()
+                game.process_command(cmd_end_turn(game.current_player))
+
+        totals = profiler.bucket_times()
+        assert totals["serialization"] > 0
+        assert "Wall time" in profiler.summary()
+        for line in profiler.collapsed_stacks():
+            stack, count = line.rsplit(" ", 1)
+            assert int(count) > 0 and stack
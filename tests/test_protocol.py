@@ -0,0 +1,107 @@
+"""Tests for message framing."""
+import pytest
+
+from src.game import Game
+from src.network.compression import COMPRESSED_FLAG, default_compression, get_codec, negotiate, supported_codecs
+from src.network.protocol import FrameReader, Message, MessageType, msg_chat, msg_ping, msg_resync
+
+
+def _stream(count: int) -> bytes:
+    return b''.join(msg_chat(f"line {i}", "P1").to_bytes() for i in range(count))
+
+
+class TestFrameReader:
+    """Test offset-based frame parsing."""
+
+    def test_burst_and_split_frames(self):
+        stream = _stream(10)
+        reader = FrameReader()
+        reader.feed(stream[:-7])
+        first = reader.get_messages()
+        assert [m.payload['text'] for m in first] == [f"line {i}" for i in range(9)]
+        assert reader.get_messages() == []
+
+        reader.feed(stream[-7:])
+        last = reader.get_messages()
+        assert [m.payload['text'] for m in last] == ["line 9"]
+        assert reader.buffered == 0
+
+    def test_byte_at_a_time(self):
+        stream = _stream(3) + msg_ping().to_bytes()
+        reader = FrameReader()
+        received = []
+        for i in range(len(stream)):
+            reader.feed(stream[i:i + 1])
+            msg = reader.get_message()
+            if msg is not None:
+                received.append(msg.type)
+        assert received == [MessageType.CHAT] * 3 + [MessageType.PING]
+
+    def test_sizes_include_header(self):
+        msg = msg_chat("hello", "P1")
+        reader = FrameReader()
+        reader.feed(msg.to_bytes() * 2)
+        sizes = [size for _, size in reader.get_messages_with_sizes()]
+        assert sizes == [len(msg.to_bytes())] * 2
+
+    def test_compacts_consumed_prefix(self, monkeypatch):
+        monkeypatch.setattr(FrameReader, 'COMPACT_THRESHOLD', 256)
+        reader = FrameReader()
+        chunk = _stream(20)
+        for _ in range(50):
+            reader.feed(chunk + chunk[:5])  # Always leaves a partial frame behind
+            reader.get_messages()
+            reader.feed(chunk[5:])
+            assert len(reader.get_messages()) == 20
+        assert len(reader._buffer) < 2 * len(chunk) + 256
+
+    def test_get_frame_and_from_buffer(self):
+        msg = msg_chat("hi", "P1")
+        reader = FrameReader()
+        reader.feed(msg.to_bytes())
+        frame = reader.get_frame()
+        assert isinstance(frame, bytes)
+        assert Message.from_bytes(memoryview(frame)).payload == msg.payload
+
+    def test_oversized_frame_rejected(self):
+        reader = FrameReader()
+        reader.feed((FrameReader.MAX_FRAME_SIZE + 1).to_bytes(4, 'big'))
+        with pytest.raises(ValueError):
+            reader.get_messages()
+
+
+class TestCompression:
+    """Test negotiated frame compression."""
+
+    def _snapshot_message(self):
+        return msg_resync(Game().snapshot_for_player(1), 7)
+
+    def test_negotiation(self):
+        codec = negotiate(supported_codecs())
+        assert codec is not None
+        assert get_codec(codec.name) is codec
+        assert negotiate(['zlib-unknown']) is None
+        assert get_codec(None) is None
+
+    def test_large_frames_compressed_small_frames_plain(self):
+        codec = default_compression()
+        big = self._snapshot_message()
+        small = msg_ping()
+
+        packed = big.to_bytes(codec)
+        assert int.from_bytes(packed[:4], 'big') & COMPRESSED_FLAG
+        assert len(packed) < len(big.to_bytes()) // 4
+        assert small.to_bytes(codec) == small.to_bytes()
+
+        reader = FrameReader(compression=codec)
+        reader.feed(packed + small.to_bytes(codec) + packed)
+        received = reader.get_messages_with_sizes()
+        assert [m.type for m, _ in received] == [MessageType.RESYNC, MessageType.PING, MessageType.RESYNC]
+        assert received[0][0].payload == big.payload
+        assert received[0][1] == len(packed)
+
+    def test_compressed_frame_needs_negotiation(self):
+        reader = FrameReader()
+        reader.feed(self._snapshot_message().to_bytes(default_compression()))
+        with pytest.raises(ValueError):
+            reader.get_messages()
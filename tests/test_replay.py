@@ -0,0 +1,113 @@
+"""Tests for the replay file format and ReplayPlayer."""
+import pytest
+
+from src.commands import Command, CommandType, cmd_end_turn
+from src.match import MatchServer
+from src.replay import Replay, ReplayError, ReplayPlayer, pack_command, state_hash, unpack_command, verify_file
+
+
+@pytest.fixture(scope='module')
+def match(match_setup, start_match, play_ai) -> MatchServer:
+    server = start_match(match_setup(3), seed=3)
+    play_ai(server, 400)
+    return server
+
+
+def _hash(game) -> str:
+    return state_hash(game.to_dict(include_ui_state=False))
+
+
+class TestEncoding:
+    """Test command packing and the file round trip."""
+
+    def test_command_round_trip(self):
+        commands = [
+            cmd_end_turn(2),
+            Command(CommandType.MOVE, 1, card_id=-3, position=29),
+            Command(CommandType.USE_ABILITY, 2, card_id=300, ability_id="лечение", target_id=0),
+            Command(CommandType.CHOOSE_AMOUNT, 1, amount=5, option="x", confirmed=False),
+            Command(CommandType.CONFIRM, 1, confirmed=True),
+        ]
+        out = bytearray()
+        for cmd in commands:
+            pack_command(out, cmd)
+        pos, unpacked = 0, []
+        while pos < len(out):
+            cmd, pos = unpack_command(memoryview(out), pos)
+            unpacked.append(cmd)
+        assert unpacked == commands
+        assert len(out) < 40
+
+    def test_file_round_trip(self, match, tmp_path):
+        replay = match.replay(players={1: "Host", 2: "Guest"})
+        path = tmp_path / "match.brpl"
+        replay.save(str(path))
+        loaded = Replay.load(str(path))
+
+        assert loaded.commands == match.command_log
+        assert loaded.header['players'] == {'1': "Host", '2': "Guest"}
+        assert loaded.header['final_hash'] == _hash(match.game)
+        assert [(k.command_index, k.turn) for k in loaded.keyframes] == \
+            [(k.command_index, k.turn) for k in replay.keyframes]
+        assert loaded.turn_starts == replay.turn_starts
+
+    def test_rejects_other_files(self):
+        with pytest.raises(ReplayError):
+            Replay.from_bytes(b'PK\x03\x04' + bytes(20))
+
+    def test_unseeded_match_cannot_be_replayed(self):
+        server = MatchServer()
+        server.setup_game([], [])
+        with pytest.raises(ReplayError):
+            server.replay()
+
+
+class TestReplayPlayer:
+    """Test seeking and verification."""
+
+    def test_seek_matches_sequential_play(self, match):
+        replay = Replay.from_bytes(match.replay().to_bytes())
+        sequential = ReplayPlayer(replay)
+        hashes = [_hash(sequential.game)]
+        while not sequential.at_end:
+            sequential.step()
+            hashes.append(_hash(sequential.game))
+        assert hashes[-1] == replay.header['final_hash']
+
+        player = ReplayPlayer(replay)
+        for index in (len(hashes) - 1, 5, 70, 33, 0, 64, 65):
+            index = min(index, len(hashes) - 1)
+            assert _hash(player.seek(index)) == hashes[index]
+        # Seeking twice to one keyframe must not reuse state mutated by play
+        assert _hash(player.seek(64)) == hashes[min(64, len(hashes) - 1)]
+
+    def test_seek_turn(self, match):
+        replay = match.replay()
+        player = ReplayPlayer(replay)
+        for turn, index in reversed(replay.turn_starts):
+            assert player.seek_turn(turn).turn_number == turn
+            assert player.position == index
+
+    def test_turn_cache_seeks_match_keyframe_seeks(self, match):
+        replay = match.replay()
+        player = ReplayPlayer(replay, cache_turns=True)
+        while not player.at_end:
+            player.step()
+        assert len(player._cache) == len(replay.turn_starts) - 1  # Every turn start but the first
+
+        reference = ReplayPlayer(replay)
+        for turn, index in reversed(replay.turn_starts):
+            assert _hash(player.seek_turn(turn)) == _hash(reference.seek(index))
+            assert replay.turn_of(index) == turn
+            assert replay.turn_of(max(0, index - 1)) == (turn if index == 0 else turn - 1)
+
+    def test_verify_detects_tampering(self, match, tmp_path):
+        replay = match.replay()
+        good = tmp_path / "good.brpl"
+        replay.save(str(good))
+        assert verify_file(str(good)) is None
+
+        replay.header['final_hash'] = '0' * 16
+        bad = tmp_path / "bad.brpl"
+        replay.save(str(bad))
+        assert verify_file(str(bad)) == "final state differs"
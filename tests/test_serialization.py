@@ -0,0 +1,87 @@
+"""Tests for the compact card and board serialization."""
+import json
+
+from src.board import Board
+from src.card import Card, CARD_SCHEMA, _SPARSE_FIELDS
+from src.game import Game
+
+
+def _full_dict(card: Card) -> dict:
+    """The CARD_SCHEMA 1 layout of a card, every field under its own name."""
+    data = {'def_id': card.def_id, 'player': card.player, 'id': card.id,
+            'curr_life': card.curr_life, 'curr_move': card.curr_move,
+            'ability_cooldowns': card.ability_cooldowns.copy()}
+    data.update({attr: getattr(card, attr) for attr, _, _ in _SPARSE_FIELDS})
+    return data
+
+
+class TestCardSerialization:
+    """Test sparse Card.to_dict and its reading back."""
+
+    def test_defaults_are_left_out(self, place_card):
+        card = place_card("Циклоп", player=2, pos=12)
+        card.armor_remaining = 0
+        assert card.to_dict() == {'d': "Циклоп", 'p': 2, 'i': card.id, 'at': 12}
+        assert Card.from_dict(card.to_dict()) == card
+
+    def test_omitted_fields_read_as_defaults(self):
+        for name in ("Циклоп", "Мастер топора"):  # Мастер топора has armor
+            card = Card.from_dict({'d': name, 'p': 1, 'i': 5})
+            assert all(getattr(card, attr) == default for attr, _, default in _SPARSE_FIELDS)
+            assert (card.curr_life, card.curr_move) == (card.life, card.move)
+
+    def test_changed_fields_round_trip(self, place_card):
+        card = place_card("Гном-басаарг", player=1, pos=7, tapped=True, damage=2)
+        card.ability_cooldowns = {'x': 2}
+        card.webbed = True
+        card.counters = 3
+        card.can_attack_flyer_until_turn = 9
+        data = json.loads(json.dumps(card.to_dict()))
+        assert Card.from_dict(data) == card
+        assert len(json.dumps(data)) < len(json.dumps(_full_dict(card))) / 2
+
+    def test_reads_full_layout(self, place_card):
+        card = place_card("Циклоп", player=1, pos=3, damage=1)
+        card.stunned = True
+        assert Card.from_dict(_full_dict(card)) == card
+
+
+class TestBoardSerialization:
+    """Test that boards keep only occupied slots."""
+
+    def test_round_trip(self, game, place_card):
+        place_card("Циклоп", player=1, pos=3)
+        place_card("Гном-басаарг", player=2, pos=27)
+        dead = place_card("Друид", player=2, pos=20)
+        game.board.cells[20] = None
+        game.board.graveyard_p2.append(dead)
+
+        data = game.board.to_dict()
+        assert data['schema'] == CARD_SCHEMA
+        assert [i for i, _ in data['cells']] == [3, 27]
+        assert data['flying_p1'] == [] and data['flying_p2'] == []
+
+        board = Board.from_dict(json.loads(json.dumps(data)))
+        assert board.cells == game.board.cells
+        assert board.flying_p1 == game.board.flying_p1
+        assert board.graveyard_p2 == game.board.graveyard_p2
+
+    def test_reads_full_layout(self, game, place_card):
+        place_card("Циклоп", player=1, pos=3)
+        legacy = {
+            'cells': [_full_dict(c) if c else None for c in game.board.cells],
+            'flying_p1': [None] * Board.FLYING_SLOTS,
+            'flying_p2': [None] * Board.FLYING_SLOTS,
+            'graveyard_p1': [],
+            'graveyard_p2': [],
+        }
+        assert Board.from_dict(legacy).cells == game.board.cells
+
+    def test_face_down_card_redacted(self, game, place_card):
+        hidden = place_card("Гном-басаарг", player=2, pos=25)
+        hidden.face_down = True
+        snapshot = game.snapshot_for_player(1)
+        assert snapshot['board']['cells'] == [[25, Card.hidden_dict(2, hidden.id, 25)]]
+
+        card = Game.from_dict(snapshot).board.get_card(25)
+        assert card.def_id == "???" and card.face_down and card.id == hidden.id
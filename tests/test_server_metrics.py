@@ -0,0 +1,57 @@
+"""Tests for GameServer metrics and the local metrics endpoint."""
+import asyncio
+
+from src.network.protocol import FrameReader, MessageType, msg_hello
+from src.network.server import GameServer
+
+
+async def _wait_started(server: GameServer):
+    for _ in range(100):
+        if server._server is not None and server._metrics_server is not None:
+            return
+        await asyncio.sleep(0.01)
+    raise TimeoutError("server did not start")
+
+
+class TestServerMetrics:
+    """Test traffic counters and the text endpoint."""
+
+    def test_endpoint_reports_traffic(self, free_port):
+        async def scenario():
+            server = GameServer(host='127.0.0.1', port=free_port(), metrics_port=free_port())
+            task = asyncio.create_task(server.start())
+            try:
+                await _wait_started(server)
+
+                # One client says hello and reads the welcome
+                reader, writer = await asyncio.open_connection('127.0.0.1', server.port)
+                writer.write(msg_hello("Bot", "").to_bytes())
+                await writer.drain()
+                frames = FrameReader()
+                while True:
+                    frames.feed(await reader.read(4096))
+                    msg = frames.get_message()
+                    if msg is not None:
+                        break
+                assert msg.type == MessageType.WELCOME
+                while 'HELLO' not in server.metrics.handler_us:
+                    await asyncio.sleep(0.01)
+
+                # Scrape metrics over plain HTTP
+                m_reader, m_writer = await asyncio.open_connection('127.0.0.1', server.metrics_port)
+                m_writer.write(b"GET /metrics HTTP/1.0\r\n\r\n")
+                await m_writer.drain()
+                response = (await m_reader.read()).decode('utf-8')
+                m_writer.close()
+                writer.close()
+                return response
+            finally:
+                await server.stop()
+                task.cancel()
+
+        response = asyncio.run(scenario())
+        assert response.startswith("HTTP/1.0 200 OK")
+        assert 'berserk_messages_in_total{type="HELLO"} 1' in response
+        assert 'berserk_messages_out_total{type="WELCOME"} 1' in response
+        assert 'berserk_sessions 1' in response
+        assert 'berserk_handler_latency_us{type="HELLO",quantile="0.5"}' in response
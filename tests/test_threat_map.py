@@ -0,0 +1,69 @@
+"""Tests for the AI threat/influence map."""
+from src.ai.threat_map import ThreatMap, FAR_AWAY
+from src.commands import cmd_end_turn
+
+
+class TestThreatMap:
+    """Test per-cell reach, adjacency and distance."""
+
+    def test_ground_reach(self, game, place_card):
+        """Untapped ground enemies reach the 8 surrounding cells."""
+        enemy = place_card("Гном-басаарг", player=2, pos=17)
+        threats = ThreatMap(game, player=1)
+
+        assert threats.attackers[12] == [enemy.id]
+        assert threats.attackers[11] == [enemy.id]  # Diagonal
+        assert threats.threat_count(7) == 0
+        assert threats.expected_damage[12] > 0
+
+    def test_tapped_enemy_no_threat(self, game, place_card):
+        """Tapped enemies do not threaten cells."""
+        place_card("Гном-басаарг", player=2, pos=17, tapped=True)
+        threats = ThreatMap(game, player=1)
+
+        assert threats.threat_count(12) == 0
+
+    def test_adjacency_and_distance(self, game, place_card):
+        """Orthogonal adjacency and Manhattan distance to nearest enemy."""
+        place_card("Гном-басаарг", player=2, pos=17)
+        threats = ThreatMap(game, player=1)
+
+        assert threats.adjacent_enemy_count(12) == 1
+        assert threats.adjacent_enemy_count(11) == 0
+        assert threats.distance_to_enemy(7) == 2
+        assert threats.distance_to_enemy(30) == FAR_AWAY
+
+    def test_flyer_taunt(self, game, place_card):
+        """Enemy flyers only threaten our visible flyer_taunt cards."""
+        spider = place_card("Паук-пересмешник", player=1, pos=0)
+        flyer = place_card("Корпит", player=2, pos=35)
+        threats = ThreatMap(game, player=1)
+
+        assert flyer.id in threats.attackers[spider.position]
+        assert flyer.id not in threats.attackers[20]
+
+    def test_enemy_targets(self, game, place_card):
+        """Our cards list only enemy targets."""
+        cyclops = place_card("Циклоп", player=1, pos=10)
+        place_card("Друид", player=1, pos=11)
+        dwarf = place_card("Гном-басаарг", player=2, pos=15)
+        threats = ThreatMap(game, player=1)
+
+        assert threats.enemy_targets(cyclops) == [dwarf.position]
+
+
+class TestStateVersion:
+    """Test the state version used to key per-state caches."""
+
+    def test_bumped_by_commands(self, game):
+        """Every processed command bumps the version."""
+        before = game.state_version
+        game.process_command(cmd_end_turn(1))
+        assert game.state_version == before + 1
+
+    def test_survives_serialization(self, game):
+        """Snapshots carry the version."""
+        from src.game import Game
+        game.state_version = 7
+        assert Game.from_dict(game.to_dict()).state_version == 7
+        assert Game.from_dict(game.snapshot_for_player(1)).state_version == 7